@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""End-to-end story latency through the task dispatcher, polling vs. event-driven.
+
+Runs the real ``task_dispatcher_loop`` against an in-memory pipeline: a story of
+``--tasks`` tasks, each blocked by the one before, where a simulated worker
+finishes a dispatched task after ``--work-ms`` and the "API" announces the
+transition on ``state:changes`` (in fakeredis) the way the ORM hook does. The
+story's latency is the time from its first dispatch to its last task done.
+
+* ``poll``   — the ``state:changes`` listener disabled: each hop waits for the
+  next sweep (the behaviour before dispatch wake-ups);
+* ``events`` — the listener attached: each hop is dispatched as soon as the
+  blocker's ``done`` is announced, the sweep only reconciles.
+
+The sweep interval is scaled down (``--interval-s``, default 1 s instead of
+production's 30 s) so the run takes seconds; polling's share of the latency
+grows linearly with it, the event-driven share does not.
+
+Usage:
+    python scripts/benchmarks/dispatch_latency.py [--tasks 5] [--work-ms 100] [--interval-s 1]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+from pathlib import Path
+import sys
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path[:0] = [str(ROOT), str(ROOT / "services" / "scheduler")]
+# The API client module reads its settings on import; nothing here connects.
+os.environ.setdefault("API_BASE_URL", "http://api.invalid")
+os.environ.setdefault("REDIS_URL", "redis://redis.invalid")
+os.environ.setdefault("INTERNAL_API_KEY", "benchmark")
+
+from fakeredis import aioredis  # noqa: E402
+import structlog  # noqa: E402
+
+from shared.contracts.queues.state_change import StateChangeEvent  # noqa: E402
+from shared.queues import STATE_CHANGES_STREAM  # noqa: E402
+from src.tasks import task_dispatcher  # noqa: E402
+
+
+class _Story:
+    """A chain of tasks, each blocked by the previous, worked by fake workers."""
+
+    def __init__(self, redis, tasks: int, work_s: float) -> None:
+        self.redis = redis
+        self.work_s = work_s
+        self.status = {f"task-{i}": "todo" for i in range(tasks)}
+        self.started: float | None = None
+        self.finished = asyncio.Event()
+        self.finished_at = 0.0
+        self._workers: set[asyncio.Task] = set()
+
+    async def dispatch(self, *_args) -> int:
+        dispatched = 0
+        previous = None
+        for task_id, status in self.status.items():
+            if status == "todo" and (previous is None or self.status[previous] == "done"):
+                self.status[task_id] = "in_dev"
+                self.started = self.started or time.perf_counter()
+                worker = asyncio.create_task(self._work(task_id))
+                self._workers.add(worker)
+                worker.add_done_callback(self._workers.discard)
+                dispatched += 1
+            previous = task_id
+        return dispatched
+
+    async def sweep(self, *_args) -> None:
+        await self.dispatch()
+
+    async def _work(self, task_id: str) -> None:
+        await asyncio.sleep(self.work_s)
+        self.status[task_id] = "done"
+        event = StateChangeEvent(entity="task", entity_id=task_id, status="done")
+        await self.redis.xadd(STATE_CHANGES_STREAM, {"data": event.model_dump_json()})
+        if all(status == "done" for status in self.status.values()):
+            self.finished_at = time.perf_counter()
+            self.finished.set()
+
+
+async def _idle(*_args, **_kwargs) -> None:
+    await asyncio.Event().wait()
+
+
+async def _measure(mode: str, tasks: int, work_s: float, interval_s: float) -> float:
+    redis_client = MagicMock()
+    redis_client.redis = aioredis.FakeRedis(decode_responses=True)
+    redis_client.connect = AsyncMock()
+    redis_client.close = AsyncMock()
+    story = _Story(redis_client.redis, tasks, work_s)
+    patches = [
+        patch.object(task_dispatcher, "RedisStreamClient", return_value=redis_client),
+        patch.object(task_dispatcher, "_dispatch_interval", return_value=interval_s),
+        patch.object(task_dispatcher, "_sweep", story.sweep),
+        patch.object(task_dispatcher, "dispatch_todo_tasks", story.dispatch),
+        patch.object(task_dispatcher, "complete_stories", AsyncMock(return_value=0)),
+    ]
+    if mode == "poll":
+        patches.append(patch.object(task_dispatcher, "follow_state_changes", _idle))
+    for p in patches:
+        p.start()
+    loop = asyncio.create_task(task_dispatcher.task_dispatcher_loop())
+    try:
+        await story.finished.wait()
+    finally:
+        loop.cancel()
+        await asyncio.gather(loop, return_exceptions=True)
+        for p in reversed(patches):
+            p.stop()
+    return story.finished_at - story.started
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=5)
+    parser.add_argument("--work-ms", type=float, default=100.0)
+    parser.add_argument("--interval-s", type=float, default=1.0)
+    args = parser.parse_args()
+    # The loop logs every pass; only the summary lines below are the result.
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+
+    work_total = args.tasks * args.work_ms / 1000
+    print(
+        f"story of {args.tasks} chained tasks, {args.work_ms:.0f} ms of work each "
+        f"({work_total:.2f} s total), sweep every {args.interval_s:g} s"
+    )
+    for mode in ("poll", "events"):
+        latency = await _measure(mode, args.tasks, args.work_ms / 1000, args.interval_s)
+        waiting = latency - work_total
+        print(
+            f"{mode:>6}: story {latency:7.3f} s  waiting on the dispatcher {waiting:7.3f} s "
+            f"({waiting / max(args.tasks - 1, 1) * 1000:8.1f} ms per hop)"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""Parse time and peak memory of the health checker's Prometheus scrapes, before and after.
+
+Builds a node_exporter and a cadvisor payload the size a busy host serves — the
+cadvisor one runs to tens of thousands of lines, most of them families the
+extractors never read — and parses each two ways:
+
+* ``full``     — every line through the regex into one list, then extraction
+  (the behaviour before family filtering);
+* ``filtered`` — only the families the extractor reads, the rest dropped by a
+  prefix test, fed line by line the way a streamed HTTP body arrives.
+
+Usage:
+    python scripts/benchmarks/prometheus_parser.py [--containers 600] [--cpus 32] [--rounds 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from functools import partial
+from pathlib import Path
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path[:0] = [str(ROOT), str(ROOT / "services" / "scheduler")]
+
+from src.metrics import read_cadvisor, read_node_exporter  # noqa: E402
+from src.metrics.cadvisor import extract_container_metrics  # noqa: E402
+from src.metrics.node_exporter import extract_node_metrics  # noqa: E402
+from src.metrics.parser import parse_prometheus_text  # noqa: E402
+
+# Families cadvisor exports per container that nothing here reads.
+_CADVISOR_NOISE = (
+    "container_blkio_device_usage_total",
+    "container_cpu_cfs_periods_total",
+    "container_cpu_cfs_throttled_periods_total",
+    "container_cpu_load_average_10s",
+    "container_cpu_system_seconds_total",
+    "container_cpu_user_seconds_total",
+    "container_file_descriptors",
+    "container_fs_inodes_free",
+    "container_fs_io_time_seconds_total",
+    "container_fs_reads_bytes_total",
+    "container_fs_usage_bytes",
+    "container_fs_writes_bytes_total",
+    "container_last_seen",
+    "container_memory_cache",
+    "container_memory_failcnt",
+    "container_memory_mapped_file",
+    "container_memory_rss",
+    "container_memory_swap",
+    "container_memory_working_set_bytes",
+    "container_network_receive_errors_total",
+    "container_network_receive_packets_total",
+    "container_network_transmit_errors_total",
+    "container_network_transmit_packets_total",
+    "container_processes",
+    "container_sockets",
+    "container_spec_cpu_period",
+    "container_spec_cpu_shares",
+    "container_start_time_seconds",
+    "container_tasks_state",
+    "container_threads",
+)
+_CADVISOR_READ = (
+    "container_cpu_usage_seconds_total",
+    "container_memory_usage_bytes",
+    "container_spec_memory_limit_bytes",
+    "container_network_receive_bytes_total",
+    "container_network_transmit_bytes_total",
+)
+
+
+def _cadvisor_payload(containers: int) -> str:
+    lines = []
+    for family in (*_CADVISOR_NOISE, *_CADVISOR_READ):
+        lines.append(f"# HELP {family} {family.replace('_', ' ')}.")
+        lines.append(f"# TYPE {family} gauge")
+        for i in range(containers):
+            cid = f"/system.slice/docker-{i:064x}.scope"
+            labels = (
+                f'container_label_com_docker_compose_project="stack{i % 7}",'
+                f'container_label_com_docker_compose_service="svc{i}",'
+                f'id="{cid}",image="registry.local/app{i % 40}:1.{i % 9}",name="app{i}"'
+            )
+            # The per-device and per-interface families repeat for each of them.
+            for device in ("eth0", "eth1") if "network" in family else ("",):
+                extra = f',interface="{device}"' if device else ""
+                lines.append(f"{family}{{{labels}{extra}}} {i * 1024 + 0.5} 1710000000000")
+    return "\n".join(lines) + "\n"
+
+
+def _node_payload(cpus: int) -> str:
+    lines = []
+    for cpu in range(cpus):
+        for mode in ("idle", "iowait", "irq", "nice", "softirq", "steal", "system", "user"):
+            lines.append(f'node_cpu_seconds_total{{cpu="{cpu}",mode="{mode}"}} {cpu * 100.5}')
+    for i in range(cpus * 40):
+        lines.append(f'node_scrape_collector_duration_seconds{{collector="c{i}"}} 0.001')
+        lines.append(f'node_softnet_processed_total{{cpu="{i % cpus}"}} {i}')
+        lines.append(f'node_interrupts_total{{cpu="{i % cpus}",devices="d{i}",type="t{i}"}} {i}')
+    for mount in ("/", "/boot", "/var/lib/docker", *(f"/run/user/{i}" for i in range(50))):
+        for family in ("size", "avail", "free", "files", "files_free", "readonly"):
+            lines.append(f'node_filesystem_{family}_bytes{{mountpoint="{mount}"}} 42949672960')
+    for device in (f"veth{i:05x}" for i in range(200)):
+        for family in ("receive_errs", "transmit_errs", "receive_bytes", "transmit_bytes"):
+            lines.append(f'node_network_{family}_total{{device="{device}"}} 1')
+    lines += [
+        "node_memory_MemTotal_bytes 68719476736",
+        "node_memory_MemAvailable_bytes 34359738368",
+        "node_load1 0.5",
+        "node_load5 0.3",
+        "node_load15 0.1",
+        "node_boot_time_seconds 1710000000",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+async def _lines(text: str) -> AsyncIterator[str]:
+    for line in text.splitlines():
+        yield line
+
+
+def _parse_full(text: str, extract: Callable) -> object:
+    return extract(parse_prometheus_text(text))
+
+
+def _parse_filtered(text: str, read: Callable) -> object:
+    return asyncio.run(read(_lines(text)))
+
+
+def _measure(parse: Callable[[], object], rounds: int) -> tuple[float, float]:
+    """Median wall time (ms) and peak traced allocation (MiB) of *parse*."""
+    times = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        parse()
+        times.append((time.perf_counter() - started) * 1000)
+    tracemalloc.start()
+    parse()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(times), peak / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--containers", type=int, default=600)
+    parser.add_argument("--cpus", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    payloads = {
+        "node_exporter": (
+            _node_payload(args.cpus),
+            extract_node_metrics,
+            read_node_exporter,
+        ),
+        "cadvisor": (
+            _cadvisor_payload(args.containers),
+            extract_container_metrics,
+            read_cadvisor,
+        ),
+    }
+    for name, (text, extract, read) in payloads.items():
+        print(f"{name}: {text.count(chr(10))} lines, {len(text) / 2**20:.1f} MiB")
+        full = _measure(partial(_parse_full, text, extract), args.rounds)
+        filtered = _measure(partial(_parse_filtered, text, read), args.rounds)
+        for label, (ms, mib) in (("full", full), ("filtered", filtered)):
+            print(f"  {label:>8}: {ms:9.1f} ms  peak {mib:7.1f} MiB")
+        print(f"  speed-up {full[0] / filtered[0]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Dequeue-to-start latency of the queue worker's staleness guard, before and after.
+
+Every entry a queue worker reads is checked against the status of the run or
+story it names before its work starts. This measures what that check adds to
+the entry's wait, two ways:
+
+* ``http``  — the status cache detached, so every check is an API round trip
+  (the behaviour before ``state:changes``);
+* ``cache`` — the listener attached and the statuses already announced, so the
+  check is a dict lookup.
+
+The API is simulated with a fixed latency (``--api-latency-ms``, default 3 ms,
+about what a same-host call with one indexed query costs), so the numbers show
+the guard's own share of the wait, not a network's.
+
+Usage:
+    python scripts/benchmarks/staleness_guard.py [--entries 2000] [--api-latency-ms 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+from pathlib import Path
+import statistics
+import sys
+import time
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path[:0] = [str(ROOT), str(ROOT / "services" / "langgraph")]
+# The guard's module reads the worker settings on import; nothing here connects.
+os.environ.setdefault("API_BASE_URL", "http://api.invalid")
+os.environ.setdefault("REDIS_URL", "redis://redis.invalid")
+os.environ.setdefault("INTERNAL_API_KEY", "benchmark")
+
+from src.consumers import _base  # noqa: E402
+from src.consumers._status_cache import StatusCache  # noqa: E402
+
+
+class _SlowAPI:
+    def __init__(self, latency_s: float) -> None:
+        self.latency_s = latency_s
+        self.calls = 0
+
+    async def get(self, path: str) -> dict:
+        self.calls += 1
+        await asyncio.sleep(self.latency_s)
+        return {"status": "running"}
+
+
+async def _measure(entries: int, cache: StatusCache, api: _SlowAPI) -> list[float]:
+    samples = []
+    with patch.object(_base, "_status_cache", cache), patch.object(_base, "api_client", api):
+        for i in range(entries):
+            started = time.perf_counter()
+            await _base._check_message_staleness({"task_id": f"run-{i % 100}"})
+            samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def _report(name: str, samples: list[float], api_calls: int) -> None:
+    quantiles = statistics.quantiles(samples, n=100)
+    print(
+        f"{name:>6}: p50 {quantiles[49]:8.3f} ms  p99 {quantiles[98]:8.3f} ms  "
+        f"api calls {api_calls}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=2000)
+    parser.add_argument("--api-latency-ms", type=float, default=3.0)
+    args = parser.parse_args()
+
+    http_api = _SlowAPI(args.api_latency_ms / 1000)
+    _report("http", await _measure(args.entries, StatusCache(), http_api), http_api.calls)
+
+    cache = StatusCache()
+    cache.attach()
+    for i in range(100):
+        cache.apply("run", f"run-{i}", "running")
+    cached_api = _SlowAPI(args.api_latency_ms / 1000)
+    _report("cache", await _measure(args.entries, cache, cached_api), cached_api.calls)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Encode/decode cost and stream memory of each stream payload codec.
+
+Compares the format every producer used before ``shared.redis.codec`` (stdlib
+``json.dumps`` / ``json.loads`` in one ``data`` field) with each codec, on
+three payload shapes: a small queue command, an engineering result and a QA
+verdict with its transcript. For each it reports the per-entry encode and
+decode time and the bytes 1,000 entries occupy.
+
+Bytes are the encoded field values by default. With ``--redis-url`` the script
+also writes 1,000 entries per codec to a scratch stream and reports Redis's own
+``MEMORY USAGE`` for it, which includes the stream's listpack overhead; the
+scratch streams are deleted afterwards.
+
+Usage:
+    python scripts/benchmarks/stream_codec.py [--iterations 2000] [--redis-url redis://localhost:6379/15]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from shared.redis.codec import CODEC_NAMES, codec_from_name, decode_fields  # noqa: E402
+
+ENTRIES = 1000
+
+
+def _payloads() -> dict[str, dict]:
+    files = [
+        {"path": f"src/app/module_{i}.py", "additions": i * 3, "deletions": i, "status": "modified"}
+        for i in range(40)
+    ]
+    return {
+        "command": {
+            "task_id": "eng-7f3a",
+            "project_id": "5b1c7e0e-8d4e-4a55-9a43-2b1f0c7d9e11",
+            "story_id": "story-42",
+            "correlation_id": "c0ffee00-0000-4000-8000-000000000001",
+        },
+        "engineering_result": {
+            "request_id": "req-1",
+            "status": "success",
+            "summary": "Implemented the endpoint, added tests, updated docs. " * 10,
+            "files_changed": files,
+            "commit_sha": "3f2a9c1b" * 5,
+            "test_output": "tests/test_api.py::test_create PASSED\n" * 120,
+        },
+        "qa_verdict": {
+            "request_id": "req-2",
+            "verdict": "fail",
+            "checks": [
+                {"name": f"check_{i}", "passed": i % 7 != 0, "evidence": "HTTP 200 body ok " * 4}
+                for i in range(60)
+            ],
+            "transcript": "assistant: probing /api/items\nuser: 200 OK\n" * 200,
+        },
+    }
+
+
+def _time_us(fn, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def _field_bytes(fields: dict) -> int:
+    return sum(len(v.encode() if isinstance(v, str) else v) + len(k) for k, v in fields.items())
+
+
+async def _redis_memory(url: str, fields: dict) -> int:
+    import redis.asyncio as redis
+
+    client = redis.from_url(url)
+    key = "benchmark:stream_codec"
+    try:
+        await client.delete(key)
+        async with client.pipeline(transaction=False) as pipe:
+            for _ in range(ENTRIES):
+                pipe.xadd(key, fields)
+            await pipe.execute()
+        return await client.memory_usage(key, samples=0)
+    finally:
+        await client.delete(key)
+        await client.aclose()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--redis-url", default=None)
+    args = parser.parse_args()
+
+    header = f"{'payload':<20}{'format':<16}{'encode us':>11}{'decode us':>11}{'KiB/1k':>10}"
+    if args.redis_url:
+        header += f"{'redis KiB/1k':>14}"
+    print(header)
+    for payload_name, payload in _payloads().items():
+        rows = [("legacy json", lambda p=payload: {"data": json.dumps(p)}, None)]
+        for name in CODEC_NAMES:
+            codec = codec_from_name(name)
+            rows.append((name, lambda p=payload, c=codec: c.encode(p), codec))
+        for label, encode, codec in rows:
+            fields = encode()
+            decode = (
+                (lambda f=fields: json.loads(f["data"]))
+                if codec is None
+                else (lambda f=fields: decode_fields(f))
+            )
+            line = (
+                f"{payload_name:<20}{label:<16}"
+                f"{_time_us(encode, args.iterations):>11.1f}"
+                f"{_time_us(decode, args.iterations):>11.1f}"
+                f"{_field_bytes(fields) * ENTRIES / 1024:>10.1f}"
+            )
+            if args.redis_url:
+                line += f"{await _redis_memory(args.redis_url, fields) / 1024:>14.1f}"
+            print(line)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Time4VPS details sweep against a local fake provider, before and after.
+
+Serves ``shared.tests.mocks.time4vps.FakeTime4VPS`` over HTTP on localhost,
+each answer delayed by ``--latency`` seconds to stand in for the round trip to
+the billing API, and fetches the details of ``--servers`` servers three ways:
+
+* ``before`` — what server sync did: one server after another, every request
+  on a new ``httpx.AsyncClient`` (a new TCP connection each time).
+* ``pooled`` — ``Time4VPSClient`` with its default budget: one connection
+  pool, all servers requested at once, the client bounding in-flight requests
+  and the request rate. Past the first burst the rate budget, not the
+  latency, sets the pace.
+* ``cached`` — the next sweep with ``max_age`` set, as server sync does for
+  servers already reporting health: no request reaches the provider.
+
+Usage:
+    python scripts/benchmarks/time4vps_sync.py [--servers 40] [--latency 0.15] [--port 8765]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from pathlib import Path
+import sys
+import time
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+
+from shared.clients.time4vps import Time4VPSClient  # noqa: E402
+from shared.tests.mocks.time4vps import FakeTime4VPS  # noqa: E402
+
+
+async def _before(base_url: str, server_ids: list[int]) -> None:
+    for server_id in server_ids:
+        async with httpx.AsyncClient() as client:
+            resp = await client.get(f"{base_url}/server/{server_id}", auth=("user", "secret"))
+            resp.raise_for_status()
+
+
+async def _sweep(client: Time4VPSClient, server_ids: list[int], max_age: float = 0) -> None:
+    await asyncio.gather(*(client.get_server_details(i, max_age=max_age) for i in server_ids))
+
+
+async def _timed(fake: FakeTime4VPS, label: str, sweep) -> None:
+    requests = len(fake.requests)
+    fake.max_in_flight = 0
+    started = time.perf_counter()
+    await sweep
+    elapsed = time.perf_counter() - started
+    print(
+        f"  {label:<7} {elapsed:7.2f} s  {len(fake.requests) - requests:>4} requests  "
+        f"max in flight {fake.max_in_flight}"
+    )
+
+
+async def _run(servers: int, latency: float, port: int) -> None:
+    fake = FakeTime4VPS(latency=latency)
+    server_ids = list(range(1, servers + 1))
+    for server_id in server_ids:
+        fake.add_server(server_id)
+
+    config = uvicorn.Config(fake, host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    base_url = f"http://127.0.0.1:{port}/api"
+    client = Time4VPSClient("user", "secret", base_url=base_url)
+    try:
+        print(f"{servers} servers, {latency * 1000:.0f} ms per provider answer")
+        await _timed(fake, "before", _before(base_url, server_ids))
+        await _timed(fake, "pooled", _sweep(client, server_ids))
+        await _timed(fake, "cached", _sweep(client, server_ids, max_age=1800))
+    finally:
+        await client.close()
+        server.should_exit = True
+        await serving
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--servers", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.15)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    asyncio.run(_run(args.servers, args.latency, args.port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Unique-user counting of the analytics aggregator at 1M synthetic users, before and after.
+
+Simulates a project whose users arrive over ``--days`` days, a share of them
+active each day, and counts them two ways:
+
+* ``known users`` — the behaviour before HyperLogLogs: every hourly run reads
+  the project's full list of user hashes from the API, holds it as a set and
+  compares the hour's users against it. Reported as the set's memory and the
+  size of the list on the wire, per run.
+* ``hyperloglog`` — ``src.tasks.analytics_users`` against a real Redis: the
+  days are recorded through ``record_users`` (the last day hour by hour, as
+  the aggregator does), then DAU, WAU, MAU and new users are read back and
+  compared with the exact figures.
+
+Needs a Redis server; it writes only keys under a throwaway project id and
+deletes them afterwards.
+
+Usage:
+    python scripts/benchmarks/unique_users.py [--users 1000000] [--days 30] \\
+        [--daily-active 0.1] [--redis-url redis://localhost:6379/15]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import UTC, date, datetime, timedelta
+import hashlib
+import json
+import os
+from pathlib import Path
+import random
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+import uuid
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path[:0] = [str(ROOT), str(ROOT / "services" / "scheduler")]
+
+from redis.asyncio import Redis  # noqa: E402
+
+from src.tasks.analytics_users import (  # noqa: E402
+    KEY_PREFIX,
+    MAU_DAYS,
+    WAU_DAYS,
+    active_users,
+    lifetime_key,
+    record_users,
+)
+
+_LAST_DAY = date(2026, 10, 16)
+
+
+def _hash(user_id: int) -> str:
+    return hashlib.sha256(f"tg:{user_id}".encode()).hexdigest()
+
+
+def _simulate(users: int, days: int, daily_active: float, seed: int) -> list[list[int]]:
+    """The user ids active on each day, oldest first; every user is active on arrival."""
+    rng = random.Random(seed)  # noqa: S311 — reproducible synthetic data
+    per_day = users // days
+    active_days = []
+    for day in range(days):
+        arrived = per_day * day
+        returning = min(arrived, int(users * daily_active) - per_day)
+        active_days.append(
+            list(range(arrived, arrived + per_day)) + rng.sample(range(arrived), max(0, returning))
+        )
+    return active_days
+
+
+def _known_users_cost(users: int) -> tuple[float, float]:
+    """MiB of the known-users set a run held, and MiB of the list it read over the API."""
+    tracemalloc.start()
+    known = {_hash(i) for i in range(users)}
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    moment = datetime(2026, 10, 16, tzinfo=UTC).isoformat()
+    row = {
+        "project_id": str(uuid.uuid4()),
+        "user_id_hash": next(iter(known)),
+        "first_seen": moment,
+        "last_seen": moment,
+    }
+    # Every row has the same length: fixed-width hash, UUID and timestamps.
+    wire = (len(json.dumps(row)) + 2) * users
+    return peak / 2**20, wire / 2**20
+
+
+def _error(estimate: int, exact: int) -> str:
+    if not exact:
+        return f"{estimate:>9,} / {exact:>9,}"
+    return f"{estimate:>9,} / {exact:>9,}  ({(estimate - exact) / exact * 100:+.2f}%)"
+
+
+async def _hyperloglog(active_days: list[list[int]], redis_url: str) -> None:
+    redis_client = SimpleNamespace(redis=Redis.from_url(redis_url, decode_responses=True))
+    project_id = f"benchmark-{uuid.uuid4()}"
+    first_day = _LAST_DAY - timedelta(days=len(active_days) - 1)
+    seen: set[int] = set()
+    try:
+        started = time.perf_counter()
+        for offset, active in enumerate(active_days[:-1]):
+            day = first_day + timedelta(days=offset)
+            await record_users(redis_client, project_id, day, {"api": {_hash(u) for u in active}})
+            seen.update(active)
+        history_s = time.perf_counter() - started
+
+        # The last day, hour by hour: new users are read off the lifetime count.
+        last = active_days[-1]
+        hour_size = -(-len(last) // 24)
+        hourly_new, exact_new = [], []
+        started = time.perf_counter()
+        for hour in range(24):
+            batch = last[hour * hour_size : (hour + 1) * hour_size]
+            new = await record_users(
+                redis_client, project_id, _LAST_DAY, {"api": {_hash(u) for u in batch}}
+            )
+            hourly_new.append(new["api"])
+            exact_new.append(len(set(batch) - seen))
+            seen.update(batch)
+        hour_ms = (time.perf_counter() - started) / 24 * 1000
+
+        started = time.perf_counter()
+        counted = await active_users(redis_client, project_id, _LAST_DAY)
+        read_ms = (time.perf_counter() - started) * 1000
+
+        keys = [key async for key in redis_client.redis.scan_iter(f"{KEY_PREFIX}:{project_id}:*")]
+        memory = sum([await redis_client.redis.memory_usage(key) or 0 for key in keys])
+
+        exact_dau = len(set(last))
+        exact_wau = len(set().union(*active_days[-WAU_DAYS:]))
+        exact_mau = len(set().union(*active_days[-MAU_DAYS:]))
+        new_today = sum(hourly_new)
+        print(f"  history: {len(active_days) - 1} days recorded in {history_s:.1f} s")
+        print(f"  one hour of the last day: {hour_ms:.0f} ms; DAU/WAU/MAU read: {read_ms:.1f} ms")
+        print(f"  redis: {len(keys)} keys, {memory / 2**10:.0f} KiB")
+        print("  estimate / exact:")
+        print(f"    DAU        {_error(counted.dau, exact_dau)}")
+        print(f"    WAU        {_error(counted.wau, exact_wau)}")
+        print(f"    MAU        {_error(counted.mau, exact_mau)}")
+        lifetime = await redis_client.redis.pfcount(lifetime_key(project_id))
+        returning = max(0, counted.dau - new_today)
+        print(f"    lifetime   {_error(lifetime, len(seen))}")
+        print(f"    new today  {_error(new_today, sum(exact_new))}")
+        print(f"    returning  {_error(returning, exact_dau - sum(exact_new))}")
+        worst = max(abs(a - b) for a, b in zip(hourly_new, exact_new, strict=True))
+        print(f"    new users per hour: worst miss {worst:,} of ~{sum(exact_new) // 24:,}")
+    finally:
+        keys = [key async for key in redis_client.redis.scan_iter(f"{KEY_PREFIX}:{project_id}:*")]
+        if keys:
+            await redis_client.redis.delete(*keys)
+        await redis_client.redis.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--daily-active", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument(
+        "--redis-url", default=os.environ.get("REDIS_URL", "redis://localhost:6379/15")
+    )
+    args = parser.parse_args()
+
+    active_days = _simulate(args.users, args.days, args.daily_active, args.seed)
+    print(f"{args.users:,} users over {args.days} days, ~{len(active_days[-1]):,} active a day")
+
+    set_mib, wire_mib = _known_users_cost(args.users)
+    print("known users (per hourly run, per project):")
+    print(f"  known set {set_mib:.0f} MiB in memory, {wire_mib:.0f} MiB read from the API")
+
+    print("hyperloglog:")
+    asyncio.run(_hyperloglog(active_days, args.redis_url))
+
+
+if __name__ == "__main__":
+    main()
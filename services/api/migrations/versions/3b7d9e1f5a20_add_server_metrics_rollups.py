@@ -0,0 +1,63 @@
+"""Add the 5-minute and 1-hour rollup tiers of server metrics history
+
+Revision ID: 3b7d9e1f5a20
+Revises: 7c19ab4de20f
+Create Date: 2026-10-16 10:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "3b7d9e1f5a20"
+down_revision: str | None = "7c19ab4de20f"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TABLE = "server_metrics_rollups"
+
+
+def upgrade() -> None:
+    """Create the rollup table. Existing raw history is rolled up by the first cycle."""
+    op.create_table(
+        TABLE,
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("server_handle", sa.String(length=255), nullable=False),
+        sa.Column("resolution_seconds", sa.Integer(), nullable=False),
+        sa.Column("recorded_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("samples", sa.Integer(), nullable=False),
+        sa.Column("metrics", sa.JSON(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["server_handle"], ["servers.handle"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "server_handle",
+            "resolution_seconds",
+            "recorded_at",
+            name="uq_server_metrics_rollups_bucket",
+        ),
+    )
+    op.create_index(f"ix_{TABLE}_server_handle", TABLE, ["server_handle"])
+    op.create_index(
+        "ix_server_metrics_rollups_resolution_recorded",
+        TABLE,
+        ["resolution_seconds", "recorded_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_server_metrics_rollups_resolution_recorded", table_name=TABLE)
+    op.drop_index(f"ix_{TABLE}_server_handle", table_name=TABLE)
+    op.drop_table(TABLE)
@@ -0,0 +1,29 @@
+"""Add mergeable latency sketches to hourly and daily analytics
+
+Revision ID: 5e2a8c0d4b17
+Revises: 3b7d9e1f5a20
+Create Date: 2026-10-16 12:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "5e2a8c0d4b17"
+down_revision: str | None = "3b7d9e1f5a20"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TABLES = ("analytics_hourly", "analytics_daily")
+
+
+def upgrade() -> None:
+    """Nullable: rows written before this keep only their stored percentiles."""
+    for table in TABLES:
+        op.add_column(table, sa.Column("latency_sketch", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_column(table, "latency_sketch")
@@ -0,0 +1,34 @@
+"""Add keyset indexes for the paged list reads
+
+Revision ID: 6c1d8e4f2a93
+Revises: 9a4f6b2c8e31
+Create Date: 2026-10-16 18:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "6c1d8e4f2a93"
+down_revision: str | None = "9a4f6b2c8e31"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# One index per list read, on its default sort key: a page is then an index
+# range scan from the cursor rather than a sort of every matching row.
+INDEXES = (
+    ("ix_runs_created_at_id", "runs", ["created_at", "id"]),
+    ("ix_projects_created_at_id", "projects", ["created_at", "id"]),
+    ("ix_tasks_priority_created_at_id", "tasks", ["priority", "created_at", "id"]),
+    ("ix_stories_priority_created_at_id", "stories", ["priority", "created_at", "id"]),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
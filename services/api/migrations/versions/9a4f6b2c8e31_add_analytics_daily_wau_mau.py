@@ -0,0 +1,29 @@
+"""Add WAU and MAU to daily analytics
+
+Revision ID: 9a4f6b2c8e31
+Revises: 5e2a8c0d4b17
+Create Date: 2026-10-16 14:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "9a4f6b2c8e31"
+down_revision: str | None = "5e2a8c0d4b17"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TABLE = "analytics_daily"
+
+
+def upgrade() -> None:
+    """Nullable: days rolled up before the user HyperLogLogs have no window counts."""
+    op.add_column(TABLE, sa.Column("wau", sa.Integer(), nullable=True))
+    op.add_column(TABLE, sa.Column("mau", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column(TABLE, "mau")
+    op.drop_column(TABLE, "wau")
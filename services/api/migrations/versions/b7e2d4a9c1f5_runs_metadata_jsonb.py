@@ -0,0 +1,52 @@
+"""Store run metadata and result as JSONB and index metadata
+
+Revision ID: b7e2d4a9c1f5
+Revises: 6c1d8e4f2a93
+Create Date: 2026-10-16 20:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "b7e2d4a9c1f5"
+down_revision: str | None = "6c1d8e4f2a93"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+COLUMNS = ("metadata", "result")
+
+
+def upgrade() -> None:
+    for column in COLUMNS:
+        op.alter_column(
+            "runs",
+            column,
+            existing_type=sa.JSON(),
+            type_=postgresql.JSONB(astext_type=sa.Text()),
+            postgresql_using=f"{column}::jsonb",
+        )
+    # jsonb_path_ops: smaller than the default operator class and serves `@>`,
+    # the only operator the filters use.
+    op.create_index(
+        "ix_runs_metadata",
+        "runs",
+        ["metadata"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"metadata": "jsonb_path_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_runs_metadata", table_name="runs", postgresql_using="gin")
+    for column in COLUMNS:
+        op.alter_column(
+            "runs",
+            column,
+            existing_type=postgresql.JSONB(astext_type=sa.Text()),
+            type_=sa.JSON(),
+            postgresql_using=f"{column}::json",
+        )
@@ -18,6 +18,7 @@ from shared.provisioning_policy import managed_time4vps_server_ids
 from . import routers
 from .database import engine
 from .dependencies import close_redis, init_redis, require_authenticated_caller
+from .state_events import install_state_change_publisher
 
 
 @asynccontextmanager
@@ -26,6 +27,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     setup_logging(service_name="api")
     managed_time4vps_server_ids()
     await init_redis()
+    install_state_change_publisher()
     yield
     await close_redis()
     await engine.dispose()
@@ -145,6 +147,7 @@ app.include_router(routers.system_configs.router, prefix="/api")
 app.include_router(routers.rag.router, prefix="/api")
 app.include_router(routers.runs.router, prefix="/api")
 app.include_router(routers.tasks.router, prefix="/api")
+app.include_router(routers.pipeline.router, prefix="/api")
 app.include_router(routers.brainstorms.router, prefix="/api")
 app.include_router(routers.repositories.router, prefix="/api")
 app.include_router(routers.stories.router, prefix="/api")
@@ -12,6 +12,7 @@ from . import (
     incidents,
     lk,
     lk_auth,
+    pipeline,
     projects,
     rag,
     repositories,
@@ -37,6 +38,7 @@ __all__ = [
     "incidents",
     "lk",
     "lk_auth",
+    "pipeline",
     "projects",
     "rag",
     "repositories",
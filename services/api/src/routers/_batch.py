@@ -0,0 +1,39 @@
+"""The id lists of the batch reads: many rows, one ``IN`` query.
+
+A caller that needs a story's tasks, the stories behind a page of records or the
+events of every sibling used to ask for them one request at a time. The batch
+reads (``GET /tasks/batch``, ``/tasks/events``, ``/stories/batch``,
+``/runs/batch``) take the ids as a repeated query parameter instead and answer
+with one query. The cap is the client's chunk size, so
+``InternalAPIClient.get_batch`` never sends a list this refuses.
+"""
+
+from __future__ import annotations
+
+from fastapi import HTTPException, status
+
+from shared.clients.internal_api import BATCH_MAX_IDS
+
+
+def batch_ids(**named: list[str] | None) -> dict[str, list[str]]:
+    """Each named id list without blanks or repeats, in the order given.
+
+    At least one list must name something: a batch read with no ids would
+    otherwise be an unfiltered read of the whole table.
+    """
+    lists = {
+        name: list(dict.fromkeys(value for value in values or () if value))
+        for name, values in named.items()
+    }
+    if not any(lists.values()):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"name at least one id in {' or '.join(named)}",
+        )
+    for name, ids in lists.items():
+        if len(ids) > BATCH_MAX_IDS:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"{name} names {len(ids)} ids; at most {BATCH_MAX_IDS} per request",
+            )
+    return lists
@@ -0,0 +1,164 @@
+"""Server metrics history rollups — the 5-minute and 1-hour tiers.
+
+Each tier is built incrementally from the one below it: a pass picks up at the
+bucket after the newest one the tier already holds, averages every complete
+bucket since, and writes them in one statement. Buckets still filling are left
+for a later pass, so a pass is cheap enough to run every health check cycle.
+"""
+
+from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import func, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared.models import ServerMetricsHistory, ServerMetricsRollup
+from shared.models.server_metrics_history import METRICS_ROLLUP_RESOLUTIONS
+
+# Fields that are counters or clocks: the latest value is the meaningful one.
+_LATEST_FIELDS = frozenset({"uptime_seconds", "network_rx_errors", "network_tx_errors"})
+
+# A range read aims for about this many points, whatever its window.
+_TARGET_POINTS = 120
+
+# Bound on the buckets one pass writes per tier, so a long backlog (the first
+# pass after the migration, a scheduler that was down) is caught up over
+# several cycles rather than loaded at once.
+_MAX_BUCKETS_PER_PASS = 288
+
+# Rollup rows per INSERT. Each row binds 5 parameters and asyncpg refuses a
+# statement with more than 32767, which a full pass over a few dozen servers
+# would exceed in a single statement.
+_INSERT_ROWS = 5000
+
+
+def bucket_start(moment: datetime, resolution: int) -> datetime:
+    """Start of the *resolution*-second bucket that holds *moment*."""
+    seconds = int(moment.timestamp())
+    return datetime.fromtimestamp(seconds - seconds % resolution, UTC)
+
+
+def resolution_for_window(hours: int) -> int | None:
+    """The coarsest tier that still gives *hours* about ``_TARGET_POINTS`` points.
+
+    None means the raw snapshots. Tier retentions grow with their resolution,
+    so the tier chosen for a window also keeps that much history.
+    """
+    step = hours * 3600 / _TARGET_POINTS
+    return max((r for r in METRICS_ROLLUP_RESOLUTIONS if r <= step), default=None)
+
+
+def _is_number(value: object) -> bool:
+    return isinstance(value, int | float) and not isinstance(value, bool)
+
+
+def merge_snapshots(snapshots: Sequence[tuple[dict, int]]) -> dict:
+    """One snapshot for a bucket from *snapshots* (oldest first), each weighted by its samples.
+
+    Gauges become their weighted mean, with their peak kept under ``max``;
+    counters and anything non-numeric keep the latest value.
+    """
+    merged: dict = {}
+    totals: dict[str, float] = {}
+    weights: dict[str, int] = {}
+    peaks: dict[str, float] = {}
+    for metrics, samples in snapshots:
+        seen_peaks = metrics.get("max") or {}
+        for field, value in metrics.items():
+            if field == "max":
+                continue
+            if value is None:
+                merged.setdefault(field, None)
+            elif field in _LATEST_FIELDS or not _is_number(value):
+                merged[field] = value
+            else:
+                totals[field] = totals.get(field, 0.0) + value * samples
+                weights[field] = weights.get(field, 0) + samples
+                peak = seen_peaks.get(field, value)
+                peaks[field] = max(peaks.get(field, peak), peak)
+    for field, total in totals.items():
+        merged[field] = total / weights[field]
+    if peaks:
+        merged["max"] = peaks
+    return merged
+
+
+async def roll_up_metrics_history(db: AsyncSession, now: datetime) -> dict[int, int]:
+    """Write every complete bucket of each tier not yet rolled up; buckets written per tier."""
+    written = {}
+    source = None
+    for resolution in METRICS_ROLLUP_RESOLUTIONS:
+        written[resolution] = await _roll_up_tier(db, resolution, source, now)
+        source = resolution
+    return written
+
+
+async def _roll_up_tier(
+    db: AsyncSession, resolution: int, source: int | None, now: datetime
+) -> int:
+    if source is None:
+        model, where, samples = ServerMetricsHistory, (), literal(1)
+    else:
+        model = ServerMetricsRollup
+        where = (ServerMetricsRollup.resolution_seconds == source,)
+        samples = ServerMetricsRollup.samples
+
+    newest = await db.scalar(
+        select(func.max(ServerMetricsRollup.recorded_at)).where(
+            ServerMetricsRollup.resolution_seconds == resolution
+        )
+    )
+    after = newest + timedelta(seconds=resolution) if newest is not None else None
+    # Start at the first source row past the tier, so a gap in the source
+    # (nothing was checked for a while) is skipped rather than walked.
+    first = await db.scalar(
+        select(func.min(model.recorded_at)).where(
+            *where, *(() if after is None else (model.recorded_at >= after,))
+        )
+    )
+    if first is None:
+        return 0
+    start = bucket_start(first, resolution)
+    end = min(
+        bucket_start(now, resolution),
+        start + timedelta(seconds=resolution * _MAX_BUCKETS_PER_PASS),
+    )
+    if source is not None:
+        # A source tier still catching up has not reached *now*: stop at the
+        # last bucket it has fully written, or that bucket would be rolled up
+        # from part of its rows and never revisited.
+        frontier = await db.scalar(select(func.max(model.recorded_at)).where(*where))
+        end = min(end, bucket_start(frontier + timedelta(seconds=source), resolution))
+    if end <= start:
+        return 0
+
+    result = await db.execute(
+        select(model.server_handle, model.recorded_at, model.metrics, samples)
+        .where(*where, model.recorded_at >= start, model.recorded_at < end)
+        .order_by(model.server_handle, model.recorded_at)
+    )
+    buckets: dict[tuple[str, datetime], list[tuple[dict, int]]] = {}
+    for handle, recorded_at, metrics, weight in result.all():
+        key = (handle, bucket_start(recorded_at, resolution))
+        buckets.setdefault(key, []).append((metrics, weight))
+    if not buckets:
+        return 0
+
+    rows = [
+        {
+            "server_handle": handle,
+            "resolution_seconds": resolution,
+            "recorded_at": bucket,
+            "samples": sum(weight for _, weight in snapshots),
+            "metrics": merge_snapshots(snapshots),
+        }
+        for (handle, bucket), snapshots in buckets.items()
+    ]
+    for offset in range(0, len(rows), _INSERT_ROWS):
+        await db.execute(
+            pg_insert(ServerMetricsRollup)
+            .values(rows[offset : offset + _INSERT_ROWS])
+            .on_conflict_do_nothing(constraint="uq_server_metrics_rollups_bucket")
+        )
+    return len(buckets)
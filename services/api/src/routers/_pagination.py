@@ -0,0 +1,205 @@
+"""Keyset pages, field projection and streamed JSON for the list reads.
+
+``GET /runs/``, ``/projects/``, ``/tasks/`` and ``/stories/`` used to answer
+with every matching row and every column, so a sweep or a dashboard paid for
+the whole table on each call. They now take three optional parameters:
+
+* ``limit`` — the most rows in the answer, at most ``PAGE_MAX``. When more
+  rows follow, the response carries ``X-Next-Cursor``; sending it back as
+  ``cursor`` returns the next page. The cursor holds the sort key of the last
+  row, so a page starts strictly after it whatever was inserted or deleted
+  meanwhile (a keyset, not an offset). ``InternalAPIClient.iter_pages`` walks
+  the pages for service callers.
+* ``fields`` — a comma-separated subset of the response schema's fields. Only
+  those columns are loaded and sent, so heavy JSON such as ``run_metadata`` or
+  ``result`` stays in the database when the caller does not need it.
+* ``cursor`` — see ``limit``.
+
+The body stays a JSON array, written row by row as it is encoded rather than
+built whole first. A read without ``limit`` still returns every row.
+"""
+
+from __future__ import annotations
+
+import base64
+from collections.abc import Callable, Iterator, Sequence
+from datetime import datetime
+import json
+from typing import Any
+import uuid
+
+from fastapi import HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Select, and_, inspect, or_, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute, load_only
+
+from shared.clients.internal_api import NEXT_CURSOR_HEADER, PAGE_MAX
+
+__all__ = ["PAGE_MAX", "ListPage", "Order", "stream_page"]
+
+# One sort key: the column and whether it runs descending. Every order ends
+# with the primary key, so no two rows share a position.
+type Order = Sequence[tuple[InstrumentedAttribute, bool]]
+
+# Rows encoded into one chunk of the streamed body.
+_CHUNK_ROWS = 100
+
+
+class ListPage:
+    """The ``limit``, ``cursor`` and ``fields`` of a list read, as one dependency."""
+
+    def __init__(
+        self,
+        limit: int | None = Query(None, ge=1, le=PAGE_MAX),
+        cursor: str | None = Query(None),
+        fields: str | None = Query(None),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.fields = fields
+
+
+def _parse_fields(fields: str | None, schema: type[BaseModel], model: type) -> list[str] | None:
+    """The requested fields in schema order, or None for all of them.
+
+    Only fields stored in a column of *model* can be projected; computed ones
+    need the whole row.
+    """
+    if not fields:
+        return None
+    projectable = {attr.key for attr in inspect(model).column_attrs}
+    allowed = [name for name in schema.model_fields if name in projectable]
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail=f"cannot project {', '.join(sorted(unknown))}; fields are {', '.join(allowed)}",
+        )
+    return [name for name in allowed if name in requested]
+
+
+def _decode_cursor(cursor: str, order: Order) -> list[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(order):
+            raise ValueError("cursor does not match the sort")
+        return [_from_json(attr, value) for (attr, _), value in zip(order, values, strict=True)]
+    except (ValueError, TypeError, AttributeError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail="cursor is malformed or belongs to another sort order",
+        ) from exc
+
+
+def _encode_cursor(row: Any, order: Order) -> str:
+    values = [_to_json(getattr(row, attr.key)) for attr, _ in order]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def _from_json(attr: InstrumentedAttribute, value: Any) -> Any:
+    """*value* as the column's Python type; a value of any other type is a ValueError.
+
+    The cursor comes from the client, so a wrong type has to stop here rather
+    than reach the driver.
+    """
+    python_type = attr.type.python_type
+    if python_type is datetime or python_type is uuid.UUID:
+        if not isinstance(value, str):
+            raise ValueError(f"cursor value for {attr.key} is not a string")
+        return datetime.fromisoformat(value) if python_type is datetime else uuid.UUID(value)
+    if not isinstance(value, python_type) or (isinstance(value, bool) and python_type is not bool):
+        raise ValueError(f"cursor value for {attr.key} is not {python_type.__name__}")
+    return value
+
+
+def _after(order: Order, values: list[Any]):
+    """Rows strictly after *values* in *order*."""
+    directions = {descending for _, descending in order}
+    if len(directions) == 1:
+        # One direction: a row comparison, which an index on the keys serves.
+        columns, bound = tuple_(*(attr for attr, _ in order)), tuple_(*values)
+        return columns < bound if directions.pop() else columns > bound
+    clauses = []
+    for i, (attr, descending) in enumerate(order):
+        ties = [prior == value for (prior, _), value in zip(order[:i], values, strict=False)]
+        clauses.append(and_(*ties, attr < values[i] if descending else attr > values[i]))
+    return or_(*clauses)
+
+
+def _paged(query: Select, order: Order, *, cursor: str | None, limit: int | None) -> Select:
+    query = query.order_by(
+        *(attr.desc() if descending else attr.asc() for attr, descending in order)
+    )
+    if cursor is not None:
+        query = query.where(_after(order, _decode_cursor(cursor, order)))
+    if limit is not None:
+        # One row past the page says whether another page follows.
+        query = query.limit(limit + 1)
+    return query
+
+
+def _json_array(rows: Sequence[Any], encode: Callable[[Any], str]) -> Iterator[bytes]:
+    yield b"["
+    for start in range(0, len(rows), _CHUNK_ROWS):
+        chunk = ",".join(encode(row) for row in rows[start : start + _CHUNK_ROWS])
+        yield (chunk if start == 0 else "," + chunk).encode()
+    yield b"]"
+
+
+async def stream_page(
+    db: AsyncSession,
+    query: Select,
+    page: ListPage,
+    *,
+    order: Order,
+    schema: type[BaseModel],
+    read: Callable[[Any], BaseModel] | None = None,
+) -> StreamingResponse:
+    """Run *query* for one *page* and stream it as a JSON array of *schema*.
+
+    *read* turns a row into its schema object (``schema.model_validate`` by
+    default). With ``page.fields``, only those columns and the sort keys are
+    loaded and each row is encoded from them alone.
+    """
+    entity = query.column_descriptions[0]["entity"]
+    fields = _parse_fields(page.fields, schema, entity)
+    limit = page.limit
+    query = _paged(query, order, cursor=page.cursor, limit=limit)
+    if fields is not None:
+        keys = dict.fromkeys([*fields, *(attr.key for attr, _ in order)])
+        query = query.options(load_only(*(getattr(entity, key) for key in keys)))
+
+    result = await db.execute(query)
+    rows = list(result.scalars().all())
+    headers = {}
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        headers[NEXT_CURSOR_HEADER] = _encode_cursor(rows[-1], order)
+
+    if fields is not None:
+        include = set(fields)
+
+        def encode(row: Any) -> str:
+            values = {name: getattr(row, name) for name in fields}
+            return schema.model_construct(**values).model_dump_json(include=include)
+
+    else:
+        to_schema = read or schema.model_validate
+
+        def encode(row: Any) -> str:
+            return to_schema(row).model_dump_json()
+
+    return StreamingResponse(
+        _json_array(rows, encode), media_type="application/json", headers=headers
+    )
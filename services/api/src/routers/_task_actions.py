@@ -16,7 +16,7 @@ from ..database import get_async_session
 from ..dependencies import get_redis_client
 from ..schemas.actions import SpawnWorkerRequest
 from ..schemas.run import RunRead
-from ..schemas.task import TaskRead, TaskResume, TaskTransition
+from ..schemas.task import TaskRead, TaskReplay, TaskResume, TaskRetry, TaskTransition
 from ._ownership import initiating_run_or_conflict
 from ._recipients import resolve_project_chat_id
 from ._task_helpers import create_status_event, get_task, to_read, validate_transition
@@ -32,6 +32,10 @@ _COMPLETE_PATH: dict[str, list[str]] = {
     TaskStatus.TESTING: [TaskStatus.DONE],
 }
 
+# The way back to TODO for a task that failed or waited: through BACKLOG, as the
+# state machine requires, but as one move.
+_RETRY_PATH = (TaskStatus.BACKLOG, TaskStatus.TODO)
+
 
 @action_router.post("/{task_id}/start", response_model=TaskRead)
 async def start_task(
@@ -194,6 +198,99 @@ async def transition_task(
     return to_read(task)
 
 
+@action_router.post("/{task_id}/retry", response_model=TaskRead)
+async def retry_task(
+    task_id: str,
+    body: TaskRetry,
+    db: AsyncSession = Depends(get_async_session),
+) -> TaskRead:
+    """Send a task back to TODO through BACKLOG and set its iteration, in one commit.
+
+    The supervisor used to make this three requests — two transitions and an
+    update — and a crash between them left the task in BACKLOG, or in TODO on
+    its old iteration. Here the row is locked, each step is checked against the
+    state machine, and one status event records the whole move.
+
+    A retry that already landed (the task in TODO on the requested iteration)
+    answers with the task unchanged, so a caller that lost the response can
+    send it again. A task in TODO on another iteration answers 409: the caller
+    read it before some other retry moved it, and changing the iteration here
+    would take no step to record it by.
+    """
+    task = await get_task(task_id, db, for_update=True)
+    if task.status == TaskStatus.TODO:
+        if body.next_iteration in (None, task.current_iteration):
+            return to_read(task)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=(
+                f"Task {task_id} is already in TODO on iteration {task.current_iteration}, "
+                f"not {body.next_iteration}"
+            ),
+        )
+
+    old_status = task.status
+    steps = list(_RETRY_PATH)
+    if old_status in steps:
+        steps = steps[steps.index(old_status) + 1 :]
+    for next_status in steps:
+        validate_transition(task.status, next_status)
+        task.status = next_status
+    if body.next_iteration is not None:
+        task.current_iteration = body.next_iteration
+    if steps:
+        details = {
+            **body.details,
+            "via": [s.value for s in steps[:-1]],
+            "iteration": task.current_iteration,
+        }
+        await create_status_event(task, old_status, TaskStatus.TODO, body.actor, details, db)
+    await db.commit()
+    await db.refresh(task)
+
+    logger.info(
+        "task_retried", task_id=task.id, from_s=old_status, iteration=task.current_iteration
+    )
+    return to_read(task)
+
+
+@action_router.post("/{task_id}/replay", response_model=TaskRead)
+async def replay_task(
+    task_id: str,
+    body: TaskReplay,
+    db: AsyncSession = Depends(get_async_session),
+) -> TaskRead:
+    """Walk a task through a chain of statuses in one commit, with one event.
+
+    For outcomes that are already recorded elsewhere — a finished run's result
+    applied to its task — where every step is known before the first one is
+    taken. Each step is checked against the state machine and the walk either
+    lands whole or not at all.
+
+    A task already standing on a status of the chain resumes after it, so a
+    replay whose response was lost can be sent again and does not fail on the
+    steps it already took.
+    """
+    task = await get_task(task_id, db, for_update=True)
+    chain = [s.value for s in body.statuses]
+    if task.status in chain:
+        chain = chain[len(chain) - chain[::-1].index(task.status) :]
+    if not chain:
+        return to_read(task)
+
+    old_status = task.status
+    for next_status in chain:
+        validate_transition(task.status, next_status)
+        task.status = next_status
+    details = {**body.details, "via": chain[:-1]}
+    await create_status_event(task, old_status, task.status, body.actor, details, db)
+    await db.commit()
+    await db.refresh(task)
+
+    logger.info("task_replayed", task_id=task.id, from_s=old_status, to_s=task.status)
+    return to_read(task)
+
+
 @action_router.post("/{task_id}/spawn-worker")
 async def spawn_worker(
     task_id: str,
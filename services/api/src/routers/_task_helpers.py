@@ -64,8 +64,12 @@ def to_read(task: Task, last_event: str | None = None) -> TaskRead:
     )
 
 
-async def get_task(task_id: str, db: AsyncSession) -> Task:
+async def get_task(task_id: str, db: AsyncSession, *, for_update: bool = False) -> Task:
     query = select(Task).where(Task.id == task_id)
+    if for_update:
+        # Held until the caller commits, so a compound transition decides from
+        # a status nobody else can change under it.
+        query = query.with_for_update()
     result = await db.execute(query)
     task = result.scalar_one_or_none()
     if not task:
@@ -1,4 +1,4 @@
-"""Analytics router — CRUD for hourly, daily, and known_users tables."""
+"""Analytics router — CRUD for hourly and daily tables, reads of known_users."""
 
 import datetime as dt
 import uuid
@@ -19,7 +19,6 @@ from ..schemas.analytics import (
     AnalyticsHourlyCreate,
     AnalyticsHourlyRead,
     AnalyticsKnownUserRead,
-    AnalyticsKnownUsersBatchUpsert,
 )
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
@@ -50,6 +49,7 @@ async def upsert_hourly(
             "p50_ms": stmt.excluded.p50_ms,
             "p95_ms": stmt.excluded.p95_ms,
             "p99_ms": stmt.excluded.p99_ms,
+            "latency_sketch": stmt.excluded.latency_sketch,
             "top_endpoints": stmt.excluded.top_endpoints,
         },
     )
@@ -126,9 +126,12 @@ async def upsert_daily(
             "unique_users": stmt.excluded.unique_users,
             "new_users": stmt.excluded.new_users,
             "dau": stmt.excluded.dau,
+            "wau": stmt.excluded.wau,
+            "mau": stmt.excluded.mau,
             "returning_users": stmt.excluded.returning_users,
             "p95_ms": stmt.excluded.p95_ms,
             "error_rate": stmt.excluded.error_rate,
+            "latency_sketch": stmt.excluded.latency_sketch,
         },
     )
     await db.execute(stmt)
@@ -179,34 +182,6 @@ async def delete_old_daily(
 # --- Known Users ---
 
 
-@router.post("/known-users", status_code=status.HTTP_201_CREATED)
-async def batch_upsert_known_users(
-    data: AnalyticsKnownUsersBatchUpsert,
-    db: AsyncSession = Depends(get_async_session),
-) -> dict[str, int]:
-    """Batch upsert known users for a project."""
-    if not data.users:
-        return {"upserted": 0}
-
-    for user in data.users:
-        stmt = pg_insert(AnalyticsKnownUsers).values(
-            project_id=data.project_id,
-            user_id_hash=user.user_id_hash,
-            first_seen=user.first_seen,
-            last_seen=user.last_seen,
-        )
-        stmt = stmt.on_conflict_do_update(
-            index_elements=["project_id", "user_id_hash"],
-            set_={
-                "last_seen": stmt.excluded.last_seen,
-            },
-        )
-        await db.execute(stmt)
-
-    await db.commit()
-    return {"upserted": len(data.users)}
-
-
 @router.get("/known-users", response_model=list[AnalyticsKnownUserRead])
 async def list_known_users(
     project_id: uuid.UUID = Query(...),
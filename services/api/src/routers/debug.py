@@ -10,6 +10,13 @@ import structlog
 
 from shared.queues import QUEUE_TOPOLOGY
 from shared.redis import decode_redis_fields
+from shared.redis.codec import (
+    ENCODING_ERRORS,
+    PayloadDecodeError,
+    decode_fields,
+    is_tagged,
+    printable_fields,
+)
 
 from ..config import get_settings
 
@@ -98,15 +105,13 @@ def _parse_message_id(mid: str) -> float:
 
 
 def _parse_fields(fields: dict) -> dict:
-    """Unwrap the {data: json_string} envelope if present, otherwise return raw."""
-    import json
-
-    if "data" in fields and len(fields) == 1:
+    """Unwrap the {data: ...} envelope, in any stream codec, otherwise return raw."""
+    if ("data" in fields and len(fields) == 1) or is_tagged(fields):
         try:
-            return json.loads(fields["data"])
-        except (json.JSONDecodeError, TypeError):
+            return decode_fields(fields)
+        except PayloadDecodeError:
             pass
-    return fields
+    return printable_fields(fields)
 
 
 @router.get("/debug/queues/{stream}/messages")
@@ -121,7 +126,10 @@ async def queue_messages(
     Returns messages oldest-first with parsed data and timestamps.
     """
     settings = get_settings()
-    r = aioredis.from_url(settings.redis_url, decode_responses=True)
+    # Binary-codec bodies come back as surrogates rather than failing the read.
+    r = aioredis.from_url(
+        settings.redis_url, decode_responses=True, encoding_errors=ENCODING_ERRORS
+    )
     try:
         try:
             raw = await r.xrange(stream, min=start, max=end, count=count)
@@ -137,7 +145,7 @@ async def queue_messages(
                     "id": mid,
                     "timestamp": _parse_message_id(mid),
                     "data": _parse_fields(fields),
-                    "raw_fields": fields,
+                    "raw_fields": printable_fields(fields),
                 }
             )
 
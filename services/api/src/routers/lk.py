@@ -13,10 +13,10 @@ from shared.analytics_health import (
     collection_state,
     decode_heartbeat,
 )
+from shared.latency_sketch import merge_sketches
 from shared.models import SystemConfig, User
 from shared.models.analytics_daily import AnalyticsDaily
 from shared.models.analytics_hourly import AnalyticsHourly
-from shared.models.analytics_known_users import AnalyticsKnownUsers
 from shared.models.project import Project
 
 from ..database import get_async_session
@@ -40,6 +40,9 @@ router = APIRouter(prefix="/lk", tags=["lk"])
 # How old the latest hourly bucket can be before we consider the service "down"
 _STATUS_UP_THRESHOLD = dt.timedelta(hours=2)
 
+# Window of WAU, and of the 7d summary period.
+_WAU_DAYS = 7
+
 
 async def _collection_health(
     db: AsyncSession,
@@ -183,8 +186,7 @@ async def _summary_from_hourly(
     error_count = sum(r.error_count for r in rows)
     total_users = sum(r.unique_users for r in rows)
     new_users = sum(r.new_users for r in rows)
-    p95_values = [r.p95_ms for r in rows if r.p95_ms is not None]
-    p95_ms = max(p95_values) if p95_values else None
+    p95_ms = _p95(rows)
     error_rate = error_count / total_requests if total_requests > 0 else 0.0
 
     # Top endpoints: merge across all rows
@@ -193,15 +195,7 @@ async def _summary_from_hourly(
     # Breakdown per service
     breakdown = _breakdown_from_hourly(rows)
 
-    # WAU: count distinct known users active in last 7 days
-    wau_cutoff = now - dt.timedelta(days=7)
-    wau_result = await db.execute(
-        select(func.count(AnalyticsKnownUsers.user_id_hash)).where(
-            AnalyticsKnownUsers.project_id == project_id,
-            AnalyticsKnownUsers.last_seen >= wau_cutoff,
-        )
-    )
-    wau = wau_result.scalar() or 0
+    wau = await _latest_wau(db, project_id, now)
 
     returning_pct = 0.0
     if total_users > 0:
@@ -247,16 +241,20 @@ async def _summary_from_daily(
     error_count = sum(r.error_count for r in rows)
     total_users = sum(r.unique_users for r in rows)
     new_users = sum(r.new_users for r in rows)
-    p95_values = [r.p95_ms for r in rows if r.p95_ms is not None]
-    p95_ms = max(p95_values) if p95_values else None
+    p95_ms = _p95(rows)
     error_rate = error_count / total_requests if total_requests > 0 else 0.0
 
     # Latest DAU
-    dau = rows[-1].dau if rows else 0
+    latest = rows[-1]
+    dau = latest.dau
 
-    # WAU: sum of unique_users over last 7 days (approximation from daily)
-    wau_rows = [r for r in rows if r.date >= dt.date.today() - dt.timedelta(days=7)]
-    wau = sum(r.unique_users for r in wau_rows)
+    # WAU/MAU: distinct users of the windows ending on the latest day. Days
+    # rolled up before those were counted leave only sums of daily users.
+    wau_rows = [r for r in rows if r.date >= dt.date.today() - dt.timedelta(days=_WAU_DAYS)]
+    wau = latest.wau if latest.wau is not None else sum(r.unique_users for r in wau_rows)
+    window_users = latest.wau if days == _WAU_DAYS else latest.mau
+    if window_users is not None:
+        total_users = window_users
 
     returning_pct = 0.0
     if total_users > 0:
@@ -291,6 +289,25 @@ async def _summary_from_daily(
     )
 
 
+async def _latest_wau(db: AsyncSession, project_id: uuid.UUID, now: dt.datetime) -> int:
+    """WAU of the latest daily rollup; the daily users of the last 7 days before one."""
+    wau = await db.scalar(
+        select(AnalyticsDaily.wau)
+        .where(AnalyticsDaily.project_id == project_id, AnalyticsDaily.wau.is_not(None))
+        .order_by(AnalyticsDaily.date.desc())
+        .limit(1)
+    )
+    if wau is not None:
+        return wau
+    users = await db.scalar(
+        select(func.sum(AnalyticsDaily.unique_users)).where(
+            AnalyticsDaily.project_id == project_id,
+            AnalyticsDaily.date >= (now - dt.timedelta(days=_WAU_DAYS)).date(),
+        )
+    )
+    return users or 0
+
+
 def _empty_summary(collection: CollectionHealth) -> ProjectSummaryResponse:
     return ProjectSummaryResponse(
         total_users=0,
@@ -307,6 +324,19 @@ def _empty_summary(collection: CollectionHealth) -> ProjectSummaryResponse:
     )
 
 
+def _p95(rows) -> float | None:
+    """p95 over analytics rows, from their merged latency sketches.
+
+    Rows stored before sketches were kept fall back to the worst of their p95s.
+    """
+    sketch = merge_sketches(r.latency_sketch for r in rows)
+    if sketch is not None:
+        value = sketch.quantile(0.95)
+        return round(value, 2) if value is not None else None
+    p95_values = [r.p95_ms for r in rows if r.p95_ms is not None]
+    return max(p95_values) if p95_values else None
+
+
 def _merge_top_endpoints(rows) -> list[dict]:
     """Merge top_endpoints from multiple hourly rows into a combined top-5."""
     merged: dict[str, int] = {}
@@ -332,14 +362,13 @@ def _breakdown_from_hourly(rows) -> list[ServiceBreakdown]:
         total_req = sum(r.total_requests for r in svc_rows)
         err_count = sum(r.error_count for r in svc_rows)
         unique = sum(r.unique_users for r in svc_rows)
-        p95_vals = [r.p95_ms for r in svc_rows if r.p95_ms is not None]
         breakdown.append(
             ServiceBreakdown(
                 service_name=svc,
                 total_requests=total_req,
                 error_count=err_count,
                 unique_users=unique,
-                p95_ms=max(p95_vals) if p95_vals else None,
+                p95_ms=_p95(svc_rows),
             )
         )
     return breakdown
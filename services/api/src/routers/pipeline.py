@@ -0,0 +1,109 @@
+"""Pipeline router — whole-pipeline reads for the scheduler.
+
+``GET /pipeline/snapshot`` is what the task dispatcher reads once per tick
+instead of asking about each TODO task separately. It costs at most six
+queries however many tasks are waiting; see
+``shared.contracts.dto.pipeline.PipelineSnapshot`` for the shape.
+"""
+
+from collections import defaultdict
+
+from fastapi import APIRouter, Depends
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from shared.contracts.dto.run import RunStatus, RunType
+from shared.contracts.dto.task import TaskEventType, TaskStatus
+from shared.models import Project, Run, Task, TaskEvent
+
+from ..database import get_async_session
+from ..dependencies import require_internal_or_admin
+from ..schemas import PipelineSnapshotRead, ProjectRead, RunRead, TaskEventRead
+from ._task_helpers import to_read
+from .runs import run_metadata_contains
+
+router = APIRouter(prefix="/pipeline", tags=["pipeline"])
+
+# The order GET /tasks lists in, which is the order the dispatcher works in.
+_DISPATCH_ORDER = (Task.priority.asc(), Task.created_at.asc())
+
+# A run in one of these still owns its task, whatever iteration it was for.
+_LIVE_RUN_STATUSES = (RunStatus.QUEUED.value, RunStatus.RUNNING.value)
+
+
+@router.get("/snapshot", response_model=PipelineSnapshotRead)
+async def get_pipeline_snapshot(
+    db: AsyncSession = Depends(get_async_session),
+    _authorized: None = Depends(require_internal_or_admin),
+) -> PipelineSnapshotRead:
+    """Every TODO task with its story, blocker, project, runs and sibling context."""
+    todo_query = select(Task).where(Task.status == TaskStatus.TODO).order_by(*_DISPATCH_ORDER)
+    todo = (await db.execute(todo_query)).scalars().all()
+    snapshot = PipelineSnapshotRead(todo_tasks=[to_read(task) for task in todo])
+    if not todo:
+        return snapshot
+
+    story_ids = {task.story_id for task in todo if task.story_id}
+    blocker_ids = {task.blocked_by_task_id for task in todo if task.blocked_by_task_id}
+    project_ids = {task.project_id for task in todo}
+    todo_ids = [task.id for task in todo]
+
+    done_sibling_ids: list[str] = []
+    if story_ids:
+        query = select(Task).where(Task.story_id.in_(story_ids)).order_by(*_DISPATCH_ORDER)
+        story_tasks: dict[str, list] = defaultdict(list)
+        for task in (await db.execute(query)).scalars().all():
+            story_tasks[task.story_id].append(to_read(task))
+            if task.status == TaskStatus.DONE:
+                done_sibling_ids.append(task.id)
+        snapshot.story_tasks = dict(story_tasks)
+
+    if blocker_ids:
+        blockers = (await db.execute(select(Task).where(Task.id.in_(blocker_ids)))).scalars().all()
+        snapshot.blockers = {task.id: to_read(task) for task in blockers}
+
+    projects_query = select(Project).where(Project.id.in_(project_ids))
+    projects = (await db.execute(projects_query)).scalars().all()
+    snapshot.projects = {
+        str(project.id): ProjectRead.model_validate(project) for project in projects
+    }
+
+    # Only the runs a dispatch decision acts on: unfinished ones, and the ones
+    # stamped with their task's current iteration. A task's finished earlier
+    # attempts, and their metadata and results, stay in the database.
+    todo_by_iteration: dict[int, list[str]] = defaultdict(list)
+    for task in todo:
+        todo_by_iteration[task.current_iteration].append(task.id)
+    current_iteration = [
+        and_(Run.task_id.in_(task_ids), run_metadata_contains({"iteration": iteration}))
+        for iteration, task_ids in todo_by_iteration.items()
+    ]
+    runs_query = (
+        select(Run)
+        .where(
+            Run.task_id.in_(todo_ids),
+            Run.type == RunType.ENGINEERING.value,
+            or_(Run.status.in_(_LIVE_RUN_STATUSES), *current_iteration),
+        )
+        .order_by(Run.created_at.desc())
+    )
+    engineering_runs: dict[str, list[RunRead]] = defaultdict(list)
+    for run in (await db.execute(runs_query)).scalars().all():
+        engineering_runs[run.task_id].append(RunRead.model_validate(run))
+    snapshot.engineering_runs = dict(engineering_runs)
+
+    if done_sibling_ids:
+        events_query = (
+            select(TaskEvent)
+            .where(
+                TaskEvent.task_id.in_(done_sibling_ids),
+                TaskEvent.event_type == TaskEventType.ITERATION_END,
+            )
+            .order_by(TaskEvent.created_at.asc())
+        )
+        iteration_events: dict[str, list[TaskEventRead]] = defaultdict(list)
+        for event in (await db.execute(events_query)).scalars().all():
+            iteration_events[event.task_id].append(TaskEventRead.model_validate(event))
+        snapshot.iteration_events = dict(iteration_events)
+
+    return snapshot
@@ -3,6 +3,7 @@
 import uuid
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 import redis.asyncio as aioredis
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -64,6 +65,7 @@ from ..schemas import (
 )
 from ..utils.telegram_binding import TELEGRAM_TOKEN_KEY, TELEGRAM_USERNAME_KEY, release_bot_binding
 from ..utils.telegram_token import bot_liveness, looks_like_bot_token, validate_telegram_token
+from ._pagination import ListPage, stream_page
 from ._recipients import resolve_project_recipient
 from .applications import UNDEPLOYABLE_STATUSES, stage_undeploy
 
@@ -250,11 +252,12 @@ async def list_projects(
     project_status: str | None = Query(None, alias="status"),
     owner_id: int | None = None,
     owner_only: bool = False,
+    page: ListPage = Depends(),
     x_telegram_id: int | None = Header(None, alias="X-Telegram-ID"),
     db: AsyncSession = Depends(get_async_session),
     _is_internal: bool = Depends(is_internal_service),
-) -> list[Project]:
-    """List projects, optionally filtered by status or owner_id."""
+) -> StreamingResponse:
+    """List projects, oldest first, optionally filtered by status or owner_id."""
     # The caller is resolved before any filter is applied, including the admin
     # panel's owner_id filter: passing owner_id must not be a way to read another
     # user's projects and their config.
@@ -278,8 +281,13 @@ async def list_projects(
     if project_status:
         query = query.where(Project.status == project_status)
 
-    result = await db.execute(query)
-    return list(result.scalars().all())
+    return await stream_page(
+        db,
+        query,
+        page,
+        order=((Project.created_at, False), (Project.id, False)),
+        schema=ProjectRead,
+    )
 
 
 async def _release_bot_if_archived(db: AsyncSession, project: Project) -> None:
@@ -1,10 +1,14 @@
 """Runs router (execution layer)."""
 
 from datetime import UTC, datetime
+import json
+from typing import Any
 import uuid
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
-from sqlalchemy import select, tuple_
+from fastapi.responses import StreamingResponse
+from sqlalchemy import ColumnElement, or_, select, tuple_, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
 import structlog
 
@@ -31,6 +35,8 @@ from shared.models import Run, User
 from ..database import get_async_session
 from ..dependencies import is_internal_service, require_internal_or_admin, resolve_actor
 from ..schemas import RunCreate, RunRead, RunUpdate
+from ._batch import batch_ids
+from ._pagination import ListPage, stream_page
 
 logger = structlog.get_logger()
 
@@ -55,6 +61,29 @@ QA_SSH_GRANT_PAGE_MAX = 500
 # number of tries — so a page is all the bound the recovery sweep needs.
 OWNER_NOTIFICATION_PAGE_MAX = 500
 
+# `/runs/` lists newest first; the id breaks ties between runs created together.
+_RUN_LIST_ORDER = ((Run.created_at, True), (Run.id, True))
+
+
+def run_metadata_contains(value: dict[str, Any]) -> ColumnElement[bool]:
+    """Runs whose metadata holds *value*: `metadata @> value`, served by `ix_runs_metadata`."""
+    return type_coerce(Run.run_metadata, JSONB).contains(value)
+
+
+def _metadata_filter(raw: str | None) -> dict[str, Any] | None:
+    if raw is None:
+        return None
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        value = None
+    if not isinstance(value, dict):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail="metadata must be a JSON object the run metadata contains",
+        )
+    return value
+
 
 async def _check_run_access(
     run: Run,
@@ -116,6 +145,34 @@ async def create_run(
     return db_run
 
 
+@router.get("/batch", response_model=list[RunRead])
+async def get_runs_batch(
+    ids: list[str] | None = Query(None),
+    task_ids: list[str] | None = Query(None),
+    run_type: str | None = None,
+    db: AsyncSession = Depends(get_async_session),
+    _is_internal: bool = Depends(require_internal_or_admin),
+) -> list[Run]:
+    """The runs named in ``ids`` and every run of the tasks in ``task_ids``.
+
+    One ``IN`` query, newest first like ``/runs/``. It is a service read: the
+    per-user scoping ``/runs/`` applies has no meaning for a list of ids a
+    service already holds, so it is open to the internal key and admins only.
+    """
+    named = batch_ids(ids=ids, task_ids=task_ids)
+    conditions = []
+    if named["ids"]:
+        conditions.append(Run.id.in_(named["ids"]))
+    if named["task_ids"]:
+        conditions.append(Run.task_id.in_(named["task_ids"]))
+    query = select(Run).where(or_(*conditions))
+    if run_type:
+        query = query.where(Run.type == run_type)
+    query = query.order_by(Run.created_at.desc())
+    result = await db.execute(query)
+    return list(result.scalars().all())
+
+
 @router.get("/{run_id}", response_model=RunRead)
 async def get_run(
     run_id: str,
@@ -139,23 +196,43 @@ async def get_run(
     return run
 
 
+class _RunFilters:
+    def __init__(
+        self,
+        project_id: uuid.UUID | None = None,
+        task_id: str | None = None,
+        story_id: str | None = None,
+        run_type: str | None = None,
+        # alias keeps the public query param name; a parameter literally named
+        # `status` would shadow the fastapi.status module
+        run_status: str | None = Query(None, alias="status"),
+        user_id: int | None = None,
+        started_after: datetime | None = None,
+        started_before: datetime | None = None,
+        # A JSON object, e.g. `{"iteration": 2}`: only runs whose metadata
+        # contains it, nested objects included.
+        metadata: str | None = Query(None),
+    ):
+        self.project_id = project_id
+        self.task_id = task_id
+        self.story_id = story_id
+        self.run_type = run_type
+        self.run_status = run_status
+        self.user_id = user_id
+        self.started_after = started_after
+        self.started_before = started_before
+        self.metadata = _metadata_filter(metadata)
+
+
 @router.get("/", response_model=list[RunRead])
 async def list_runs(
-    project_id: uuid.UUID | None = None,
-    task_id: str | None = None,
-    story_id: str | None = None,
-    run_type: str | None = None,
-    # alias keeps the public query param name; a parameter literally named
-    # `status` would shadow the fastapi.status module used below
-    run_status: str | None = Query(None, alias="status"),
-    user_id: int | None = None,
-    started_after: datetime | None = None,
-    started_before: datetime | None = None,
+    filters: _RunFilters = Depends(),
+    page: ListPage = Depends(),
     db: AsyncSession = Depends(get_async_session),
     x_telegram_id: int | None = Header(None, alias="X-Telegram-ID"),
     _is_internal: bool = Depends(is_internal_service),
-) -> list[Run]:
-    """List runs with optional filters."""
+) -> StreamingResponse:
+    """List runs with optional filters, newest first; paged and projected on request."""
     # Resolved before any filter is applied: naming a user_id must not be a way to
     # read another user's runs, and neither must holding the internal key.
     actor = await resolve_actor(is_internal=_is_internal, telegram_id=x_telegram_id, db=db)
@@ -163,34 +240,36 @@ async def list_runs(
     query = select(Run)
 
     # Apply filters
-    if project_id:
-        query = query.where(Run.project_id == project_id)
-    if task_id:
-        query = query.where(Run.task_id == task_id)
-    if story_id:
-        query = query.where(Run.story_id == story_id)
-    if run_type:
-        query = query.where(Run.type == run_type)
-    if run_status:
-        query = query.where(Run.status == run_status)
-    if user_id is not None and actor is None:
-        query = query.where(Run.user_id == user_id)
-    if started_after:
-        query = query.where(Run.started_at >= started_after)
-    if started_before:
-        query = query.where(Run.started_at <= started_before)
+    if filters.project_id:
+        query = query.where(Run.project_id == filters.project_id)
+    if filters.task_id:
+        query = query.where(Run.task_id == filters.task_id)
+    if filters.story_id:
+        query = query.where(Run.story_id == filters.story_id)
+    if filters.run_type:
+        query = query.where(Run.type == filters.run_type)
+    if filters.run_status:
+        query = query.where(Run.status == filters.run_status)
+    if filters.user_id is not None and actor is None:
+        query = query.where(Run.user_id == filters.user_id)
+    if filters.started_after:
+        query = query.where(Run.started_at >= filters.started_after)
+    if filters.started_before:
+        query = query.where(Run.started_at <= filters.started_before)
+    if filters.metadata is not None:
+        query = query.where(run_metadata_contains(filters.metadata))
 
     # A named user sees only their own runs; an admin sees all of them.
     if actor is not None and not actor.is_admin:
         query = query.where(Run.user_id == actor.id)
 
-    # Order by creation time (newest first)
-    query = query.order_by(Run.created_at.desc())
-
-    result = await db.execute(query)
-    runs = result.scalars().all()
-
-    return list(runs)
+    return await stream_page(
+        db,
+        query,
+        page,
+        order=_RUN_LIST_ORDER,
+        schema=RunRead,
+    )
 
 
 @router.get("/qa-ssh-grants/held", response_model=list[RunRead])
@@ -269,11 +348,10 @@ async def list_runs_owing_owner_notification(
     cannot stay in the selection across more ticks than that bound, and the head
     of the page cannot wedge behind it.
     """
-    notification = Run.run_metadata[OWNER_NOTIFICATION_KEY]
-    state = Run.run_metadata[(OWNER_NOTIFICATION_KEY, "state")].as_string()
+    owed = {OWNER_NOTIFICATION_KEY: {"state": OwnerNotificationState.OWED.value}}
     query = (
         select(Run)
-        .where(notification.is_not(None), state == OwnerNotificationState.OWED.value)
+        .where(run_metadata_contains(owed))
         .order_by(Run.created_at.asc(), Run.id.asc())
         .limit(limit)
     )
@@ -400,7 +478,7 @@ async def update_run(
     for field, value in update_data.items():
         if field == "run_metadata" and value is not None:
             # Merge metadata instead of replacing to preserve existing keys.
-            # A fresh dict is required: run_metadata is a plain JSON column,
+            # A fresh dict is required: run_metadata is not a MutableDict,
             # so in-place mutation does not mark the attribute dirty.
             run.run_metadata = {**(run.run_metadata or {}), **value}
         else:
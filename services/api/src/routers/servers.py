@@ -26,6 +26,7 @@ from ..dependencies import require_internal_or_admin
 from ..schemas import (
     AllocateNextPortRequest,
     ApplicationRead,
+    MetricsHistoryBulkCreate,
     MetricsHistoryCreate,
     MetricsHistoryRead,
     PortAllocationCreate,
@@ -33,6 +34,7 @@ from ..schemas import (
     ServerCreate,
     ServerRead,
 )
+from ._metrics_rollup import resolution_for_window, roll_up_metrics_history
 
 router = APIRouter(prefix="/servers", tags=["servers"])
 
@@ -515,25 +517,35 @@ async def get_metrics_history(
     db: AsyncSession = Depends(get_async_session),
     _: None = Depends(require_internal_or_admin),
 ) -> list:
-    """Get metrics history for a server (admin only)."""
+    """Get metrics history for a server (admin only).
+
+    Reads from the coarsest tier that still resolves the window: raw snapshots
+    for a few hours, 5-minute rollups for days, 1-hour rollups beyond.
+    """
     from datetime import datetime, timedelta
 
-    from shared.models import ServerMetricsHistory
+    from shared.models import ServerMetricsHistory, ServerMetricsRollup
 
     if not await db.get(Server, handle):
         raise HTTPException(status_code=404, detail="Server not found")
 
     cutoff = datetime.now(UTC) - timedelta(hours=hours)
-    query = (
-        select(ServerMetricsHistory)
-        .where(
+    resolution = resolution_for_window(hours)
+    if resolution is None:
+        query = select(ServerMetricsHistory).where(
             ServerMetricsHistory.server_handle == handle,
             ServerMetricsHistory.recorded_at >= cutoff,
         )
-        .order_by(ServerMetricsHistory.recorded_at.desc())
-    )
+        order = ServerMetricsHistory.recorded_at
+    else:
+        query = select(ServerMetricsRollup).where(
+            ServerMetricsRollup.server_handle == handle,
+            ServerMetricsRollup.resolution_seconds == resolution,
+            ServerMetricsRollup.recorded_at >= cutoff,
+        )
+        order = ServerMetricsRollup.recorded_at
 
-    result = await db.execute(query)
+    result = await db.execute(query.order_by(order.desc()))
     return result.scalars().all()
 
 
@@ -594,6 +606,80 @@ async def delete_old_metrics_history(
     return {"deleted": result.rowcount}
 
 
+@router.delete("/metrics-history/rollups")
+async def delete_old_metrics_rollups(
+    resolution_seconds: int,
+    retention_hours: int,
+    db: AsyncSession = Depends(get_async_session),
+    _: None = Depends(require_internal_or_admin),
+) -> dict:
+    """Delete the buckets of one rollup tier older than retention_hours."""
+    from datetime import datetime, timedelta
+
+    from sqlalchemy import delete as sa_delete
+
+    from shared.models import ServerMetricsRollup
+    from shared.models.server_metrics_history import METRICS_ROLLUP_RESOLUTIONS
+
+    if resolution_seconds not in METRICS_ROLLUP_RESOLUTIONS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown rollup resolution: {resolution_seconds}",
+        )
+    cutoff = datetime.now(UTC) - timedelta(hours=retention_hours)
+    stmt = sa_delete(ServerMetricsRollup).where(
+        ServerMetricsRollup.resolution_seconds == resolution_seconds,
+        ServerMetricsRollup.recorded_at < cutoff,
+    )
+    result = await db.execute(stmt)
+    await db.commit()
+    return {"deleted": result.rowcount}
+
+
+@router.post("/metrics-history/rollups")
+async def create_metrics_rollups(
+    db: AsyncSession = Depends(get_async_session),
+    _: None = Depends(require_internal_or_admin),
+) -> dict:
+    """Roll every complete bucket not yet rolled up into its tier (internal use)."""
+    from datetime import datetime
+
+    written = await roll_up_metrics_history(db, datetime.now(UTC))
+    await db.commit()
+    return {"written": {str(resolution): count for resolution, count in written.items()}}
+
+
+@router.post("/metrics-history/bulk", status_code=status.HTTP_201_CREATED)
+async def create_metrics_history_bulk(
+    payload: MetricsHistoryBulkCreate,
+    db: AsyncSession = Depends(get_async_session),
+    _: None = Depends(require_internal_or_admin),
+) -> dict:
+    """Append the snapshots of many servers in one statement (internal use).
+
+    Snapshots of servers that no longer exist are dropped and reported rather
+    than failing the rest of the cycle.
+    """
+    from sqlalchemy import insert
+
+    from shared.models import ServerMetricsHistory
+
+    handles = {snapshot.server_handle for snapshot in payload.snapshots}
+    if not handles:
+        return {"inserted": 0, "unknown_servers": []}
+    result = await db.execute(select(Server.handle).where(Server.handle.in_(handles)))
+    known = set(result.scalars().all())
+    rows = [
+        {"server_handle": snapshot.server_handle, "metrics": snapshot.metrics}
+        for snapshot in payload.snapshots
+        if snapshot.server_handle in known
+    ]
+    if rows:
+        await db.execute(insert(ServerMetricsHistory).values(rows))
+        await db.commit()
+    return {"inserted": len(rows), "unknown_servers": sorted(handles - known)}
+
+
 @router.post(
     "/{handle}/metrics-history",
     response_model=MetricsHistoryRead,
@@ -5,6 +5,7 @@ import secrets
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 import structlog
@@ -28,12 +29,23 @@ from ..schemas.story import (
     StoryTransition,
     StoryUpdate,
 )
+from ._batch import batch_ids
+from ._pagination import ListPage, stream_page
 from ._recipients import resolve_project_chat_id
 
 logger = structlog.get_logger()
 
 router = APIRouter(prefix="/stories", tags=["stories"])
 
+# Sort orders of `GET /stories/` by `sort` value; anything else is the default
+# (priority, then age). The id breaks ties so pages never overlap.
+_STORY_LIST_ORDERS = {
+    None: ((Story.priority, False), (Story.created_at, False), (Story.id, False)),
+    "created_at": ((Story.created_at, False), (Story.id, False)),
+    "-created_at": ((Story.created_at, True), (Story.id, True)),
+    "-priority": ((Story.priority, True), (Story.created_at, False), (Story.id, False)),
+}
+
 
 def _generate_id() -> str:
     return f"story-{secrets.token_hex(4)}"
@@ -144,8 +156,9 @@ async def list_stories(
     type_filter: str | None = Query(None, alias="type"),
     priority: int | None = Query(None),
     sort: str | None = Query(None),
+    page: ListPage = Depends(),
     db: AsyncSession = Depends(get_async_session),
-) -> list[StoryRead]:
+) -> StreamingResponse:
     query = select(Story)
 
     if project_id:
@@ -159,18 +172,29 @@ async def list_stories(
     if priority is not None:
         query = query.where(Story.priority == priority)
 
-    if sort == "-created_at":
-        query = query.order_by(Story.created_at.desc())
-    elif sort == "created_at":
-        query = query.order_by(Story.created_at.asc())
-    elif sort == "-priority":
-        query = query.order_by(Story.priority.desc(), Story.created_at.asc())
-    else:
-        query = query.order_by(Story.priority.asc(), Story.created_at.asc())
+    return await stream_page(
+        db,
+        query,
+        page,
+        order=_STORY_LIST_ORDERS.get(sort, _STORY_LIST_ORDERS[None]),
+        schema=StoryRead,
+    )
 
+
+@router.get("/batch", response_model=list[StoryRead])
+async def get_stories_batch(
+    ids: list[str] | None = Query(None),
+    db: AsyncSession = Depends(get_async_session),
+) -> list[StoryRead]:
+    """The stories named in ``ids``, in one ``IN`` query; unknown ids are absent."""
+    named = batch_ids(ids=ids)
+    query = (
+        select(Story)
+        .where(Story.id.in_(named["ids"]))
+        .order_by(Story.priority.asc(), Story.created_at.asc())
+    )
     result = await db.execute(query)
-    items = result.scalars().all()
-    return [StoryRead.model_validate(s, from_attributes=True) for s in items]
+    return [StoryRead.model_validate(s, from_attributes=True) for s in result.scalars().all()]
 
 
 @router.get("/{story_id}", response_model=StoryRead)
@@ -1,17 +1,45 @@
-"""System configs router — CRUD for operational constants."""
+"""System configs router — CRUD for operational constants.
+
+Every committed write is announced on ``CONFIG_CHANGES_CHANNEL`` so that the
+services' config stores apply it at once instead of on their next reload.
+"""
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+import structlog
 
+from shared.contracts.queues.config_change import ConfigChangeEvent
 from shared.models import SystemConfig
+from shared.queues import CONFIG_CHANGES_CHANNEL
 
 from ..database import get_async_session
+from ..dependencies import get_redis_client
 from ..schemas.system_config import SystemConfigCreate, SystemConfigRead, SystemConfigUpdate
 
+logger = structlog.get_logger(__name__)
+
 router = APIRouter(prefix="/system-configs", tags=["system-configs"])
 
 
+async def publish_config_change(config: SystemConfig, *, deleted: bool = False) -> None:
+    """Announce a committed change of *config*; log, never raise, on failure."""
+    event = ConfigChangeEvent(
+        key=config.key,
+        value=None if deleted else config.value,
+        category=config.category,
+        deleted=deleted,
+    )
+    try:
+        await get_redis_client().redis.publish(CONFIG_CHANGES_CHANNEL, event.model_dump_json())
+    except Exception as exc:
+        logger.warning(
+            "system_config_change_publish_failed",
+            key=config.key,
+            error_type=type(exc).__name__,
+        )
+
+
 @router.post("/", response_model=SystemConfigRead, status_code=status.HTTP_201_CREATED)
 async def create_or_update_system_config(
     data: SystemConfigCreate,
@@ -25,12 +53,14 @@ async def create_or_update_system_config(
                 setattr(existing, field, val)
         await db.commit()
         await db.refresh(existing)
+        await publish_config_change(existing)
         return existing
 
     config = SystemConfig(**data.model_dump())
     db.add(config)
     await db.commit()
     await db.refresh(config)
+    await publish_config_change(config)
     return config
 
 
@@ -82,6 +112,7 @@ async def update_system_config(
 
     await db.commit()
     await db.refresh(config)
+    await publish_config_change(config)
     return config
 
 
@@ -99,3 +130,4 @@ async def delete_system_config(
         )
     await db.delete(config)
     await db.commit()
+    await publish_config_change(config, deleted=True)
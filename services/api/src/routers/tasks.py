@@ -5,7 +5,8 @@ import re
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func, select
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 import structlog
 
@@ -20,6 +21,8 @@ from ..schemas.task import (
     TaskRead,
     TaskUpdate,
 )
+from ._batch import batch_ids
+from ._pagination import ListPage, stream_page
 from ._task_actions import (
     _COMPLETE_PATH,
     action_router,
@@ -76,7 +79,6 @@ class _TaskFilters:
         repository_id: str | None = Query(None),
         story_id: str | None = Query(None),
         since: datetime | None = Query(None),
-        limit: int | None = Query(None, ge=1),
         sort: str | None = Query(None),
     ):
         self.project_id = project_id
@@ -86,10 +88,18 @@ class _TaskFilters:
         self.repository_id = repository_id
         self.story_id = story_id
         self.since = since
-        self.limit = limit
         self.sort = sort
 
 
+# Sort orders of `GET /tasks/` by `sort` value; anything else is the default
+# (priority, then age). The id breaks ties so pages never overlap.
+_TASK_LIST_ORDERS = {
+    None: ((Task.priority, False), (Task.created_at, False), (Task.id, False)),
+    "created_at": ((Task.created_at, False), (Task.id, False)),
+    "-created_at": ((Task.created_at, True), (Task.id, True)),
+}
+
+
 # --- CRUD ---
 
 
@@ -172,8 +182,9 @@ async def push_task(
 @router.get("/", response_model=list[TaskRead])
 async def list_tasks(
     filters: _TaskFilters = Depends(),
+    page: ListPage = Depends(),
     db: AsyncSession = Depends(get_async_session),
-) -> list[TaskRead]:
+) -> StreamingResponse:
     query = select(Task)
 
     if filters.project_id:
@@ -191,20 +202,58 @@ async def list_tasks(
     if filters.since:
         query = query.where(Task.updated_at >= filters.since)
 
-    # Sorting
-    if filters.sort == "-created_at":
-        query = query.order_by(Task.created_at.desc())
-    elif filters.sort == "created_at":
-        query = query.order_by(Task.created_at.asc())
-    else:
-        query = query.order_by(Task.priority.asc(), Task.created_at.asc())
+    return await stream_page(
+        db,
+        query,
+        page,
+        order=_TASK_LIST_ORDERS.get(filters.sort, _TASK_LIST_ORDERS[None]),
+        schema=TaskRead,
+        read=to_read,
+    )
+
+
+@router.get("/batch", response_model=list[TaskRead])
+async def get_tasks_batch(
+    ids: list[str] | None = Query(None),
+    story_ids: list[str] | None = Query(None),
+    db: AsyncSession = Depends(get_async_session),
+) -> list[TaskRead]:
+    """The tasks named in ``ids`` and every task of the stories in ``story_ids``.
+
+    One ``IN`` query however many are named, in the list's order (priority, then
+    age). An id that names no task is absent from the answer, not a 404.
+    """
+    named = batch_ids(ids=ids, story_ids=story_ids)
+    conditions = []
+    if named["ids"]:
+        conditions.append(Task.id.in_(named["ids"]))
+    if named["story_ids"]:
+        conditions.append(Task.story_id.in_(named["story_ids"]))
+    query = (
+        select(Task).where(or_(*conditions)).order_by(Task.priority.asc(), Task.created_at.asc())
+    )
+    result = await db.execute(query)
+    return [to_read(task) for task in result.scalars().all()]
+
 
-    if filters.limit is not None:
-        query = query.limit(filters.limit)
+@router.get("/events", response_model=list[TaskEventRead])
+async def list_events_of_tasks(
+    task_ids: list[str] | None = Query(None),
+    event_type: str | None = None,
+    db: AsyncSession = Depends(get_async_session),
+) -> list[TaskEventRead]:
+    """The events of every task in ``task_ids``, grouped by task, oldest first."""
+    named = batch_ids(task_ids=task_ids)
+    query = (
+        select(TaskEvent)
+        .where(TaskEvent.task_id.in_(named["task_ids"]))
+        .order_by(TaskEvent.task_id.asc(), TaskEvent.created_at.asc())
+    )
+    if event_type:
+        query = query.where(TaskEvent.event_type == event_type)
 
     result = await db.execute(query)
-    items = result.scalars().all()
-    return [to_read(task) for task in items]
+    return list(result.scalars().all())
 
 
 @router.get("/stats")
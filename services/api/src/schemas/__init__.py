@@ -12,6 +12,7 @@ from .application import (
 )
 from .brainstorm import BrainstormCreate, BrainstormRead, BrainstormTransition, BrainstormUpdate
 from .incident import IncidentCreate, IncidentRead, IncidentUpdate
+from .pipeline import PipelineSnapshotRead
 from .port_allocation import AllocateNextPortRequest, PortAllocationCreate, PortAllocationRead
 from .project import (
     BotAccessRequest,
@@ -22,7 +23,14 @@ from .project import (
 )
 from .rag import RAGDocsIngest, RAGDocsIngestResult, RAGMessageCreate, RAGMessageRead
 from .run import RunCreate, RunRead, RunUpdate
-from .server import MetricsHistoryCreate, MetricsHistoryRead, ServerCreate, ServerRead
+from .server import (
+    MetricsHistoryBulkCreate,
+    MetricsHistoryBulkItem,
+    MetricsHistoryCreate,
+    MetricsHistoryRead,
+    ServerCreate,
+    ServerRead,
+)
 from .service_deployment import (
     DeploymentCreate,
     DeploymentRead,
@@ -76,10 +84,13 @@ __all__ = [
     "RAGDocsIngestResult",
     "RAGMessageCreate",
     "RAGMessageRead",
+    "MetricsHistoryBulkCreate",
+    "MetricsHistoryBulkItem",
     "MetricsHistoryCreate",
     "MetricsHistoryRead",
     "ServerCreate",
     "ServerRead",
+    "PipelineSnapshotRead",
     "AllocateNextPortRequest",
     "PortAllocationCreate",
     "PortAllocationRead",
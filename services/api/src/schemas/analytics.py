@@ -11,8 +11,6 @@ from pydantic import BaseModel, ConfigDict
 from shared.contracts.dto.analytics import (
     AnalyticsDailyCreate,
     AnalyticsHourlyCreate,
-    AnalyticsKnownUsersBatchUpsert,
-    AnalyticsKnownUserUpsert,
 )
 from shared.contracts.dto.base import TimestampedDTO
 
@@ -22,8 +20,6 @@ __all__ = [
     "AnalyticsHourlyCreate",
     "AnalyticsHourlyRead",
     "AnalyticsKnownUserRead",
-    "AnalyticsKnownUserUpsert",
-    "AnalyticsKnownUsersBatchUpsert",
 ]
 
 # --- Hourly ---
@@ -45,6 +41,7 @@ class AnalyticsHourlyRead(TimestampedDTO):
     p50_ms: float | None = None
     p95_ms: float | None = None
     p99_ms: float | None = None
+    latency_sketch: dict[str, Any] | None = None
 
     top_endpoints: list[dict[str, Any]] | None = None
 
@@ -66,10 +63,13 @@ class AnalyticsDailyRead(TimestampedDTO):
     unique_users: int
     new_users: int
     dau: int
+    wau: int | None = None
+    mau: int | None = None
     returning_users: int
 
     p95_ms: float | None = None
     error_rate: float | None = None
+    latency_sketch: dict[str, Any] | None = None
 
     model_config = ConfigDict(from_attributes=True)
 
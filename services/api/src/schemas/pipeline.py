@@ -0,0 +1,18 @@
+"""Pipeline snapshot schema — the dispatcher's one read per tick."""
+
+from pydantic import BaseModel
+
+from .project import ProjectRead
+from .run import RunRead
+from .task import TaskEventRead, TaskRead
+
+
+class PipelineSnapshotRead(BaseModel):
+    """See ``shared.contracts.dto.pipeline.PipelineSnapshot``, which reads this."""
+
+    todo_tasks: list[TaskRead] = []
+    story_tasks: dict[str, list[TaskRead]] = {}
+    blockers: dict[str, TaskRead] = {}
+    projects: dict[str, ProjectRead] = {}
+    engineering_runs: dict[str, list[RunRead]] = {}
+    iteration_events: dict[str, list[TaskEventRead]] = {}
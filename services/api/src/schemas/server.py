@@ -65,10 +65,29 @@ class MetricsHistoryCreate(BaseModel):
     metrics: dict
 
 
+class MetricsHistoryBulkItem(BaseModel):
+    """One server's snapshot within a bulk write."""
+
+    server_handle: str
+    metrics: dict
+
+
+class MetricsHistoryBulkCreate(BaseModel):
+    """Schema for writing the snapshots of one health check cycle at once."""
+
+    snapshots: list[MetricsHistoryBulkItem]
+
+
 class MetricsHistoryRead(BaseDTO):
-    """Schema for reading a metrics history entry."""
+    """Schema for reading a metrics history entry.
+
+    Entries read from a rollup tier carry its bucket width and the number of
+    raw snapshots they summarise; ``recorded_at`` is then the bucket start.
+    """
 
     id: int
     server_handle: str
     recorded_at: datetime
     metrics: dict
+    resolution_seconds: int | None = None
+    samples: int = 1
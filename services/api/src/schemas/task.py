@@ -3,20 +3,22 @@
 from typing import Any
 import uuid
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from shared.contracts.dto.base import TimestampedDTO
 
 # The request schemas are the contract every client already imports; the API
 # validates against that same object rather than a look-alike of its own.
-from shared.contracts.dto.task import TaskCreate, TaskEventCreate, TaskUpdate
+from shared.contracts.dto.task import TaskCreate, TaskEventCreate, TaskStatus, TaskUpdate
 
 __all__ = [
     "TaskCreate",
     "TaskEventCreate",
     "TaskEventRead",
     "TaskRead",
+    "TaskReplay",
     "TaskResume",
+    "TaskRetry",
     "TaskTransition",
     "TaskUpdate",
 ]
@@ -55,6 +57,23 @@ class TaskTransition(BaseModel):
     details: dict[str, Any] = {}
 
 
+class TaskRetry(BaseModel):
+    """Schema for sending a task back to TODO in one transaction."""
+
+    actor: str = "system"
+    # The iteration the retried task runs as; None leaves it where it is.
+    next_iteration: int | None = Field(None, ge=0)
+    details: dict[str, Any] = {}
+
+
+class TaskReplay(BaseModel):
+    """Schema for walking a task through a recorded chain of statuses."""
+
+    statuses: list[TaskStatus] = Field(min_length=1)
+    actor: str = "system"
+    details: dict[str, Any] = {}
+
+
 class TaskResume(BaseModel):
     """Schema for resuming a task from WAITING_HUMAN_REVIEW."""
 
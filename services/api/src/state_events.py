@@ -0,0 +1,129 @@
+"""Announce committed status transitions on ``state:changes``.
+
+Consumers decide whether a queued message is stale by the status of the run or
+story it names. Asking the API for that status before every message is a full
+round trip and a query per dequeue, so the API also pushes each transition to a
+stream that consumers fold into a local view and ask instead. The scheduler
+follows the same stream to dispatch as soon as a task, story or run moves,
+rather than on its next tick.
+
+The hook sits on the ORM session rather than in the routers: a status is
+written by a dozen action endpoints, PATCHes and compound operations, and an
+announcement each of them has to remember is one a future endpoint will forget.
+``after_flush`` records every tracked row whose ``status`` changed — while the
+attribute history still holds the old value — and ``after_commit`` publishes
+what the transaction recorded. A rollback discards it, so nothing is announced
+that the database does not hold.
+
+Publishing is best-effort and happens after the response has been decided: a
+Redis failure is logged and never fails the request that made the change.
+Readers fall back to the API for anything they have not seen, so a lost event
+costs them a round trip, not correctness.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+import structlog
+
+from shared.contracts.queues.state_change import StateChangeEvent, StateEntity
+from shared.models import Run, Story, Task
+from shared.queues import STATE_CHANGES_STREAM
+
+from .dependencies import get_redis_client
+
+logger = structlog.get_logger(__name__)
+
+# Which mapped classes announce their transitions, and under what entity name.
+TRACKED_ENTITIES: dict[type, StateEntity] = {
+    Run: "run",
+    Story: "story",
+    Task: "task",
+}
+
+_PENDING_KEY = "state_change_events"
+
+# Publishing tasks are fire-and-forget; asyncio keeps only a weak reference.
+_publishing: set[asyncio.Task] = set()
+
+
+def collect_state_changes(session: Session) -> list[StateChangeEvent]:
+    """The status transitions the session is about to flush, as events.
+
+    ``previous_status`` is whatever the row held when it was loaded; it is None
+    for a new row, and for one whose old value was never loaded into the session.
+    """
+    changes: list[StateChangeEvent] = []
+    for obj in (*session.new, *session.dirty):
+        entity = TRACKED_ENTITIES.get(type(obj))
+        if entity is None or obj.status is None:
+            continue
+        history = inspect(obj).attrs.status.history
+        if obj not in session.new and not history.has_changes():
+            continue
+        previous = str(history.deleted[0]) if history.deleted else None
+        if previous == str(obj.status):
+            continue
+        changes.append(
+            StateChangeEvent(
+                entity=entity,
+                entity_id=str(obj.id),
+                status=str(obj.status),
+                previous_status=previous,
+            )
+        )
+    return changes
+
+
+def _record_flushed(session: Session, _flush_context) -> None:
+    changes = collect_state_changes(session)
+    if changes:
+        session.info.setdefault(_PENDING_KEY, []).extend(changes)
+
+
+def _discard(session: Session, *_args) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def _publish_committed(session: Session) -> None:
+    changes = session.info.pop(_PENDING_KEY, None)
+    if not changes:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # A synchronous session outside the service (a script, a migration)
+        # has nobody listening for its changes.
+        return
+    task = loop.create_task(publish_state_changes(changes))
+    _publishing.add(task)
+    task.add_done_callback(_publishing.discard)
+
+
+async def publish_state_changes(changes: list[StateChangeEvent]) -> None:
+    """Append *changes* to ``state:changes``; log, never raise, on failure."""
+    try:
+        redis = get_redis_client()
+        for change in changes:
+            await redis.publish_message(STATE_CHANGES_STREAM, change)
+    except Exception as exc:
+        logger.warning(
+            "state_change_publish_failed",
+            changes=len(changes),
+            error_type=type(exc).__name__,
+        )
+
+
+def install_state_change_publisher() -> None:
+    """Hook the publisher onto every ORM session in this process. Idempotent."""
+    hooks = (
+        ("after_flush", _record_flushed),
+        ("after_commit", _publish_committed),
+        ("after_rollback", _discard),
+    )
+    for name, hook in hooks:
+        if not event.contains(Session, name, hook):
+            event.listen(Session, name, hook)
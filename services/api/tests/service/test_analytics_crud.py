@@ -1,12 +1,16 @@
 """Service test — analytics CRUD endpoints against real DB.
 
-Tests the full lifecycle: upsert hourly, upsert daily, batch upsert known users,
+Tests the full lifecycle: upsert hourly, upsert daily, list known users,
 query, cleanup.
 """
 
+import datetime as dt
 from http import HTTPStatus
 
 import pytest
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from shared.models.analytics_known_users import AnalyticsKnownUsers
 
 pytestmark = pytest.mark.asyncio
 
@@ -163,76 +167,23 @@ class TestAnalyticsDaily:
 
 
 class TestAnalyticsKnownUsers:
-    async def test_batch_upsert(self, async_client, _tasks_project):
-        payload = {
-            "project_id": TASK_TEST_PROJECT_ID,
-            "users": [
-                {
-                    "user_id_hash": "abc123def456",
-                    "first_seen": "2026-03-20T10:00:00Z",
-                    "last_seen": "2026-03-20T14:00:00Z",
-                },
-                {
-                    "user_id_hash": "xyz789abc012",
-                    "first_seen": "2026-03-20T12:00:00Z",
-                    "last_seen": "2026-03-20T14:00:00Z",
-                },
-            ],
-        }
-        resp = await async_client.post("/api/analytics/known-users", json=payload)
-        assert resp.status_code == HTTPStatus.CREATED
-        assert resp.json()["upserted"] == 2
-
-    async def test_upsert_updates_last_seen(self, async_client, _tasks_project):
-        payload = {
-            "project_id": TASK_TEST_PROJECT_ID,
-            "users": [
-                {
-                    "user_id_hash": "abc123def456",
-                    "first_seen": "2026-03-20T10:00:00Z",
-                    "last_seen": "2026-03-20T16:00:00Z",  # later
-                },
-            ],
-        }
-        resp = await async_client.post("/api/analytics/known-users", json=payload)
-        assert resp.status_code == HTTPStatus.CREATED
-
-        # Verify last_seen was updated
-        resp = await async_client.get(
-            "/api/analytics/known-users",
-            params={"project_id": TASK_TEST_PROJECT_ID},
+    async def test_list_by_project(self, async_client, db_session, _tasks_project):
+        # The API only reads known users now; seed one the way the scheduler once wrote it.
+        await db_session.execute(
+            pg_insert(AnalyticsKnownUsers)
+            .values(
+                project_id=TASK_TEST_PROJECT_ID,
+                user_id_hash="list_test_hash",
+                first_seen=dt.datetime(2026, 3, 20, 10, tzinfo=dt.UTC),
+                last_seen=dt.datetime(2026, 3, 20, 14, tzinfo=dt.UTC),
+            )
+            .on_conflict_do_nothing()
         )
-        users = resp.json()
-        matching = [u for u in users if u["user_id_hash"] == "abc123def456"]
-        assert len(matching) == 1
-        assert "16:00:00" in matching[0]["last_seen"]
-
-    async def test_list_by_project(self, async_client, _tasks_project):
-        # Seed data
-        payload = {
-            "project_id": TASK_TEST_PROJECT_ID,
-            "users": [
-                {
-                    "user_id_hash": "list_test_hash",
-                    "first_seen": "2026-03-20T10:00:00Z",
-                    "last_seen": "2026-03-20T14:00:00Z",
-                },
-            ],
-        }
-        await async_client.post("/api/analytics/known-users", json=payload)
+        await db_session.commit()
 
         resp = await async_client.get(
             "/api/analytics/known-users",
             params={"project_id": TASK_TEST_PROJECT_ID},
         )
         assert resp.status_code == HTTPStatus.OK
-        assert len(resp.json()) >= 1
-
-    async def test_empty_batch(self, async_client, _tasks_project):
-        payload = {
-            "project_id": TASK_TEST_PROJECT_ID,
-            "users": [],
-        }
-        resp = await async_client.post("/api/analytics/known-users", json=payload)
-        assert resp.status_code == HTTPStatus.CREATED
-        assert resp.json()["upserted"] == 0
+        assert "list_test_hash" in {u["user_id_hash"] for u in resp.json()}
@@ -0,0 +1,215 @@
+"""Unit tests for the batch reads: many ids, one ``IN`` query."""
+
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+import uuid
+
+from httpx import ASGITransport, AsyncClient
+from internal_caller import INTERNAL_HEADERS
+import pytest
+
+from shared.clients.internal_api import BATCH_MAX_IDS
+from src.database import get_async_session
+from src.main import app
+
+PROJECT_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+_NOW = datetime.now(UTC)
+
+
+def _task(task_id: str, story_id: str | None = None) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=task_id,
+        project_id=PROJECT_ID,
+        type="feature",
+        title=f"Task {task_id}",
+        description=None,
+        plan=None,
+        status="todo",
+        priority=0,
+        acceptance_criteria=None,
+        current_iteration=0,
+        max_iterations=3,
+        need_e2e=False,
+        created_by="system",
+        source_brainstorm_id=None,
+        repository_id=None,
+        story_id=story_id,
+        blocked_by_task_id=None,
+        failure_metadata=None,
+        created_at=_NOW,
+        updated_at=_NOW,
+    )
+
+
+def _story(story_id: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=story_id,
+        project_id=PROJECT_ID,
+        parent_story_id=None,
+        title=f"Story {story_id}",
+        description=None,
+        acceptance_criteria=None,
+        type="product",
+        status="in_progress",
+        priority=0,
+        blocked_by_story_id=None,
+        created_by="system",
+        user_report=None,
+        quarantine_reason=None,
+        created_at=_NOW,
+        updated_at=_NOW,
+    )
+
+
+def _run(run_id: str, task_id: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=run_id,
+        type="engineering",
+        status="completed",
+        project_id=PROJECT_ID,
+        user_id=None,
+        story_id="story-1",
+        task_id=task_id,
+        run_metadata={},
+        result=None,
+        error_message=None,
+        started_at=None,
+        completed_at=None,
+        callback_stream=None,
+        iteration=None,
+        input_tokens=None,
+        output_tokens=None,
+        total_tokens=None,
+        cost_usd=None,
+        agent_profile=None,
+        transcript_path=None,
+        transcript_truncated=None,
+        created_at=_NOW,
+        updated_at=_NOW,
+    )
+
+
+def _event(task_id: str, event_id: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=event_id,
+        task_id=task_id,
+        event_type="iteration_end",
+        from_status=None,
+        to_status=None,
+        iteration=0,
+        details={"summary": f"work on {task_id}"},
+        actor="worker",
+        created_at=_NOW,
+        updated_at=_NOW,
+    )
+
+
+def _session(rows: list) -> AsyncMock:
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = rows
+    session = AsyncMock()
+    session.execute = AsyncMock(return_value=result)
+    return session
+
+
+@pytest.fixture(autouse=True)
+def _cleanup_overrides():
+    yield
+    app.dependency_overrides.clear()
+
+
+async def _get(session: AsyncMock, path: str, params: dict):
+    async def override():
+        yield session
+
+    app.dependency_overrides[get_async_session] = override
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test", headers=INTERNAL_HEADERS
+    ) as client:
+        return await client.get(path, params=params)
+
+
+def _statement(session: AsyncMock) -> str:
+    [call] = session.execute.await_args_list
+    return str(call.args[0])
+
+
+class TestTasksBatch:
+    async def test_many_ids_are_one_in_query(self):
+        session = _session([_task(f"task-{i}") for i in range(50)])
+
+        resp = await _get(session, "/api/tasks/batch", {"ids": [f"task-{i}" for i in range(50)]})
+
+        assert resp.status_code == 200, resp.text
+        assert len(resp.json()) == 50
+        assert " IN " in _statement(session)
+
+    async def test_the_tasks_of_many_stories_are_one_query(self):
+        session = _session([_task("task-1", "story-1"), _task("task-2", "story-2")])
+
+        resp = await _get(session, "/api/tasks/batch", {"story_ids": ["story-1", "story-2"]})
+
+        assert resp.status_code == 200, resp.text
+        assert [t["story_id"] for t in resp.json()] == ["story-1", "story-2"]
+        assert "tasks.story_id IN" in _statement(session)
+
+    async def test_no_ids_is_refused_rather_than_read_as_everything(self):
+        session = _session([])
+
+        resp = await _get(session, "/api/tasks/batch", {})
+
+        assert resp.status_code == 422
+        session.execute.assert_not_awaited()
+
+    async def test_more_ids_than_the_cap_are_refused(self):
+        session = _session([])
+        ids = [f"task-{i}" for i in range(BATCH_MAX_IDS + 1)]
+
+        resp = await _get(session, "/api/tasks/batch", {"ids": ids})
+
+        assert resp.status_code == 422
+        session.execute.assert_not_awaited()
+
+    async def test_the_events_of_many_tasks_are_one_query(self):
+        session = _session([_event("task-1", 1), _event("task-2", 2)])
+
+        resp = await _get(
+            session,
+            "/api/tasks/events",
+            {"task_ids": ["task-1", "task-2"], "event_type": "iteration_end"},
+        )
+
+        assert resp.status_code == 200, resp.text
+        assert [e["task_id"] for e in resp.json()] == ["task-1", "task-2"]
+        statement = _statement(session)
+        assert "task_events.task_id IN" in statement
+        assert "task_events.event_type" in statement
+
+
+class TestStoriesBatch:
+    async def test_many_ids_are_one_in_query(self):
+        session = _session([_story("story-1"), _story("story-2")])
+
+        resp = await _get(session, "/api/stories/batch", {"ids": ["story-1", "story-2"]})
+
+        assert resp.status_code == 200, resp.text
+        assert [s["id"] for s in resp.json()] == ["story-1", "story-2"]
+        assert "stories.id IN" in _statement(session)
+
+
+class TestRunsBatch:
+    async def test_the_runs_of_many_tasks_are_one_query(self):
+        session = _session([_run("run-1", "task-1"), _run("run-2", "task-2")])
+
+        resp = await _get(
+            session,
+            "/api/runs/batch",
+            {"task_ids": ["task-1", "task-2"], "run_type": "engineering"},
+        )
+
+        assert resp.status_code == 200, resp.text
+        assert [r["id"] for r in resp.json()] == ["run-1", "run-2"]
+        statement = _statement(session)
+        assert "runs.task_id IN" in statement
+        assert "runs.type" in statement
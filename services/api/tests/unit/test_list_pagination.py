@@ -0,0 +1,196 @@
+"""Unit tests for the list reads: keyset pages, field projection, streamed JSON."""
+
+import base64
+from datetime import UTC, datetime, timedelta
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+import uuid
+
+from httpx import ASGITransport, AsyncClient
+from internal_caller import INTERNAL_HEADERS
+import pytest
+
+from shared.clients.internal_api import NEXT_CURSOR_HEADER
+from src.database import get_async_session
+from src.main import app
+from src.routers._pagination import _encode_cursor
+from src.routers.stories import _STORY_LIST_ORDERS
+
+PROJECT_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+_NOW = datetime(2026, 10, 16, 12, 0, tzinfo=UTC)
+
+
+def _run(index: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=f"run-{index}",
+        type="engineering",
+        status="completed",
+        project_id=PROJECT_ID,
+        user_id=None,
+        story_id="story-1",
+        task_id="task-1",
+        run_metadata={"prompt": "x" * 100},
+        result={"summary": "done"},
+        error_message=None,
+        started_at=None,
+        completed_at=None,
+        callback_stream=None,
+        iteration=None,
+        input_tokens=None,
+        output_tokens=None,
+        total_tokens=None,
+        cost_usd=None,
+        agent_profile=None,
+        transcript_path=None,
+        transcript_truncated=None,
+        created_at=_NOW - timedelta(minutes=index),
+        updated_at=_NOW,
+    )
+
+
+def _session(rows: list) -> AsyncMock:
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = rows
+    session = AsyncMock()
+    session.execute = AsyncMock(return_value=result)
+    return session
+
+
+@pytest.fixture(autouse=True)
+def _cleanup_overrides():
+    yield
+    app.dependency_overrides.clear()
+
+
+async def _get(session: AsyncMock, path: str, params: dict):
+    async def override():
+        yield session
+
+    app.dependency_overrides[get_async_session] = override
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test", headers=INTERNAL_HEADERS
+    ) as client:
+        return await client.get(path, params=params)
+
+
+def _statement(session: AsyncMock) -> str:
+    [call] = session.execute.await_args_list
+    return str(call.args[0])
+
+
+class TestKeysetPages:
+    async def test_a_full_page_names_the_next_one(self):
+        # The query asks for one row past the page; its presence means more follow.
+        session = _session([_run(i) for i in range(3)])
+
+        resp = await _get(session, "/api/runs/", {"limit": 2})
+
+        assert resp.status_code == 200, resp.text
+        assert [r["id"] for r in resp.json()] == ["run-0", "run-1"]
+        assert resp.headers[NEXT_CURSOR_HEADER]
+        assert "LIMIT" in _statement(session)
+
+    async def test_the_last_page_names_none(self):
+        session = _session([_run(0)])
+
+        resp = await _get(session, "/api/runs/", {"limit": 2})
+
+        assert resp.status_code == 200, resp.text
+        assert NEXT_CURSOR_HEADER not in resp.headers
+
+    async def test_the_cursor_starts_the_page_after_the_last_row(self):
+        first = await _get(_session([_run(i) for i in range(3)]), "/api/runs/", {"limit": 2})
+        session = _session([_run(2)])
+
+        resp = await _get(
+            session, "/api/runs/", {"limit": 2, "cursor": first.headers[NEXT_CURSOR_HEADER]}
+        )
+
+        assert resp.status_code == 200, resp.text
+        # Newest first: the next page holds the rows that sort below the cursor.
+        assert "(runs.created_at, runs.id) < " in _statement(session)
+
+    async def test_a_mixed_direction_sort_pages_with_an_or_chain(self):
+        session = _session([])
+        cursor_source = SimpleNamespace(priority=1, created_at=_NOW, id="story-1")
+        cursor = _encode_cursor(cursor_source, _STORY_LIST_ORDERS["-priority"])
+
+        resp = await _get(
+            session, "/api/stories/", {"sort": "-priority", "limit": 10, "cursor": cursor}
+        )
+
+        assert resp.status_code == 200, resp.text
+        statement = _statement(session)
+        assert "stories.priority < " in statement
+        assert "stories.created_at > " in statement
+
+    async def test_a_malformed_cursor_is_refused(self):
+        session = _session([])
+
+        resp = await _get(session, "/api/runs/", {"limit": 2, "cursor": "not-a-cursor"})
+
+        assert resp.status_code == 422
+        session.execute.assert_not_awaited()
+
+    @pytest.mark.parametrize(
+        ("path", "values"),
+        [
+            # A number where the datetime and the id belong.
+            ("/api/runs/", [1, 2]),
+            # A string where the priority belongs.
+            ("/api/stories/", ["high", "2026-10-16T12:00:00+00:00", "story-1"]),
+            # A boolean is not an integer priority either.
+            ("/api/stories/", [True, "2026-10-16T12:00:00+00:00", "story-1"]),
+        ],
+    )
+    async def test_a_cursor_of_the_wrong_types_is_refused(self, path, values):
+        session = _session([])
+        cursor = base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+        resp = await _get(session, path, {"limit": 2, "cursor": cursor})
+
+        assert resp.status_code == 422
+        session.execute.assert_not_awaited()
+
+    async def test_a_page_past_the_cap_is_refused(self):
+        resp = await _get(_session([]), "/api/runs/", {"limit": 100_000})
+
+        assert resp.status_code == 422
+
+    async def test_without_a_limit_every_row_is_returned(self):
+        session = _session([_run(i) for i in range(5)])
+
+        resp = await _get(session, "/api/runs/", {})
+
+        assert len(resp.json()) == 5
+        assert NEXT_CURSOR_HEADER not in resp.headers
+        assert "LIMIT" not in _statement(session)
+
+
+class TestFieldProjection:
+    async def test_only_the_named_columns_are_read_and_sent(self):
+        session = _session([_run(0)])
+
+        resp = await _get(session, "/api/runs/", {"fields": "id,status"})
+
+        assert resp.status_code == 200, resp.text
+        assert resp.json() == [{"id": "run-0", "status": "completed"}]
+        statement = _statement(session)
+        assert "runs.status" in statement
+        assert "runs.metadata" not in statement
+        assert "runs.result" not in statement
+
+    async def test_an_unknown_field_is_refused(self):
+        session = _session([])
+
+        resp = await _get(session, "/api/runs/", {"fields": "id,password"})
+
+        assert resp.status_code == 422
+        assert "password" in resp.json()["detail"]
+        session.execute.assert_not_awaited()
+
+    async def test_a_computed_field_cannot_be_projected(self):
+        resp = await _get(_session([]), "/api/tasks/", {"fields": "id,elapsed_minutes"})
+
+        assert resp.status_code == 422
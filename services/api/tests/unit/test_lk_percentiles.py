@@ -0,0 +1,36 @@
+"""Unit tests for the LK's range percentiles: merged sketches, stored p95s as fallback."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from shared.latency_sketch import LatencySketch
+from src.routers.lk import _p95
+
+
+def _row(p95_ms: float, latencies: list[float] | None = None) -> SimpleNamespace:
+    sketch = None
+    if latencies is not None:
+        sketch = LatencySketch()
+        for value in latencies:
+            sketch.add(value)
+        sketch = sketch.to_dict()
+    return SimpleNamespace(p95_ms=p95_ms, latency_sketch=sketch)
+
+
+def test_a_range_p95_comes_from_the_merged_sketches():
+    rows = [_row(900.0, [900.0] * 4), _row(12.0, [10.0, 11.0, 12.0] * 32)]
+
+    # 4 slow requests out of 100 sit above the range's p95.
+    assert _p95(rows) == pytest.approx(12.0, rel=0.01)
+
+
+def test_rows_without_sketches_fall_back_to_the_worst_p95():
+    rows = [_row(30.0, [30.0]), _row(80.0)]
+
+    assert _p95(rows) == 80.0
+
+
+def test_no_latencies_at_all():
+    assert _p95([_row(None, [])]) is None
+    assert _p95([]) is None
@@ -0,0 +1,256 @@
+"""Unit tests for the metrics history tiers: rollups, tier choice and bulk writes."""
+
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from httpx import ASGITransport, AsyncClient
+from internal_caller import INTERNAL_HEADERS
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.database import get_async_session
+from src.main import app
+from src.routers._metrics_rollup import (
+    bucket_start,
+    merge_snapshots,
+    resolution_for_window,
+    roll_up_metrics_history,
+)
+
+_NOW = datetime(2026, 10, 16, 12, 7, 30, tzinfo=UTC)
+
+
+def _result(*, scalars: list | None = None, rows: list | None = None) -> MagicMock:
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = scalars or []
+    result.all.return_value = rows or []
+    return result
+
+
+@pytest.fixture(autouse=True)
+def _cleanup_overrides():
+    yield
+    app.dependency_overrides.clear()
+
+
+async def _call(session: AsyncMock, method: str, path: str, **kwargs):
+    async def override():
+        yield session
+
+    app.dependency_overrides[get_async_session] = override
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test", headers=INTERNAL_HEADERS
+    ) as client:
+        return await client.request(method, path, **kwargs)
+
+
+class TestMergeSnapshots:
+    def test_gauges_are_weighted_means_with_their_peak(self):
+        merged = merge_snapshots([({"cpu_usage_pct": 10.0}, 1), ({"cpu_usage_pct": 40.0}, 2)])
+
+        assert merged["cpu_usage_pct"] == 30.0
+        assert merged["max"] == {"cpu_usage_pct": 40.0}
+
+    def test_counters_and_lists_keep_the_latest_value(self):
+        merged = merge_snapshots(
+            [
+                ({"uptime_seconds": 100.0, "containers": [{"name": "a"}]}, 1),
+                ({"uptime_seconds": 160.0, "containers": [{"name": "b"}]}, 1),
+            ]
+        )
+
+        assert merged["uptime_seconds"] == 160.0
+        assert merged["containers"] == [{"name": "b"}]
+        assert "max" not in merged
+
+    def test_a_coarser_tier_keeps_the_peaks_of_the_finer_one(self):
+        merged = merge_snapshots(
+            [
+                ({"cpu_usage_pct": 20.0, "max": {"cpu_usage_pct": 95.0}}, 5),
+                ({"cpu_usage_pct": 30.0, "max": {"cpu_usage_pct": 50.0}}, 5),
+            ]
+        )
+
+        assert merged["cpu_usage_pct"] == 25.0
+        assert merged["max"] == {"cpu_usage_pct": 95.0}
+
+    def test_missing_values_do_not_skew_the_mean(self):
+        merged = merge_snapshots([({"load_avg_1m": None}, 1), ({"load_avg_1m": 2.0}, 1)])
+
+        assert merged["load_avg_1m"] == 2.0
+
+
+class TestResolutionForWindow:
+    @pytest.mark.parametrize(
+        ("hours", "resolution"),
+        [(1, None), (6, None), (24, 300), (72, 300), (168, 3600), (24 * 90, 3600)],
+    )
+    def test_the_coarsest_tier_that_still_resolves_the_window(self, hours, resolution):
+        assert resolution_for_window(hours) == resolution
+
+
+class TestRollUp:
+    async def test_complete_buckets_are_written_in_one_statement(self):
+        raw = [
+            ("vps-1", datetime(2026, 10, 16, 11, 55, 10, tzinfo=UTC), {"cpu_usage_pct": 10.0}, 1),
+            ("vps-1", datetime(2026, 10, 16, 11, 58, 10, tzinfo=UTC), {"cpu_usage_pct": 30.0}, 1),
+            ("vps-1", datetime(2026, 10, 16, 12, 1, 10, tzinfo=UTC), {"cpu_usage_pct": 50.0}, 1),
+            ("vps-2", datetime(2026, 10, 16, 11, 56, 0, tzinfo=UTC), {"cpu_usage_pct": 70.0}, 1),
+        ]
+        session = AsyncMock()
+        # 5-minute tier: no buckets yet, oldest raw row; then the 1-hour tier
+        # finds nothing to roll up below the current hour.
+        session.scalar = AsyncMock(side_effect=[None, raw[0][1], None, None])
+        session.execute = AsyncMock(side_effect=[_result(rows=raw), MagicMock()])
+
+        written = await roll_up_metrics_history(session, _NOW)
+
+        assert written == {300: 3, 3600: 0}
+        insert = session.execute.await_args_list[1].args[0]
+        rows = insert.compile().params
+        assert "ON CONFLICT" in str(insert.compile(dialect=postgresql.dialect()))
+        assert {rows[f"recorded_at_m{i}"] for i in range(3)} == {
+            datetime(2026, 10, 16, 11, 55, tzinfo=UTC),
+            datetime(2026, 10, 16, 12, 0, tzinfo=UTC),
+        }
+        # The bucket still filling (12:05) is not read.
+        read = str(session.execute.await_args_list[0].args[0].compile(dialect=postgresql.dialect()))
+        assert "server_metrics_history.recorded_at <" in read
+
+    async def test_the_hourly_tier_stops_where_a_catching_up_source_tier_stopped(self):
+        # A raw backlog of 30 hours: one pass writes 288 five-minute buckets,
+        # which ends half-way through the 06:00 hour.
+        first_raw = datetime(2026, 10, 15, 6, 30, tzinfo=UTC)
+        raw = [
+            ("vps-1", first_raw + timedelta(minutes=5 * i), {"cpu_usage_pct": 1.0}, 1)
+            for i in range(30 * 12)
+        ]
+        five_minute_frontier = datetime(2026, 10, 16, 6, 25, tzinfo=UTC)
+        session = AsyncMock()
+        session.scalar = AsyncMock(
+            side_effect=[None, first_raw, None, first_raw, five_minute_frontier]
+        )
+        session.execute = AsyncMock(
+            side_effect=[_result(rows=raw[:288]), MagicMock(), _result(rows=[]), MagicMock()]
+        )
+
+        written = await roll_up_metrics_history(session, _NOW)
+
+        assert written == {300: 288, 3600: 0}
+        params = session.execute.await_args_list[2].args[0].compile().params
+        bounds = [value for value in params.values() if isinstance(value, datetime)]
+        # The 06:00 hour is only half rolled up into five-minute buckets, so the
+        # hourly tier must leave it for a later pass instead of reading up to 12:00.
+        assert max(bounds) == datetime(2026, 10, 16, 6, 0, tzinfo=UTC)
+
+    async def test_a_full_pass_over_many_servers_stays_under_the_bind_limit(self):
+        # 30 servers with a full 288-bucket pass each: 8,640 rollup rows, far
+        # more than asyncpg's 32,767 bind parameters allow in one statement.
+        first_raw = datetime(2026, 10, 15, 6, 30, tzinfo=UTC)
+        raw = [
+            (f"vps-{server}", first_raw + timedelta(minutes=5 * i), {"cpu_usage_pct": 1.0}, 1)
+            for server in range(30)
+            for i in range(288)
+        ]
+        session = AsyncMock()
+        session.scalar = AsyncMock(side_effect=[None, first_raw, None, None])
+        session.execute = AsyncMock(side_effect=[_result(rows=raw), *[MagicMock()] * 5])
+
+        written = await roll_up_metrics_history(session, _NOW)
+
+        assert written == {300: 30 * 288, 3600: 0}
+        inserts = [call.args[0] for call in session.execute.await_args_list[1:]]
+        assert len(inserts) > 1
+        params = [len(insert.compile(dialect=postgresql.dialect()).params) for insert in inserts]
+        assert max(params) <= 32767
+        assert sum(params) == 30 * 288 * 5
+
+    async def test_nothing_to_roll_up_writes_nothing(self):
+        session = AsyncMock()
+        session.scalar = AsyncMock(return_value=None)
+
+        assert await roll_up_metrics_history(session, _NOW) == {300: 0, 3600: 0}
+        session.execute.assert_not_awaited()
+
+    def test_buckets_are_aligned_to_their_width(self):
+        assert bucket_start(_NOW, 300) == datetime(2026, 10, 16, 12, 5, tzinfo=UTC)
+        assert bucket_start(_NOW, 3600) == datetime(2026, 10, 16, 12, 0, tzinfo=UTC)
+
+
+class TestMetricsHistoryEndpoints:
+    async def test_a_cycle_of_snapshots_is_one_insert(self):
+        session = AsyncMock()
+        session.execute = AsyncMock(side_effect=[_result(scalars=["vps-1", "vps-2"]), MagicMock()])
+
+        resp = await _call(
+            session,
+            "POST",
+            "/api/servers/metrics-history/bulk",
+            json={
+                "snapshots": [
+                    {"server_handle": "vps-1", "metrics": {"cpu_usage_pct": 1.0}},
+                    {"server_handle": "vps-2", "metrics": {"cpu_usage_pct": 2.0}},
+                    {"server_handle": "gone", "metrics": {"cpu_usage_pct": 3.0}},
+                ]
+            },
+        )
+
+        assert resp.status_code == 201, resp.text
+        assert resp.json() == {"inserted": 2, "unknown_servers": ["gone"]}
+        insert = session.execute.await_args_list[1].args[0]
+        assert str(insert).startswith("INSERT INTO server_metrics_history")
+        session.commit.assert_awaited_once()
+
+    async def test_a_long_window_reads_the_hourly_tier(self):
+        session = AsyncMock()
+        session.get = AsyncMock(return_value=SimpleNamespace(handle="vps-1"))
+        rollup = SimpleNamespace(
+            id=1,
+            server_handle="vps-1",
+            recorded_at=_NOW,
+            metrics={"cpu_usage_pct": 5.0},
+            resolution_seconds=3600,
+            samples=60,
+        )
+        session.execute = AsyncMock(return_value=_result(scalars=[rollup]))
+
+        resp = await _call(
+            session, "GET", "/api/servers/vps-1/metrics-history", params={"hours": 168}
+        )
+
+        assert resp.status_code == 200, resp.text
+        assert resp.json()[0]["resolution_seconds"] == 3600
+        assert resp.json()[0]["samples"] == 60
+        statement = str(session.execute.await_args.args[0])
+        assert "FROM server_metrics_rollups" in statement
+        assert "server_metrics_rollups.resolution_seconds" in statement
+
+    async def test_a_short_window_reads_the_raw_snapshots(self):
+        session = AsyncMock()
+        session.get = AsyncMock(return_value=SimpleNamespace(handle="vps-1"))
+        raw = SimpleNamespace(
+            id=1, server_handle="vps-1", recorded_at=_NOW, metrics={"cpu_usage_pct": 5.0}
+        )
+        session.execute = AsyncMock(return_value=_result(scalars=[raw]))
+
+        resp = await _call(
+            session, "GET", "/api/servers/vps-1/metrics-history", params={"hours": 1}
+        )
+
+        assert resp.status_code == 200, resp.text
+        assert resp.json()[0]["resolution_seconds"] is None
+        assert "FROM server_metrics_history" in str(session.execute.await_args.args[0])
+
+    async def test_an_unknown_rollup_tier_is_refused(self):
+        session = AsyncMock()
+
+        resp = await _call(
+            session,
+            "DELETE",
+            "/api/servers/metrics-history/rollups",
+            params={"resolution_seconds": 60, "retention_hours": 24},
+        )
+
+        assert resp.status_code == 422
+        session.execute.assert_not_awaited()
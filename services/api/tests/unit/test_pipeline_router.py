@@ -0,0 +1,193 @@
+"""Unit tests for the pipeline snapshot endpoint."""
+
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+import uuid
+
+from httpx import ASGITransport, AsyncClient
+from internal_caller import INTERNAL_HEADERS
+import pytest
+
+from src.database import get_async_session
+from src.main import app
+
+PROJECT_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+_NOW = datetime.now(UTC)
+
+
+def _task(task_id: str, status: str, **overrides) -> SimpleNamespace:
+    fields = {
+        "id": task_id,
+        "project_id": PROJECT_ID,
+        "type": "feature",
+        "title": f"Task {task_id}",
+        "description": None,
+        "plan": None,
+        "status": status,
+        "priority": 0,
+        "acceptance_criteria": None,
+        "current_iteration": 0,
+        "max_iterations": 3,
+        "need_e2e": False,
+        "created_by": "system",
+        "source_brainstorm_id": None,
+        "repository_id": None,
+        "story_id": None,
+        "blocked_by_task_id": None,
+        "failure_metadata": None,
+        "created_at": _NOW,
+        "updated_at": _NOW,
+    }
+    fields.update(overrides)
+    return SimpleNamespace(**fields)
+
+
+def _project() -> SimpleNamespace:
+    return SimpleNamespace(
+        id=PROJECT_ID,
+        title="Weather bot",
+        slug="weather-bot",
+        status="active",
+        config={"workspace_ready": True},
+        owner_id=1,
+        project_spec=None,
+        initiating_run_id="run-init",
+        created_at=_NOW,
+        updated_at=_NOW,
+    )
+
+
+def _run(run_id: str, task_id: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=run_id,
+        type="engineering",
+        status="running",
+        project_id=PROJECT_ID,
+        user_id=None,
+        story_id="story-1",
+        task_id=task_id,
+        run_metadata={"iteration": 0},
+        result=None,
+        error_message=None,
+        started_at=None,
+        completed_at=None,
+        callback_stream=None,
+        iteration=None,
+        input_tokens=None,
+        output_tokens=None,
+        total_tokens=None,
+        cost_usd=None,
+        agent_profile=None,
+        transcript_path=None,
+        transcript_truncated=None,
+        created_at=_NOW,
+        updated_at=_NOW,
+    )
+
+
+def _event(task_id: str, summary: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=1,
+        task_id=task_id,
+        event_type="iteration_end",
+        from_status=None,
+        to_status=None,
+        iteration=0,
+        details={"summary": summary},
+        actor="worker",
+        created_at=_NOW,
+        updated_at=_NOW,
+    )
+
+
+def _result(rows: list) -> MagicMock:
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = rows
+    return result
+
+
+def _session(*results: list) -> AsyncMock:
+    session = AsyncMock()
+    session.execute = AsyncMock(side_effect=[_result(rows) for rows in results])
+    return session
+
+
+@pytest.fixture(autouse=True)
+def _cleanup_overrides():
+    yield
+    app.dependency_overrides.clear()
+
+
+async def _get_snapshot(session: AsyncMock) -> dict:
+    async def override():
+        yield session
+
+    app.dependency_overrides[get_async_session] = override
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test", headers=INTERNAL_HEADERS
+    ) as client:
+        resp = await client.get("/api/pipeline/snapshot")
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+class TestPipelineSnapshot:
+    async def test_one_response_carries_everything_a_dispatch_decision_reads(self):
+        todo = _task("task-2", "todo", story_id="story-1", blocked_by_task_id="task-1")
+        done = _task("task-1", "done", story_id="story-1")
+        session = _session(
+            [todo],
+            [done, todo],
+            [done],
+            [_project()],
+            [_run("eng-1", "task-2")],
+            [_event("task-1", "added the endpoint")],
+        )
+
+        snapshot = await _get_snapshot(session)
+
+        assert [t["id"] for t in snapshot["todo_tasks"]] == ["task-2"]
+        assert [t["id"] for t in snapshot["story_tasks"]["story-1"]] == ["task-1", "task-2"]
+        assert snapshot["blockers"]["task-1"]["status"] == "done"
+        assert snapshot["projects"][str(PROJECT_ID)]["initiating_run_id"] == "run-init"
+        assert [r["id"] for r in snapshot["engineering_runs"]["task-2"]] == ["eng-1"]
+        [event] = snapshot["iteration_events"]["task-1"]
+        assert event["details"]["summary"] == "added the endpoint"
+        assert session.execute.await_count == 6
+
+    async def test_the_query_count_does_not_grow_with_the_backlog(self):
+        todo = [_task(f"task-{i}", "todo") for i in range(200)]
+        session = _session(todo, [_project()], [])
+
+        snapshot = await _get_snapshot(session)
+
+        assert len(snapshot["todo_tasks"]) == 200
+        # No stories, blockers or finished siblings: tasks, projects, runs.
+        assert session.execute.await_count == 3
+
+    async def test_an_empty_backlog_is_one_query(self):
+        session = _session([])
+
+        snapshot = await _get_snapshot(session)
+
+        assert snapshot["todo_tasks"] == []
+        assert session.execute.await_count == 1
+
+    async def test_only_the_runs_a_dispatch_acts_on_are_read(self):
+        todo = [
+            _task("task-1", "todo", current_iteration=1),
+            _task("task-2", "todo", current_iteration=2),
+            _task("task-3", "todo", current_iteration=2),
+        ]
+        session = _session(todo, [_project()], [])
+
+        await _get_snapshot(session)
+
+        runs_query = session.execute.await_args_list[2].args[0]
+        statement = str(runs_query)
+        assert "runs.status IN" in statement
+        # One containment per distinct iteration, not per task.
+        assert statement.count("runs.metadata @>") == 2
+        assert {"iteration": 1} in runs_query.compile().params.values()
+        assert {"iteration": 2} in runs_query.compile().params.values()
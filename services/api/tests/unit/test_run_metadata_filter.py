@@ -0,0 +1,90 @@
+"""Unit tests for the run metadata filters: `@>` on the indexed JSONB column."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+from httpx import ASGITransport, AsyncClient
+from internal_caller import INTERNAL_HEADERS
+import pytest
+
+from src.database import get_async_session
+from src.main import app
+
+
+def _session() -> AsyncMock:
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = []
+    session = AsyncMock()
+    session.execute = AsyncMock(return_value=result)
+    return session
+
+
+@pytest.fixture(autouse=True)
+def _cleanup_overrides():
+    yield
+    app.dependency_overrides.clear()
+
+
+async def _get(session: AsyncMock, path: str, params: dict):
+    async def override():
+        yield session
+
+    app.dependency_overrides[get_async_session] = override
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test", headers=INTERNAL_HEADERS
+    ) as client:
+        return await client.get(path, params=params)
+
+
+def _query(session: AsyncMock):
+    [call] = session.execute.await_args_list
+    return call.args[0]
+
+
+class TestListRunsMetadataFilter:
+    async def test_the_filter_is_a_containment_the_database_answers(self):
+        session = _session()
+
+        resp = await _get(
+            session,
+            "/api/runs/",
+            {
+                "task_id": "task-1",
+                "metadata": '{"iteration": 2, "qa_ssh_grant": {"state": "open"}}',
+            },
+        )
+
+        assert resp.status_code == 200, resp.text
+        query = _query(session)
+        assert "runs.metadata @>" in str(query)
+        assert {
+            "iteration": 2,
+            "qa_ssh_grant": {"state": "open"},
+        } in query.compile().params.values()
+
+    async def test_without_the_filter_metadata_is_not_consulted(self):
+        session = _session()
+
+        await _get(session, "/api/runs/", {"task_id": "task-1"})
+
+        assert "@>" not in str(_query(session))
+
+    @pytest.mark.parametrize("value", ["{not json", "[1, 2]", '"iteration"'])
+    async def test_anything_but_a_json_object_is_refused(self, value):
+        session = _session()
+
+        resp = await _get(session, "/api/runs/", {"metadata": value})
+
+        assert resp.status_code == 422
+        session.execute.assert_not_awaited()
+
+
+class TestOwedOwnerNotifications:
+    async def test_the_selection_is_a_containment(self):
+        session = _session()
+
+        resp = await _get(session, "/api/runs/owner-notifications/owed", {"limit": 10})
+
+        assert resp.status_code == 200, resp.text
+        query = _query(session)
+        assert "runs.metadata @>" in str(query)
+        assert {"owner_notification": {"state": "owed"}} in query.compile().params.values()
@@ -1,6 +1,6 @@
 """Unit tests for ServerMetricsHistory model."""
 
-from shared.models.server_metrics_history import ServerMetricsHistory
+from shared.models.server_metrics_history import ServerMetricsHistory, ServerMetricsRollup
 
 
 class TestServerMetricsHistoryModel:
@@ -44,3 +44,20 @@ class TestServerMetricsHistoryModel:
 
     def test_id_is_primary_key(self):
         assert ServerMetricsHistory.__table__.c.id.primary_key
+
+
+class TestServerMetricsRollupModel:
+    def test_one_bucket_per_server_and_tier(self):
+        [unique] = [
+            c
+            for c in ServerMetricsRollup.__table__.constraints
+            if c.name == "uq_server_metrics_rollups_bucket"
+        ]
+        assert [c.name for c in unique.columns] == [
+            "server_handle",
+            "resolution_seconds",
+            "recorded_at",
+        ]
+
+    def test_samples_are_required(self):
+        assert not ServerMetricsRollup.__table__.c.samples.nullable
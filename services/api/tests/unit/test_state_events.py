@@ -0,0 +1,142 @@
+"""Committed status transitions are announced on ``state:changes``, and nothing else is."""
+
+from unittest.mock import AsyncMock, patch
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from shared.contracts.dto.run import RunStatus
+from shared.contracts.dto.story import StoryStatus
+from shared.contracts.dto.task import TaskStatus
+from shared.models import Run, Story, Task
+from shared.queues import STATE_CHANGES_STREAM
+from src import state_events
+
+
+@pytest.fixture()
+def session():
+    engine = create_engine("sqlite://")
+    Run.__table__.create(engine)
+    Story.__table__.create(engine)
+    Task.__table__.create(engine)
+    # As in ``src.database``: a committed row keeps its values, so the next
+    # change still knows what it replaced.
+    with Session(engine, expire_on_commit=False) as session:
+        yield session
+
+
+@pytest.fixture()
+def published():
+    """Install the hooks, capturing what they would publish instead of publishing it."""
+    batches: list[list] = []
+
+    def fake_publish(session):
+        changes = session.info.pop(state_events._PENDING_KEY, None)
+        if changes:
+            batches.append(changes)
+
+    hooks = (
+        ("after_flush", state_events._record_flushed),
+        ("after_commit", fake_publish),
+        ("after_rollback", state_events._discard),
+    )
+    for name, hook in hooks:
+        event.listen(Session, name, hook)
+    yield batches
+    for name, hook in hooks:
+        event.remove(Session, name, hook)
+
+
+def _story(session: Session, status: str = StoryStatus.CREATED.value) -> Story:
+    story = Story(id=str(uuid.uuid4()), project_id=uuid.uuid4(), title="t", status=status)
+    session.add(story)
+    session.commit()
+    return story
+
+
+class TestCollectStateChanges:
+    def test_a_committed_transition_is_announced_with_its_previous_status(self, session, published):
+        story = _story(session)
+        published.clear()
+
+        story.status = StoryStatus.COMPLETED.value
+        session.commit()
+
+        [[change]] = published
+        assert (change.entity, change.entity_id) == ("story", story.id)
+        assert (change.previous_status, change.status) == ("created", "completed")
+
+    def test_a_rolled_back_transition_is_not_announced(self, session, published):
+        story = _story(session)
+        published.clear()
+
+        story.status = StoryStatus.FAILED.value
+        session.flush()
+        session.rollback()
+
+        assert published == []
+
+    def test_writes_that_leave_the_status_alone_are_not_announced(self, session, published):
+        story = _story(session)
+        published.clear()
+
+        story.title = "renamed"
+        session.commit()
+
+        assert published == []
+
+    def test_every_flush_of_the_transaction_is_announced_at_commit(self, session, published):
+        run = Run(id="eng-1", type="engineering", status=RunStatus.QUEUED.value)
+        session.add(run)
+        session.flush()
+        run.status = RunStatus.RUNNING.value
+        session.flush()
+        assert published == []
+
+        session.commit()
+
+        [changes] = published
+        assert [(c.entity, c.status) for c in changes] == [("run", "queued"), ("run", "running")]
+
+    def test_task_transitions_are_announced_for_the_dispatcher(self, session, published):
+        task = Task(
+            id="task-1", project_id=uuid.uuid4(), title="t", status=TaskStatus.BACKLOG.value
+        )
+        session.add(task)
+        session.commit()
+        published.clear()
+
+        task.status = TaskStatus.TODO.value
+        session.commit()
+
+        [[change]] = published
+        assert (change.entity, change.entity_id, change.status) == ("task", "task-1", "todo")
+
+
+class TestPublish:
+    async def test_changes_go_to_the_state_changes_stream(self):
+        redis = AsyncMock()
+        change = state_events.StateChangeEvent(entity="run", entity_id="r1", status="failed")
+        with patch.object(state_events, "get_redis_client", return_value=redis):
+            await state_events.publish_state_changes([change])
+
+        redis.publish_message.assert_awaited_once_with(STATE_CHANGES_STREAM, change)
+
+    async def test_a_redis_failure_is_swallowed(self):
+        redis = AsyncMock()
+        redis.publish_message.side_effect = ConnectionError("down")
+        change = state_events.StateChangeEvent(entity="run", entity_id="r1", status="failed")
+        with patch.object(state_events, "get_redis_client", return_value=redis):
+            await state_events.publish_state_changes([change])
+
+    def test_installing_twice_hooks_once(self):
+        try:
+            state_events.install_state_change_publisher()
+            state_events.install_state_change_publisher()
+            assert event.contains(Session, "after_commit", state_events._publish_committed)
+        finally:
+            event.remove(Session, "after_flush", state_events._record_flushed)
+            event.remove(Session, "after_commit", state_events._publish_committed)
+            event.remove(Session, "after_rollback", state_events._discard)
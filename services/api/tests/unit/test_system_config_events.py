@@ -0,0 +1,50 @@
+"""Committed system-config writes are announced on ``system_configs:changes``."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from shared.contracts.queues.config_change import ConfigChangeEvent
+from shared.models import SystemConfig
+from shared.queues import CONFIG_CHANGES_CHANNEL
+from src.routers import system_configs
+
+
+def _redis_client() -> MagicMock:
+    client = MagicMock()
+    client.redis.publish = AsyncMock(return_value=1)
+    return client
+
+
+def _config() -> SystemConfig:
+    return SystemConfig(key="scheduler.interval", value=45, category="scheduler")
+
+
+class TestPublishConfigChange:
+    async def test_an_update_carries_the_new_value(self):
+        client = _redis_client()
+        with patch.object(system_configs, "get_redis_client", return_value=client):
+            await system_configs.publish_config_change(_config())
+
+        channel, payload = client.redis.publish.await_args.args
+        assert channel == CONFIG_CHANGES_CHANNEL
+        event = ConfigChangeEvent.model_validate_json(payload)
+        assert (event.key, event.value, event.category, event.deleted) == (
+            "scheduler.interval",
+            45,
+            "scheduler",
+            False,
+        )
+
+    async def test_a_delete_carries_no_value(self):
+        client = _redis_client()
+        with patch.object(system_configs, "get_redis_client", return_value=client):
+            await system_configs.publish_config_change(_config(), deleted=True)
+
+        event = ConfigChangeEvent.model_validate_json(client.redis.publish.await_args.args[1])
+        assert event.deleted
+        assert event.value is None
+
+    async def test_a_redis_failure_is_swallowed(self):
+        client = _redis_client()
+        client.redis.publish.side_effect = ConnectionError("down")
+        with patch.object(system_configs, "get_redis_client", return_value=client):
+            await system_configs.publish_config_change(_config())
@@ -1035,3 +1035,121 @@ async def test_reopen_from_whr_to_backlog():
 
     assert resp.status_code == 200  # noqa: PLR2004
     assert task.status == "backlog"
+
+
+# --- Compound transitions ---
+
+
+async def _post(session, path: str, json: dict):
+    _override_session(session)
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test", headers=INTERNAL_HEADERS
+    ) as client:
+        return await client.post(path, json=json)
+
+
+@pytest.mark.asyncio
+async def test_retry_moves_failed_to_todo_with_one_event_and_one_commit():
+    task = _make_task(id="task-abc", status="failed", current_iteration=1)
+    session = _mock_session(scalar_one_or_none=task)
+
+    resp = await _post(
+        session, "/api/tasks/task-abc/retry", {"actor": "supervisor", "next_iteration": 2}
+    )
+
+    assert resp.status_code == 200  # noqa: PLR2004
+    assert task.status == "todo"
+    assert task.current_iteration == 2  # noqa: PLR2004
+    [event] = [call.args[0] for call in session.add.call_args_list]
+    assert (event.from_status, event.to_status) == ("failed", "todo")
+    assert event.details == {"via": ["backlog"], "iteration": 2}
+    session.commit.assert_awaited_once()
+    assert "FOR UPDATE" in str(session.execute.await_args_list[0].args[0])
+
+
+@pytest.mark.asyncio
+async def test_retry_already_landed_is_answered_unchanged():
+    task = _make_task(id="task-abc", status="todo", current_iteration=2)
+    session = _mock_session(scalar_one_or_none=task)
+
+    resp = await _post(session, "/api/tasks/task-abc/retry", {"next_iteration": 2})
+
+    assert resp.status_code == 200  # noqa: PLR2004
+    session.add.assert_not_called()
+    session.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_retry_of_a_task_already_retried_to_another_iteration_conflicts():
+    task = _make_task(id="task-abc", status="todo", current_iteration=3)
+    session = _mock_session(scalar_one_or_none=task)
+
+    resp = await _post(session, "/api/tasks/task-abc/retry", {"next_iteration": 2})
+
+    assert resp.status_code == 409  # noqa: PLR2004
+    assert task.current_iteration == 3  # noqa: PLR2004
+    session.add.assert_not_called()
+    session.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_retry_from_a_status_without_a_way_back_writes_nothing():
+    task = _make_task(id="task-abc", status="in_dev")
+    session = _mock_session(scalar_one_or_none=task)
+
+    resp = await _post(session, "/api/tasks/task-abc/retry", {"next_iteration": 1})
+
+    assert resp.status_code == 422  # noqa: PLR2004
+    session.add.assert_not_called()
+    session.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_replay_walks_the_chain_with_one_event():
+    task = _make_task(id="task-abc", status="todo")
+    session = _mock_session(scalar_one_or_none=task)
+
+    resp = await _post(
+        session,
+        "/api/tasks/task-abc/replay",
+        {"statuses": ["in_dev", "in_ci", "testing", "done"], "actor": "dispatcher"},
+    )
+
+    assert resp.status_code == 200  # noqa: PLR2004
+    assert task.status == "done"
+    [event] = [call.args[0] for call in session.add.call_args_list]
+    assert (event.from_status, event.to_status) == ("todo", "done")
+    assert event.details == {"via": ["in_dev", "in_ci", "testing"]}
+    session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_replay_resumes_after_the_status_the_task_stands_on():
+    task = _make_task(id="task-abc", status="in_ci")
+    session = _mock_session(scalar_one_or_none=task)
+
+    resp = await _post(
+        session, "/api/tasks/task-abc/replay", {"statuses": ["in_dev", "in_ci", "testing", "done"]}
+    )
+
+    assert resp.status_code == 200  # noqa: PLR2004
+    [event] = [call.args[0] for call in session.add.call_args_list]
+    assert (event.from_status, event.to_status) == ("in_ci", "done")
+
+    session.add.reset_mock()
+    resp = await _post(session, "/api/tasks/task-abc/replay", {"statuses": ["in_ci", "done"]})
+
+    assert resp.status_code == 200  # noqa: PLR2004
+    session.add.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_replay_with_an_invalid_step_commits_nothing():
+    task = _make_task(id="task-abc", status="todo")
+    session = _mock_session(scalar_one_or_none=task)
+
+    resp = await _post(session, "/api/tasks/task-abc/replay", {"statuses": ["in_dev", "done"]})
+
+    assert resp.status_code == 422  # noqa: PLR2004
+    session.add.assert_not_called()
+    session.commit.assert_not_awaited()
@@ -156,21 +156,25 @@ class ProvisionerNode(FunctionalNode):
             )
 
         time4vps_client = Time4VPSClient(time4vps_username, time4vps_password)
-        details = await time4vps_client.get_server_details(target.provider_id)
-        if not provider_ip_matches(expected_ip=target.ip, provider_ip=details.ip):
-            logger.error(
-                "provisioning_provider_identity_mismatch",
-                server_handle=server_handle,
-                server_id=target.provider_id,
-                database_ip=target.ip,
-                provider_ip=details.ip,
-            )
-            raise ProvisioningDenied(
-                reason="provider_identity_mismatch",
-                error="Provider identity mismatch",
-                message=f"❌ Provider identity mismatch for {server_handle}.",
-                mark_server_error=True,
-            )
+        try:
+            details = await time4vps_client.get_server_details(target.provider_id)
+            if not provider_ip_matches(expected_ip=target.ip, provider_ip=details.ip):
+                logger.error(
+                    "provisioning_provider_identity_mismatch",
+                    server_handle=server_handle,
+                    server_id=target.provider_id,
+                    database_ip=target.ip,
+                    provider_ip=details.ip,
+                )
+                raise ProvisioningDenied(
+                    reason="provider_identity_mismatch",
+                    error="Provider identity mismatch",
+                    message=f"❌ Provider identity mismatch for {server_handle}.",
+                    mark_server_error=True,
+                )
+        except BaseException:
+            await time4vps_client.close()
+            raise
 
         return time4vps_client
 
@@ -387,42 +391,44 @@ class ProvisionerNode(FunctionalNode):
         except ProvisioningDenied as denial:
             return await self._handle_denial(server_handle, state, denial)
 
-        # Step 4: Update status
-        await update_server_status(server_handle, "provisioning")
+        # The client pools connections; release them however provisioning ends.
+        async with time4vps_client:
+            # Step 4: Update status
+            await update_server_status(server_handle, "provisioning")
 
-        logger.info(
-            "provisioning_start",
-            server_handle=server_handle,
-            attempt=provisioning_attempts,
-        )
-
-        # Step 5: Determine provisioning method and execute
-        use_reinstall = server_info.status == ServerStatus.FORCE_REBUILD
-
-        if use_reinstall:
-            return await self._run_reinstall_path(
-                time4vps_client=time4vps_client,
+            logger.info(
+                "provisioning_start",
                 server_handle=server_handle,
-                server_id=server_id,
-                server_ip=server_ip,
-                deploy_user=server_info.ssh_user,
-                os_template=os_template,
-                provisioning_attempts=provisioning_attempts,
-                provisioning_episode_id=provisioning_episode_id,
-                is_recovery=is_recovery,
-                state=state,
-            )
-        else:
-            return await self._run_existing_access_path(
-                server_handle=server_handle,
-                server_ip=server_ip,
-                deploy_user=server_info.ssh_user,
-                provisioning_attempts=provisioning_attempts,
-                provisioning_episode_id=provisioning_episode_id,
-                is_recovery=is_recovery,
-                state=state,
+                attempt=provisioning_attempts,
             )
 
+            # Step 5: Determine provisioning method and execute
+            use_reinstall = server_info.status == ServerStatus.FORCE_REBUILD
+
+            if use_reinstall:
+                return await self._run_reinstall_path(
+                    time4vps_client=time4vps_client,
+                    server_handle=server_handle,
+                    server_id=server_id,
+                    server_ip=server_ip,
+                    deploy_user=server_info.ssh_user,
+                    os_template=os_template,
+                    provisioning_attempts=provisioning_attempts,
+                    provisioning_episode_id=provisioning_episode_id,
+                    is_recovery=is_recovery,
+                    state=state,
+                )
+            else:
+                return await self._run_existing_access_path(
+                    server_handle=server_handle,
+                    server_ip=server_ip,
+                    deploy_user=server_info.ssh_user,
+                    provisioning_attempts=provisioning_attempts,
+                    provisioning_episode_id=provisioning_episode_id,
+                    is_recovery=is_recovery,
+                    state=state,
+                )
+
 
 provisioner_node = ProvisionerNode()
 run = provisioner_node.run
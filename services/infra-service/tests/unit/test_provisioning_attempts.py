@@ -87,7 +87,8 @@ async def test_force_rebuild_status_selects_reinstall_path(monkeypatch):
     )
     update_status = AsyncMock()
     monkeypatch.setattr("src.provisioner.node.update_server_status", update_status)
-    monkeypatch.setattr(node, "_init_time4vps_client", AsyncMock(return_value=MagicMock()))
+    client = MagicMock()
+    monkeypatch.setattr(node, "_init_time4vps_client", AsyncMock(return_value=client))
     reinstall_path = AsyncMock(return_value={"provisioning_result": {"status": "success"}})
     existing_path = AsyncMock()
     monkeypatch.setattr(node, "_run_reinstall_path", reinstall_path)
@@ -100,6 +101,8 @@ async def test_force_rebuild_status_selects_reinstall_path(monkeypatch):
     reinstall_path.assert_awaited_once()
     assert reinstall_path.await_args.kwargs["server_id"] == 1001
     existing_path.assert_not_awaited()
+    # The client pools connections; the run releases them once it is done.
+    client.__aexit__.assert_awaited_once()
 
 
 @pytest.mark.asyncio
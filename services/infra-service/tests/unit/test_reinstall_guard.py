@@ -1,4 +1,5 @@
-from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
 
 import httpx
 import pytest
@@ -78,26 +79,16 @@ async def test_reinstall_refuses_missing_provider_ip(monkeypatch, provider_ip):
     client.reinstall_server.assert_not_awaited()
 
 
-class _ScriptedTransport:
-    """httpx.AsyncClient stand-in replaying the provider's answers in order."""
+class _ScriptedTransport(httpx.AsyncBaseTransport):
+    """httpx transport replaying the provider's answers in order."""
 
     def __init__(self, responses):
         self._responses = list(responses)
         self.calls: list[tuple[str, str]] = []
 
-    def __call__(self, *args, **kwargs):
-        return self
-
-    async def __aenter__(self):
-        return self
-
-    async def __aexit__(self, *exc_info):
-        return False
-
-    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
-        self.calls.append((method, url))
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append((request.method, str(request.url)))
         status, payload = self._responses.pop(0)
-        request = httpx.Request(method, url)
         if isinstance(payload, str):
             return httpx.Response(status, text=payload, request=request)
         return httpx.Response(status, json=payload, request=request)
@@ -106,6 +97,8 @@ class _ScriptedTransport:
 class _FakeAsyncio:
     """Fake clock so the boot wait and the rate-limit wait cost no real seconds."""
 
+    Semaphore = asyncio.Semaphore
+
     def __init__(self):
         self.now = 0.0
         self.slept: list[float] = []
@@ -163,9 +156,9 @@ async def test_rate_limited_poll_still_yields_the_new_root_password(monkeypatch)
     ansible = MagicMock()
     ansible.run_playbook.return_value = (True, "ok")
 
-    with patch("shared.clients.time4vps.httpx.AsyncClient", transport):
+    async with Time4VPSClient("user", "secret", transport=transport) as client:
         success, message = await reinstall_and_provision(
-            time4vps_client=Time4VPSClient("user", "secret"),
+            time4vps_client=client,
             server_handle="vps-275301",
             server_id=275301,
             server_ip="203.0.113.10",
@@ -73,8 +73,8 @@ class LanggraphAPIClient(InternalAPIClient):
 
     async def list_projects(self, *, telegram_id: int | None = None) -> list[ProjectDTO]:
         headers = {"X-Telegram-ID": str(telegram_id)} if telegram_id else None
-        resp = await self.request("GET", "projects/", headers=headers)
-        return [ProjectDTO.model_validate(p) for p in resp.json()]
+        rows = await self.get_all("projects/", headers=headers)
+        return [ProjectDTO.model_validate(p) for p in rows]
 
     async def list_servers(self, is_managed: bool | None = None) -> list[ServerDTO]:
         params = {}
@@ -237,8 +237,8 @@ class LanggraphAPIClient(InternalAPIClient):
         return StoryDTO.model_validate(resp.json())
 
     async def get_tasks_by_story(self, story_id: str) -> list[TaskDTO]:
-        resp = await self.request("GET", "tasks/", params={"story_id": story_id})
-        return [TaskDTO.model_validate(t) for t in resp.json()]
+        rows = await self.get_all("tasks/", story_id=story_id)
+        return [TaskDTO.model_validate(t) for t in rows]
 
     async def get_task_events(self, task_id: str) -> list[TaskEventDTO]:
         resp = await self.request("GET", f"tasks/{task_id}/events")
@@ -38,6 +38,7 @@ from shared.contracts.queues.worker import (
 from shared.log_config import get_logger
 from shared.queues import WORKER_COMMANDS, WORKER_RESPONSES
 from shared.redis.client import DEFAULT_STREAM_MAXLEN
+from shared.redis.ephemeral import register_ephemeral
 
 from ..config.settings import get_settings
 from .worker_spawner import CREATION_TIMEOUT, _wait_for_response, _wait_until_ready
@@ -204,6 +205,7 @@ async def run_qa_executor(
             maxlen=DEFAULT_STREAM_MAXLEN,
             approximate=True,
         )
+        await register_ephemeral(redis_client, f"worker:{worker_id}:input", output_stream)
         logger.info("qa_executor_started", worker_id=worker_id, timeout=timeout)
 
         transcript = await _await_verdict_or_exit(
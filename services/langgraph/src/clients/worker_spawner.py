@@ -35,6 +35,7 @@ from shared.diagnostics import safe_validation_errors
 from shared.log_config import get_logger
 from shared.queues import WORKER_COMMANDS, WORKER_RESPONSES
 from shared.redis.client import DEFAULT_STREAM_MAXLEN, decode_redis_value
+from shared.redis.ephemeral import register_ephemeral
 
 from ..config.constants import Timeouts
 from ..config.settings import get_settings
@@ -405,6 +406,9 @@ async def _send_turn(
         maxlen=DEFAULT_STREAM_MAXLEN,
         approximate=True,
     )
+    await register_ephemeral(
+        redis_client, f"worker:{worker_id}:input", f"worker:{worker_id}:output"
+    )
     logger.info(
         "task_sent_to_worker",
         request_id=request_id,
@@ -692,6 +696,7 @@ async def send_task_to_worker(
             maxlen=DEFAULT_STREAM_MAXLEN,
             approximate=True,
         )
+        await register_ephemeral(redis_client, input_stream, output_stream)
         logger.info(
             "task_sent_to_existing_worker",
             request_id=request_id,
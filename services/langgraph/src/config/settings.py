@@ -32,6 +32,11 @@ class Settings(BaseSettings):
     allocation_ram_reserve_mb: int = Field(default=256, ge=0)
     allocation_metrics_freshness_seconds: int = Field(default=300, gt=0)
 
+    # Queue consumers (engineering, deploy, architect, QA): how many entries one
+    # process keeps in flight. Entries for the same project still run one at a
+    # time, in order; this only lets different projects stop waiting on each other.
+    queue_worker_concurrency: int = Field(default=4, ge=1)
+
     # Optional: Mount host Claude session for dev agents (avoids API key need)
     mount_claude_session: bool = True
 
@@ -3,8 +3,20 @@
 Provides common boilerplate shared by engineering_worker and deploy_worker:
 signal handling, consumer group setup, message reading, ACKing, and shutdown.
 
+Entries are dispatched concurrently through ``KeyedDispatcher``: up to
+``concurrency`` at once, strictly in read order among entries with the same
+ordering key (the project, by default). Each entry is ACKed by its own task when
+its work ends, so ACKs land out of order — which XACK, addressing ids, does not
+mind.
+
 Includes a staleness guard: before processing, checks if the referenced run/story
 is already terminal (COMPLETED/FAILED/CANCELLED/ARCHIVED). If so, ACKs and skips.
+The guard reads ``StatusCache`` first — a local view the worker keeps current by
+following the API's ``state:changes`` announcements — and asks the API only on a
+miss. Every entry logs ``dequeue_to_start_ms``, the time from read to the start
+of its work, which is what the guard's round trip used to inflate. Each entry's
+handler time lands in ``redis_stream_handler_seconds`` by outcome (``ok``,
+``skipped``, ``invalid``, ``error``, ``cancelled``).
 """
 
 from __future__ import annotations
@@ -13,6 +25,7 @@ import asyncio
 from collections.abc import Awaitable, Callable
 import os
 import signal
+import time
 
 from pydantic import ValidationError
 import structlog
@@ -22,10 +35,14 @@ from shared.contracts.dto.story import StoryStatus
 from shared.log_config import setup_logging
 from shared.log_config.correlation import bind_message_context, unbind_message_context
 from shared.queues import WORKER_GROUP
-from shared.redis_client import RedisStreamClient
+from shared.redis.metrics import STREAM_METRICS
+from shared.redis_client import RedisStreamClient, StreamMessage
 
 from ..clients.api import api_client
+from ..config.settings import get_settings
+from ._dispatch import KeyedDispatcher, OrderingKeyFn, project_ordering_key
 from ._live_work import execute_live_work
+from ._status_cache import StatusCache
 from ._validation import _safe_validation_errors
 
 logger = structlog.get_logger(__name__)
@@ -45,6 +62,10 @@ class TerminalMessageValidationError(Exception):
 # Module-level shutdown flag (set by signal handler)
 _shutdown = False
 
+# Statuses this process has been told about; see ``_status_cache``. Answers only
+# while ``run_queue_worker`` keeps its listener attached.
+_status_cache = StatusCache()
+
 # Terminal statuses — messages referencing these are stale
 _TERMINAL_RUN_STATUSES = {
     RunStatus.COMPLETED.value,
@@ -76,49 +97,151 @@ def _handle_shutdown(signum, _frame):
 async def _check_message_staleness(job_data: dict) -> bool:
     """Check if a queue message references a terminal run or story.
 
-    Returns True if the message is stale and should be skipped.
+    Returns True if the message is stale and should be skipped. The status
+    comes from ``_status_cache`` when it has one and from the API otherwise.
     On API errors, returns False (proceed with processing).
     """
     task_id = job_data.get("task_id")
     if task_id:
-        try:
-            run_data = await api_client.get(f"runs/{task_id}")
-            if run_data["status"] in _TERMINAL_RUN_STATUSES:
-                logger.info(
-                    "stale_message_skipped",
-                    task_id=task_id,
-                    run_status=run_data["status"],
-                    reason="run_terminal",
-                )
-                return True
-        except Exception:
-            logger.debug("staleness_guard_api_error", task_id=task_id, exc_info=True)
+        run_status = _status_cache.get("run", task_id)
+        if run_status is None:
+            try:
+                run_data = await api_client.get(f"runs/{task_id}")
+                run_status = run_data["status"]
+            except Exception:
+                logger.debug("staleness_guard_api_error", task_id=task_id, exc_info=True)
+                return False
+            _status_cache.remember("run", task_id, run_status)
+        if run_status in _TERMINAL_RUN_STATUSES:
+            logger.info(
+                "stale_message_skipped",
+                task_id=task_id,
+                run_status=run_status,
+                reason="run_terminal",
+            )
+            return True
         return False
 
     story_id = job_data.get("story_id")
     if story_id:
-        try:
-            story = await api_client.get_story(story_id)
-            if story.status in _TERMINAL_STORY_STATUSES:
-                logger.info(
-                    "stale_message_skipped",
-                    story_id=story_id,
-                    story_status=story.status,
-                    reason="story_terminal",
-                )
-                return True
-        except Exception:
-            logger.debug("staleness_guard_api_error", story_id=story_id, exc_info=True)
+        story_status = _status_cache.get("story", story_id)
+        if story_status is None:
+            try:
+                story = await api_client.get_story(story_id)
+                story_status = story.status
+            except Exception:
+                logger.debug("staleness_guard_api_error", story_id=story_id, exc_info=True)
+                return False
+            _status_cache.remember("story", story_id, story_status)
+        if story_status in _TERMINAL_STORY_STATUSES:
+            logger.info(
+                "stale_message_skipped",
+                story_id=story_id,
+                story_status=story_status,
+                reason="story_terminal",
+            )
+            return True
         return False
 
     return False
 
 
+async def _process_entry(
+    redis: RedisStreamClient,
+    msg: StreamMessage,
+    *,
+    service_name: str,
+    queue: str,
+    group: str,
+    process_fn: ProcessFn,
+    read_at: float | None = None,
+) -> None:
+    """Guard, run and settle one entry. Never raises for a processing failure.
+
+    *read_at* is the ``time.monotonic()`` reading taken when the entry came off
+    the stream; with it, the entry logs how long it waited to start.
+
+    A failure that can never succeed (the message itself fails validation) is
+    ACKed with a payload-safe diagnostic; any other failure is logged and the
+    entry left in the PEL for the reclaim sweep.
+    """
+    started = time.monotonic()
+    # Anything that ends the entry without reaching an outcome below is a cancel.
+    outcome = "cancelled"
+    try:
+        bind_message_context(msg.data)
+
+        # Staleness guard: skip messages for terminal runs/stories
+        if await _check_message_staleness(msg.data):
+            outcome = "skipped"
+            await redis.ack(queue, group, msg.message_id)
+            logger.debug("stale_job_acked", entry_id=msg.message_id, worker=service_name)
+            return
+        if read_at is not None:
+            logger.debug(
+                "job_started",
+                entry_id=msg.message_id,
+                worker=service_name,
+                dequeue_to_start_ms=round((time.monotonic() - read_at) * 1000, 1),
+            )
+
+        project_id = msg.data.get("project_id")
+        result = await execute_live_work(
+            redis,
+            queue=queue,
+            group=group,
+            message_id=msg.message_id,
+            project_id=project_id if isinstance(project_id, str) and project_id else None,
+            process=lambda data=msg.data: process_fn(data, redis),
+        )
+        outcome = "skipped" if result is None else "ok"
+        if result is not None:
+            msg.data.update(result)
+            logger.debug("job_acked", entry_id=msg.message_id, worker=service_name)
+    except TerminalMessageValidationError as exc:
+        # A schema error cannot become valid when reclaimed from the PEL.
+        # ACK it after recording a payload-safe terminal diagnostic.
+        outcome = "invalid"
+        logger.error(
+            "terminal_message_validation_failed",
+            entry_id=msg.message_id,
+            worker=service_name,
+            errors=_safe_validation_errors(exc.validation_error),
+        )
+        try:
+            await redis.ack(queue, group, msg.message_id)
+        except Exception as ack_exc:
+            logger.error(
+                "terminal_message_ack_failed",
+                entry_id=msg.message_id,
+                worker=service_name,
+                error_type=type(ack_exc).__name__,
+                exc_info=True,
+            )
+    except Exception as exc:
+        outcome = "error"
+        logger.error(
+            "job_processing_error",
+            entry_id=msg.message_id,
+            error_type=type(exc).__name__,
+            worker=service_name,
+            exc_info=True,
+        )
+    finally:
+        STREAM_METRICS.handler_seconds.observe(
+            time.monotonic() - started, stream=queue, group=group, outcome=outcome
+        )
+        unbind_message_context()
+
+
 async def run_queue_worker(
     service_name: str,
     queue: str,
     process_fn: ProcessFn,
     group: str = WORKER_GROUP,
+    *,
+    concurrency: int | None = None,
+    ordering_key: OrderingKeyFn = project_ordering_key,
 ) -> None:
     """Generic worker loop for Redis Stream queue consumption.
 
@@ -127,6 +250,10 @@ async def run_queue_worker(
         queue: Redis Stream queue name to consume from
         process_fn: Async function(job_data, redis) -> result dict
         group: Consumer group name (defaults to WORKER_GROUP)
+        concurrency: Entries in flight at once. Defaults to the
+            ``queue_worker_concurrency`` setting.
+        ordering_key: Picks the key entries are serialized on; entries whose
+            key is None run unordered.
     """
     global _shutdown
     _shutdown = False
@@ -134,13 +261,20 @@ async def run_queue_worker(
     setup_logging(service_name=service_name)
 
     consumer_name = f"{service_name}-{os.getpid()}"
+    if concurrency is None:
+        concurrency = get_settings().queue_worker_concurrency
+    dispatcher = KeyedDispatcher(concurrency)
 
     redis = RedisStreamClient()
     await redis.connect()
+    status_listener = asyncio.create_task(_status_cache.follow(redis), name="status-listener")
 
-    logger.info(f"{service_name}_started", consumer=consumer_name)
+    logger.info(f"{service_name}_started", consumer=consumer_name, concurrency=concurrency)
 
     try:
+        # Room is held before every read, so nothing is taken off the stream
+        # while the dispatcher is full.
+        await dispatcher.reserve()
         async for msg in redis.consume(
             queue,
             group,
@@ -152,57 +286,33 @@ async def run_queue_worker(
                 break
             if msg is None:
                 continue
-            try:
-                bind_message_context(msg.data)
-
-                # Staleness guard: skip messages for terminal runs/stories
-                if await _check_message_staleness(msg.data):
-                    await redis.ack(queue, group, msg.message_id)
-                    logger.debug("stale_job_acked", entry_id=msg.message_id, worker=service_name)
-                    continue
-
-                project_id = msg.data.get("project_id")
-                result = await execute_live_work(
+            read_at = time.monotonic()
+            if dispatcher.in_flight(msg.message_id):
+                # Our own sweep, coming back round to an entry that is still
+                # running (or waiting on its key) here.
+                logger.debug("in_flight_entry_redelivered", entry_id=msg.message_id)
+                continue
+            dispatcher.start(
+                msg.message_id,
+                ordering_key(msg.data),
+                lambda msg=msg, read_at=read_at: _process_entry(
                     redis,
+                    msg,
+                    service_name=service_name,
                     queue=queue,
                     group=group,
-                    message_id=msg.message_id,
-                    project_id=project_id if isinstance(project_id, str) and project_id else None,
-                    process=lambda data=msg.data: process_fn(data, redis),
-                )
-                if result is not None:
-                    msg.data.update(result)
-                    logger.debug("job_acked", entry_id=msg.message_id, worker=service_name)
-            except TerminalMessageValidationError as exc:
-                # A schema error cannot become valid when reclaimed from the PEL.
-                # ACK it after recording a payload-safe terminal diagnostic.
-                logger.error(
-                    "terminal_message_validation_failed",
-                    entry_id=msg.message_id,
-                    worker=service_name,
-                    errors=_safe_validation_errors(exc.validation_error),
-                )
-                try:
-                    await redis.ack(queue, group, msg.message_id)
-                except Exception as ack_exc:
-                    logger.error(
-                        "terminal_message_ack_failed",
-                        entry_id=msg.message_id,
-                        worker=service_name,
-                        error_type=type(ack_exc).__name__,
-                        exc_info=True,
-                    )
-            except Exception as exc:
-                logger.error(
-                    "job_processing_error",
-                    entry_id=msg.message_id,
-                    error_type=type(exc).__name__,
-                    worker=service_name,
-                    exc_info=True,
-                )
-            finally:
-                unbind_message_context()
+                    process_fn=process_fn,
+                    read_at=read_at,
+                ),
+            )
+            await dispatcher.reserve()
+        # Shutdown (or the end of the stream) stops the reading, not the work
+        # already started: every entry in flight still gets to settle.
+        await dispatcher.drain()
     finally:
+        await dispatcher.cancel()
+        status_listener.cancel()
+        await asyncio.gather(status_listener, return_exceptions=True)
         await redis.close()
         await api_client.close()
         logger.info(f"{service_name}_shutdown")
@@ -213,6 +323,9 @@ def start_worker(
     queue: str,
     process_fn: ProcessFn,
     group: str = WORKER_GROUP,
+    *,
+    concurrency: int | None = None,
+    ordering_key: OrderingKeyFn = project_ordering_key,
 ) -> None:
     """Entry point: register signal handlers and run the worker loop.
 
@@ -221,8 +334,19 @@ def start_worker(
         queue: Redis Stream queue name to consume from
         process_fn: Async function(job_data, redis) -> result dict
         group: Consumer group name (defaults to WORKER_GROUP)
+        concurrency: Entries in flight at once (see ``run_queue_worker``)
+        ordering_key: Key entries are serialized on (see ``run_queue_worker``)
     """
     signal.signal(signal.SIGTERM, _handle_shutdown)
     signal.signal(signal.SIGINT, _handle_shutdown)
 
-    asyncio.run(run_queue_worker(service_name, queue, process_fn, group=group))
+    asyncio.run(
+        run_queue_worker(
+            service_name,
+            queue,
+            process_fn,
+            group=group,
+            concurrency=concurrency,
+            ordering_key=ordering_key,
+        )
+    )
@@ -0,0 +1,136 @@
+"""Bounded concurrent dispatch for queue consumers, in order per key.
+
+The shared worker loop used to process one entry at a time, so a single long
+LLM or GitHub wait held up every other project on the same queue. This module
+is what lets the loop keep several entries in flight: each entry runs in its
+own ``asyncio.Task``, at most ``concurrency`` of them at once, and entries that
+share an ordering key run strictly one after another, in the order they were
+read.
+
+It is the PO consumer's semaphore-plus-per-user-lock idea made general, with
+two differences. Ordering is a chain rather than a lock: an entry waits for
+the task of the entry before it with the same key, so the order is the read
+order by construction rather than by the fairness of ``asyncio.Lock``. And
+there are two bounds rather than one. A running slot is taken only once an
+entry's predecessor has ended, so entries queued behind one busy project never
+hold the slots another project's entries need. Room to read is reserved
+*before* the next read, for up to ``backlog`` entries on top of the running
+ones, so a busy process does not pull entries off the stream without end —
+past that they stay unclaimed for another consumer instead of ageing in this
+one's PEL.
+
+ACKs are the entries' own business: each task settles its entry when its work
+ends, in whatever order that happens. XACK names the id it releases, so one
+entry finishing before an earlier one is no different from the two finishing
+in order.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Picks the ordering key out of a queue payload; None means "no ordering".
+OrderingKeyFn = Callable[[dict], str | None]
+
+# Entries read ahead, per running slot, while they wait behind their key.
+BACKLOG_PER_SLOT = 4
+
+
+def project_ordering_key(job_data: dict) -> str | None:
+    """Order entries per project: the unit the deploy lock and live-work leases use."""
+    project_id = job_data.get("project_id")
+    if isinstance(project_id, str) and project_id:
+        return project_id
+    return None
+
+
+class KeyedDispatcher:
+    """Runs entries concurrently, at most ``concurrency`` at once, in order per key.
+
+    The caller reserves room before it reads (``reserve``) and hands the entry
+    it read to ``start``, which spends the reservation; the entry takes one of
+    the ``concurrency`` running slots once its key's predecessor has ended. At
+    most ``concurrency + backlog`` entries are held at once. ``in_flight``
+    answers whether an entry id is already being worked on here: the consumer's
+    own reclaim sweep hands such an id back once it has been pending for the
+    sweep's idle bar, and starting it twice would run the same job twice.
+    """
+
+    def __init__(self, concurrency: int, backlog: int | None = None) -> None:
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        if backlog is None:
+            backlog = concurrency * BACKLOG_PER_SLOT
+        if backlog < 0:
+            raise ValueError(f"backlog must not be negative, got {backlog}")
+        self.concurrency = concurrency
+        self.backlog = backlog
+        self._room = asyncio.Semaphore(concurrency + backlog)
+        self._slots = asyncio.Semaphore(concurrency)
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._tails: dict[str, asyncio.Task] = {}
+
+    def in_flight(self, message_id: str) -> bool:
+        """Whether *message_id* is running or queued behind its key here."""
+        return message_id in self._tasks
+
+    @property
+    def active(self) -> int:
+        """How many entries are running or waiting on a predecessor."""
+        return len(self._tasks)
+
+    async def reserve(self) -> None:
+        """Wait until there is room for one more entry."""
+        await self._room.acquire()
+
+    def start(self, message_id: str, key: str | None, work: Callable[[], Awaitable[None]]) -> None:
+        """Run *work* for *message_id* behind the last started entry with *key*.
+
+        Spends the room taken by ``reserve``; the room comes back when the task
+        ends, however it ends.
+        """
+        predecessor = self._tails.get(key) if key is not None else None
+        task = asyncio.create_task(self._run(predecessor, work), name=f"dispatch:{message_id}")
+        self._tasks[message_id] = task
+        if key is not None:
+            self._tails[key] = task
+        task.add_done_callback(lambda done: self._settled(done, message_id, key))
+
+    async def _run(
+        self, predecessor: asyncio.Task | None, work: Callable[[], Awaitable[None]]
+    ) -> None:
+        if predecessor is not None:
+            # Only that the predecessor ended matters here, not how: a failed
+            # entry stays in the PEL for reclaim and must not hold up the next.
+            await asyncio.wait([predecessor])
+        async with self._slots:
+            await work()
+
+    def _settled(self, task: asyncio.Task, message_id: str, key: str | None) -> None:
+        self._room.release()
+        self._tasks.pop(message_id, None)
+        if key is not None and self._tails.get(key) is task:
+            del self._tails[key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(
+                "dispatched_entry_failed",
+                entry_id=message_id,
+                error_type=type(task.exception()).__name__,
+            )
+
+    async def drain(self) -> None:
+        """Wait for every entry already started to finish."""
+        while self._tasks:
+            await asyncio.wait(list(self._tasks.values()))
+
+    async def cancel(self) -> None:
+        """Cancel whatever is still running and wait for it to unwind."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,162 @@
+"""Process-local view of run and story statuses, kept current by ``state:changes``.
+
+The staleness guard in ``_base`` asks one question per dequeued entry: is the
+run or story it names already terminal? Answered over HTTP, that is an API
+round trip and a database query on every entry, paid even though the answer is
+almost always "no". The API now announces every committed status transition on
+``state:changes`` (see ``services/api/src/state_events.py``), and this cache
+folds those announcements into a bounded map the guard reads first.
+
+Trust comes from the listener, not from the entries. The cache answers only
+while ``follow`` is attached to the stream: attaching clears it, and any read
+error clears it again and stops it answering until the listener has
+re-attached. A status learned before an outage can therefore never be served
+after it, when the transitions in between may have been missed. While detached
+every lookup misses and the guard is back on HTTP, exactly as before.
+
+Within an attachment, announcements overwrite and HTTP answers only fill gaps
+(``remember`` never replaces an entry): an announcement that lands while a
+guard's HTTP read is in flight is newer than the body that read returns.
+Publishing is best-effort on the API side, so entries also expire after
+``ttl_seconds`` — the longest a lost announcement can leave an entry wrong.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+import time
+
+import structlog
+
+from shared.queues import STATE_CHANGES_STREAM
+from shared.redis import RedisStreamClient, decode_redis_value
+from shared.redis.codec import PayloadDecodeError, decode_fields
+
+logger = structlog.get_logger(__name__)
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_TTL_SECONDS = 300.0
+
+# Entries asked for per XREAD while following the stream.
+_READ_COUNT = 500
+
+# The entities the staleness guard asks about. Task transitions share the
+# stream (the scheduler dispatches on them) but would only crowd these out.
+_GUARDED_ENTITIES = frozenset({"run", "story"})
+
+
+class StatusCache:
+    """Bounded LRU of ``(entity, id) -> status``, answering only while attached."""
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        clock=time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str, str], tuple[str, float]] = OrderedDict()
+        self._live = False
+
+    @property
+    def live(self) -> bool:
+        """Whether the listener is attached, and so whether lookups can hit."""
+        return self._live
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, entity: str, entity_id: str) -> str | None:
+        """The cached status, or None when unknown, expired or detached."""
+        if not self._live:
+            return None
+        key = (entity, entity_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        status, stored_at = entry
+        if self._clock() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return status
+
+    def apply(self, entity: str, entity_id: str, status: str) -> None:
+        """Record an announced transition, replacing whatever was cached."""
+        self._store((entity, entity_id), status)
+
+    def remember(self, entity: str, entity_id: str, status: str) -> None:
+        """Record a status read over HTTP, unless something newer is cached."""
+        if not self._live or (entity, entity_id) in self._entries:
+            return
+        self._store((entity, entity_id), status)
+
+    def attach(self) -> None:
+        """Start answering from an empty map; the listener is now positioned."""
+        self._entries.clear()
+        self._live = True
+
+    def detach(self) -> None:
+        """Stop answering and forget everything: transitions may be missed now."""
+        self._live = False
+        self._entries.clear()
+
+    def _store(self, key: tuple[str, str], status: str) -> None:
+        self._entries[key] = (status, self._clock())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _apply_fields(self, fields: dict) -> None:
+        try:
+            data = decode_fields(fields)
+            if data["entity"] in _GUARDED_ENTITIES:
+                self.apply(data["entity"], data["entity_id"], data["status"])
+        except (KeyError, TypeError, PayloadDecodeError):
+            logger.warning("state_change_unreadable", fields=sorted(fields))
+
+    async def follow(
+        self,
+        redis: RedisStreamClient,
+        *,
+        stream: str = STATE_CHANGES_STREAM,
+        block_ms: int = 5000,
+        retry_delay_s: float = 1.0,
+    ) -> None:
+        """Fold announcements into the cache until cancelled.
+
+        Attaches at the stream's current end: what was announced before the
+        listener existed is not replayed, it is fetched over HTTP on demand.
+        """
+        try:
+            while True:
+                try:
+                    await self._follow_once(redis, stream=stream, block_ms=block_ms)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as exc:
+                    self.detach()
+                    logger.warning(
+                        "state_change_listener_detached",
+                        stream=stream,
+                        error_type=type(exc).__name__,
+                    )
+                    await asyncio.sleep(retry_delay_s)
+        finally:
+            self.detach()
+
+    async def _follow_once(self, redis: RedisStreamClient, *, stream: str, block_ms: int) -> None:
+        newest = await redis.redis.xrevrange(stream, count=1)
+        last_id = decode_redis_value(newest[0][0]) if newest else "0-0"
+        self.attach()
+        logger.info("state_change_listener_attached", stream=stream, from_id=last_id)
+        while True:
+            response = await redis.redis.xread({stream: last_id}, count=_READ_COUNT, block=block_ms)
+            for _stream, entries in response or []:
+                for message_id, fields in entries:
+                    last_id = message_id
+                    self._apply_fields(fields)
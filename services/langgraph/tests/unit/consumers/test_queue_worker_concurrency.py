@@ -0,0 +1,255 @@
+"""The shared queue worker keeps several entries in flight, in order per project."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.consumers._dispatch import KeyedDispatcher, project_ordering_key
+
+
+def _message(message_id: str, project_id: str | None) -> MagicMock:
+    data = {"task_id": f"run-{message_id}"}
+    if project_id is not None:
+        data["project_id"] = project_id
+    return MagicMock(message_id=message_id, data=data)
+
+
+def _redis(messages: list) -> MagicMock:
+    async def consume(*_args, **_kwargs):
+        for message in messages:
+            yield message
+
+    redis = MagicMock()
+    redis.connect = AsyncMock()
+    redis.close = AsyncMock()
+    redis.ack = AsyncMock()
+    redis.consume = consume
+    # Live-work leases: registered and never cancelled.
+    redis.redis.eval = AsyncMock(return_value=1)
+    redis.redis.exists = AsyncMock(return_value=False)
+    redis.redis.zrem = AsyncMock()
+    return redis
+
+
+@pytest.fixture()
+def fresh_runs():
+    with patch("src.consumers._base.api_client") as api:
+        api.get = AsyncMock(return_value={"status": "running"})
+        api.close = AsyncMock()
+        yield api
+
+
+async def _run(redis, process, **kwargs) -> None:
+    from src.consumers._base import run_queue_worker
+
+    with patch("src.consumers._base.RedisStreamClient", return_value=redis):
+        await asyncio.wait_for(run_queue_worker("test", "queue", process, **kwargs), timeout=2)
+
+
+class TestRunQueueWorker:
+    async def test_different_projects_do_not_wait_for_each_other(self, fresh_runs):
+        slow_started = asyncio.Event()
+        release_slow = asyncio.Event()
+        order: list[str] = []
+
+        async def process(data, _redis):
+            if data["project_id"] == "slow":
+                slow_started.set()
+                await release_slow.wait()
+            else:
+                await slow_started.wait()
+                order.append(data["project_id"])
+                release_slow.set()
+            return {}
+
+        redis = _redis([_message("1-0", "slow"), _message("2-0", "fast")])
+        await _run(redis, process, concurrency=2)
+
+        assert order == ["fast"], "the second project waited for the first"
+        assert redis.ack.await_count == 2
+
+    async def test_a_hot_project_does_not_hold_every_slot(self, fresh_runs):
+        cold_done = asyncio.Event()
+        finished: list[str] = []
+
+        async def process(data, _redis):
+            if data["project_id"] == "hot":
+                # Only the cold project's entry can let the hot one go on.
+                await cold_done.wait()
+            else:
+                cold_done.set()
+            finished.append(data["task_id"])
+            return {}
+
+        hot = [_message(f"{i}-0", "hot") for i in range(1, 4)]
+        redis = _redis([*hot, _message("4-0", "cold")])
+        await _run(redis, process, concurrency=2)
+
+        assert finished == ["run-4-0", "run-1-0", "run-2-0", "run-3-0"]
+
+    async def test_same_project_runs_strictly_in_read_order(self, fresh_runs):
+        running = 0
+        overlapped = False
+        finished: list[str] = []
+
+        async def process(data, _redis):
+            nonlocal running, overlapped
+            running += 1
+            overlapped = overlapped or running > 1
+            # The first entry is the slowest, so any reordering would show.
+            await asyncio.sleep({"run-1-0": 0.05, "run-2-0": 0.01}.get(data["task_id"], 0))
+            finished.append(data["task_id"])
+            running -= 1
+            return {}
+
+        redis = _redis([_message("1-0", "p"), _message("2-0", "p"), _message("3-0", "p")])
+        await _run(redis, process, concurrency=3)
+
+        assert not overlapped
+        assert finished == ["run-1-0", "run-2-0", "run-3-0"]
+
+    async def test_acks_follow_completion_not_read_order(self, fresh_runs):
+        async def process(data, _redis):
+            await asyncio.sleep(0.05 if data["project_id"] == "a" else 0)
+            return {}
+
+        redis = _redis([_message("1-0", "a"), _message("2-0", "b")])
+        await _run(redis, process, concurrency=2)
+
+        acked = [call.args[2] for call in redis.ack.await_args_list]
+        assert acked == ["2-0", "1-0"]
+
+    async def test_concurrency_bounds_entries_in_flight(self, fresh_runs):
+        running = 0
+        peak = 0
+
+        async def process(_data, _redis):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {}
+
+        redis = _redis([_message(f"{i}-0", f"p{i}") for i in range(6)])
+        await _run(redis, process, concurrency=2)
+
+        assert peak == 2
+        assert redis.ack.await_count == 6
+
+    async def test_an_entry_already_in_flight_is_not_started_again(self, fresh_runs):
+        release = asyncio.Event()
+        calls = 0
+
+        async def process(_data, _redis):
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return {}
+
+        entry = _message("1-0", "p")
+
+        async def consume(*_args, **_kwargs):
+            yield entry
+            # The reclaim sweep handing back work that is still running here.
+            yield entry
+            release.set()
+
+        redis = _redis([])
+        redis.consume = consume
+        await _run(redis, process, concurrency=2)
+
+        assert calls == 1
+        redis.ack.assert_awaited_once_with("queue", "capability-workers", "1-0")
+
+    async def test_a_failed_entry_does_not_block_the_next_one_for_its_project(self, fresh_runs):
+        async def process(data, _redis):
+            if data["task_id"] == "run-1-0":
+                raise RuntimeError("transient")
+            return {}
+
+        redis = _redis([_message("1-0", "p"), _message("2-0", "p")])
+        await _run(redis, process, concurrency=2)
+
+        # The failure stays in the PEL for reclaim; its successor still runs.
+        redis.ack.assert_awaited_once_with("queue", "capability-workers", "2-0")
+
+
+class TestKeyedDispatcher:
+    def test_concurrency_must_be_positive(self):
+        with pytest.raises(ValueError, match="at least 1"):
+            KeyedDispatcher(0)
+
+    async def test_reads_stop_once_the_backlog_is_full(self):
+        dispatcher = KeyedDispatcher(1, backlog=1)
+        release = asyncio.Event()
+        for message_id in ("1-0", "2-0"):
+            await dispatcher.reserve()
+            dispatcher.start(message_id, "p", release.wait)
+
+        with pytest.raises(TimeoutError):
+            await asyncio.wait_for(dispatcher.reserve(), timeout=0.05)
+        release.set()
+        await dispatcher.drain()
+        await asyncio.wait_for(dispatcher.reserve(), timeout=1)
+
+    async def test_unkeyed_entries_run_concurrently(self):
+        dispatcher = KeyedDispatcher(2)
+        both_running = asyncio.Event()
+        running = 0
+
+        async def work():
+            nonlocal running
+            running += 1
+            if running == 2:
+                both_running.set()
+            await asyncio.wait_for(both_running.wait(), timeout=1)
+
+        for message_id in ("1-0", "2-0"):
+            await dispatcher.reserve()
+            dispatcher.start(message_id, None, work)
+        await dispatcher.drain()
+
+        assert both_running.is_set()
+        assert dispatcher.active == 0
+
+    async def test_cancel_stops_entries_still_running(self):
+        dispatcher = KeyedDispatcher(1)
+        await dispatcher.reserve()
+        dispatcher.start("1-0", "p", lambda: asyncio.Event().wait())
+        await asyncio.sleep(0)
+
+        await dispatcher.cancel()
+
+        assert dispatcher.active == 0
+
+    def test_project_is_the_default_ordering_key(self):
+        assert project_ordering_key({"project_id": "p1", "story_id": "s1"}) == "p1"
+        assert project_ordering_key({"story_id": "s1"}) is None
+        assert project_ordering_key({"project_id": ""}) is None
+
+
+class TestHandlerMetrics:
+    async def test_handler_time_is_recorded_by_outcome(self, fresh_runs):
+        from shared.queues import WORKER_GROUP
+        from shared.redis.metrics import STREAM_METRICS
+
+        def count(outcome: str) -> int:
+            histogram = STREAM_METRICS.handler_seconds
+            return histogram.count(stream="queue", group=WORKER_GROUP, outcome=outcome)
+
+        before = {outcome: count(outcome) for outcome in ("ok", "error")}
+
+        async def process(data, _redis):
+            if data["project_id"] == "broken":
+                raise RuntimeError("boom")
+            return {}
+
+        redis = _redis([_message("1-0", "p"), _message("2-0", "broken")])
+        await _run(redis, process, concurrency=2)
+
+        assert count("ok") == before["ok"] + 1
+        assert count("error") == before["error"] + 1
@@ -0,0 +1,168 @@
+"""The staleness guard answers from a push-fed status cache before calling the API."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fakeredis import aioredis
+import pytest
+
+from shared.contracts.dto.run import RunStatus
+from shared.contracts.dto.story import StoryStatus
+from shared.contracts.queues.state_change import StateChangeEvent
+from shared.queues import STATE_CHANGES_STREAM
+from src.consumers._status_cache import StatusCache
+
+
+def _attached(**kwargs) -> StatusCache:
+    cache = StatusCache(**kwargs)
+    cache.attach()
+    return cache
+
+
+@pytest.fixture()
+def api():
+    with patch("src.consumers._base.api_client") as mock:
+        mock.get = AsyncMock(return_value={"status": RunStatus.RUNNING.value})
+        mock.get_story = AsyncMock(return_value=MagicMock(status=StoryStatus.IN_PROGRESS.value))
+        yield mock
+
+
+class TestStatusCache:
+    def test_a_detached_cache_never_answers(self):
+        cache = StatusCache()
+        cache.apply("run", "r1", "completed")
+
+        assert cache.get("run", "r1") is None
+
+    def test_detaching_forgets_what_was_known(self):
+        cache = _attached()
+        cache.apply("run", "r1", "completed")
+
+        cache.detach()
+        cache.attach()
+
+        assert cache.get("run", "r1") is None
+
+    def test_an_announcement_overwrites_and_an_http_read_only_fills_gaps(self):
+        cache = _attached()
+        cache.remember("story", "s1", "in_progress")
+        cache.apply("story", "s1", "completed")
+        # A read that started before the announcement returns the older status.
+        cache.remember("story", "s1", "in_progress")
+
+        assert cache.get("story", "s1") == "completed"
+
+    def test_entries_expire_after_the_ttl(self):
+        now = [0.0]
+        cache = _attached(ttl_seconds=10, clock=lambda: now[0])
+        cache.apply("run", "r1", "running")
+
+        now[0] = 11.0
+
+        assert cache.get("run", "r1") is None
+        assert len(cache) == 0
+
+    def test_the_least_recently_used_entry_is_evicted(self):
+        cache = _attached(max_entries=2)
+        cache.apply("run", "a", "running")
+        cache.apply("run", "b", "running")
+        cache.get("run", "a")
+        cache.apply("run", "c", "running")
+
+        assert cache.get("run", "b") is None
+        assert cache.get("run", "a") == "running"
+
+    def test_task_announcements_do_not_take_up_entries(self):
+        cache = _attached()
+        event = StateChangeEvent(entity="task", entity_id="t1", status="todo")
+
+        cache._apply_fields({"data": event.model_dump_json()})
+
+        assert len(cache) == 0
+
+
+class TestFollow:
+    async def test_announcements_after_attaching_reach_the_cache(self):
+        client = MagicMock()
+        client.redis = aioredis.FakeRedis(decode_responses=True)
+        # Announced before the listener existed: never replayed.
+        before = StateChangeEvent(entity="run", entity_id="old", status="failed")
+        await client.redis.xadd(STATE_CHANGES_STREAM, {"data": before.model_dump_json()})
+        cache = StatusCache()
+        listener = asyncio.create_task(cache.follow(client, block_ms=10))
+        try:
+            while not cache.live:
+                await asyncio.sleep(0.001)
+            event = StateChangeEvent(entity="run", entity_id="r1", status="completed")
+            await client.redis.xadd(STATE_CHANGES_STREAM, {"data": event.model_dump_json()})
+            while cache.get("run", "r1") is None:
+                await asyncio.sleep(0.001)
+        finally:
+            listener.cancel()
+            await asyncio.gather(listener, return_exceptions=True)
+
+        assert not cache.live
+        cache.attach()
+        assert cache.get("run", "old") is None
+
+    async def test_a_read_failure_detaches_until_the_listener_is_back(self):
+        client = MagicMock()
+        client.redis.xrevrange = AsyncMock(return_value=[])
+        reads = 0
+
+        async def xread(*_args, **_kwargs):
+            nonlocal reads
+            reads += 1
+            if reads == 1:
+                event = {"entity": "run", "entity_id": "r1", "status": "completed"}
+                return [[STATE_CHANGES_STREAM, [("1-0", {"data": json.dumps(event)})]]]
+            if reads == 2:
+                raise ConnectionError("redis went away")
+            await asyncio.Event().wait()
+
+        client.redis.xread = xread
+        cache = StatusCache()
+        listener = asyncio.create_task(cache.follow(client, retry_delay_s=0))
+        try:
+            while reads < 3:
+                await asyncio.sleep(0.001)
+        finally:
+            listener.cancel()
+            await asyncio.gather(listener, return_exceptions=True)
+
+        # Re-attached with nothing carried over from before the failure.
+        assert client.redis.xrevrange.await_count == 2
+
+
+class TestGuardUsesCache:
+    async def test_a_cached_terminal_run_is_stale_without_an_api_call(self, api):
+        from src.consumers._base import _check_message_staleness
+
+        cache = _attached()
+        cache.apply("run", "r1", RunStatus.CANCELLED.value)
+        with patch("src.consumers._base._status_cache", cache):
+            assert await _check_message_staleness({"task_id": "r1"}) is True
+        api.get.assert_not_awaited()
+
+    async def test_a_miss_asks_the_api_once_and_remembers(self, api):
+        from src.consumers._base import _check_message_staleness
+
+        cache = _attached()
+        with patch("src.consumers._base._status_cache", cache):
+            assert await _check_message_staleness({"story_id": "s1"}) is False
+            assert await _check_message_staleness({"story_id": "s1"}) is False
+        api.get_story.assert_awaited_once_with("s1")
+
+    async def test_an_announced_reopen_lets_the_story_through_again(self, api):
+        from src.consumers._base import _check_message_staleness
+
+        cache = _attached()
+        cache.apply("story", "s1", StoryStatus.COMPLETED.value)
+        with patch("src.consumers._base._status_cache", cache):
+            assert await _check_message_staleness({"story_id": "s1"}) is True
+            cache.apply("story", "s1", StoryStatus.REOPENED.value)
+            assert await _check_message_staleness({"story_id": "s1"}) is False
+        api.get_story.assert_not_awaited()
@@ -483,7 +483,7 @@ class TestTheInFlightSetAtTheProductionRatio:
         assert await _until(lambda: po_run.graph.ainvoke.await_count >= 2, timeout=5.0), (
             "the id was never released after its task ended, so the redelivery was ignored"
         )
-        assert len(acked) >= 2
+        assert await _until(lambda: len(acked) >= 2)
 
     async def test_the_id_is_released_when_the_ack_fails(self, po_run, production_ratio):
         """The ACK lives in the task's ``finally``; when it raises, the entry is
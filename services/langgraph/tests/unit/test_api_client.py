@@ -138,6 +138,7 @@ class TestListProjectsWithTelegramId:
                 "created_at": _NOW,
             }
         ]
+        resp.headers = httpx.Headers()
         mock_httpx_client.request.return_value = resp
 
         result = await api_client.list_projects(telegram_id=99999)
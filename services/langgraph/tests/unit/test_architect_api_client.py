@@ -34,6 +34,7 @@ def _ok_response(data):
     resp = MagicMock(spec=httpx.Response)
     resp.status_code = 200
     resp.json.return_value = data
+    resp.headers = httpx.Headers()
     return resp
 
 
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable, Hashable, Iterable
 from datetime import datetime
+import json
 
 import httpx
 
@@ -13,6 +15,7 @@ from shared.contracts.dto.deploy_dispatch import (
     DeployDispatchWithdrawal,
 )
 from shared.contracts.dto.incident import IncidentDTO
+from shared.contracts.dto.pipeline import PipelineSnapshot
 from shared.contracts.dto.project import ProjectDTO, ProjectUpdate
 from shared.contracts.dto.repository import RepositoryDTO
 from shared.contracts.dto.run import RunDTO
@@ -27,8 +30,78 @@ from shared.contracts.dto.temporary_access import (
     TemporaryAccessObservation,
 )
 from shared.contracts.dto.user import UserDTO
+from src.clients.tick_cache import current_tick_cache
 from src.config import get_settings
 
+# Second path segments that name a route of a collection rather than one row of it.
+_COLLECTION_ROUTES = frozenset(
+    {
+        "active",
+        "batch",
+        "by-provider-id",
+        "events",
+        "hourly",
+        "metrics-history",
+        "owner-notifications",
+        "snapshot",
+    }
+)
+# Reads put together from many collections, which any write can change.
+_AGGREGATE_READS = frozenset({"analytics", "pipeline"})
+# Collections a write to another one changes as a whole. The API opens runs
+# for a task it dispatches and for an application it deploys, fails the run of
+# an escalated access grant, and allocates servers to applications; and a
+# server is read by handle but written by id, so its path does not say which
+# cached server read the write touched.
+_WRITES_REACH = {
+    "applications": frozenset({"repositories", "runs", "servers"}),
+    "servers": frozenset({"servers"}),
+    "tasks": frozenset({"runs"}),
+    "temporary-access-grants": frozenset({"runs"}),
+}
+
+
+def _resource(path: str) -> tuple[str, str | None]:
+    """The collection *path* is under, and the row it names (None for the collection)."""
+    segments = path.strip("/").split("/")
+    row = segments[1] if len(segments) > 1 and segments[1] not in _COLLECTION_ROUTES else None
+    return segments[0], row
+
+
+def _read_key(path: str, params: dict) -> tuple[str, tuple[tuple[str, str], ...]]:
+    """The tick cache key of a GET; a list parameter counts once per value, as it is sent."""
+    pairs = (
+        (str(name), str(item))
+        for name, value in params.items()
+        for item in (value if isinstance(value, list | tuple) else (value,))
+    )
+    return path.strip("/"), tuple(sorted(pairs))
+
+
+def _changed_by(path: str) -> Callable[[Hashable], bool]:
+    """Whether a cached read may have changed under a write to *path*.
+
+    A write to one row drops the reads of that row, every read naming it in its
+    path or parameters (the runs of a task, the tasks of a story), and the
+    listings of its collection; reads of the collection's other rows stay. A
+    write to no row in particular (a create) drops the whole collection.
+    """
+    collection, row = _resource(path)
+    reached = _WRITES_REACH.get(collection, frozenset())
+
+    def changed(key: Hashable) -> bool:
+        read_path, params = key
+        read_collection, read_row = _resource(read_path)
+        if read_collection in _AGGREGATE_READS or read_collection in reached:
+            return True
+        if row is not None and (
+            row in read_path.split("/") or any(value == row for _name, value in params)
+        ):
+            return True
+        return read_collection == collection and None in (row, read_row)
+
+    return changed
+
 
 class SchedulerAPIClient(InternalAPIClient):
     """HTTP client for scheduler-required API endpoints."""
@@ -36,6 +109,27 @@ class SchedulerAPIClient(InternalAPIClient):
     def __init__(self) -> None:
         super().__init__(get_settings().api_base_url)
 
+    async def request_raw(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send a request, through the tick's cache when one is open (see ``tick_cache``)."""
+        cache = current_tick_cache()
+        if cache is None:
+            return await super().request_raw(method, path, **kwargs)
+        if method.upper() != "GET":
+            changed = _changed_by(path)
+            cache.invalidate(changed)
+            try:
+                return await super().request_raw(method, path, **kwargs)
+            finally:
+                cache.invalidate(changed)
+        if set(kwargs) - {"params"}:
+            return await super().request_raw(method, path, **kwargs)
+        return await cache.read(
+            _read_key(path, kwargs.get("params") or {}),
+            lambda: super(SchedulerAPIClient, self).request_raw(method, path, **kwargs),
+            # A server error is not an answer worth repeating for the rest of the tick.
+            keep=lambda resp: resp.status_code < httpx.codes.INTERNAL_SERVER_ERROR,
+        )
+
     async def ingest_rag(self, body: bytes, headers: dict) -> dict:
         resp = await self.request("POST", "rag/ingest", content=body, headers=headers)
         return resp.json()
@@ -141,14 +235,34 @@ class SchedulerAPIClient(InternalAPIClient):
         return RunDTO.model_validate(resp.json())
 
     async def list_runs(
-        self, *, task_id: str, run_type: str, status: str | None = None
+        self,
+        *,
+        task_id: str,
+        run_type: str,
+        status: str | None = None,
+        metadata: dict | None = None,
     ) -> list[RunDTO]:
-        """List runs of a task filtered by type, newest first; status is optional."""
+        """List runs of a task filtered by type, newest first.
+
+        *status* and *metadata* narrow it further; a run matches *metadata* when
+        its own metadata contains every key and value given, which the API
+        answers from an index.
+        """
         params = {"task_id": task_id, "run_type": run_type}
         if status is not None:
             params["status"] = status
-        resp = await self.request("GET", "runs/", params=params)
-        return [RunDTO.model_validate(r) for r in resp.json()]
+        if metadata is not None:
+            params["metadata"] = json.dumps(metadata, sort_keys=True)
+        rows = await self.get_all("runs/", **params)
+        return [RunDTO.model_validate(r) for r in rows]
+
+    async def list_runs_by_task_ids(
+        self, task_ids: Iterable[str], *, run_type: str | None = None
+    ) -> list[RunDTO]:
+        """Every run of the named tasks, newest first, in one request per batch."""
+        params = {"run_type": run_type} if run_type is not None else {}
+        rows = await self.get_batch("runs/batch", "task_ids", task_ids, **params)
+        return [RunDTO.model_validate(r) for r in rows]
 
     async def list_runs_owing_owner_notification(self, *, limit: int) -> list[RunDTO]:
         """One page of the runs whose owner has not been told their story ended.
@@ -202,10 +316,11 @@ class SchedulerAPIClient(InternalAPIClient):
         """Return the newest run for a story, validating only that run.
 
         The runs endpoint returns the story's runs newest-first. Routing only
-        cares about the latest one, so we validate `rows[0]` alone — an older,
-        legacy/corrupt run must not fail a story whose current run is valid.
+        cares about the latest one, so we ask for one row and validate `rows[0]`
+        alone — an older, legacy/corrupt run must not fail a story whose current
+        run is valid.
         """
-        params: dict[str, str] = {"story_id": story_id}
+        params: dict[str, str | int] = {"story_id": story_id, "limit": 1}
         if run_type:
             params["run_type"] = run_type
         resp = await self.request("GET", "runs/", params=params)
@@ -363,13 +478,18 @@ class SchedulerAPIClient(InternalAPIClient):
         resp = await self.request("GET", f"stories/{story_id}")
         return StoryDTO.model_validate(resp.json())
 
+    async def get_stories_by_ids(self, story_ids: Iterable[str]) -> list[StoryDTO]:
+        """The named stories that exist, in one request per batch."""
+        rows = await self.get_batch("stories/batch", "ids", story_ids)
+        return [StoryDTO.model_validate(s) for s in rows]
+
     async def get_stories_by_status(self, status: str) -> list[StoryDTO]:
-        resp = await self.request("GET", "stories/", params={"status": status})
-        return [StoryDTO.model_validate(s) for s in resp.json()]
+        rows = await self.get_all("stories/", status=status)
+        return [StoryDTO.model_validate(s) for s in rows]
 
     async def get_stories_by_project(self, project_id: str) -> list[StoryDTO]:
-        resp = await self.request("GET", "stories/", params={"project_id": project_id})
-        return [StoryDTO.model_validate(s) for s in resp.json()]
+        rows = await self.get_all("stories/", project_id=project_id)
+        return [StoryDTO.model_validate(s) for s in rows]
 
     async def fail_story(self, story_id: str) -> StoryDTO:
         """Transition story to failed status."""
@@ -407,25 +527,36 @@ class SchedulerAPIClient(InternalAPIClient):
 
     # --- Tasks ---
 
+    async def get_pipeline_snapshot(self) -> PipelineSnapshot:
+        """Every TODO task with what deciding its dispatch reads, in one request."""
+        resp = await self.request("GET", "pipeline/snapshot")
+        return PipelineSnapshot.model_validate(resp.json())
+
     async def get_tasks_by_status(self, status: str) -> list[TaskDTO]:
-        resp = await self.request("GET", "tasks/", params={"status": status})
-        return [TaskDTO.model_validate(t) for t in resp.json()]
+        rows = await self.get_all("tasks/", status=status)
+        return [TaskDTO.model_validate(t) for t in rows]
 
     async def get_tasks_by_story(self, story_id: str) -> list[TaskDTO]:
-        resp = await self.request("GET", "tasks/", params={"story_id": story_id})
-        return [TaskDTO.model_validate(t) for t in resp.json()]
+        rows = await self.get_all("tasks/", story_id=story_id)
+        return [TaskDTO.model_validate(t) for t in rows]
+
+    async def get_tasks_by_ids(self, task_ids: Iterable[str]) -> list[TaskDTO]:
+        """The named tasks that exist, in one request per batch."""
+        rows = await self.get_batch("tasks/batch", "ids", task_ids)
+        return [TaskDTO.model_validate(t) for t in rows]
+
+    async def get_tasks_by_story_ids(self, story_ids: Iterable[str]) -> list[TaskDTO]:
+        """Every task of the named stories, in one request per batch."""
+        rows = await self.get_batch("tasks/batch", "story_ids", story_ids)
+        return [TaskDTO.model_validate(t) for t in rows]
 
     async def get_tasks_by_project_and_status(
         self,
         project_id: str,
         status: str,
     ) -> list[TaskDTO]:
-        resp = await self.request(
-            "GET",
-            "tasks/",
-            params={"project_id": project_id, "status": status},
-        )
-        return [TaskDTO.model_validate(t) for t in resp.json()]
+        rows = await self.get_all("tasks/", project_id=project_id, status=status)
+        return [TaskDTO.model_validate(t) for t in rows]
 
     async def create_task(self, task_data: dict) -> TaskDTO:
         resp = await self.request("POST", "tasks/", json=task_data)
@@ -450,6 +581,36 @@ class SchedulerAPIClient(InternalAPIClient):
         )
         return TaskDTO.model_validate(resp.json())
 
+    async def retry_task(
+        self, task_id: str, *, next_iteration: int | None = None, actor: str = "architect"
+    ) -> TaskDTO | None:
+        """Send a task back to TODO (through BACKLOG) in one transaction and one event.
+
+        None means the task is already in TODO on another iteration: a retry
+        that started from an older read of it, which the API refuses.
+        """
+        body: dict = {"actor": actor}
+        if next_iteration is not None:
+            body["next_iteration"] = next_iteration
+        try:
+            resp = await self.request("POST", f"tasks/{task_id}/retry", json=body)
+        except httpx.HTTPStatusError as error:
+            if error.response.status_code != httpx.codes.CONFLICT:
+                raise
+            return None
+        return TaskDTO.model_validate(resp.json())
+
+    async def replay_task_statuses(
+        self, task_id: str, statuses: Iterable[str], actor: str = "architect"
+    ) -> TaskDTO:
+        """Walk a task through *statuses* in one transaction and one event."""
+        resp = await self.request(
+            "POST",
+            f"tasks/{task_id}/replay",
+            json={"statuses": [str(s) for s in statuses], "actor": actor},
+        )
+        return TaskDTO.model_validate(resp.json())
+
     async def create_task_event(self, task_id: str, event: dict) -> TaskEventDTO:
         resp = await self.request("POST", f"tasks/{task_id}/events", json=event)
         return TaskEventDTO.model_validate(resp.json())
@@ -458,6 +619,14 @@ class SchedulerAPIClient(InternalAPIClient):
         resp = await self.request("GET", f"tasks/{task_id}/events")
         return [TaskEventDTO.model_validate(e) for e in resp.json()]
 
+    async def get_task_events_by_task_ids(
+        self, task_ids: Iterable[str], *, event_type: str | None = None
+    ) -> list[TaskEventDTO]:
+        """The events of every named task, grouped by task, oldest first."""
+        params = {"event_type": event_type} if event_type is not None else {}
+        rows = await self.get_batch("tasks/events", "task_ids", task_ids, **params)
+        return [TaskEventDTO.model_validate(e) for e in rows]
+
     # --- Incidents ---
 
     async def create_incident(
@@ -529,6 +698,29 @@ class SchedulerAPIClient(InternalAPIClient):
         )
         return resp.json()
 
+    async def create_metrics_history_bulk(self, snapshots: list[dict]) -> dict:
+        """Append one cycle's ``{server_handle, metrics}`` snapshots in one request."""
+        resp = await self.request(
+            "POST",
+            "servers/metrics-history/bulk",
+            json={"snapshots": snapshots},
+        )
+        return resp.json()
+
+    async def roll_up_metrics_history(self) -> dict:
+        resp = await self.request("POST", "servers/metrics-history/rollups")
+        return resp.json()
+
+    async def delete_old_metrics_rollups(
+        self, resolution_seconds: int, retention_hours: int
+    ) -> dict:
+        resp = await self.request(
+            "DELETE",
+            "servers/metrics-history/rollups",
+            params={"resolution_seconds": resolution_seconds, "retention_hours": retention_hours},
+        )
+        return resp.json()
+
     # --- Applications ---
 
     async def get_applications(
@@ -630,15 +822,6 @@ class SchedulerAPIClient(InternalAPIClient):
         resp = await self.request("POST", "analytics/daily", json=data)
         return resp.json()
 
-    async def upsert_known_users(self, project_id: str, users: list[dict]) -> dict:
-        """Batch upsert known users for a project."""
-        resp = await self.request(
-            "POST",
-            "analytics/known-users",
-            json={"project_id": project_id, "users": users},
-        )
-        return resp.json()
-
     async def get_known_users(self, project_id: str) -> list[dict]:
         """Get known users for a project."""
         resp = await self.request(
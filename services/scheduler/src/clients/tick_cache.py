@@ -0,0 +1,96 @@
+"""Read-through cache for the API reads of one dispatcher tick.
+
+The sweeps of a tick read the same rows many times over: the project of every
+story they touch, the engineering runs of a task once to find a live run and
+again to find a terminal one, the tasks of a story from two sweeps at once.
+Inside ``tick_cache()`` the ``SchedulerAPIClient`` answers a GET it has already
+sent this tick from the response it got, and a GET identical to one still in
+flight waits for that one instead of sending its own.
+
+A tick sees the API as of its reads, as it always has between one read and
+the next; what the cache must never do is hide the tick's own changes. So any
+write the client sends — a POST, PATCH, PUT or DELETE — drops every cached
+read it can change, before it goes out and again once it has landed, and the
+next read of those asks the API. Which reads a write can change is the
+client's to say; the rest stay cached for the other sweeps of the tick. The
+scope is a context variable: the tasks a tick gathers share its cache, and
+the scheduler's other workers, which use the same client, never see it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Hashable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any
+
+_current: ContextVar[TickCache | None] = ContextVar("scheduler_tick_cache", default=None)
+
+
+class TickCache:
+    """In-flight and completed reads of one tick, keyed by request."""
+
+    def __init__(self) -> None:
+        self._entries: dict[Hashable, asyncio.Task] = {}
+        # Reads answered without a request of their own, and reads sent.
+        self.hits = 0
+        self.misses = 0
+
+    async def read(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        *,
+        keep: Callable[[Any], bool] = lambda _result: True,
+    ) -> Any:
+        """*fetch*'s result for *key*, sending it only if nothing sent it this tick.
+
+        A result *keep* rejects is handed to the callers already waiting for it
+        and then forgotten, like a read that raised.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            # A task of its own, so a caller cut short (a sweep over its budget)
+            # does not cancel the read the others are waiting on.
+            entry = asyncio.ensure_future(fetch())
+            self._entries[key] = entry
+            entry.add_done_callback(lambda done: self._settle(key, done, keep))
+        else:
+            self.hits += 1
+        return await asyncio.shield(entry)
+
+    def invalidate(self, stale: Callable[[Hashable], bool] | None = None) -> None:
+        """Forget the reads whose key *stale* accepts, or every read without one.
+
+        A read still in flight is forgotten too: its answer may predate the
+        change, so the callers already waiting get it and the next one asks again.
+        """
+        if stale is None:
+            self._entries.clear()
+            return
+        for key in [key for key in self._entries if stale(key)]:
+            del self._entries[key]
+
+    def _settle(self, key: Hashable, done: asyncio.Task, keep: Callable[[Any], bool]) -> None:
+        # A failed read is not an answer: the next caller tries again.
+        failed = done.cancelled() or done.exception() is not None
+        if (failed or not keep(done.result())) and self._entries.get(key) is done:
+            del self._entries[key]
+
+
+def current_tick_cache() -> TickCache | None:
+    """The cache of the tick this code runs in, or None outside one."""
+    return _current.get()
+
+
+@asynccontextmanager
+async def tick_cache() -> AsyncIterator[TickCache]:
+    """Serve the API reads made inside the block from one ``TickCache``."""
+    cache = TickCache()
+    token = _current.set(cache)
+    try:
+        yield cache
+    finally:
+        _current.reset(token)
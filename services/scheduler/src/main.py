@@ -35,11 +35,11 @@ CONSUMER_NAME = f"scheduler-{os.getpid()}"
 CONFIG_VALIDATION_RETRY_SECONDS = 2
 
 
-def _validate_configs():
+async def _validate_configs():
     """Validate system configs from DB before starting workers."""
     from .startup import init_config
 
-    init_config()
+    await init_config()
     logger.info("system_configs_validated")
 
 
@@ -47,7 +47,7 @@ async def initialize_configs() -> None:
     """Wait for the system-config API before starting scheduler workers."""
     while True:
         try:
-            _validate_configs()
+            await _validate_configs()
             return
         except ConfigStoreUnavailableError as exc:
             logger.warning(
@@ -3,25 +3,45 @@
 Public API:
     parse_node_exporter(text) -> NodeMetrics
     parse_cadvisor(text) -> list[ContainerMetrics]
+    read_node_exporter(lines) -> NodeMetrics            (lines arriving asynchronously)
+    read_cadvisor(lines) -> list[ContainerMetrics]      (lines arriving asynchronously)
+
+Each parses only the metric families its extractor reads.
 """
 
-from src.metrics.cadvisor import ContainerMetrics, extract_container_metrics
-from src.metrics.node_exporter import NodeMetrics, extract_node_metrics
-from src.metrics.parser import parse_prometheus_text
+from collections.abc import AsyncIterable
+
+from src.metrics.cadvisor import CADVISOR_FAMILIES, ContainerMetrics, extract_container_metrics
+from src.metrics.node_exporter import NODE_EXPORTER_FAMILIES, NodeMetrics, extract_node_metrics
+from src.metrics.parser import aiter_prometheus_metrics, parse_prometheus_text
 
 __all__ = [
     "ContainerMetrics",
     "NodeMetrics",
     "parse_cadvisor",
     "parse_node_exporter",
+    "read_cadvisor",
+    "read_node_exporter",
 ]
 
 
 def parse_node_exporter(text: str) -> NodeMetrics:
     """Parse raw node_exporter /metrics text into structured NodeMetrics."""
-    return extract_node_metrics(parse_prometheus_text(text))
+    return extract_node_metrics(parse_prometheus_text(text, NODE_EXPORTER_FAMILIES))
 
 
 def parse_cadvisor(text: str) -> list[ContainerMetrics]:
     """Parse raw cadvisor /metrics text into per-container metrics."""
-    return extract_container_metrics(parse_prometheus_text(text))
+    return extract_container_metrics(parse_prometheus_text(text, CADVISOR_FAMILIES))
+
+
+async def read_node_exporter(lines: AsyncIterable[str]) -> NodeMetrics:
+    """Parse a node_exporter /metrics body as its lines arrive."""
+    samples = [m async for m in aiter_prometheus_metrics(lines, NODE_EXPORTER_FAMILIES)]
+    return extract_node_metrics(samples)
+
+
+async def read_cadvisor(lines: AsyncIterable[str]) -> list[ContainerMetrics]:
+    """Parse a cadvisor /metrics body as its lines arrive."""
+    samples = [m async for m in aiter_prometheus_metrics(lines, CADVISOR_FAMILIES)]
+    return extract_container_metrics(samples)
@@ -15,6 +15,9 @@ _NET_TX = "container_network_transmit_bytes_total"
 
 _KNOWN_METRICS = {_CPU, _MEM_USAGE, _MEM_LIMIT, _NET_RX, _NET_TX}
 
+# The families extract_container_metrics reads; the parser can drop the rest unparsed.
+CADVISOR_FAMILIES = frozenset(_KNOWN_METRICS)
+
 
 @dataclass(slots=True)
 class ContainerMetrics:
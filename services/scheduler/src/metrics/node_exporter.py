@@ -7,6 +7,23 @@ import time
 
 from src.metrics.parser import PrometheusMetric
 
+# The families extract_node_metrics reads; the parser can drop the rest unparsed.
+NODE_EXPORTER_FAMILIES = frozenset(
+    {
+        "node_cpu_seconds_total",
+        "node_memory_MemTotal_bytes",
+        "node_memory_MemAvailable_bytes",
+        "node_filesystem_size_bytes",
+        "node_filesystem_avail_bytes",
+        "node_load1",
+        "node_load5",
+        "node_load15",
+        "node_boot_time_seconds",
+        "node_network_receive_errs_total",
+        "node_network_transmit_errs_total",
+    }
+)
+
 
 @dataclass(slots=True)
 class NodeMetrics:
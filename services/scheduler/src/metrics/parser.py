@@ -2,10 +2,17 @@
 
 Parses the standard Prometheus /metrics text format into structured Python objects.
 Ref: https://prometheus.io/docs/instrumenting/exposition_formats/
+
+The parser is a generator over lines, so a scrape can be parsed as its body
+arrives (``aiter_prometheus_metrics`` over ``httpx.Response.aiter_lines()``)
+rather than after it has been read whole. Given the metric families a caller
+reads, it drops every other line with one ``str.startswith`` before any regex
+work — most of a cadvisor scrape is families nobody here looks at.
 """
 
 from __future__ import annotations
 
+from collections.abc import AsyncIterable, AsyncIterator, Collection, Iterable, Iterator
 from dataclasses import dataclass, field
 import math
 import re
@@ -49,35 +56,81 @@ def _parse_value(raw: str) -> float:
     return float(raw)
 
 
-def parse_prometheus_text(text: str) -> list[PrometheusMetric]:
-    """Parse Prometheus text exposition format into a list of metrics.
+# Sample-name suffixes of one histogram or summary family.
+_FAMILY_SUFFIXES = ("_bucket", "_sum", "_count")
 
-    Skips comment lines (# HELP, # TYPE) and blank lines.
-    """
-    results: list[PrometheusMetric] = []
-
-    for line in text.splitlines():
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
-
-        match = _METRIC_RE.match(line)
-        if not match:
-            continue
-
-        name = match.group("name")
-        labels = _parse_labels(match.group("labels") or "")
-        value = _parse_value(match.group("value"))
-        ts_raw = match.group("timestamp")
-        timestamp = float(ts_raw) if ts_raw else None
-
-        results.append(
-            PrometheusMetric(
-                name=name,
-                labels=labels,
-                value=value,
-                timestamp=timestamp,
-            )
+
+class _FamilyFilter:
+    """Which lines belong to the wanted families, decided as cheaply as possible."""
+
+    def __init__(self, families: Collection[str] | None) -> None:
+        if families is None:
+            self.prefixes: tuple[str, ...] | None = None
+            self.names: frozenset[str] = frozenset()
+            return
+        # The prefix test keeps every wanted line and a few near misses
+        # (node_load1 also admits node_load15); the exact name test after the
+        # regex drops the misses.
+        self.prefixes = tuple(families)
+        self.names = frozenset(
+            [*families, *(f + suffix for f in families for suffix in _FAMILY_SUFFIXES)]
         )
 
-    return results
+    def admits_line(self, line: str) -> bool:
+        return self.prefixes is None or line.startswith(self.prefixes)
+
+    def admits_name(self, name: str) -> bool:
+        return self.prefixes is None or name in self.names
+
+
+def _parse_line(line: str, wanted: _FamilyFilter) -> PrometheusMetric | None:
+    line = line.strip()
+    if not line or line.startswith("#") or not wanted.admits_line(line):
+        return None
+
+    match = _METRIC_RE.match(line)
+    if not match:
+        return None
+
+    name = match.group("name")
+    if not wanted.admits_name(name):
+        return None
+    ts_raw = match.group("timestamp")
+    return PrometheusMetric(
+        name=name,
+        labels=_parse_labels(match.group("labels") or ""),
+        value=_parse_value(match.group("value")),
+        timestamp=float(ts_raw) if ts_raw else None,
+    )
+
+
+def iter_prometheus_metrics(
+    lines: Iterable[str], families: Collection[str] | None = None
+) -> Iterator[PrometheusMetric]:
+    """Yield the samples of *lines*, only those of *families* when given.
+
+    Skips comment lines (# HELP, # TYPE) and blank lines.
+    """
+    wanted = _FamilyFilter(families)
+    for line in lines:
+        metric = _parse_line(line, wanted)
+        if metric is not None:
+            yield metric
+
+
+async def aiter_prometheus_metrics(
+    lines: AsyncIterable[str], families: Collection[str] | None = None
+) -> AsyncIterator[PrometheusMetric]:
+    """``iter_prometheus_metrics`` over lines that arrive asynchronously."""
+    wanted = _FamilyFilter(families)
+    async for line in lines:
+        metric = _parse_line(line, wanted)
+        if metric is not None:
+            yield metric
+
+
+def parse_prometheus_text(
+    text: str, families: Collection[str] | None = None
+) -> list[PrometheusMetric]:
+    """Parse Prometheus text exposition format into a list of metrics."""
+    return list(iter_prometheus_metrics(text.splitlines(), families))
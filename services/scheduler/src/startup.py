@@ -1,23 +1,28 @@
-"""Scheduler startup: validate system configs and expose ConfigStore.
+"""Scheduler startup: validate system configs and expose the config store.
 
-Call init_config() once at startup before any workers start.
-Other modules import `config` and use `config.get_int(...)`.
+Await init_config() once at startup before any workers start.
+Other modules call `get_config().get_int(...)`: the store holds every key in
+memory and keeps it current in the background, so a read never waits on the
+network.
 """
 
 import os
 
-from shared.config_store import ConfigStore
+from shared.config_store import AsyncConfigStore
 
 # Module-level singleton — initialized by init_config()
-config: ConfigStore | None = None
+config: AsyncConfigStore | None = None
 
 # All config keys required by the scheduler service
 REQUIRED_KEYS = [
     "scheduler.dispatch_interval_seconds",
     "scheduler.github_sync_interval",
     "scheduler.github_sync_missing_threshold",
+    "scheduler.github_sync_concurrency",
+    "scheduler.github_sync_request_budget",
     "scheduler.server_sync_interval",
     "scheduler.server_details_sync_interval",
+    "scheduler.server_details_cache_ttl_seconds",
     "scheduler.provisioning_stuck_timeout_seconds",
     "scheduler.provisioning_trigger_cooldown_seconds",
     "scheduler.scaffold_inflight_ttl",
@@ -49,12 +54,16 @@ REQUIRED_KEYS = [
     "health.consecutive_failure_threshold",
     "health.ssl_expiry_warning_days",
     "health.metrics_retention_hours",
+    "health.metrics_rollup_5m_retention_hours",
+    "health.metrics_rollup_1h_retention_hours",
     "health.metrics_cleanup_interval_seconds",
     "health.http_timeout",
+    "health.check_concurrency",
+    "health.server_check_deadline_seconds",
 ]
 
 
-def get_config() -> ConfigStore:
+def get_config() -> AsyncConfigStore:
     """Return the initialized scheduler configuration store."""
     if config is None:
         raise RuntimeError(
@@ -63,10 +72,11 @@ def get_config() -> ConfigStore:
     return config
 
 
-def init_config() -> ConfigStore:
-    """Initialize ConfigStore and validate all required keys.
+async def init_config() -> AsyncConfigStore:
+    """Load every system config, start keeping it current, and validate the required keys.
 
-    Raises RuntimeError if any required config is missing.
+    Raises ConfigStoreUnavailableError if the API cannot answer, and
+    RuntimeError if any required config is missing.
     Must be called before workers start.
     """
     global config  # noqa: PLW0603
@@ -74,6 +84,12 @@ def init_config() -> ConfigStore:
     if not api_base_url:
         raise RuntimeError("API_BASE_URL is not set")
 
-    config = ConfigStore(api_base_url)
-    config.validate_required(REQUIRED_KEYS)
+    store = AsyncConfigStore(api_base_url)
+    await store.start()
+    try:
+        store.validate_required(REQUIRED_KEYS)
+    except RuntimeError:
+        await store.close()
+        raise
+    config = store
     return config
@@ -0,0 +1,94 @@
+"""Advisory per-story and per-task locks for the dispatcher's concurrent sweeps.
+
+The sweeps of one dispatcher tick run side by side, and several of them look
+at the same stories and tasks from different angles — a story can be both
+``in_progress`` for story completion and overdue for the stuck-story check. A
+sweep walks its entities through ``each_locked``, which holds
+``scheduler:lock:{kind}:{id}`` while the sweep acts on one and skips any entity
+another sweep holds: that sweep is already acting on it, and the next tick
+will look again.
+
+The locks live in Redis rather than in process so a second scheduler, briefly
+alive during a rolling deploy, respects them too. Each is a ``SET NX`` with a
+TTL and a per-holder token; release deletes the key only while it still holds
+that token, so a holder that outlived its TTL cannot free someone else's lock.
+"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Iterable
+from typing import TYPE_CHECKING
+import uuid
+
+import structlog
+
+if TYPE_CHECKING:
+    from shared.redis_client import RedisStreamClient
+
+logger = structlog.get_logger(__name__)
+
+LOCK_KEY_PREFIX = "scheduler:lock"
+
+# Longer than any sweep's budget, so a lock only outlives its holder when the
+# process died holding it.
+DEFAULT_LOCK_TTL_S = 300
+
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def lock_key(kind: str, entity_id: str) -> str:
+    return f"{LOCK_KEY_PREFIX}:{kind}:{entity_id}"
+
+
+async def try_lock(
+    redis_client: RedisStreamClient,
+    kind: str,
+    entity_id: str,
+    *,
+    ttl_s: int = DEFAULT_LOCK_TTL_S,
+) -> str | None:
+    """Take the lock on one entity; its token, or None when someone holds it."""
+    token = uuid.uuid4().hex
+    acquired = await redis_client.redis.set(lock_key(kind, entity_id), token, nx=True, ex=ttl_s)
+    return token if acquired else None
+
+
+async def unlock(redis_client: RedisStreamClient, kind: str, entity_id: str, token: str) -> None:
+    """Release a lock taken by ``try_lock``; a failure leaves it to its TTL."""
+    try:
+        await redis_client.redis.eval(_RELEASE_SCRIPT, 1, lock_key(kind, entity_id), token)
+    except Exception as exc:
+        logger.warning(
+            "entity_lock_release_failed",
+            kind=kind,
+            entity_id=entity_id,
+            error_type=type(exc).__name__,
+        )
+
+
+async def each_locked[T](
+    redis_client: RedisStreamClient,
+    kind: str,
+    entities: Iterable[T],
+    *,
+    sweep: str,
+    ttl_s: int = DEFAULT_LOCK_TTL_S,
+) -> AsyncIterator[T]:
+    """Yield each entity another sweep is not acting on, locked until the next one."""
+    for entity in entities:
+        entity_id = str(entity.id)
+        token = await try_lock(redis_client, kind, entity_id, ttl_s=ttl_s)
+        if token is None:
+            logger.info(
+                "entity_locked_by_another_sweep", kind=kind, entity_id=entity_id, sweep=sweep
+            )
+            continue
+        try:
+            yield entity
+        finally:
+            await unlock(redis_client, kind, entity_id, token)
@@ -1,10 +1,14 @@
 """Analytics aggregator — hourly metrics from Loki, daily rollups, cleanup.
 
-Runs every hour at :05. For each active project:
-1. Query Loki for structured request logs in the last hour
+Runs every hour at :05. For each active project (several at a time):
+1. Ask Loki for the last hour's request counts, errors and top endpoints as
+   metric queries, and page through its latencies and user ids
 2. Compute hourly metrics (requests, errors, users, percentiles, top endpoints)
-3. Upsert into analytics_hourly via API
-4. At midnight UTC: roll up hourly→daily, compute returning users
+   and a latency sketch that later rollups merge
+3. Add the hour's users to the project's HyperLogLogs in Redis (see
+   ``analytics_users``) and upsert into analytics_hourly via API
+4. At midnight UTC: roll up hourly→daily, with DAU/WAU/MAU and returning users
+   from the HyperLogLogs
 5. Cleanup: hourly >90 days, daily >365 days
 """
 
@@ -19,127 +23,103 @@ import time
 import structlog
 
 from shared.analytics_health import ANALYTICS_HEARTBEAT_KEY, encode_heartbeat
-from shared.clients.loki import LokiClient
+from shared.clients.loki import LokiClient, unix_ns
+from shared.latency_sketch import LatencySketch, merge_sketches
+from shared.redis_client import RedisStreamClient
 from src.clients.api import api_client
+from src.tasks.analytics_users import (
+    ActiveUsers,
+    active_users,
+    has_lifetime,
+    record_users,
+    seed_lifetime,
+)
 
 logger = structlog.get_logger()
 
 AGGREGATION_INTERVAL = 3600  # 1 hour
 HOURLY_RETENTION_DAYS = 90
 DAILY_RETENTION_DAYS = 365
-HTTP_SERVER_ERROR_THRESHOLD = 500
 AGGREGATION_MINUTE = 5  # Run at :05 past the hour
+PROJECT_CONCURRENCY = 4  # Projects aggregated side by side
+TOP_ENDPOINTS = 5
+LATENCY_QUANTILES = (("p50_ms", 0.5), ("p95_ms", 0.95), ("p99_ms", 0.99))
 
 
-def compute_hourly_metrics(
-    logs: list[dict],
-    known_user_hashes: set[str],
-) -> dict:
-    """Compute hourly metrics from a list of parsed Loki log entries.
+@dataclass
+class ServiceTraffic:
+    """One service's requests over an hour, as Loki counted them."""
+
+    total_requests: int = 0
+    error_count: int = 0
+    latency: LatencySketch = field(default_factory=LatencySketch)
+    endpoints: Counter[str] = field(default_factory=Counter)
+    user_ids: set[str] = field(default_factory=set)
+
+
+def compute_hourly_metrics(traffic: ServiceTraffic, new_users: int) -> dict:
+    """Compute hourly metrics from one service's traffic.
 
     Args:
-        logs: Parsed log entries with event, status_code, duration_ms, user_id.
-        known_user_hashes: Set of user_id_hash values already seen for this project.
+        traffic: Request and error counts, latency sketch, endpoint counts
+            and user ids of the service, as ``_collect_traffic`` reads them.
+        new_users: How many of its users are new to the project, as
+            ``record_users`` estimated it.
 
     Returns:
-        Dict with metric fields + seen_users list for known_users upsert.
+        Dict with the analytics_hourly metric fields.
     """
-    total_requests = 0
-    error_count = 0
-    durations: list[float] = []
-    user_ids: set[str] = set()
-    endpoint_counter: Counter[str] = Counter()
-
-    for entry in logs:
-        # Only count request events
-        event = entry.get("event")
-        if event != "request":
-            continue
-
-        total_requests += 1
-
-        # Errors: HTTP 5xx or level=error
-        status_code = entry.get("status_code")
-        level = entry.get("level", "")
-        is_server_error = (
-            isinstance(status_code, int) and status_code >= HTTP_SERVER_ERROR_THRESHOLD
-        )
-        if is_server_error or level == "error":
-            error_count += 1
-
-        # Duration
-        duration = entry.get("duration_ms")
-        if isinstance(duration, (int, float)):
-            durations.append(float(duration))
-
-        # Users
-        user_id = entry.get("user_id")
-        if user_id:
-            user_ids.add(str(user_id))
-
-        # Endpoints
-        path = entry.get("path") or entry.get("command")
-        if path:
-            endpoint_counter[path] += 1
-
-    # Percentiles
-    p50 = _percentile(durations, 50)
-    p95 = _percentile(durations, 95)
-    p99 = _percentile(durations, 99)
-
-    # Top endpoints
     top_endpoints = [
-        {"path": path, "count": count} for path, count in endpoint_counter.most_common(5)
+        {"path": path, "count": count}
+        for path, count in traffic.endpoints.most_common(TOP_ENDPOINTS)
     ]
 
-    # New vs known users
-    user_hashes = {_hash_user_id(uid) for uid in user_ids}
-    new_user_hashes = user_hashes - known_user_hashes
-
     return {
-        "total_requests": total_requests,
-        "error_count": error_count,
-        "unique_users": len(user_hashes),
-        "new_users": len(new_user_hashes),
-        "p50_ms": p50,
-        "p95_ms": p95,
-        "p99_ms": p99,
+        "total_requests": traffic.total_requests,
+        "error_count": traffic.error_count,
+        "unique_users": len(traffic.user_ids),
+        "new_users": new_users,
+        **_latency_quantiles(traffic.latency),
+        "latency_sketch": traffic.latency.to_dict(),
         "top_endpoints": top_endpoints,
-        "seen_users": [{"user_id_hash": h} for h in user_hashes],
     }
 
 
-def compute_daily_rollup(hourly_rows: list[dict], known_users: list[dict]) -> dict:
+def _latency_quantiles(sketch: LatencySketch) -> dict[str, float | None]:
+    quantiles = {}
+    for name, q in LATENCY_QUANTILES:
+        value = sketch.quantile(q)
+        quantiles[name] = round(value, 2) if value is not None else None
+    return quantiles
+
+
+def compute_daily_rollup(hourly_rows: list[dict], users: ActiveUsers) -> dict:
     """Compute daily rollup from hourly analytics rows.
 
     Args:
         hourly_rows: List of hourly analytics dicts for the day.
-        known_users: List of known user dicts with first_seen/last_seen.
+        users: Distinct users of the day, week and month, from the project's
+            HyperLogLogs.
 
     Returns:
         Dict with daily metric fields.
     """
     total_requests = sum(r["total_requests"] for r in hourly_rows)
     error_count = sum(r["error_count"] for r in hourly_rows)
+    # A user is new in the first hour it is seen, so hours add up.
     new_users = sum(r["new_users"] for r in hourly_rows)
 
-    # Unique users: count distinct user hashes seen in known_users for the day
-    # (since hourly unique_users can double-count across hours)
-    # We use known_users.last_seen to filter for today
-    unique_users = sum(r["unique_users"] for r in hourly_rows)
-    # Best approximation: MAX of hourly unique_users (lower bound on true daily)
-    # In practice, for small scale this is fine per brainstorm decisions
-    dau = max((r["unique_users"] for r in hourly_rows), default=0)
-
-    # Returning users: users in known_users whose first_seen < today
-    # (they existed before today)
-    returning_users = sum(1 for u in known_users if u.get("first_seen") and u.get("last_seen"))
-    # Subtract new users from total known to get returning
-    returning_users = max(0, len(known_users) - new_users)
+    # Returning users: the day's users who are not new to the project.
+    returning_users = max(0, users.dau - new_users)
 
-    # p95: worst-of-hourly-p95s per brainstorm decision
-    p95_values = [r["p95_ms"] for r in hourly_rows if r.get("p95_ms") is not None]
-    p95 = max(p95_values) if p95_values else None
+    # p95 of the day from the merged hourly sketches. Rows from before
+    # sketches were stored leave only worst-of-hourly-p95s to go on.
+    sketch = merge_sketches(r.get("latency_sketch") for r in hourly_rows)
+    if sketch is not None:
+        p95 = _latency_quantiles(sketch)["p95_ms"]
+    else:
+        p95_values = [r["p95_ms"] for r in hourly_rows if r.get("p95_ms") is not None]
+        p95 = max(p95_values) if p95_values else None
 
     # Error rate
     error_rate = error_count / total_requests if total_requests > 0 else 0.0
@@ -147,27 +127,20 @@ def compute_daily_rollup(hourly_rows: list[dict], known_users: list[dict]) -> di
     return {
         "total_requests": total_requests,
         "error_count": error_count,
-        "unique_users": unique_users,
+        "unique_users": users.dau,
         "new_users": new_users,
-        "dau": dau,
+        "dau": users.dau,
+        "wau": users.wau,
+        "mau": users.mau,
         "returning_users": returning_users,
         "p95_ms": p95,
         "error_rate": round(error_rate, 4),
+        "latency_sketch": sketch.to_dict() if sketch is not None else None,
     }
 
 
-def _percentile(values: list[float], pct: int) -> float | None:
-    """Compute percentile from a sorted list."""
-    if not values:
-        return None
-    sorted_vals = sorted(values)
-    idx = int(len(sorted_vals) * pct / 100)
-    idx = min(idx, len(sorted_vals) - 1)
-    return round(sorted_vals[idx], 2)
-
-
 def _hash_user_id(user_id: str) -> str:
-    """SHA256 hash of user_id for privacy."""
+    """SHA256 hash of user_id for privacy; only hashes reach the HyperLogLogs."""
     return hashlib.sha256(user_id.encode()).hexdigest()
 
 
@@ -179,12 +152,27 @@ class CycleResult:
     failed: set[str] = field(default_factory=set)
 
 
+async def _project_services(apps: list) -> dict[str, set[str]]:
+    """Group application service names by project, through their repositories."""
+    repos = {repo.id: repo for repo in await api_client.get_repositories()}
+    project_services: dict[str, set[str]] = {}
+    for app in apps:
+        repo = repos.get(app.repo_id)
+        if repo is None:
+            continue
+        # DTO carries a UUID; everything downstream (LogQL labels, JSON
+        # payloads, heartbeat) works with the string form.
+        project_services.setdefault(str(repo.project_id), set()).add(app.service_name)
+    return project_services
+
+
 async def _aggregate_hourly(
     loki: LokiClient,
+    redis_client: RedisStreamClient,
     bucket_start: datetime,
     bucket_end: datetime,
 ) -> CycleResult:
-    """Run hourly aggregation for all active projects."""
+    """Run hourly aggregation for all active projects, PROJECT_CONCURRENCY at a time."""
     result = CycleResult()
 
     # Get projects that have running applications
@@ -193,65 +181,150 @@ async def _aggregate_hourly(
         logger.info("analytics_no_active_apps")
         return result
 
-    # Group applications by project_id (via repo → project chain)
-    # We need project_id for each app; get it from repositories
-    project_services: dict[str, set[str]] = {}
-    for app in apps:
-        repo = await api_client.get_repositories()
-        matching = [r for r in repo if r.id == app.repo_id]
-        if not matching:
-            continue
-        # DTO carries a UUID; everything downstream (LogQL labels, JSON
-        # payloads, heartbeat) works with the string form.
-        pid = str(matching[0].project_id)
-        if pid not in project_services:
-            project_services[pid] = set()
-        project_services[pid].add(app.service_name)
+    project_services = await _project_services(apps)
+    result.attempted.update(project_services)
+    semaphore = asyncio.Semaphore(PROJECT_CONCURRENCY)
 
-    for project_id, services in project_services.items():
-        result.attempted.add(project_id)
-        try:
-            await _aggregate_project_hourly(loki, project_id, services, bucket_start, bucket_end)
-        except Exception:
-            result.failed.add(project_id)
-            logger.exception(
-                "analytics_project_error",
-                project_id=project_id,
-            )
+    async def aggregate(project_id: str, services: set[str]) -> None:
+        async with semaphore:
+            try:
+                await _aggregate_project_hourly(
+                    loki, redis_client, project_id, services, bucket_start, bucket_end
+                )
+            except Exception:
+                result.failed.add(project_id)
+                logger.exception(
+                    "analytics_project_error",
+                    project_id=project_id,
+                )
 
+    await asyncio.gather(*(aggregate(pid, services) for pid, services in project_services.items()))
     return result
 
 
+async def _collect_traffic(
+    loki: LokiClient,
+    project_id: str,
+    services: set[str],
+    bucket_start: datetime,
+    bucket_end: datetime,
+) -> dict[str, ServiceTraffic]:
+    """Read one project's hour of requests from Loki, per service.
+
+    Counts, error counts and top endpoints are metric queries Loki evaluates
+    itself, so only their per-service results cross the wire. Latencies and
+    users are what Loki cannot reduce for us: the latency sketch needs every
+    duration (Loki's own quantiles do not merge into daily ones) and the
+    project's user HyperLogLogs need the ids, not a count. Both are paged through together as bare
+    ``"<duration_ms> <user_id>"`` lines and folded in as they arrive.
+    """
+    # Service names are compose service names, which carry no regex syntax.
+    selector = (
+        f'{{job="docker", project_id="{project_id}", '
+        f'compose_service=~"{"|".join(sorted(services))}"}} | json | event="request"'
+    )
+    window = f"[{int((bucket_end - bucket_start).total_seconds())}s]"
+    # Metric queries cover (time - range, time]; one nanosecond back makes
+    # that exactly the bucket [start, end).
+    at = unix_ns(bucket_end) - 1
+    by = "compose_service"
+
+    def counts(pipeline: str = "") -> str:
+        return f"sum by ({by}) (count_over_time({selector}{pipeline} {window}))"
+
+    def top(label: str, pipeline: str) -> str:
+        return (
+            f"topk({TOP_ENDPOINTS}, sum by ({by}, {label}) "
+            f"(count_over_time({selector}{pipeline} {window}))) by ({by})"
+        )
+
+    queries = {
+        "requests": counts(),
+        "errors": counts(' | status_code=~"5.." or level="error"'),
+        "paths": top("path", ' | path!=""'),
+        "commands": top("command", ' | path="" | command!=""'),
+    }
+
+    traffic: dict[str, ServiceTraffic] = {name: ServiceTraffic() for name in services}
+
+    async def read_requests() -> None:
+        lines = loki.iter_range(
+            f'{selector} | line_format "{{{{.duration_ms}}}} {{{{.user_id}}}}"',
+            bucket_start,
+            bucket_end,
+        )
+        async for entry in lines:
+            service = traffic.get(entry["_labels"].get(by, ""))
+            if service is None:
+                continue
+            # A duration never holds a space; a user id might.
+            duration, _, user_id = str(entry.get("raw", "")).partition(" ")
+            try:
+                service.latency.add(float(duration))
+            except ValueError:
+                pass
+            if user_id:
+                service.user_ids.add(user_id)
+
+    *results, _ = await asyncio.gather(
+        *(loki.query_metric(query, at) for query in queries.values()),
+        read_requests(),
+    )
+
+    for name, series in zip(queries, results, strict=True):
+        for labels, value in series:
+            service = traffic.get(labels.get(by, ""))
+            if service is None:
+                continue
+            if name == "requests":
+                service.total_requests = int(value)
+            elif name == "errors":
+                service.error_count = int(value)
+            elif name == "paths":
+                service.endpoints[labels["path"]] += int(value)
+            elif name == "commands":
+                service.endpoints[labels["command"]] += int(value)
+    return traffic
+
+
+async def _ensure_lifetime_seeded(redis_client: RedisStreamClient, project_id: str) -> None:
+    """Seed the project's lifetime users from the API's known users, once."""
+    if await has_lifetime(redis_client, project_id):
+        return
+    known_users = await api_client.get_known_users(project_id)
+    await seed_lifetime(redis_client, project_id, (u["user_id_hash"] for u in known_users))
+
+
 async def _aggregate_project_hourly(
     loki: LokiClient,
+    redis_client: RedisStreamClient,
     project_id: str,
     services: set[str],
     bucket_start: datetime,
     bucket_end: datetime,
 ):
     """Aggregate hourly metrics for one project."""
-    # Get known users for this project
-    known_users_raw = await api_client.get_known_users(project_id)
-    known_user_hashes = {u["user_id_hash"] for u in known_users_raw}
-
-    for service_name in services:
-        query = (
-            f'{{job="docker", project_id="{project_id}", compose_service="{service_name}"}} | json'
+    traffic, _ = await asyncio.gather(
+        _collect_traffic(loki, project_id, services, bucket_start, bucket_end),
+        _ensure_lifetime_seeded(redis_client, project_id),
+    )
+    active = {name: t for name, t in traffic.items() if t.total_requests}
+    for service_name in sorted(services - active.keys()):
+        logger.debug(
+            "analytics_no_logs",
+            project_id=project_id,
+            service=service_name,
         )
-        logs = await loki.query_range(query, bucket_start, bucket_end)
 
-        if not logs:
-            logger.debug(
-                "analytics_no_logs",
-                project_id=project_id,
-                service=service_name,
-            )
-            continue
-
-        metrics = compute_hourly_metrics(logs, known_user_hashes)
-        seen_users = metrics.pop("seen_users")
+    new_users = await record_users(
+        redis_client,
+        project_id,
+        bucket_start.date(),
+        {name: {_hash_user_id(u) for u in t.user_ids} for name, t in active.items()},
+    )
 
-        # Upsert hourly row
+    for service_name in sorted(active):
+        metrics = compute_hourly_metrics(active[service_name], new_users[service_name])
         await api_client.upsert_analytics_hourly(
             {
                 "project_id": project_id,
@@ -261,22 +334,6 @@ async def _aggregate_project_hourly(
             }
         )
 
-        # Update known users
-        if seen_users:
-            now_iso = bucket_end.isoformat()
-            users_payload = [
-                {
-                    "user_id_hash": u["user_id_hash"],
-                    "first_seen": now_iso,
-                    "last_seen": now_iso,
-                }
-                for u in seen_users
-            ]
-            await api_client.upsert_known_users(project_id, users_payload)
-
-            # Update known set for next service
-            known_user_hashes.update(u["user_id_hash"] for u in seen_users)
-
     logger.info(
         "analytics_project_done",
         project_id=project_id,
@@ -284,7 +341,7 @@ async def _aggregate_project_hourly(
     )
 
 
-async def _run_daily_rollup(yesterday: datetime) -> set[str]:
+async def _run_daily_rollup(redis_client: RedisStreamClient, yesterday: datetime) -> set[str]:
     """Roll up hourly data into daily for yesterday. Returns failed project ids."""
     yesterday_date = yesterday.date().isoformat()
     today_start = yesterday.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
@@ -292,12 +349,7 @@ async def _run_daily_rollup(yesterday: datetime) -> set[str]:
 
     # Get all projects that have hourly data for yesterday
     apps = await api_client.get_applications(status="running")
-    project_ids: set[str] = set()
-    for app in apps:
-        repos = await api_client.get_repositories()
-        matching = [r for r in repos if r.id == app.repo_id]
-        if matching:
-            project_ids.add(str(matching[0].project_id))
+    project_ids = set(await _project_services(apps))
 
     failed: set[str] = set()
     for project_id in project_ids:
@@ -310,8 +362,8 @@ async def _run_daily_rollup(yesterday: datetime) -> set[str]:
             if not hourly_rows:
                 continue
 
-            known_users = await api_client.get_known_users(project_id)
-            daily = compute_daily_rollup(hourly_rows, known_users)
+            users = await active_users(redis_client, project_id, yesterday.date())
+            daily = compute_daily_rollup(hourly_rows, users)
 
             await api_client.upsert_analytics_daily(
                 {
@@ -373,6 +425,8 @@ async def analytics_aggregator_worker():
     logger.info("analytics_aggregator_worker_started")
 
     loki = LokiClient()
+    redis_client = RedisStreamClient()
+    await redis_client.connect()
 
     try:
         while True:
@@ -404,12 +458,12 @@ async def analytics_aggregator_worker():
             )
 
             try:
-                cycle = await _aggregate_hourly(loki, bucket_start, bucket_end)
+                cycle = await _aggregate_hourly(loki, redis_client, bucket_start, bucket_end)
 
                 # Daily rollup at midnight UTC (when current hour is 0)
                 if now.hour == 0:
                     yesterday = now - timedelta(days=1)
-                    cycle.failed |= await _run_daily_rollup(yesterday)
+                    cycle.failed |= await _run_daily_rollup(redis_client, yesterday)
                     await _cleanup()
 
                 if cycle.failed:
@@ -429,3 +483,4 @@ async def analytics_aggregator_worker():
             logger.info("analytics_cycle_complete", duration_sec=round(duration, 2))
     finally:
         await loki.close()
+        await redis_client.close()
@@ -2,12 +2,19 @@
 
 Probes each deployed application's health endpoint, tracks response times,
 consecutive failures (→ SERVICE_DOWN incidents), and SSL cert expiry
-(→ SSL_EXPIRING incidents). Stores history for uptime calculation.
+(→ SSL_EXPIRING incidents). Stores history for the dashboards.
+
+Applications are probed concurrently, at most ``health.check_concurrency`` at a
+time. Failure streaks and 24h uptime come from counters in Redis
+(``app_uptime``), so a cycle reads nothing from the API per application and
+survives a restart with its streaks intact.
 """
 
 from __future__ import annotations
 
+import asyncio
 from datetime import UTC, datetime
+from typing import TYPE_CHECKING
 
 import structlog
 
@@ -15,11 +22,14 @@ from shared.clients.infra_client import check_http_health
 from shared.contracts.dto.application import ApplicationStatus
 from shared.models.incident import IncidentType
 from shared.notifications import notify_admins_best_effort
-from src.clients.api import api_client
+from src.tasks.app_uptime import consecutive_failures as stored_failures, record_probe
 from src.tasks.ssl_checker import check_ssl_expiry
 
 from .. import startup
 
+if TYPE_CHECKING:
+    from shared.redis_client import RedisStreamClient
+
 logger = structlog.get_logger()
 
 
@@ -31,8 +41,8 @@ def _ssl_expiry_warning_days() -> int:
     return startup.get_config().get_int("health.ssl_expiry_warning_days")
 
 
-# In-memory state for consecutive failure tracking (reset on worker restart)
-_consecutive_failures: dict[int, int] = {}
+def _probe_concurrency() -> int:
+    return startup.get_config().get_int("health.check_concurrency")
 
 
 async def check_application(
@@ -40,10 +50,12 @@ async def check_application(
     server_ip: str,
     consecutive_failures: int,
     api_client: object,
+    redis_client: RedisStreamClient,
 ) -> int:
     """Check a single application's health.
 
-    Returns updated consecutive failure count.
+    Returns updated consecutive failure count, which is also stored with the
+    probe's uptime counters.
     """
     app_id = app.id
     ports = app.ports
@@ -63,6 +75,11 @@ async def check_application(
     ssl_expiry = await check_ssl_expiry(server_ip, port)
 
     now = datetime.now(UTC)
+    previous_failures = consecutive_failures
+    consecutive_failures = 0 if healthy else consecutive_failures + 1
+    uptime_pct = await record_probe(
+        redis_client, app_id, healthy=healthy, failures=consecutive_failures
+    )
 
     if healthy:
         # Update application as running
@@ -70,6 +87,7 @@ async def check_application(
             "status": ApplicationStatus.RUNNING.value,
             "response_time_ms": health.get("response_time_ms"),
             "last_health_check": now.isoformat(),
+            "uptime_pct_24h": uptime_pct,
         }
         if ssl_expiry:
             fields["ssl_expires_at"] = ssl_expiry.isoformat()
@@ -77,7 +95,7 @@ async def check_application(
         await api_client.update_application(app_id, fields)
 
         # Auto-resolve SERVICE_DOWN incidents on recovery
-        if consecutive_failures > 0:
+        if previous_failures > 0:
             active = await api_client.get_active_incidents(
                 app.server_handle, IncidentType.SERVICE_DOWN
             )
@@ -93,14 +111,12 @@ async def check_application(
                 )
 
         log.debug("app_health_ok", response_time_ms=health.get("response_time_ms"))
-        consecutive_failures = 0
     else:
-        consecutive_failures += 1
-
         # Update application status to DOWN
         fields = {
             "status": ApplicationStatus.DOWN.value,
             "last_health_check": now.isoformat(),
+            "uptime_pct_24h": uptime_pct,
         }
         await api_client.update_application(app_id, fields)
 
@@ -178,13 +194,11 @@ async def check_application(
     return consecutive_failures
 
 
-async def app_health_probe_cycle(client: object | None = None) -> None:
+async def app_health_probe_cycle(client: object, redis_client: RedisStreamClient) -> None:
     """Run one full cycle of application health probing.
 
-    Fetches all deployed applications, groups by server, probes each.
+    Fetches all deployed applications and probes them side by side.
     """
-    client = client or api_client
-
     # Get all applications (exclude not_deployed)
     apps = await client.get_applications()
     deployed_apps = [a for a in apps if a.status != ApplicationStatus.NOT_DEPLOYED.value]
@@ -196,63 +210,38 @@ async def app_health_probe_cycle(client: object | None = None) -> None:
     servers = await client.get_servers()
     server_ips = {s.handle: s.public_ip for s in servers}
 
+    probes = []
     for app in deployed_apps:
-        app_id = app.id
-        server_handle = app.server_handle
-        server_ip = server_ips.get(server_handle)
-
+        server_ip = server_ips.get(app.server_handle)
         if not server_ip:
-            logger.warning("app_prober_no_server_ip", app_id=app_id, server_handle=server_handle)
+            logger.warning(
+                "app_prober_no_server_ip", app_id=app.id, server_handle=app.server_handle
+            )
             continue
-
-        ports = app.ports
-        if not ports:
-            logger.debug("app_prober_no_ports", app_id=app_id, service=app.service_name)
+        if not app.ports:
+            logger.debug("app_prober_no_ports", app_id=app.id, service=app.service_name)
             continue
+        probes.append((app, server_ip))
+
+    failures = await stored_failures(redis_client, [app.id for app, _ in probes])
+    semaphore = asyncio.Semaphore(_probe_concurrency())
+
+    async def probe(app, server_ip: str) -> None:
+        async with semaphore:
+            try:
+                await check_application(
+                    app=app,
+                    server_ip=server_ip,
+                    consecutive_failures=failures.get(app.id, 0),
+                    api_client=client,
+                    redis_client=redis_client,
+                )
+            except Exception:
+                logger.error(
+                    "app_health_check_error",
+                    app_id=app.id,
+                    service=app.service_name,
+                    exc_info=True,
+                )
 
-        prev_failures = _consecutive_failures.get(app_id, 0)
-        try:
-            new_failures = await check_application(
-                app=app,
-                server_ip=server_ip,
-                consecutive_failures=prev_failures,
-                api_client=client,
-            )
-            _consecutive_failures[app_id] = new_failures
-        except Exception:
-            logger.error(
-                "app_health_check_error",
-                app_id=app_id,
-                service=app.service_name,
-                exc_info=True,
-            )
-
-    # Compute uptime_pct_24h for each probed app
-    for app in deployed_apps:
-        app_id = app.id
-        try:
-            await _update_uptime(app_id, client)
-        except Exception:
-            logger.debug("uptime_calc_error", app_id=app_id, exc_info=True)
-
-
-async def _update_uptime(app_id: int, client: object) -> None:
-    """Calculate and update 24h uptime percentage from health history."""
-    # The API returns history for last N hours
-    # We need to fetch and compute: healthy_count / total_count * 100
-    try:
-        resp = await client.request(
-            "GET", f"applications/{app_id}/health-history", params={"hours": 24}
-        )
-        history = resp.json()
-    except Exception:
-        return
-
-    if not history:
-        return
-
-    total = len(history)
-    healthy_count = sum(1 for h in history if h.get("metrics", {}).get("healthy"))
-    uptime_pct = round((healthy_count / total) * 100, 2)
-
-    await client.update_application(app_id, {"uptime_pct_24h": uptime_pct})
+    await asyncio.gather(*(probe(app, server_ip) for app, server_ip in probes))
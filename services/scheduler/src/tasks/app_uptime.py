@@ -0,0 +1,93 @@
+"""Rolling uptime and failure streaks of the application probes, kept in Redis.
+
+``uptime_pct_24h`` used to be recomputed every cycle from the last 24 hours of
+probe history: one API read per application, each returning every probe of the
+window. Each probe now increments a counter of its five-minute bucket instead —
+``n:{bucket}`` probes and ``ok:{bucket}`` healthy ones, fields of one hash per
+application. Recording a probe and reading the window back is one pipelined
+round trip whose size is bounded by the number of buckets (288), however often
+the application is probed. Buckets that fall out of the window are deleted when
+they are next seen, and the hash expires a window after its last probe, so a
+removed application leaves nothing behind.
+
+The consecutive-failure count sits next to it, so a scheduler restart no longer
+forgets that an application has already failed twice.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+import time
+from typing import TYPE_CHECKING
+
+from shared.redis import decode_redis_fields
+
+if TYPE_CHECKING:
+    from shared.redis_client import RedisStreamClient
+
+KEY_PREFIX = "scheduler:app_health"
+
+UPTIME_WINDOW_SECONDS = 24 * 3600
+UPTIME_BUCKET_SECONDS = 300
+_WINDOW_BUCKETS = UPTIME_WINDOW_SECONDS // UPTIME_BUCKET_SECONDS
+
+
+def uptime_key(app_id: int) -> str:
+    return f"{KEY_PREFIX}:{app_id}:uptime"
+
+
+def failures_key(app_id: int) -> str:
+    return f"{KEY_PREFIX}:{app_id}:failures"
+
+
+async def consecutive_failures(
+    redis_client: RedisStreamClient, app_ids: Sequence[int]
+) -> dict[int, int]:
+    """The failure streak of each application, in one read; absent means none."""
+    if not app_ids:
+        return {}
+    values = await redis_client.redis.mget([failures_key(app_id) for app_id in app_ids])
+    return {
+        app_id: int(value)
+        for app_id, value in zip(app_ids, values, strict=True)
+        if value is not None
+    }
+
+
+async def record_probe(
+    redis_client: RedisStreamClient,
+    app_id: int,
+    *,
+    healthy: bool,
+    failures: int,
+    now: float | None = None,
+) -> float:
+    """Count one probe and store the failure streak; the uptime % of the window."""
+    bucket = int((time.time() if now is None else now) // UPTIME_BUCKET_SECONDS)
+    key = uptime_key(app_id)
+
+    pipe = redis_client.redis.pipeline(transaction=False)
+    pipe.hincrby(key, f"n:{bucket}", 1)
+    if healthy:
+        pipe.hincrby(key, f"ok:{bucket}", 1)
+    pipe.expire(key, UPTIME_WINDOW_SECONDS + UPTIME_BUCKET_SECONDS)
+    pipe.set(failures_key(app_id), failures, ex=UPTIME_WINDOW_SECONDS)
+    pipe.hgetall(key)
+    *_, fields = await pipe.execute()
+
+    oldest = bucket - _WINDOW_BUCKETS + 1
+    probes = healthy_probes = 0
+    stale = []
+    for field, count in decode_redis_fields(fields).items():
+        kind, _, field_bucket = field.partition(":")
+        if int(field_bucket) < oldest:
+            stale.append(field)
+        elif kind == "n":
+            probes += int(count)
+        else:
+            healthy_probes += int(count)
+    if stale:
+        await redis_client.redis.hdel(key, *stale)
+
+    # Never zero: this probe was counted above.
+    return round(healthy_probes / probes * 100, 2)
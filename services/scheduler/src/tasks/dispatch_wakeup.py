@@ -0,0 +1,135 @@
+"""Wake the task dispatcher when the pipeline moves, not on its next tick.
+
+``task_dispatcher_loop`` used to find out about a task that became TODO, a
+task that finished or a run that ended only by polling, so every hop of a
+story waited on average half a ``scheduler.dispatch_interval_seconds`` tick
+before anyone looked. The API already announces every committed task, story
+and run transition on ``state:changes`` (``services/api/src/state_events.py``);
+``follow_state_changes`` tails that stream and wakes the dispatcher for the
+transitions dispatch and story completion act on.
+
+A wake-up is a hint, never a work item. It carries no entity: the woken pass
+reads the pipeline the way a tick does, so however many triggers arrive
+before it runs they cost one pass, and a trigger lost while Redis was away
+costs latency only — the periodic sweep still runs every interval and picks
+up whatever the events missed. When the listener re-attaches after a failure
+it wakes the dispatcher once, since transitions may have passed unseen.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import structlog
+
+from shared.contracts.dto.run import RunStatus
+from shared.contracts.dto.story import StoryStatus
+from shared.contracts.dto.task import TaskStatus
+from shared.contracts.queues.state_change import StateChangeEvent
+from shared.queues import STATE_CHANGES_STREAM
+from shared.redis import RedisStreamClient, decode_redis_value
+from shared.redis.codec import PayloadDecodeError, decode_fields
+
+logger = structlog.get_logger(__name__)
+
+# Entries asked for per XREAD while following the stream.
+_READ_COUNT = 500
+
+# The transitions after which a dispatch or story-completion pass can find new
+# work: a task became dispatchable or unblocked its dependants (or finished its
+# story), a run ended, or a story (re-)entered development.
+_TRIGGERS: dict[str, frozenset[str]] = {
+    "task": frozenset({TaskStatus.TODO, TaskStatus.DONE}),
+    "run": frozenset({RunStatus.COMPLETED, RunStatus.FAILED, RunStatus.CANCELLED}),
+    "story": frozenset({StoryStatus.IN_PROGRESS, StoryStatus.REOPENED}),
+}
+
+
+def wakes_dispatcher(event: StateChangeEvent) -> bool:
+    """Whether *event* can have made work for the dispatcher."""
+    return event.status in _TRIGGERS.get(event.entity, ())
+
+
+class DispatchWakeup:
+    """Coalesces dispatch triggers into at most one pending wake-up."""
+
+    def __init__(self) -> None:
+        self._event = asyncio.Event()
+        self._triggers = 0
+        self._oldest_id: str | None = None
+
+    def notify(self, entry_id: str | None = None) -> None:
+        """Record a trigger; the first since the last ``take`` sets the wake-up."""
+        if self._triggers == 0:
+            self._oldest_id = entry_id
+        self._triggers += 1
+        self._event.set()
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait up to *timeout* seconds for a trigger; True if one is pending."""
+        if self._event.is_set():
+            return True
+        try:
+            await asyncio.wait_for(self._event.wait(), timeout)
+        except TimeoutError:
+            return False
+        return True
+
+    def take(self) -> tuple[int, str | None]:
+        """Clear the wake-up: how many triggers it held, and the oldest's entry id."""
+        taken = (self._triggers, self._oldest_id)
+        self._event.clear()
+        self._triggers = 0
+        self._oldest_id = None
+        return taken
+
+
+async def follow_state_changes(
+    redis: RedisStreamClient,
+    wakeup: DispatchWakeup,
+    *,
+    stream: str = STATE_CHANGES_STREAM,
+    block_ms: int = 5000,
+    retry_delay_s: float = 1.0,
+) -> None:
+    """Wake *wakeup* on every dispatch trigger announced, until cancelled.
+
+    Attaches at the stream's current end, like every ``state:changes`` reader:
+    what was announced before is the periodic sweep's to find.
+    """
+    attached_before = False
+    while True:
+        try:
+            newest = await redis.redis.xrevrange(stream, count=1)
+            last_id = decode_redis_value(newest[0][0]) if newest else "0-0"
+            if attached_before:
+                wakeup.notify()
+            attached_before = True
+            logger.info("dispatch_wakeup_attached", stream=stream, from_id=last_id)
+            while True:
+                response = await redis.redis.xread(
+                    {stream: last_id}, count=_READ_COUNT, block=block_ms
+                )
+                for _stream, entries in response or []:
+                    for message_id, fields in entries:
+                        last_id = decode_redis_value(message_id)
+                        _apply_fields(wakeup, last_id, fields)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.warning(
+                "dispatch_wakeup_detached",
+                stream=stream,
+                error_type=type(exc).__name__,
+            )
+            await asyncio.sleep(retry_delay_s)
+
+
+def _apply_fields(wakeup: DispatchWakeup, entry_id: str, fields: dict) -> None:
+    try:
+        event = StateChangeEvent.model_validate(decode_fields(fields))
+    except (ValueError, PayloadDecodeError):
+        logger.warning("state_change_unreadable", entry_id=entry_id, fields=sorted(fields))
+        return
+    if wakes_dispatcher(event):
+        wakeup.notify(entry_id)
@@ -1,6 +1,22 @@
-"""GitHub sync worker - syncs projects and their status from GitHub."""
+"""GitHub sync worker - syncs projects and their status from GitHub.
+
+A cycle lists the organization's repositories once and syncs them side by
+side, at most ``scheduler.github_sync_concurrency`` at a time. The listing
+carries each repository's ``pushed_at``, so a repository nobody pushed to
+since its last completed sync costs no further GitHub request. One that moved
+has its spec and README fetched; the project is updated and the documents
+sent to RAG only when their content hash differs from the last sync's.
+
+File fetches share a budget of ``scheduler.github_sync_request_budget`` GitHub
+requests per cycle. Repositories past it are left for the next cycle, so a
+burst of pushes is spread out instead of draining the installation's hourly
+rate limit. Sync state is kept in memory: after a restart the first cycle
+fetches every repository once, and RAG deduplicates the unchanged documents.
+"""
 
 import asyncio
+from dataclasses import dataclass
+from datetime import datetime
 import hashlib
 import hmac
 import json
@@ -25,6 +41,34 @@ from .. import startup
 
 logger = structlog.get_logger()
 
+# Synced files per repository, and GitHub requests per file: the installation
+# lookup behind ``get_token`` plus the contents request.
+_DOCS_PATHS = (".project-spec.yaml", "README.md")
+_DOCS_SYNC_REQUESTS = len(_DOCS_PATHS) * 2
+
+
+@dataclass(frozen=True)
+class RepoSyncState:
+    """What the last completed docs sync of a repository saw."""
+
+    pushed_at: datetime | None
+    docs_hash: str
+
+
+class _RequestBudget:
+    """GitHub requests a cycle may still spend on file fetches."""
+
+    def __init__(self, requests: int):
+        self.remaining = requests
+        self.deferred = 0
+
+    def take(self, requests: int) -> bool:
+        if requests > self.remaining:
+            self.deferred += 1
+            return False
+        self.remaining -= requests
+        return True
+
 
 def _sync_interval() -> int:
     return startup.get_config().get_int("scheduler.github_sync_interval")
@@ -34,15 +78,24 @@ def _missing_threshold() -> int:
     return startup.get_config().get_int("scheduler.github_sync_missing_threshold")
 
 
+def _sync_concurrency() -> int:
+    return startup.get_config().get_int("scheduler.github_sync_concurrency")
+
+
+def _request_budget() -> int:
+    return startup.get_config().get_int("scheduler.github_sync_request_budget")
+
+
 async def _ingest_to_rag(
     project_id: str,
     repo_full_name: str,
     documents: list[dict],
-) -> None:
+) -> bool:
     """Send documents to RAG ingest API (best-effort, non-blocking).
 
     Documents are indexed with hash-based deduplication - unchanged
-    content will be skipped by the API automatically.
+    content will be skipped by the API automatically. Returns False when
+    the request failed and is worth retrying.
     """
     settings = get_settings()
     secret = os.getenv("RAG_INGEST_SECRET")
@@ -54,10 +107,10 @@ async def _ingest_to_rag(
             has_api_url=bool(settings.api_base_url),
             has_secret=bool(secret),
         )
-        return
+        return True
 
     if not documents:
-        return
+        return True
 
     # Build payload
     payload = {
@@ -89,6 +142,7 @@ async def _ingest_to_rag(
             docs_indexed=result.get("documents_indexed", 0),
             docs_skipped=result.get("documents_skipped", 0),
         )
+        return True
     except httpx.HTTPStatusError as exc:
         logger.warning(
             "rag_ingest_http_error",
@@ -105,6 +159,7 @@ async def _ingest_to_rag(
             error=str(exc),
             error_type=type(exc).__name__,
         )
+    return False
 
 
 def _hash_content(content: str) -> str:
@@ -117,101 +172,136 @@ async def _sync_project_docs(
     github_client: GitHubAppClient,
     project: ProjectDTO,
     r: GitHubRepository,
-) -> None:
-    """Sync project spec and README to RAG index."""
-    rag_documents: list[dict] = []
+    last_hash: str | None = None,
+) -> str | None:
+    """Sync project spec and README to RAG index.
+
+    Returns the hash of the fetched files, which skips the project update and
+    RAG ingest while it matches *last_hash*; None when a fetch or write failed
+    and the repository should be synced again next cycle.
+    """
     owner, repo = r.full_name.split("/")
 
-    # Sync project spec from .project-spec.yaml
     try:
-        spec_content = await github_client.get_file_contents(owner, repo, ".project-spec.yaml")
-        if spec_content:
-            spec_dict = yaml.safe_load(spec_content)
-            spec_model = ProjectSpecYAML(**spec_dict)
-
-            # Update project spec via API
-            await api_client.update_project(
-                project.id, ProjectUpdate(project_spec=spec_model.to_yaml_dict())
-            )
-
-            logger.info(
-                "project_spec_synced",
-                project_name=project.title,
-                spec_version=spec_dict.get("version", "unknown"),
-            )
-            rag_documents.append(
-                {
-                    "source_type": "project_spec",
-                    "source_id": ".project-spec.yaml",
-                    "source_uri": f"repo://{r.full_name}/.project-spec.yaml",
-                    "scope": "public",
-                    "path": ".project-spec.yaml",
-                    "title": f"{project.title} Project Spec",
-                    "content": spec_content,
-                    "content_hash": _hash_content(spec_content),
-                }
-            )
-    except ValidationError as e:
-        logger.error(
-            "project_spec_validation_failed",
-            project_name=project.title,
-            error=str(e),
-        )
-        await notify_admins_best_effort(
-            f"⚠️ Invalid Specification for *{project.title}*\n"
-            f"The `.project-spec.yaml` file is invalid:\n"
-            f"```\n{str(e)[:1000]}\n```",
-            level="warning",
-            component="github_sync",
-            project_id=str(project.id),
-        )
+        spec_content, readme_content = [
+            await github_client.get_file_contents(owner, repo, path) for path in _DOCS_PATHS
+        ]
     except Exception as e:
         logger.debug(
-            "project_spec_sync_skipped",
+            "project_docs_fetch_failed",
             project_name=project.title,
             error=str(e),
             error_type=type(e).__name__,
         )
+        return None
 
-    # Fetch README.md for RAG
-    try:
-        readme_content = await github_client.get_file_contents(owner, repo, "README.md")
-        if readme_content:
-            rag_documents.append(
-                {
-                    "source_type": "readme",
-                    "source_id": "README.md",
-                    "source_uri": f"repo://{r.full_name}/README.md",
-                    "scope": "public",
-                    "path": "README.md",
-                    "title": f"{project.title} README",
-                    "content": readme_content,
-                    "content_hash": _hash_content(readme_content),
-                }
+    docs_hash = _hash_content(f"{spec_content or ''}\0{readme_content or ''}")
+    if docs_hash == last_hash:
+        logger.debug("project_docs_unchanged", project_name=project.title, repo=r.full_name)
+        return docs_hash
+
+    rag_documents: list[dict] = []
+    complete = True
+
+    # Sync project spec from .project-spec.yaml
+    if spec_content:
+        try:
+            spec_dict = yaml.safe_load(spec_content)
+            spec_model = ProjectSpecYAML(**spec_dict)
+        except ValidationError as e:
+            # An invalid spec stays invalid until the next push: reported once.
+            logger.error(
+                "project_spec_validation_failed",
+                project_name=project.title,
+                error=str(e),
             )
-    except Exception as e:
-        logger.debug(
-            "readme_fetch_skipped",
-            project_name=project.title,
-            error=str(e),
-            error_type=type(e).__name__,
+            await notify_admins_best_effort(
+                f"⚠️ Invalid Specification for *{project.title}*\n"
+                f"The `.project-spec.yaml` file is invalid:\n"
+                f"```\n{str(e)[:1000]}\n```",
+                level="warning",
+                component="github_sync",
+                project_id=str(project.id),
+            )
+        except (yaml.YAMLError, TypeError) as e:
+            logger.debug(
+                "project_spec_sync_skipped",
+                project_name=project.title,
+                error=str(e),
+                error_type=type(e).__name__,
+            )
+        else:
+            try:
+                # Update project spec via API
+                await api_client.update_project(
+                    project.id, ProjectUpdate(project_spec=spec_model.to_yaml_dict())
+                )
+            except Exception as e:
+                complete = False
+                logger.debug(
+                    "project_spec_sync_skipped",
+                    project_name=project.title,
+                    error=str(e),
+                    error_type=type(e).__name__,
+                )
+            else:
+                logger.info(
+                    "project_spec_synced",
+                    project_name=project.title,
+                    spec_version=spec_dict.get("version", "unknown"),
+                )
+                rag_documents.append(
+                    {
+                        "source_type": "project_spec",
+                        "source_id": ".project-spec.yaml",
+                        "source_uri": f"repo://{r.full_name}/.project-spec.yaml",
+                        "scope": "public",
+                        "path": ".project-spec.yaml",
+                        "title": f"{project.title} Project Spec",
+                        "content": spec_content,
+                        "content_hash": _hash_content(spec_content),
+                    }
+                )
+
+    # README.md for RAG
+    if readme_content:
+        rag_documents.append(
+            {
+                "source_type": "readme",
+                "source_id": "README.md",
+                "source_uri": f"repo://{r.full_name}/README.md",
+                "scope": "public",
+                "path": "README.md",
+                "title": f"{project.title} README",
+                "content": readme_content,
+                "content_hash": _hash_content(readme_content),
+            }
         )
 
     # Ingest documents to RAG (best-effort)
     if rag_documents:
-        await _ingest_to_rag(
+        complete &= await _ingest_to_rag(
             project_id=str(project.id),
             repo_full_name=r.full_name,
             documents=rag_documents,
         )
 
+    return docs_hash if complete else None
+
 
 async def _sync_single_repo(
     github_client: GitHubAppClient,
     r: GitHubRepository,
     missing_counters: dict[str, int],
+    sync_state: dict[int, RepoSyncState] | None = None,
+    budget: _RequestBudget | None = None,
 ) -> None:
-    """Sync a single repository to the database and RAG index."""
+    """Sync a single repository to the database and RAG index.
+
+    With *sync_state*, the files of a repository whose ``pushed_at`` has not
+    moved since its last completed sync are not fetched; with *budget*, they
+    are fetched only while the cycle's requests last.
+    """
     repo_id = r.id
     repo_name = r.name
 
@@ -242,7 +332,15 @@ async def _sync_single_repo(
         return
 
     # Sync project spec and README to RAG
-    await _sync_project_docs(github_client, project, r)
+    state = sync_state.get(repo_id) if sync_state is not None else None
+    if state and r.pushed_at is not None and state.pushed_at == r.pushed_at:
+        logger.debug("project_docs_unchanged", project_name=project.title, repo=r.full_name)
+    elif budget is None or budget.take(_DOCS_SYNC_REQUESTS):
+        docs_hash = await _sync_project_docs(
+            github_client, project, r, state.docs_hash if state else None
+        )
+        if docs_hash is not None and sync_state is not None:
+            sync_state[repo_id] = RepoSyncState(pushed_at=r.pushed_at, docs_hash=docs_hash)
 
     # Reset missing counter if it was missing
     project_id_str = str(project.id)
@@ -318,12 +416,51 @@ async def _detect_missing_projects(
                 )
 
 
+async def _sync_repos(
+    github_client: GitHubAppClient,
+    github_repos: list[GitHubRepository],
+    missing_counters: dict[str, int],
+    sync_state: dict[int, RepoSyncState],
+) -> int:
+    """Sync *github_repos* concurrently; returns how many synced without error."""
+    semaphore = asyncio.Semaphore(_sync_concurrency())
+    budget = _RequestBudget(_request_budget())
+    synced = 0
+
+    async def sync(r: GitHubRepository) -> None:
+        nonlocal synced
+        async with semaphore:
+            try:
+                await _sync_single_repo(github_client, r, missing_counters, sync_state, budget)
+            except Exception as e:
+                logger.error(
+                    "github_repo_sync_failed",
+                    repo=r.full_name,
+                    error=str(e),
+                    error_type=type(e).__name__,
+                )
+                return
+            synced += 1
+
+    await asyncio.gather(*(sync(r) for r in github_repos))
+
+    if budget.deferred:
+        logger.warning(
+            "github_sync_budget_exhausted",
+            deferred=budget.deferred,
+            request_budget=_request_budget(),
+        )
+    return synced
+
+
 async def sync_projects_worker() -> None:
     """Background worker to sync projects from GitHub."""
     logger.info("github_sync_worker_started")
 
     # In-memory failure tracking for robust alerting
     missing_counters: dict[str, int] = {}
+    # Last completed docs sync per GitHub repository ID
+    sync_state: dict[int, RepoSyncState] = {}
 
     while True:
         start_time = time.time()
@@ -372,10 +509,12 @@ async def sync_projects_worker() -> None:
             # Map by ID for accurate tracking
             gh_repos_map = {r.id: r for r in github_repos}
 
-            # 3. Sync each repo
-            for r in github_repos:
-                await _sync_single_repo(github_client, r, missing_counters)
-                repos_synced += 1
+            # 3. Sync each repo; forget repos that left the org
+            for repo_id in sync_state.keys() - gh_repos_map.keys():
+                del sync_state[repo_id]
+            repos_synced = await _sync_repos(
+                github_client, github_repos, missing_counters, sync_state
+            )
 
             # 4. Detect missing projects
             await _detect_missing_projects(gh_repos_map, missing_counters)
@@ -2,9 +2,16 @@
 
 Monitors managed servers, updates metrics in DB, creates incidents
 on failure or resource exhaustion, and notifies admins via Telegram.
+
+Servers are checked side by side, at most ``health.check_concurrency`` at a
+time, each within ``health.server_check_deadline_seconds``, through one
+keep-alive HTTP client the worker holds for its lifetime. A cycle takes about
+as long as its slowest server, not the sum of all of them, and an unreachable
+host costs its own slot its timeout and nobody else anything.
 """
 
 import asyncio
+from collections.abc import AsyncIterable, Awaitable, Callable
 from datetime import UTC, datetime
 import os
 import time
@@ -15,8 +22,9 @@ import structlog
 from shared.contracts.dto.server import ServerStatus, ServerUpdate
 from shared.models.incident import IncidentType
 from shared.notifications import notify_admins_best_effort
+from shared.redis_client import RedisStreamClient
 from src.clients.api import api_client
-from src.metrics import parse_cadvisor, parse_node_exporter
+from src.metrics import read_cadvisor, read_node_exporter
 from src.tasks.app_health_prober import app_health_probe_cycle
 
 from .. import startup
@@ -53,13 +61,37 @@ def _retention_hours() -> int:
     return startup.get_config().get_int("health.metrics_retention_hours")
 
 
+def _rollup_retention_hours() -> dict[int, int]:
+    """Retention of each rollup tier, keyed by its bucket width in seconds."""
+    config = startup.get_config()
+    return {
+        300: config.get_int("health.metrics_rollup_5m_retention_hours"),
+        3600: config.get_int("health.metrics_rollup_1h_retention_hours"),
+    }
+
+
+def _check_concurrency() -> int:
+    return startup.get_config().get_int("health.check_concurrency")
+
+
+def _server_deadline() -> float:
+    return startup.get_config().get_float("health.server_check_deadline_seconds")
+
+
 # Statuses that indicate a server should be health-checked
 _CHECKABLE_STATUSES = {ServerStatus.ACTIVE, ServerStatus.IN_USE, ServerStatus.READY}
 
 
 def _get_http_client() -> httpx.AsyncClient:
-    """Create an HTTP client for metrics fetching."""
-    return httpx.AsyncClient(timeout=_http_timeout())
+    """Create the worker's HTTP client for metrics fetching.
+
+    Idle connections outlive the sleep between cycles, so each exporter is
+    scraped over the connection the previous cycle opened.
+    """
+    return httpx.AsyncClient(
+        timeout=_http_timeout(),
+        limits=httpx.Limits(keepalive_expiry=HEALTH_CHECK_INTERVAL * 2),
+    )
 
 
 def _get_checkable_servers(servers: list) -> list:
@@ -67,37 +99,84 @@ def _get_checkable_servers(servers: list) -> list:
     return [s for s in servers if s.is_managed and s.status in _CHECKABLE_STATUSES]
 
 
-async def _fetch_metrics(http: httpx.AsyncClient, ip: str, port: int) -> str | None:
-    """Fetch /metrics from a server, return text or None on failure."""
+async def _fetch_metrics[T](
+    http: httpx.AsyncClient,
+    ip: str,
+    port: int,
+    read: Callable[[AsyncIterable[str]], Awaitable[T]],
+) -> T | None:
+    """Scrape /metrics from a server, parsed by *read* as it streams in; None on failure."""
     try:
-        resp = await http.get(f"http://{ip}:{port}/metrics")
-        resp.raise_for_status()
-        return resp.text
+        async with http.stream(
+            "GET", f"http://{ip}:{port}/metrics", timeout=_http_timeout()
+        ) as resp:
+            resp.raise_for_status()
+            return await read(resp.aiter_lines())
     except (httpx.HTTPError, httpx.TimeoutException):
         return None
 
 
-async def _check_server(server) -> None:
-    """Run health check for a single server."""
+async def _check_servers(http: httpx.AsyncClient, servers: list) -> dict[str, dict | None]:
+    """Check *servers* concurrently.
+
+    Returns the history snapshot of each server that finished within its
+    deadline, keyed by handle; None for one that was checked but yielded none.
+    """
+    semaphore = asyncio.Semaphore(_check_concurrency())
+    deadline = _server_deadline()
+    results: dict[str, dict | None] = {}
+
+    async def check(server) -> None:
+        async with semaphore:
+            # The deadline starts once the server has a slot, not while it queues.
+            try:
+                async with asyncio.timeout(deadline):
+                    snapshot = await _check_server(server, http)
+            except TimeoutError:
+                logger.warning(
+                    "health_check_deadline_exceeded",
+                    server_handle=server.handle,
+                    deadline_sec=deadline,
+                )
+                return
+            results[server.handle] = snapshot
+
+    await asyncio.gather(*(check(server) for server in servers))
+    return results
+
+
+async def _write_history(results: dict[str, dict | None]) -> None:
+    """Append the cycle's snapshots in one request, then roll up complete buckets."""
+    snapshots = [
+        {"server_handle": handle, "metrics": metrics}
+        for handle, metrics in results.items()
+        if metrics is not None
+    ]
+    if snapshots:
+        await api_client.create_metrics_history_bulk(snapshots)
+    await api_client.roll_up_metrics_history()
+
+
+async def _check_server(server, http: httpx.AsyncClient) -> dict | None:
+    """Run health check for a single server; its metrics history snapshot, if any."""
     log = logger.bind(server_handle=server.handle, server_ip=server.public_ip)
-    http = _get_http_client()
 
     try:
         # Fetch node_exporter metrics
-        node_text = await _fetch_metrics(http, server.public_ip, NODE_EXPORTER_PORT)
+        node_metrics = await _fetch_metrics(
+            http, server.public_ip, NODE_EXPORTER_PORT, read_node_exporter
+        )
 
-        if node_text is None:
+        if node_metrics is None:
             # Server unreachable
             log.warning("server_unreachable", reason="node_exporter_fetch_failed")
             await _handle_unreachable(server)
-            return
+            return None
 
         # Fetch cadvisor metrics (non-critical — server can still be healthy)
-        cadvisor_text = await _fetch_metrics(http, server.public_ip, CADVISOR_PORT)
-
-        # Parse metrics
-        node_metrics = parse_node_exporter(node_text)
-        containers = parse_cadvisor(cadvisor_text) if cadvisor_text else []
+        containers = (
+            await _fetch_metrics(http, server.public_ip, CADVISOR_PORT, read_cadvisor) or []
+        )
 
         # Auto-resolve any active SERVER_UNREACHABLE incidents
         await _resolve_unreachable_incidents(server)
@@ -135,7 +214,7 @@ async def _check_server(server) -> None:
         )
         await api_client.update_server(server.handle, update)
 
-        # Append metrics history
+        # Metrics history, written with the rest of the cycle's
         history_metrics = {
             "cpu_usage_pct": node_metrics.cpu_usage_pct,
             "ram_used_bytes": node_metrics.ram_used_bytes,
@@ -158,7 +237,6 @@ async def _check_server(server) -> None:
                 for c in containers
             ],
         }
-        await api_client.create_metrics_history(server.handle, history_metrics)
 
         # Check resource thresholds
         await _check_resource_thresholds(server, node_metrics)
@@ -169,11 +247,11 @@ async def _check_server(server) -> None:
             ram_used_mb=used_ram_mb,
             containers=len(containers),
         )
+        return history_metrics
 
     except Exception as e:
         log.error("health_check_error", error=str(e), error_type=type(e).__name__, exc_info=True)
-    finally:
-        await http.aclose()
+        return None
 
 
 async def _handle_unreachable(server) -> None:
@@ -266,6 +344,16 @@ async def _cleanup_old_history() -> int:
     if deleted > 0:
         logger.info("metrics_history_cleanup", deleted=deleted, retention_hours=_retention_hours())
 
+    for resolution, retention_hours in _rollup_retention_hours().items():
+        result = await api_client.delete_old_metrics_rollups(resolution, retention_hours)
+        if result.get("deleted", 0) > 0:
+            logger.info(
+                "metrics_rollup_cleanup",
+                deleted=result["deleted"],
+                resolution_sec=resolution,
+                retention_hours=retention_hours,
+            )
+
     # Also clean up application health history
     app_result = await api_client.delete_old_app_health_history(_retention_hours())
     app_deleted = app_result.get("deleted", 0)
@@ -282,48 +370,69 @@ async def health_check_worker():
     logger.info("health_check_worker_started", interval_sec=HEALTH_CHECK_INTERVAL)
 
     last_cleanup = time.monotonic()
+    redis_client = RedisStreamClient()
+    await redis_client.connect()
+    try:
+        async with _get_http_client() as http:
+            while True:
+                last_cleanup = await _health_check_cycle(http, redis_client, last_cleanup)
+                await asyncio.sleep(HEALTH_CHECK_INTERVAL)
+    finally:
+        await redis_client.close()
 
-    while True:
-        start_time = time.time()
-        checked = 0
-        try:
-            servers = await api_client.get_servers()
-            checkable = _get_checkable_servers(servers)
-
-            for server in checkable:
-                await _check_server(server)
-                checked += 1
 
-            # Application health probing (after server checks)
-            try:
-                await app_health_probe_cycle()
-            except Exception as e:
-                logger.error(
-                    "app_health_probe_error",
-                    error=str(e),
-                    error_type=type(e).__name__,
-                    exc_info=True,
-                )
+async def _health_check_cycle(
+    http: httpx.AsyncClient, redis_client: RedisStreamClient, last_cleanup: float
+) -> float:
+    """One pass over servers, applications and cleanup; when cleanup last ran."""
+    start_time = time.time()
+    checked = 0
+    try:
+        servers = await api_client.get_servers()
+        checkable = _get_checkable_servers(servers)
 
-            # Daily cleanup
-            now = time.monotonic()
-            if now - last_cleanup > _cleanup_interval():
-                await _cleanup_old_history()
-                last_cleanup = now
+        results = await _check_servers(http, checkable)
+        checked = len(results)
 
+        try:
+            await _write_history(results)
         except Exception as e:
             logger.error(
-                "health_check_worker_error",
+                "metrics_history_write_error",
                 error=str(e),
                 error_type=type(e).__name__,
                 exc_info=True,
             )
-        finally:
-            duration = time.time() - start_time
-            logger.info(
-                "health_check_cycle_complete",
-                servers_checked=checked,
-                duration_sec=round(duration, 2),
+
+        # Application health probing (after server checks)
+        try:
+            await app_health_probe_cycle(api_client, redis_client)
+        except Exception as e:
+            logger.error(
+                "app_health_probe_error",
+                error=str(e),
+                error_type=type(e).__name__,
+                exc_info=True,
             )
 
-        await asyncio.sleep(HEALTH_CHECK_INTERVAL)
+        # Daily cleanup
+        now = time.monotonic()
+        if now - last_cleanup > _cleanup_interval():
+            await _cleanup_old_history()
+            last_cleanup = now
+
+    except Exception as e:
+        logger.error(
+            "health_check_worker_error",
+            error=str(e),
+            error_type=type(e).__name__,
+            exc_info=True,
+        )
+    finally:
+        duration = time.time() - start_time
+        logger.info(
+            "health_check_cycle_complete",
+            servers_checked=checked,
+            duration_sec=round(duration, 2),
+        )
+    return last_cleanup
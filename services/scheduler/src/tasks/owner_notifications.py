@@ -66,6 +66,8 @@ from shared.redis_client import RedisStreamClient
 from ._recipients import resolve_project_recipient
 
 if TYPE_CHECKING:
+    from shared.contracts.dto.story import StoryDTO
+
     from ..clients.api import SchedulerAPIClient
 
 logger = structlog.get_logger(__name__)
@@ -286,6 +288,8 @@ async def deliver_owed_notification(
     run_id: str,
     record: OwnerNotification,
     log: structlog.stdlib.BoundLogger,
+    *,
+    story: StoryDTO | None = None,
 ) -> OwnerNotificationOutcome:
     """Spend one attempt on an owed message and record what happened.
 
@@ -296,7 +300,11 @@ async def deliver_owed_notification(
     not a failure to retry — no message is due, so the record is voided and no
     attempt is spent, and the ending is owed again if routing reaches it later.
     Reading the story is itself an API call, so a lookup that failed is treated
-    as the transient failure it is, not as proof of a missing transition.
+    as the transient failure it is, not as proof of a missing transition. A
+    caller that already read the story in a batch passes it as *story*, but only
+    when it shows the ``terminal_status``: a story that does not is read again
+    here, because voiding must rest on the story as it is now, not as it was
+    when the batch went out.
 
     Resolving the recipient and publishing are then one attempt on purpose: both
     sit between the committed transition and the owner, and both fail the same
@@ -310,7 +318,8 @@ async def deliver_owed_notification(
 
     attempts = record.attempts + 1
     try:
-        story = await api_client.get_story(record.story_id)
+        if story is None or story.status is not record.terminal_status:
+            story = await api_client.get_story(record.story_id)
     except Exception as exc:
         return await _spend_failed_attempt(
             api_client,
@@ -420,13 +429,32 @@ async def supervise_owed_owner_notifications(
     """
     counts = _empty_counts()
     runs = await api_client.list_runs_owing_owner_notification(limit=OWNER_NOTIFICATION_PAGE)
+    owed = []
     for run in runs:
         record = read_owner_notification(run)
         if record is None:
             raise RuntimeError(
                 f"Run {run.id} was selected as owing a notification but carries none"
             )
+        owed.append((run, record))
+
+    # The page's stories in one batch read. It only saves requests: a story it
+    # did not return, or returned short of its ending, is read again per record.
+    try:
+        stories = {
+            story.id: story
+            for story in await api_client.get_stories_by_ids(
+                record.story_id for _run, record in owed
+            )
+        }
+    except Exception:
+        logger.warning("owed_notification_stories_read_failed", exc_info=True)
+        stories = {}
+
+    for run, record in owed:
         log = logger.bind(story_id=record.story_id, project_id=record.project_id)
-        outcome = await deliver_owed_notification(api_client, redis_client, run.id, record, log)
+        outcome = await deliver_owed_notification(
+            api_client, redis_client, run.id, record, log, story=stories.get(record.story_id)
+        )
         counts[outcome.value] += 1
     return counts
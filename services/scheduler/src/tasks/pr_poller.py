@@ -18,6 +18,7 @@ from shared.queues import DEPLOY_QUEUE
 from shared.redis_client import RedisStreamClient
 
 from .. import startup
+from ._entity_locks import each_locked
 from ._recipients import resolve_project_recipient
 from .story_completion import _parse_owner_repo
 
@@ -185,7 +186,7 @@ async def poll_merged_prs(
     deployed = 0
     github = GitHubAppClient()
 
-    for story in stories:
+    async for story in each_locked(redis_client, "story", stories, sweep="merged_prs"):
         story_id = story.id
         project_id = str(story.project_id)
         log = logger.bind(story_id=story_id, project_id=project_id)
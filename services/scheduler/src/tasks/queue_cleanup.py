@@ -3,7 +3,19 @@
 Cleans:
 1. Orphan po:response:* streams (created for PO request-response, not deleted on timeout)
 2. Orphan worker:*:input and worker:*:output streams (left by deleted workers)
-3. Old messages in task queues via XTRIM MINID (safety net beyond MAXLEN)
+   Both are found through EPHEMERAL_REGISTRY, the sorted set their producers
+   score by last write: ZRANGEBYSCORE hands over the expired ones, so a run
+   costs what there is to delete rather than a SCAN of the whole keyspace.
+   OBJECT IDLETIME then confirms each before a pipelined DELETE, because reads
+   (a worker blocked on its input) keep a stream alive without re-scoring it.
+3. Consumed messages in task queues via XTRIM MINID up to the oldest entry any
+   consumer group still needs — the bound on queue memory when producers run
+   with REDIS_STREAM_TRIM=consumer-groups, and harmless under MAXLEN
+4. Old messages in task queues via XTRIM MINID (safety net beyond MAXLEN)
+
+Step 3 also reports consumer groups that hold a queue's low-water mark back
+for longer than LAG_WARN_AGE_S: a group whose consumers died, or one that
+cannot keep up, pins every entry written since in memory.
 """
 
 from __future__ import annotations
@@ -14,23 +26,24 @@ import time
 import structlog
 
 from shared.queues import JOB_TTL_SECONDS, QUEUE_TOPOLOGY
+from shared.redis.ephemeral import EPHEMERAL_PATTERNS, EPHEMERAL_REGISTRY
 from shared.redis_client import RedisStreamClient
 
 logger = structlog.get_logger(__name__)
 
-# Patterns for ephemeral streams that should be cleaned when idle
-_ORPHAN_PATTERNS = [
-    "po:response:*",
-    "worker:*:input",
-    "worker:*:output",
-]
-
 # Default idle threshold: 10 minutes (PO response timeout is 5 min)
 DEFAULT_IDLE_THRESHOLD_S = 600
 
 # Cleanup interval: 10 minutes
 CLEANUP_INTERVAL_S = 600
 
+# Expired registry members checked and deleted per pair of round trips
+ORPHAN_BATCH_SIZE = 500
+
+# A consumer group still needing an entry older than this is reported as
+# pinning its stream. An hour is far beyond any healthy job's time in the PEL.
+LAG_WARN_AGE_S = 3600
+
 
 async def _scan_keys(redis, pattern: str) -> list[str]:
     """Collect all keys matching pattern via SCAN (non-blocking iteration)."""
@@ -44,6 +57,43 @@ async def _scan_keys(redis, pattern: str) -> list[str]:
     return keys
 
 
+async def _idle_times(redis, keys: list[str]) -> list:
+    """OBJECT IDLETIME of each key in one round trip: seconds, None when the
+    key is gone, or the exception the command raised."""
+    pipe = redis.pipeline(transaction=False)
+    for key in keys:
+        pipe.object("idletime", key)
+    return await pipe.execute(raise_on_error=False)
+
+
+async def _register_unindexed_streams(client: RedisStreamClient) -> int:
+    """Add ephemeral streams missing from the registry, scored by their idle time.
+
+    Catches streams written before producers registered them. Walks the
+    keyspace once, so the worker runs it at startup only. Returns the number
+    of streams added.
+    """
+    redis = client.redis
+    added = 0
+    for pattern in EPHEMERAL_PATTERNS:
+        keys = await _scan_keys(redis, pattern)
+        for start in range(0, len(keys), ORPHAN_BATCH_SIZE):
+            batch = keys[start : start + ORPHAN_BATCH_SIZE]
+            now = time.time()
+            scores = {
+                key: now - idle_s
+                for key, idle_s in zip(batch, await _idle_times(redis, batch), strict=True)
+                if isinstance(idle_s, int)
+            }
+            if scores:
+                # NX: a producer's fresher score wins.
+                added += await redis.zadd(EPHEMERAL_REGISTRY, scores, nx=True)
+
+    if added:
+        logger.info("orphan_streams_registered", count=added)
+    return added
+
+
 async def _clean_orphan_streams(
     client: RedisStreamClient,
     idle_threshold_s: int = DEFAULT_IDLE_THRESHOLD_S,
@@ -55,17 +105,37 @@ async def _clean_orphan_streams(
     redis = client.redis
     cleaned = 0
 
-    for pattern in _ORPHAN_PATTERNS:
-        keys = await _scan_keys(redis, pattern)
-        for key in keys:
-            try:
-                idle_s = await redis.object("idletime", key)
-                if idle_s >= idle_threshold_s:
-                    await redis.delete(key)
-                    cleaned += 1
-                    logger.debug("orphan_stream_deleted", key=key, idle_s=idle_s)
-            except Exception:
-                logger.debug("orphan_stream_check_failed", key=key, exc_info=True)
+    while True:
+        keys = await redis.zrangebyscore(
+            EPHEMERAL_REGISTRY,
+            "-inf",
+            time.time() - idle_threshold_s,
+            start=0,
+            num=ORPHAN_BATCH_SIZE,
+        )
+        if not keys:
+            break
+
+        idle_times = await _idle_times(redis, keys)
+        now = time.time()
+        pipe = redis.pipeline(transaction=False)
+        for key, idle_s in zip(keys, idle_times, strict=True):
+            if isinstance(idle_s, Exception):
+                # Look again next run rather than in this loop.
+                logger.debug("orphan_stream_check_failed", key=key, error=str(idle_s))
+                pipe.zadd(EPHEMERAL_REGISTRY, {key: now}, gt=True)
+            elif idle_s is None:
+                # Already deleted by its owner.
+                pipe.zrem(EPHEMERAL_REGISTRY, key)
+            elif idle_s >= idle_threshold_s:
+                pipe.delete(key)
+                pipe.zrem(EPHEMERAL_REGISTRY, key)
+                cleaned += 1
+                logger.debug("orphan_stream_deleted", key=key, idle_s=idle_s)
+            else:
+                # Read since its last write: still in use.
+                pipe.zadd(EPHEMERAL_REGISTRY, {key: now - idle_s}, gt=True)
+        await pipe.execute()
 
     if cleaned:
         logger.info("orphan_streams_cleaned", count=cleaned)
@@ -73,6 +143,48 @@ async def _clean_orphan_streams(
     return cleaned
 
 
+async def _trim_consumed_messages(
+    client: RedisStreamClient,
+    lag_warn_age_s: int = LAG_WARN_AGE_S,
+) -> int:
+    """Trim every queue up to what all of its consumer groups have ACKed.
+
+    Returns total number of entries trimmed across all queues.
+    """
+    now_ms = int(time.time() * 1000)
+    total_trimmed = 0
+
+    for stream in dict.fromkeys(binding.stream for binding in QUEUE_TOPOLOGY):
+        try:
+            report = await client.trim_consumed(stream)
+        except Exception:
+            logger.warning("queue_consumed_trim_failed", stream=stream, exc_info=True)
+            continue
+        if report.trimmed:
+            logger.info(
+                "queue_trimmed_to_consumed",
+                stream=stream,
+                trimmed=report.trimmed,
+                minid=report.minid,
+            )
+            total_trimmed += report.trimmed
+        for backlog in report.groups:
+            age_s = backlog.age_s(now_ms)
+            if age_s >= lag_warn_age_s:
+                logger.warning(
+                    "consumer_group_pinning_stream",
+                    stream=stream,
+                    group=backlog.group,
+                    pinned_by=backlog.pinned_by,
+                    floor_id=backlog.floor_id,
+                    floor_age_s=int(age_s),
+                    pending=backlog.pending,
+                    undelivered=backlog.undelivered,
+                )
+
+    return total_trimmed
+
+
 async def _trim_old_messages(
     client: RedisStreamClient,
     ttl_seconds: int = JOB_TTL_SECONDS,
@@ -118,13 +230,20 @@ async def queue_cleanup_worker() -> None:
     logger.info("queue_cleanup_worker_started", interval_s=CLEANUP_INTERVAL_S)
 
     try:
+        try:
+            await _register_unindexed_streams(client)
+        except Exception:
+            logger.error("orphan_stream_registration_failed", exc_info=True)
+
         while True:
             try:
                 orphans = await _clean_orphan_streams(client)
+                consumed = await _trim_consumed_messages(client)
                 trimmed = await _trim_old_messages(client)
                 logger.debug(
                     "queue_cleanup_cycle_done",
                     orphans_cleaned=orphans,
+                    consumed_trimmed=consumed,
                     messages_trimmed=trimmed,
                 )
             except Exception:
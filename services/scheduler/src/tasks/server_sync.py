@@ -60,6 +60,10 @@ def _details_sync_interval() -> int:
     return startup.get_config().get_int("scheduler.server_details_sync_interval")
 
 
+def _details_cache_ttl() -> int:
+    return startup.get_config().get_int("scheduler.server_details_cache_ttl_seconds")
+
+
 def _provisioning_stuck_timeout() -> int:
     return startup.get_config().get_int("scheduler.provisioning_stuck_timeout_seconds")
 
@@ -68,8 +72,14 @@ def _provisioning_cooldown() -> int:
     return startup.get_config().get_int("scheduler.provisioning_trigger_cooldown_seconds")
 
 
+# One client across cycles: its connection pool, rate budget and details cache
+# only pay off if they outlive a single sync. Replaced when the credentials change.
+_client: Time4VPSClient | None = None
+
+
 async def get_time4vps_client() -> Time4VPSClient | None:
-    """Create Time4VPS client with credentials from DB."""
+    """Time4VPS client for the credentials stored in the DB, reused while they hold."""
+    global _client  # noqa: PLW0603
     api_key_data = await api_client.get_api_key("time4vps")
 
     if not api_key_data or "value" not in api_key_data:
@@ -80,12 +90,18 @@ async def get_time4vps_client() -> Time4VPSClient | None:
         creds = api_key_data["value"]
         if isinstance(creds, str):
             creds = json.loads(creds)
-
-        return Time4VPSClient(creds["username"], creds["password"])
+        username, password = creds["username"], creds["password"]
     except (json.JSONDecodeError, KeyError, TypeError) as e:
         logger.error(f"Failed to parse Time4VPS credentials: {e}")
         return None
 
+    if _client is not None and (_client.username, _client.password) == (username, password):
+        return _client
+    if _client is not None:
+        await _client.close()
+    _client = Time4VPSClient(username, password)
+    return _client
+
 
 async def sync_servers_worker():
     """Background worker to sync servers from Time4VPS."""
@@ -458,64 +474,88 @@ async def _resolve_provider_outage() -> None:
 
 
 async def _sync_server_details(client: Time4VPSClient) -> int:
-    """Fetch detailed specs for each server (RAM, disk, OS)."""
+    """Fetch detailed specs for each server (RAM, disk, OS), all servers at once.
+
+    The client bounds how many requests reach the provider and how fast. Details
+    fetched within ``scheduler.server_details_cache_ttl_seconds`` are reused,
+    except for servers still reading their usage or status from the provider:
+    those without a health check yet and those still ``new``. A server whose
+    row already matches its details is not written.
+    """
     logger.info("server_details_sync_start")
 
     servers = await api_client.get_servers()
     servers = [s for s in servers if s.status != ServerStatus.UNREACHABLE]
+    cache_ttl = _details_cache_ttl()
 
-    updated_count = 0
+    results = await asyncio.gather(
+        *(_sync_one_server_details(client, server, cache_ttl) for server in servers)
+    )
+    updated_count = sum(results)
 
-    for server in servers:
-        provider_id = parse_time4vps_server_id(server.provider_id)
-        if provider_id is None:
-            continue
+    logger.info("server_details_sync_complete", updated_count=updated_count)
+    return updated_count
 
-        try:
-            details_model = await client.get_server_details(provider_id)
-            details = details_model.model_dump()
-
-            # Prepare update
-            update_data = ServerUpdate(
-                capacity_cpu=details.get("cpu_cores", server.capacity_cpu),
-                capacity_ram_mb=details.get("ram_limit", server.capacity_ram_mb),
-                capacity_disk_mb=details.get("disk_limit", server.capacity_disk_mb),
-                os_template=details.get("os"),
-            )
-            if server.last_health_check is None:
-                # The hypervisor counts page cache as used, so once the health
-                # checker reports real MemAvailable-based usage, the provider's
-                # inflated numbers must not overwrite it — the allocator reads
-                # used_ram_mb and would starve on a healthy server.
-                update_data.used_ram_mb = details.get("ram_used", 0)
-                update_data.used_disk_mb = details.get("disk_usage", 0)
-
-            # Check if status update is needed
-            api_status = details.get("status", "").lower()
-            if api_status == "active" and server.status == ServerStatus.NEW:
-                update_data.status = ServerStatus.ACTIVE
-
-            await api_client.update_server(server.handle, update_data)
-            updated_count += 1
-
-            logger.debug(
-                "server_details_updated",
-                server_handle=server.handle,
-                ram_mb=update_data.capacity_ram_mb,
-                disk_mb=update_data.capacity_disk_mb,
-            )
 
-        except Exception as e:
-            logger.warning(
-                "server_details_fetch_failed",
-                server_handle=server.handle,
-                error=str(e),
-                error_type=type(e).__name__,
-            )
-            continue
+async def _sync_one_server_details(
+    client: Time4VPSClient, server: ServerDTO, cache_ttl: int
+) -> bool:
+    """Bring one server's specs up to date; True if its row was written."""
+    provider_id = parse_time4vps_server_id(server.provider_id)
+    if provider_id is None:
+        return False
 
-    logger.info("server_details_sync_complete", updated_count=updated_count)
-    return updated_count
+    fresh = server.last_health_check is None or server.status == ServerStatus.NEW
+    try:
+        details_model = await client.get_server_details(
+            provider_id, max_age=0 if fresh else cache_ttl
+        )
+        details = details_model.model_dump()
+
+        # Prepare update
+        update_data = ServerUpdate(
+            capacity_cpu=details.get("cpu_cores", server.capacity_cpu),
+            capacity_ram_mb=details.get("ram_limit", server.capacity_ram_mb),
+            capacity_disk_mb=details.get("disk_limit", server.capacity_disk_mb),
+            os_template=details.get("os"),
+        )
+        if server.last_health_check is None:
+            # The hypervisor counts page cache as used, so once the health
+            # checker reports real MemAvailable-based usage, the provider's
+            # inflated numbers must not overwrite it — the allocator reads
+            # used_ram_mb and would starve on a healthy server.
+            update_data.used_ram_mb = details.get("ram_used", 0)
+            update_data.used_disk_mb = details.get("disk_usage", 0)
+
+        # Check if status update is needed
+        api_status = (details.get("status") or "").lower()
+        if api_status == "active" and server.status == ServerStatus.NEW:
+            update_data.status = ServerStatus.ACTIVE
+
+        if all(
+            getattr(server, field) == value
+            for field, value in update_data.model_dump(exclude_unset=True).items()
+        ):
+            return False
+
+        await api_client.update_server(server.handle, update_data)
+
+        logger.debug(
+            "server_details_updated",
+            server_handle=server.handle,
+            ram_mb=update_data.capacity_ram_mb,
+            disk_mb=update_data.capacity_disk_mb,
+        )
+        return True
+
+    except Exception as e:
+        logger.warning(
+            "server_details_fetch_failed",
+            server_handle=server.handle,
+            error=str(e),
+            error_type=type(e).__name__,
+        )
+        return False
 
 
 async def _neutralize_unauthorized_trigger(server: ServerDTO) -> None:
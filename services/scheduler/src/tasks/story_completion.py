@@ -14,6 +14,7 @@ from shared.contracts.queues.worker import DeleteWorkerCommand
 from shared.queues import ARCHITECT_QUEUE, STORY_WORKERS_KEY, WORKER_COMMANDS
 from shared.redis_client import RedisStreamClient
 
+from ._entity_locks import each_locked, try_lock, unlock
 from ._recipients import resolve_project_recipient
 
 if TYPE_CHECKING:
@@ -85,15 +86,24 @@ async def _trigger_next_story(
         return
 
     next_story = project_stories[0]
-    recipient = await resolve_project_recipient(
-        api_client, project_id, event="next_story_triggered", story_id=next_story.id
-    )
-    arch_msg = ArchitectMessage(
-        story_id=next_story.id,
-        project_id=project_id,
-        telegram_chat_id=recipient.telegram_chat_id,
-    )
-    await redis_client.publish_message(ARCHITECT_QUEUE, arch_msg)
+    # The stuck-story sweep may be re-triggering the architect for this story
+    # right now; one of the two is enough.
+    token = await try_lock(redis_client, "story", next_story.id)
+    if token is None:
+        logger.info("next_story_locked_by_another_sweep", story_id=next_story.id)
+        return
+    try:
+        recipient = await resolve_project_recipient(
+            api_client, project_id, event="next_story_triggered", story_id=next_story.id
+        )
+        arch_msg = ArchitectMessage(
+            story_id=next_story.id,
+            project_id=project_id,
+            telegram_chat_id=recipient.telegram_chat_id,
+        )
+        await redis_client.publish_message(ARCHITECT_QUEUE, arch_msg)
+    finally:
+        await unlock(redis_client, "story", next_story.id, token)
     logger.info(
         "next_story_triggered",
         story_id=next_story.id,
@@ -126,11 +136,16 @@ async def complete_stories(
             in_progress_stories=len(stories),
         )
 
-    for story in stories:
+    # Every story's tasks in one batch read rather than one request per story.
+    story_tasks: dict[str, list] = {}
+    for task in await api_client.get_tasks_by_story_ids(story.id for story in stories):
+        story_tasks.setdefault(task.story_id, []).append(task)
+
+    async for story in each_locked(redis_client, "story", stories, sweep="complete_stories"):
         story_id = story.id
         project_id = str(story.project_id)
 
-        tasks = await api_client.get_tasks_by_story(story_id)
+        tasks = story_tasks.get(story_id, [])
 
         # Skip if no tasks (architect may not have run yet)
         if not tasks:
@@ -75,6 +75,7 @@ if TYPE_CHECKING:
     from ..clients.api import SchedulerAPIClient
 
 from .. import startup
+from ._entity_locks import each_locked
 from ._recipients import resolve_project_recipient
 from .owner_notifications import deliver_owed_notification, owe_owner_notification
 from .temporary_access import grant_temporary_access
@@ -197,23 +198,26 @@ async def supervise_stuck_stories(
     now = datetime.now(UTC)
     redis = redis_client._redis
 
-    for story in stories:
+    # Old enough to be stuck, and not queued behind its project's active story.
+    overdue = [
+        story
+        for story in stories
+        if (now - _parse_datetime(story.created_at)).total_seconds() / 60
+        >= _story_stuck_threshold()
+        and str(story.project_id) not in active_projects
+    ]
+    # Only a story the architect has not created any tasks for is stuck; one
+    # batch read answers that for all of them.
+    decomposed = {
+        task.story_id
+        for task in await api_client.get_tasks_by_story_ids(story.id for story in overdue)
+    }
+    stuck = [story for story in overdue if story.id not in decomposed]
+
+    async for story in each_locked(redis_client, "story", stuck, sweep="stuck_stories"):
         story_id = story.id
         project_id = str(story.project_id)
-        created_at = _parse_datetime(story.created_at)
-        age_minutes = (now - created_at).total_seconds() / 60
-
-        if age_minutes < _story_stuck_threshold():
-            continue
-
-        # Skip if project already has an active story (sequential processing)
-        if project_id in active_projects:
-            continue
-
-        # Only retry if architect hasn't created any tasks yet
-        tasks = await api_client.get_tasks_by_story(story_id)
-        if tasks:
-            continue
+        age_minutes = (now - _parse_datetime(story.created_at)).total_seconds() / 60
 
         log = logger.bind(story_id=story_id, age_minutes=round(age_minutes, 1))
 
@@ -271,7 +275,7 @@ async def supervise_failed_tasks(
     retried = 0
     escalated = 0
 
-    for task in tasks:
+    async for task in each_locked(redis_client, "task", tasks, sweep="failed_tasks"):
         task_id = task.id
         story_id = task.story_id
 
@@ -287,10 +291,14 @@ async def supervise_failed_tasks(
             continue
 
         if current_iter < max_iter:
-            # Retry: failed → backlog → todo, bump iteration
-            await api_client.transition_task(task_id, TaskStatus.BACKLOG, "supervisor")
-            await api_client.transition_task(task_id, TaskStatus.TODO, "supervisor")
-            await api_client.update_task(task_id, {"current_iteration": current_iter + 1})
+            # Retry: failed → backlog → todo, bump iteration — one transaction
+            retried_task = await api_client.retry_task(
+                task_id, next_iteration=current_iter + 1, actor="supervisor"
+            )
+            if retried_task is None:
+                # Another retry moved it on since the list was read.
+                log.info("task_retry_already_moved")
+                continue
             log.warning(
                 "task_retry",
                 new_iteration=current_iter + 1,
@@ -527,7 +535,7 @@ async def supervise_waiting_resource_tasks(
     tasks = await api_client.get_tasks_by_status(TaskStatus.WAITING_RESOURCES)
     resumed = 0
     expired = 0
-    for task in tasks:
+    async for task in each_locked(redis_client, "task", tasks, sweep="waiting_resource_tasks"):
         metadata = task.failure_metadata or {}
         started_at = _parse_datetime(
             metadata.get("resource_wait_started_at") or task.updated_at or task.created_at
@@ -557,8 +565,7 @@ async def supervise_waiting_resource_tasks(
         if not await _resources_available(api_client, metadata):
             continue
         await _clear_failed_run_iteration(api_client, task)
-        await api_client.transition_task(task.id, TaskStatus.BACKLOG, "supervisor")
-        await api_client.transition_task(task.id, TaskStatus.TODO, "supervisor")
+        await api_client.retry_task(task.id, actor="supervisor")
         try:
             await _notify_resources_resumed_via_po(api_client, redis_client, task)
         except Exception:
@@ -574,15 +581,17 @@ async def _clear_failed_run_iteration(api_client: SchedulerAPIClient, task) -> N
     code-generation iteration. The dispatcher therefore needs the prior run's
     iteration stamp removed before the task returns to todo.
     """
-    runs = await api_client.list_runs(task_id=task.id, run_type=RunType.ENGINEERING.value)
-    for run in runs:
-        if run.run_metadata.get("iteration") != task.current_iteration:
-            continue
+    runs = await api_client.list_runs(
+        task_id=task.id,
+        run_type=RunType.ENGINEERING.value,
+        metadata={"iteration": task.current_iteration},
+    )
+    if runs:
+        run = runs[0]
         await api_client.update_run(
             run.id,
             {"run_metadata": {**run.run_metadata, "iteration": None}},
         )
-        return
 
 
 async def _resources_available(api_client: SchedulerAPIClient, metadata: dict) -> bool:
@@ -671,7 +680,7 @@ async def supervise_stuck_tasks(
     stopping = 0
     now = datetime.now(UTC)
 
-    for task in tasks:
+    async for task in each_locked(redis_client, "task", tasks, sweep="stuck_tasks"):
         run = await select_live_engineering_run(api_client, task.id)
         if run is None:
             terminal_run = await select_terminal_engineering_run(api_client, task.id)
@@ -740,7 +749,7 @@ async def supervise_deploying_stories(  # noqa: PLR0912
     refused: dict[RefusedDeployAction, int] = dict.fromkeys(RefusedDeployAction, 0)
     redis = redis_client._redis
 
-    for story in stories:
+    async for story in each_locked(redis_client, "story", stories, sweep="deploying_stories"):
         story_id = story.id
         project_id = str(story.project_id)
         log = logger.bind(story_id=story_id, project_id=project_id)
@@ -1696,7 +1705,9 @@ async def supervise_waiting_user_secret_stories(
     redispatched = 0
     failed = 0
 
-    for story in stories:
+    async for story in each_locked(
+        redis_client, "story", stories, sweep="waiting_user_secret_stories"
+    ):
         story_id = story.id
         project_id = str(story.project_id)
         log = logger.bind(story_id=story_id, project_id=project_id)
@@ -1837,7 +1848,7 @@ async def supervise_testing_stories(
     failed = 0
     recovered = 0
 
-    for story in stories:
+    async for story in each_locked(redis_client, "story", stories, sweep="testing_stories"):
         story_id = story.id
         project_id = str(story.project_id)
         log = logger.bind(story_id=story_id, project_id=project_id)
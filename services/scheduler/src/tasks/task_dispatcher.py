@@ -6,19 +6,30 @@ A) Find todo tasks with no blocker (or blocker done), create Run,
 B) Find stories where all tasks are done → complete story + trigger deploy.
 C) Supervise pipeline: detect stuck states, retry or fail-fast.
 
-Runs as a periodic scheduler job (every 30s).
+Runs as a periodic scheduler job (every 30s). Between sweeps, A and B also
+run within milliseconds of a committed state change that can unblock them; see
+``dispatch_wakeup``. The sweep stays as the reconciliation pass for anything
+the events did not cover.
+
+Dispatch reads the whole pipeline in one request, ``GET /pipeline/snapshot``,
+and decides every TODO task from it; only the writes — runs, transitions,
+messages — go out per task.
 """
 
 from __future__ import annotations
 
 import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 from enum import StrEnum
-from typing import TYPE_CHECKING
+import time
+from typing import TYPE_CHECKING, Any
 import uuid
 
 import structlog
 
 from shared.contracts.dto.engineering import EngineeringStatus
+from shared.contracts.dto.pipeline import PipelineSnapshot
 from shared.contracts.dto.project import (
     ProjectDTO,
     ProjectPredatesRunOwnership,
@@ -32,9 +43,13 @@ from shared.contracts.queues.engineering import EngineeringMessage
 from shared.contracts.vocab import ActionType
 from shared.contracts.worker_turn import AttemptTurnMetadata
 from shared.queues import ENGINEERING_QUEUE
+from shared.redis.metrics import entry_age_s
 from shared.redis_client import RedisStreamClient
 
-from ._recipients import resolve_project_recipient
+from ..clients.tick_cache import tick_cache
+from ._entity_locks import each_locked
+from ._recipients import resolve_owner_recipient
+from .dispatch_wakeup import DispatchWakeup, follow_state_changes
 from .owner_notifications import supervise_owed_owner_notifications
 from .pr_poller import poll_ci_failures, poll_merged_prs
 from .scaffold_trigger import trigger_scaffolds
@@ -94,6 +109,14 @@ _LIVE_RUN_STATUSES = (RunStatus.QUEUED, RunStatus.RUNNING)
 # error_message written on a run whose EngineeringMessage never reached the queue.
 PUBLISH_FAILED_ERROR = "dispatch publish failed"
 
+# How long one sweep of a tick may run before it is cut short. GitHub-bound
+# sweeps get longer: their calls are the slow ones.
+SWEEP_BUDGET_S = 60.0
+GITHUB_SWEEP_BUDGET_S = 120.0
+
+# How long a wake-up waits for the rest of its burst before reading the pipeline.
+_WAKEUP_SETTLE_S = 0.01
+
 
 def _dispatch_interval() -> int:
     return startup.get_config().get_int("scheduler.dispatch_interval_seconds")
@@ -118,8 +141,8 @@ def _build_cumulative_context(sibling_events: list) -> str:
     return "## Context from completed tasks\n" + "\n".join(lines) + "\n\n"
 
 
-async def _find_unfinished_run(api_client: SchedulerAPIClient, task: TaskDTO) -> RunDTO | None:
-    """Return an engineering run for this task that has not finished, any iteration.
+def _find_unfinished_run(runs: list[RunDTO]) -> RunDTO | None:
+    """Return an engineering run of this task that has not finished, any iteration.
 
     This is the guard that keeps one story branch to one worker, and it reads the
     only fact that answers the question: whether an attempt is still open. It
@@ -133,14 +156,13 @@ async def _find_unfinished_run(api_client: SchedulerAPIClient, task: TaskDTO) ->
     run before it fails the task. So a run left in queued/running always means
     work that is still owned, never a leftover to be dispatched past.
     """
-    runs = await api_client.list_runs(task_id=task.id, run_type=RunType.ENGINEERING.value)
     for run in runs:
         if run.status in _LIVE_RUN_STATUSES:
             return run
     return None
 
 
-async def _find_dispatched_run(api_client: SchedulerAPIClient, task: TaskDTO) -> RunDTO | None:
+def _find_dispatched_run(runs: list[RunDTO], task: TaskDTO) -> RunDTO | None:
     """Return the finished engineering run this task's current iteration produced.
 
     Only terminal runs reach here — an unfinished one is caught by
@@ -150,7 +172,6 @@ async def _find_dispatched_run(api_client: SchedulerAPIClient, task: TaskDTO) ->
     earlier iterations are ignored, because a legitimate retry has to be
     dispatchable.
     """
-    runs = await api_client.list_runs(task_id=task.id, run_type=RunType.ENGINEERING.value)
     for run in runs:
         if run.run_metadata.get("iteration") == task.current_iteration:
             return run
@@ -173,9 +194,9 @@ async def _recover_dispatched_task(
     The run is always finished by the time this is called: an unfinished one is
     adopted by the caller's guard before it gets here.
     """
-    await api_client.transition_task(task_id, TaskStatus.IN_DEV, "dispatcher")
-    for status in terminal_task_statuses(run):
-        await api_client.transition_task(task_id, status, "dispatcher")
+    await api_client.replay_task_statuses(
+        task_id, (TaskStatus.IN_DEV, *terminal_task_statuses(run)), "dispatcher"
+    )
     log.info("task_outcome_replayed", run_id=run.id, run_status=run.status.value)
 
 
@@ -214,10 +235,17 @@ _DISPATCH_COMPLETING = (_PriorAttempt.RECOVERED, _PriorAttempt.REPLAYED)
 
 
 async def _handle_prior_attempt(
-    api_client: SchedulerAPIClient, task: TaskDTO, log: structlog.BoundLogger
+    api_client: SchedulerAPIClient,
+    task: TaskDTO,
+    runs: list[RunDTO],
+    log: structlog.BoundLogger,
 ) -> _PriorAttempt | None:
     """Deal with an attempt this task already has, or `None` if it has none.
 
+    *runs* are the task's engineering runs from the tick's snapshot, newest first:
+    the unfinished ones and those of its current iteration, which is all either
+    check below looks at.
+
     Unfinished first, and — this is the whole point — without consulting
     `current_iteration` to decide *whether* to stop. That field is incremented by
     the very retry that creates the risk, so a guard keyed on it stops
@@ -228,7 +256,7 @@ async def _handle_prior_attempt(
     one of an earlier iteration is a live attempt the retry path ran ahead of.
     Both take the same action; they are not the same event in the logs.
     """
-    unfinished_run = await _find_unfinished_run(api_client, task)
+    unfinished_run = _find_unfinished_run(runs)
     if unfinished_run is not None:
         run_iteration = unfinished_run.run_metadata.get("iteration")
         own_dispatch = run_iteration == task.current_iteration
@@ -245,7 +273,7 @@ async def _handle_prior_attempt(
         await api_client.transition_task(task.id, TaskStatus.IN_DEV, "dispatcher")
         return _PriorAttempt.RECOVERED if own_dispatch else _PriorAttempt.BLOCKED
 
-    prior_run = await _find_dispatched_run(api_client, task)
+    prior_run = _find_dispatched_run(runs, task)
     if prior_run is not None:
         await _recover_dispatched_task(api_client, task.id, prior_run, log)
         return _PriorAttempt.REPLAYED
@@ -257,6 +285,7 @@ async def _create_and_publish_run(
     redis_client: RedisStreamClient,
     task: TaskDTO,
     description: str,
+    project: ProjectDTO,
     initiating_run_id: str,
     log: structlog.BoundLogger,
 ) -> str | None:
@@ -293,8 +322,13 @@ async def _create_and_publish_run(
     )
 
     action = ActionType.FEATURE if task.type is TaskType.REFACTOR else ActionType(task.type)
-    recipient = await resolve_project_recipient(
-        api_client, project_id, event="task_dispatch", story_id=story_id or ""
+    # The project came with the snapshot; only its owner is looked up.
+    recipient = await resolve_owner_recipient(
+        api_client,
+        project.owner_id,
+        event="task_dispatch",
+        project_id=project_id,
+        story_id=story_id or "",
     )
     eng_msg = EngineeringMessage(
         task_id=run_id,
@@ -353,8 +387,8 @@ async def _transition_to_in_dev(
     return True
 
 
-async def _project_and_initiating_run(
-    api_client: SchedulerAPIClient, project_id: str, log: structlog.BoundLogger
+def _project_and_initiating_run(
+    project: ProjectDTO | None, project_id: str, log: structlog.BoundLogger
 ) -> tuple[ProjectDTO, str] | None:
     """The project and the run that will own its worker, or None to skip the task.
 
@@ -364,7 +398,6 @@ async def _project_and_initiating_run(
     skipped loudly rather than dispatched into a worker nobody could attribute
     after it dies.
     """
-    project = await api_client.get_project(project_id)
     if project is None:
         log.error("task_skipped_project_missing", project_id=project_id)
         return None
@@ -385,35 +418,45 @@ async def dispatch_todo_tasks(
 ) -> int:
     """Find and dispatch unblocked todo tasks.
 
-    Returns the number of tasks dispatched.
+    Every decision is read from one ``PipelineSnapshot``, so the tick costs the
+    same handful of reads however long the backlog is. Returns the number of
+    tasks dispatched.
     """
-    tasks = await api_client.get_tasks_by_status(TaskStatus.TODO)
+    snapshot: PipelineSnapshot = await api_client.get_pipeline_snapshot()
     dispatched = 0
+    # Stories this tick has already changed. The snapshot no longer describes
+    # them — a sibling it shows in todo may be in_dev now — so the rest of such a
+    # story waits for the next tick instead of being judged on stale state.
+    acted_on: set[str] = set()
 
-    for task in tasks:
+    async for task in each_locked(redis_client, "task", snapshot.todo_tasks, sweep="todo_tasks"):
         task_id = task.id
         blocker_id = task.blocked_by_task_id
 
         # Check if blocker is resolved
         if blocker_id:
-            blocker = await api_client.get_task(blocker_id)
-            if blocker.status != TaskStatus.DONE:
+            blocker = snapshot.blockers.get(blocker_id)
+            if blocker is None or blocker.status != TaskStatus.DONE:
                 continue  # Still blocked
 
         story_id = task.story_id
         project_id = str(task.project_id)
         log = logger.bind(task_id=task_id, story_id=story_id)
 
+        if story_id in acted_on:
+            log.info("task_skipped_story_changed_this_tick")
+            continue
+
         # Skip internal project tasks — implemented manually via /implement
         # TODO: replace with proper project.internal flag when going to prod
         INTERNAL_PROJECT_ID = "033c2033-fc75-4d86-ade2-08efe7b15a5e"
         if project_id == INTERNAL_PROJECT_ID:
             continue
 
-        # The project is read once and kept: it decides whether this task may be
-        # dispatched at all, and it carries the run that initiated the work,
-        # which the message below has to hand on to the worker.
-        resolved = await _project_and_initiating_run(api_client, project_id, log)
+        # The project decides whether this task may be dispatched at all, and it
+        # carries the run that initiated the work, which the message below has
+        # to hand on to the worker.
+        resolved = _project_and_initiating_run(snapshot.projects.get(project_id), project_id, log)
         if resolved is None:
             continue
         project, initiating_run_id = resolved
@@ -426,29 +469,31 @@ async def dispatch_todo_tasks(
             log.info("task_skipped_workspace_not_ready", project_id=project_id)
             continue
 
-        # Fetch siblings once — used for both guard and context
-        siblings = await api_client.get_tasks_by_story(story_id) if story_id else []
+        # Siblings serve both the guard and the context
+        siblings = snapshot.story_tasks.get(story_id, []) if story_id else []
         if _story_blocks_dispatch(siblings, log):
             continue
 
         # This task may already have an attempt — one still running, or one that
         # finished before its outcome could be applied. Either way it must not
         # get a second worker on the same story branch.
-        prior = await _handle_prior_attempt(api_client, task, log)
+        runs = snapshot.engineering_runs.get(task_id, [])
+        prior = await _handle_prior_attempt(api_client, task, runs, log)
         if prior is not None:
+            if story_id:
+                acted_on.add(story_id)
             if prior in _DISPATCH_COMPLETING:
                 dispatched += 1
             continue
 
         # Build cumulative context from sibling tasks
-        context = ""
-        if siblings:
-            all_events = []
-            for sibling in siblings:
-                if sibling.id != task_id and sibling.status == TaskStatus.DONE:
-                    events = await api_client.get_task_events(sibling.id)
-                    all_events.extend(events)
-            context = _build_cumulative_context(all_events)
+        all_events = [
+            event
+            for sibling in siblings
+            if sibling.id != task_id and sibling.status == TaskStatus.DONE
+            for event in snapshot.iteration_events.get(sibling.id, [])
+        ]
+        context = _build_cumulative_context(all_events)
 
         # Enrich description with context
         description = task.description or ""
@@ -456,10 +501,12 @@ async def dispatch_todo_tasks(
             description = context + description
 
         run_id = await _create_and_publish_run(
-            api_client, redis_client, task, description, initiating_run_id, log
+            api_client, redis_client, task, description, project, initiating_run_id, log
         )
         if run_id is None:
             continue
+        if story_id:
+            acted_on.add(story_id)
 
         if not await _transition_to_in_dev(api_client, task_id, run_id, log):
             continue
@@ -470,133 +517,283 @@ async def dispatch_todo_tasks(
     return dispatched
 
 
+@dataclass(frozen=True)
+class _Sweep:
+    """One sweep of a tick, with how long it may run before it is cut short."""
+
+    name: str
+    run: Callable[[SchedulerAPIClient, RedisStreamClient], Awaitable[Any]]
+    budget_s: float = SWEEP_BUDGET_S
+
+
+def _sweep_lanes() -> tuple[tuple[_Sweep, ...], ...]:
+    """The sweeps of a tick, as lanes that run side by side.
+
+    Within a lane sweeps run in order, and only where the order is part of the
+    contract; everything else gets its own lane. Built per tick so each name
+    resolves to whatever this module holds at the time.
+    """
+    return (
+        (_Sweep("scaffolds", trigger_scaffolds),),
+        # Story completion reads the tasks dispatch has just moved.
+        (
+            _Sweep("todo_tasks", dispatch_todo_tasks),
+            _Sweep("complete_stories", complete_stories),
+        ),
+        # Both ask GitHub about the same PR_REVIEW stories; one after the other
+        # they never reach for the same story at once.
+        (
+            _Sweep("merged_prs", poll_merged_prs, GITHUB_SWEEP_BUDGET_S),
+            _Sweep(
+                "ci_failures",
+                lambda api_client, _redis: poll_ci_failures(api_client),
+                GITHUB_SWEEP_BUDGET_S,
+            ),
+        ),
+        (_Sweep("stuck_stories", supervise_stuck_stories),),
+        (_Sweep("stuck_tasks", supervise_stuck_tasks),),
+        (_Sweep("failed_tasks", supervise_failed_tasks),),
+        (_Sweep("waiting_resource_tasks", supervise_waiting_resource_tasks),),
+        (_Sweep("deploying_stories", supervise_deploying_stories),),
+        (_Sweep("waiting_user_secret_stories", supervise_waiting_user_secret_stories),),
+        # Messages a committed terminal transition still owes are re-attempted
+        # before the routing that owes new ones. Ordered this way round, a
+        # record written by this tick's routing gets exactly the one in-tick
+        # attempt routing makes; the other way round the sweep would
+        # immediately spend a second attempt of the bound on it, in the same
+        # second.
+        #
+        # Stories are routed on their QA runs before the access sweep runs,
+        # and that order is the delivery guarantee: a product QA has passed is
+        # handed to its owner on the tick that reads the verdict, and the
+        # cleanup of the identity it borrowed happens afterwards. Sweeping
+        # first would let a cleanup that ran out of attempts during a gap in
+        # this loop write its incident on the QA run before the story had been
+        # routed, turning a passed product into a quarantine over a leftover
+        # test user.
+        (
+            _Sweep("owner_notifications", supervise_owed_owner_notifications),
+            _Sweep("testing_stories", supervise_testing_stories),
+            _Sweep("temporary_access", supervise_temporary_access),
+        ),
+    )
+
+
+async def _run_sweep(
+    sweep: _Sweep,
+    api_client: SchedulerAPIClient,
+    redis_client: RedisStreamClient,
+    results: dict[str, Any],
+    durations_ms: dict[str, int],
+) -> bool:
+    """Run one sweep within its budget, recording its result; False if it did not finish."""
+    started = time.monotonic()
+    budget = asyncio.timeout(sweep.budget_s)
+    try:
+        async with budget:
+            results[sweep.name] = await sweep.run(api_client, redis_client)
+        return True
+    except TimeoutError:
+        if not budget.expired():
+            logger.exception("dispatcher_sweep_error", sweep=sweep.name)
+            return False
+        # Cut short between two awaits. Every sweep is written to be
+        # re-entered after a crash, so the next tick picks up where it stopped.
+        logger.warning("dispatcher_sweep_over_budget", sweep=sweep.name, budget_s=sweep.budget_s)
+        return False
+    except Exception:
+        logger.exception("dispatcher_sweep_error", sweep=sweep.name)
+        return False
+    finally:
+        durations_ms[sweep.name] = round((time.monotonic() - started) * 1000)
+
+
+async def _run_lane(
+    lane: tuple[_Sweep, ...],
+    api_client: SchedulerAPIClient,
+    redis_client: RedisStreamClient,
+    results: dict[str, Any],
+    durations_ms: dict[str, int],
+) -> None:
+    """Run a lane's sweeps in order, stopping at one that does not finish.
+
+    A later sweep in a lane relies on the earlier ones having run this tick,
+    so it waits for the next tick rather than run without them.
+    """
+    for sweep in lane:
+        if not await _run_sweep(sweep, api_client, redis_client, results, durations_ms):
+            return
+
+
+async def _sweep(api_client: SchedulerAPIClient, redis_client: RedisStreamClient) -> None:
+    """One full pass: dispatch, story completion, PR polling and every supervisor.
+
+    Independent sweeps run concurrently, so one slow GitHub or API call holds
+    up only its own lane; the per-entity locks in ``_entity_locks`` keep two
+    sweeps off the same story or task.
+    """
+    results: dict[str, Any] = {}
+    durations_ms: dict[str, int] = {}
+    async with tick_cache() as reads:
+        await asyncio.gather(
+            *(
+                _run_lane(lane, api_client, redis_client, results, durations_ms)
+                for lane in _sweep_lanes()
+            )
+        )
+
+    dispatched = results.get("todo_tasks") or 0
+    completed = results.get("complete_stories") or 0
+    scaffolds = results.get("scaffolds") or 0
+    merged = results.get("merged_prs") or 0
+    stuck_stories = results.get("stuck_stories") or {}
+    stuck_tasks = results.get("stuck_tasks") or {}
+    failed_tasks = results.get("failed_tasks") or {}
+    waiting_resources = results.get("waiting_resource_tasks") or {}
+    deploying = results.get("deploying_stories") or {}
+    waiting_secret = results.get("waiting_user_secret_stories") or {}
+    owner_notifications = results.get("owner_notifications") or {}
+    testing = results.get("testing_stories") or {}
+    temporary_access = results.get("temporary_access") or {}
+
+    # Always log the cycle summary for observability
+    logger.info(
+        "dispatcher_cycle",
+        tasks_dispatched=dispatched,
+        stories_completed=completed,
+        scaffolds_triggered=scaffolds,
+        prs_merged=merged,
+        # Per-sweep wall time; a sweep near its budget is the one to look at.
+        sweep_ms=durations_ms,
+        # API reads sent, and reads the tick cache answered without one.
+        api_reads=reads.misses,
+        api_reads_coalesced=reads.hits,
+    )
+    supervisor_active = (
+        stuck_stories.get("retried", 0)
+        + stuck_stories.get("failed", 0)
+        + stuck_tasks.get("timed_out", 0)
+        + failed_tasks.get("retried", 0)
+        + failed_tasks.get("escalated", 0)
+        + waiting_resources.get("resumed", 0)
+        + waiting_resources.get("expired", 0)
+        + deploying.get("tested", 0)
+        + deploying.get("retried", 0)
+        + deploying.get("redispatched", 0)
+        + deploying.get("waiting", 0)
+        + deploying.get("escalated", 0)
+        + deploying.get("failed", 0)
+        + waiting_secret.get("redispatched", 0)
+        + waiting_secret.get("failed", 0)
+        + testing.get("completed", 0)
+        + testing.get("redispatched", 0)
+        + testing.get("failed", 0)
+        + temporary_access.get("dispatched", 0)
+        + temporary_access.get("released", 0)
+        + temporary_access.get("revoked", 0)
+        + temporary_access.get("revoke_failed", 0)
+        + temporary_access.get("escalated", 0)
+        + owner_notifications.get("delivered", 0)
+        + owner_notifications.get("retrying", 0)
+        + owner_notifications.get("exhausted", 0)
+        + owner_notifications.get("unaddressable", 0)
+        + owner_notifications.get("voided", 0)
+    )
+    if supervisor_active:
+        logger.info(
+            "supervisor_cycle",
+            stories_retried=stuck_stories.get("retried", 0),
+            stories_failed=stuck_stories.get("failed", 0),
+            tasks_timed_out=stuck_tasks.get("timed_out", 0),
+            tasks_retried=failed_tasks.get("retried", 0),
+            tasks_escalated=failed_tasks.get("escalated", 0),
+            deploy_tested=deploying.get("tested", 0),
+            deploy_retried=deploying.get("retried", 0),
+            deploy_redispatched=deploying.get("redispatched", 0),
+            deploy_waiting_user_secret=deploying.get("waiting", 0),
+            deploy_escalated=deploying.get("escalated", 0),
+            deploy_failed=deploying.get("failed", 0),
+            user_secret_redispatched=waiting_secret.get("redispatched", 0),
+            user_secret_failed=waiting_secret.get("failed", 0),
+            qa_completed=testing.get("completed", 0),
+            qa_redispatched=testing.get("redispatched", 0),
+            qa_failed=testing.get("failed", 0),
+            temporary_access_dispatched=temporary_access.get("dispatched", 0),
+            temporary_access_released=temporary_access.get("released", 0),
+            temporary_access_revoked=temporary_access.get("revoked", 0),
+            temporary_access_expired=temporary_access.get("expired", 0),
+            # Still being chased vs. given up on and handed to a human.
+            temporary_access_revoke_failed=temporary_access.get("revoke_failed", 0),
+            temporary_access_escalated=temporary_access.get("escalated", 0),
+            # Owner notifications recovered from a committed
+            # terminal transition whose publish did not land. Still
+            # being chased vs. given up on and handed to a human vs.
+            # refused because the owner has no chat to write to.
+            owner_notify_recovered=owner_notifications.get("delivered", 0),
+            owner_notify_retrying=owner_notifications.get("retrying", 0),
+            owner_notify_exhausted=owner_notifications.get("exhausted", 0),
+            owner_notify_unaddressable=owner_notifications.get("unaddressable", 0),
+            # A record whose transition never committed: nothing was
+            # sent, nothing was spent, and the ending is owed again
+            # if routing does reach it.
+            owner_notify_voided=owner_notifications.get("voided", 0),
+        )
+
+
+async def _dispatch_on_wakeup(
+    api_client: SchedulerAPIClient,
+    redis_client: RedisStreamClient,
+    wakeup: DispatchWakeup,
+) -> None:
+    """The part of a sweep a state change can unblock, run as soon as it is announced."""
+    # Transitions announced together (one commit, one burst of result handling)
+    # are let in before the pass reads the pipeline, so they cost one pass.
+    await asyncio.sleep(_WAKEUP_SETTLE_S)
+    triggers, oldest_id = wakeup.take()
+    try:
+        async with tick_cache():
+            dispatched = await dispatch_todo_tasks(api_client, redis_client)
+            completed = await complete_stories(api_client, redis_client)
+    except Exception:
+        logger.exception("dispatcher_wakeup_error")
+        return
+    logger.info(
+        "dispatcher_wakeup_pass",
+        triggers=triggers,
+        tasks_dispatched=dispatched,
+        stories_completed=completed,
+        # Announcement to the end of the pass it caused: the event-driven share
+        # of a story's end-to-end latency.
+        trigger_age_ms=round(entry_age_s(oldest_id) * 1000, 1) if oldest_id else None,
+    )
+
+
 async def task_dispatcher_loop() -> None:
-    """Periodic loop: dispatch tasks + complete stories every 30s."""
+    """Sweep every dispatch interval; dispatch in between whenever the pipeline moves."""
     from ..clients.api import api_client
 
     redis_client = RedisStreamClient()
     await redis_client.connect()
+    wakeup = DispatchWakeup()
+    listener = asyncio.create_task(
+        follow_state_changes(redis_client, wakeup), name="dispatch_wakeup_listener"
+    )
 
     logger.info("task_dispatcher_started", interval=_dispatch_interval())
 
     try:
+        next_sweep = 0.0
         while True:
-            try:
-                scaffolds = await trigger_scaffolds(api_client, redis_client)
-                dispatched = await dispatch_todo_tasks(api_client, redis_client)
-                completed = await complete_stories(api_client, redis_client)
-                merged = await poll_merged_prs(api_client, redis_client)
-                await poll_ci_failures(api_client)
-
-                # Supervisor checks
-                stuck_stories = await supervise_stuck_stories(api_client, redis_client)
-                stuck_tasks = await supervise_stuck_tasks(api_client, redis_client)
-                failed_tasks = await supervise_failed_tasks(api_client, redis_client)
-                waiting_resources = await supervise_waiting_resource_tasks(api_client, redis_client)
-                deploying = await supervise_deploying_stories(api_client, redis_client)
-                waiting_secret = await supervise_waiting_user_secret_stories(
-                    api_client, redis_client
-                )
-                # Messages a committed terminal transition still owes are
-                # re-attempted before the routing that owes new ones. Ordered
-                # this way round, a record written by this tick's routing gets
-                # exactly the one in-tick attempt routing makes; the other way
-                # round the sweep would immediately spend a second attempt of
-                # the bound on it, in the same second.
-                owner_notifications = await supervise_owed_owner_notifications(
-                    api_client, redis_client
-                )
-                # Stories are routed on their QA runs before the access sweep
-                # runs, and that order is the delivery guarantee: a product QA
-                # has passed is handed to its owner on the tick that reads the
-                # verdict, and the cleanup of the identity it borrowed happens
-                # afterwards. Sweeping first would let a cleanup that ran out of
-                # attempts during a gap in this loop write its incident on the QA
-                # run before the story had been routed, turning a passed product
-                # into a quarantine over a leftover test user.
-                testing = await supervise_testing_stories(api_client, redis_client)
-                temporary_access = await supervise_temporary_access(api_client, redis_client)
-
-                # Always log the cycle summary for observability
-                logger.info(
-                    "dispatcher_cycle",
-                    tasks_dispatched=dispatched,
-                    stories_completed=completed,
-                    scaffolds_triggered=scaffolds,
-                    prs_merged=merged,
-                )
-                supervisor_active = (
-                    stuck_stories.get("retried", 0)
-                    + stuck_stories.get("failed", 0)
-                    + stuck_tasks.get("timed_out", 0)
-                    + failed_tasks.get("retried", 0)
-                    + failed_tasks.get("escalated", 0)
-                    + waiting_resources.get("resumed", 0)
-                    + waiting_resources.get("expired", 0)
-                    + deploying.get("tested", 0)
-                    + deploying.get("retried", 0)
-                    + deploying.get("redispatched", 0)
-                    + deploying.get("waiting", 0)
-                    + deploying.get("escalated", 0)
-                    + deploying.get("failed", 0)
-                    + waiting_secret.get("redispatched", 0)
-                    + waiting_secret.get("failed", 0)
-                    + testing.get("completed", 0)
-                    + testing.get("redispatched", 0)
-                    + testing.get("failed", 0)
-                    + temporary_access.get("dispatched", 0)
-                    + temporary_access.get("released", 0)
-                    + temporary_access.get("revoked", 0)
-                    + temporary_access.get("revoke_failed", 0)
-                    + temporary_access.get("escalated", 0)
-                    + owner_notifications["delivered"]
-                    + owner_notifications["retrying"]
-                    + owner_notifications["exhausted"]
-                    + owner_notifications["unaddressable"]
-                    + owner_notifications["voided"]
-                )
-                if supervisor_active:
-                    logger.info(
-                        "supervisor_cycle",
-                        stories_retried=stuck_stories.get("retried", 0),
-                        stories_failed=stuck_stories.get("failed", 0),
-                        tasks_timed_out=stuck_tasks.get("timed_out", 0),
-                        tasks_retried=failed_tasks.get("retried", 0),
-                        tasks_escalated=failed_tasks.get("escalated", 0),
-                        deploy_tested=deploying.get("tested", 0),
-                        deploy_retried=deploying.get("retried", 0),
-                        deploy_redispatched=deploying.get("redispatched", 0),
-                        deploy_waiting_user_secret=deploying.get("waiting", 0),
-                        deploy_escalated=deploying.get("escalated", 0),
-                        deploy_failed=deploying.get("failed", 0),
-                        user_secret_redispatched=waiting_secret.get("redispatched", 0),
-                        user_secret_failed=waiting_secret.get("failed", 0),
-                        qa_completed=testing.get("completed", 0),
-                        qa_redispatched=testing.get("redispatched", 0),
-                        qa_failed=testing.get("failed", 0),
-                        temporary_access_dispatched=temporary_access.get("dispatched", 0),
-                        temporary_access_released=temporary_access.get("released", 0),
-                        temporary_access_revoked=temporary_access.get("revoked", 0),
-                        temporary_access_expired=temporary_access.get("expired", 0),
-                        # Still being chased vs. given up on and handed to a human.
-                        temporary_access_revoke_failed=temporary_access.get("revoke_failed", 0),
-                        temporary_access_escalated=temporary_access.get("escalated", 0),
-                        # Owner notifications recovered from a committed
-                        # terminal transition whose publish did not land. Still
-                        # being chased vs. given up on and handed to a human vs.
-                        # refused because the owner has no chat to write to.
-                        owner_notify_recovered=owner_notifications["delivered"],
-                        owner_notify_retrying=owner_notifications["retrying"],
-                        owner_notify_exhausted=owner_notifications["exhausted"],
-                        owner_notify_unaddressable=owner_notifications["unaddressable"],
-                        # A record whose transition never committed: nothing was
-                        # sent, nothing was spent, and the ending is owed again
-                        # if routing does reach it.
-                        owner_notify_voided=owner_notifications["voided"],
-                    )
-            except Exception:
-                logger.exception("dispatcher_cycle_error")
-            await asyncio.sleep(_dispatch_interval())
+            remaining = next_sweep - time.monotonic()
+            if remaining <= 0:
+                # The sweep reads everything announced so far.
+                wakeup.take()
+                await _sweep(api_client, redis_client)
+                next_sweep = time.monotonic() + _dispatch_interval()
+            elif await wakeup.wait(remaining):
+                await _dispatch_on_wakeup(api_client, redis_client, wakeup)
     finally:
+        listener.cancel()
+        await asyncio.gather(listener, return_exceptions=True)
         await redis_client.close()
         logger.info("task_dispatcher_stopped")
@@ -144,8 +144,7 @@ def terminal_task_statuses(run: Any) -> tuple[TaskStatus, ...]:
 
 async def replay_terminal_attempt(api_client: Any, task_id: str, run: Any, actor: str) -> None:
     """Apply a terminal run's already-recorded outcome without changing the run."""
-    for status in terminal_task_statuses(run):
-        await api_client.transition_task(task_id, status, actor)
+    await api_client.replay_task_statuses(task_id, terminal_task_statuses(run), actor)
 
 
 async def fail_removed_attempt(api_client: Any, task: Any, run: Any) -> None:
@@ -32,8 +32,11 @@ def initialized_scheduler_config(monkeypatch):
         "scheduler.dispatch_interval_seconds": 30,
         "scheduler.github_sync_interval": 300,
         "scheduler.github_sync_missing_threshold": 3,
+        "scheduler.github_sync_concurrency": 4,
+        "scheduler.github_sync_request_budget": 300,
         "scheduler.server_sync_interval": 60,
         "scheduler.server_details_sync_interval": 300,
+        "scheduler.server_details_cache_ttl_seconds": 1800,
         "scheduler.provisioning_stuck_timeout_seconds": 1800,
         "scheduler.provisioning_trigger_cooldown_seconds": 120,
         "scheduler.scaffold_inflight_ttl": 600,
@@ -66,8 +69,12 @@ def initialized_scheduler_config(monkeypatch):
         "health.consecutive_failure_threshold": 3,
         "health.ssl_expiry_warning_days": 7,
         "health.metrics_retention_hours": 168,
+        "health.metrics_rollup_5m_retention_hours": 720,
+        "health.metrics_rollup_1h_retention_hours": 8760,
         "health.metrics_cleanup_interval_seconds": 86400,
         "health.http_timeout": 10.0,
+        "health.check_concurrency": 8,
+        "health.server_check_deadline_seconds": 30.0,
     }
     config = MagicMock()
     config.get.side_effect = values.__getitem__
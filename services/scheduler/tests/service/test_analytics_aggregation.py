@@ -21,7 +21,9 @@ from shared.analytics_health import (
     decode_heartbeat,
 )
 from shared.clients.loki import LokiClient
+from shared.redis_client import RedisStreamClient
 from src.tasks import analytics_aggregator
+from src.tasks.analytics_users import active_users
 
 LOKI_URL = os.environ["LOKI_URL"]
 INTERNAL_KEY = os.environ["INTERNAL_API_KEY"]
@@ -177,12 +179,18 @@ async def test_loki_logs_land_in_analytics_hourly(api_client, running_applicatio
     )
 
     loki = LokiClient()
+    redis_client = RedisStreamClient()
+    await redis_client.connect()
     try:
         await _wait_for_logs(loki, project_id, bucket_start, bucket_end, expected=4)
 
-        cycle = await analytics_aggregator._aggregate_hourly(loki, bucket_start, bucket_end)
+        cycle = await analytics_aggregator._aggregate_hourly(
+            loki, redis_client, bucket_start, bucket_end
+        )
+        users = await active_users(redis_client, project_id, bucket_start.date())
     finally:
         await loki.close()
+        await redis_client.close()
 
     assert project_id in cycle.attempted
     assert cycle.failed == set()
@@ -200,10 +208,11 @@ async def test_loki_logs_land_in_analytics_hourly(api_client, running_applicatio
     assert row["unique_users"] == 2
     assert row["new_users"] == 2
     assert row["p95_ms"] is not None
+    assert row["latency_sketch"]["max"] == 90.0
     assert {e["path"] for e in row["top_endpoints"]} == {"/items", "/boom"}
 
-    known = await api_client.get_known_users(project_id)
-    assert len(known) == 2
+    # Two distinct users, counted in the project's day HyperLogLog.
+    assert users.dau == 2
 
     # A cycle that collected this project reports it as healthy to the LK.
     await analytics_aggregator._record_heartbeat(datetime.now(UTC), cycle.failed)
@@ -220,10 +229,15 @@ async def test_unreachable_loki_marks_the_project_as_failing(api_client, running
     bucket_start = bucket_end - timedelta(hours=1)
 
     dead_loki = LokiClient(base_url="http://loki:3999")
+    redis_client = RedisStreamClient()
+    await redis_client.connect()
     try:
-        cycle = await analytics_aggregator._aggregate_hourly(dead_loki, bucket_start, bucket_end)
+        cycle = await analytics_aggregator._aggregate_hourly(
+            dead_loki, redis_client, bucket_start, bucket_end
+        )
     finally:
         await dead_loki.close()
+        await redis_client.close()
 
     assert project_id in cycle.failed
 
@@ -0,0 +1,101 @@
+"""Serve a mock API client's aggregate reads from its per-entity answers.
+
+Not a test module (no `test_` prefix). The dispatcher reads one
+`PipelineSnapshot` per tick, and the sweeps read a story's tasks or a page's
+stories with one batch request, while the tests were written against the
+per-entity reads they used to make — `get_task`, `get_project`,
+`get_tasks_by_story`, `get_story`, `list_runs`, `get_task_events`.
+`serve_snapshot` wires a mock client's `get_pipeline_snapshot` and batch reads
+to assemble their answers from those same mocks, the way the API assembles them
+from the tables, so each test keeps describing the pipeline the way it always
+has.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+import copy
+from typing import Any
+
+from shared.contracts.dto.pipeline import PipelineSnapshot
+from shared.contracts.dto.run import RunType
+from shared.contracts.dto.task import TaskStatus
+
+
+async def snapshot_from_mocks(api_client: Any) -> PipelineSnapshot:
+    """The snapshot the API would serve for the pipeline the mocks describe."""
+    todo = await api_client.get_tasks_by_status(TaskStatus.TODO)
+    story_tasks: dict[str, Any] = {}
+    blockers: dict[str, Any] = {}
+    projects: dict[str, Any] = {}
+    engineering_runs: dict[str, Any] = {}
+    for task in todo:
+        if task.blocked_by_task_id and task.blocked_by_task_id not in blockers:
+            blockers[task.blocked_by_task_id] = await api_client.get_task(task.blocked_by_task_id)
+        project_id = str(task.project_id)
+        if project_id not in projects:
+            project = await api_client.get_project(project_id)
+            # A project that no longer exists is absent from the snapshot.
+            if project is not None:
+                projects[project_id] = project
+        if task.story_id and task.story_id not in story_tasks:
+            story_tasks[task.story_id] = await api_client.get_tasks_by_story(task.story_id)
+        engineering_runs[task.id] = await api_client.list_runs(
+            task_id=task.id, run_type=RunType.ENGINEERING.value
+        )
+
+    iteration_events: dict[str, Any] = {}
+    for siblings in story_tasks.values():
+        for sibling in siblings:
+            if sibling.status == TaskStatus.DONE and sibling.id not in iteration_events:
+                iteration_events[sibling.id] = await api_client.get_task_events(sibling.id)
+
+    # Built without validation: the mocks hand back stand-ins, not DTOs.
+    return PipelineSnapshot.model_construct(
+        todo_tasks=list(todo),
+        story_tasks=story_tasks,
+        blockers=blockers,
+        projects=projects,
+        engineering_runs=engineering_runs,
+        iteration_events=iteration_events,
+    )
+
+
+def _of_story(task: Any, story_id: str) -> Any:
+    """*task* as the API lists it under *story_id*: carrying that story's id."""
+    if hasattr(task, "model_copy"):
+        return task.model_copy(update={"story_id": story_id})
+    listed = copy.copy(task)
+    listed.story_id = story_id
+    return listed
+
+
+async def tasks_of_stories_from_mocks(api_client: Any, story_ids: Iterable[str]) -> list:
+    """What `GET /tasks/batch?story_ids=` would answer for the mocked stories."""
+    tasks = []
+    for story_id in dict.fromkeys(story_ids):
+        tasks.extend(_of_story(t, story_id) for t in await api_client.get_tasks_by_story(story_id))
+    return tasks
+
+
+async def stories_from_mocks(api_client: Any, story_ids: Iterable[str]) -> list:
+    """What `GET /stories/batch?ids=` would answer: every story `get_story` knows."""
+    return [await api_client.get_story(story_id) for story_id in dict.fromkeys(story_ids)]
+
+
+def serve_snapshot(api_client: Any) -> Any:
+    """Make *api_client*'s snapshot and batch reads answer from its other mocks."""
+
+    async def _snapshot() -> PipelineSnapshot:
+        return await snapshot_from_mocks(api_client)
+
+    async def _tasks_of_stories(story_ids: Iterable[str]) -> list:
+        return await tasks_of_stories_from_mocks(api_client, story_ids)
+
+    async def _stories(story_ids: Iterable[str]) -> list:
+        return await stories_from_mocks(api_client, story_ids)
+
+    api_client.get_pipeline_snapshot.side_effect = _snapshot
+    api_client.get_tasks_by_story_ids.side_effect = _tasks_of_stories
+    api_client.get_stories_by_ids.side_effect = _stories
+    return api_client
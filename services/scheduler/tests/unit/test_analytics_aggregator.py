@@ -6,13 +6,30 @@ import os
 os.environ.setdefault("API_BASE_URL", "http://test:8000")
 os.environ.setdefault("LOKI_URL", "http://test:3100")
 
+import asyncio
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fakeredis import aioredis
 import pytest
 
+from shared.latency_sketch import LatencySketch
+from shared.tests.mocks.loki import FakeLoki
 from src.tasks.analytics_aggregator import (
+    _aggregate_hourly,
+    _aggregate_project_hourly,
+    _collect_traffic,
+    _hash_user_id,
     analytics_aggregator_worker,
     compute_daily_rollup,
     compute_hourly_metrics,
 )
+from src.tasks.analytics_users import ActiveUsers, active_users, has_lifetime
+
+PROJECT_ID = "11111111-1111-1111-1111-111111111111"
+BUCKET_START = datetime(2026, 3, 20, 10, tzinfo=UTC)
+BUCKET_END = BUCKET_START + timedelta(hours=1)
 
 
 def _make_request_log(
@@ -33,83 +50,227 @@ def _make_request_log(
     }
 
 
+def _push(loki: FakeLoki, logs: list, service="backend", project_id=PROJECT_ID, start=None):
+    start = start or BUCKET_START + timedelta(seconds=1)
+    loki.push(
+        {"job": "docker", "project_id": project_id, "compose_service": service},
+        [(start + timedelta(milliseconds=i), log) for i, log in enumerate(logs)],
+    )
+
+
+async def _hourly(logs: list, new_users: int = 0, loki: FakeLoki | None = None):
+    loki = loki or FakeLoki()
+    _push(loki, logs)
+    traffic = await _collect_traffic(
+        loki.client(), PROJECT_ID, {"backend"}, BUCKET_START, BUCKET_END
+    )
+    return compute_hourly_metrics(traffic["backend"], new_users)
+
+
+@pytest.fixture
+def redis_client():
+    client = MagicMock()
+    client.redis = aioredis.FakeRedis(decode_responses=True)
+    return client
+
+
 class TestComputeHourlyMetrics:
-    def test_basic_request_counting(self):
+    async def test_basic_request_counting(self):
         logs = [_make_request_log(), _make_request_log(), _make_request_log()]
-        result = compute_hourly_metrics(logs, set())
+        result = await _hourly(logs)
         assert result["total_requests"] == 3
 
-    def test_error_counting_5xx(self):
+    async def test_error_counting_5xx(self):
         logs = [
             _make_request_log(status_code=200),
             _make_request_log(status_code=500),
             _make_request_log(status_code=503),
         ]
-        result = compute_hourly_metrics(logs, set())
+        result = await _hourly(logs)
         assert result["error_count"] == 2
 
-    def test_error_counting_level_error(self):
+    async def test_error_counting_level_error(self):
         logs = [_make_request_log(level="error", status_code=200)]
-        result = compute_hourly_metrics(logs, set())
+        result = await _hourly(logs)
         assert result["error_count"] == 1
 
-    def test_unique_users(self):
+    async def test_unique_users(self):
         logs = [
             _make_request_log(user_id="tg:1"),
             _make_request_log(user_id="tg:2"),
             _make_request_log(user_id="tg:1"),  # duplicate
         ]
-        result = compute_hourly_metrics(logs, set())
+        result = await _hourly(logs)
         assert result["unique_users"] == 2
 
-    def test_new_users_vs_known(self):
-        # Pre-hash user tg:1
-        from src.tasks.analytics_aggregator import _hash_user_id
-
-        known = {_hash_user_id("tg:1")}
+    async def test_new_users_are_passed_through(self):
         logs = [
             _make_request_log(user_id="tg:1"),
             _make_request_log(user_id="tg:2"),
         ]
-        result = compute_hourly_metrics(logs, known)
+        result = await _hourly(logs, new_users=1)
         assert result["unique_users"] == 2
-        assert result["new_users"] == 1  # only tg:2 is new
+        assert result["new_users"] == 1
 
-    def test_percentiles(self):
+    async def test_percentiles(self):
         logs = [_make_request_log(duration_ms=d) for d in [10, 20, 30, 40, 50]]
-        result = compute_hourly_metrics(logs, set())
-        assert result["p50_ms"] is not None
+        result = await _hourly(logs)
+        assert result["p50_ms"] == pytest.approx(30.0, rel=0.01)
         assert result["p95_ms"] is not None
+        assert result["p99_ms"] is not None
+
+    async def test_the_hour_keeps_a_mergeable_latency_sketch(self):
+        logs = [_make_request_log(duration_ms=d) for d in [10, 20, 30, 40, 50]]
+        result = await _hourly(logs)
+        sketch = LatencySketch.from_dict(result["latency_sketch"])
+        assert sketch.count == 5
+        assert (sketch.min, sketch.max) == (10, 50)
 
-    def test_top_endpoints(self):
+    async def test_users_without_a_duration_still_count(self):
+        bot_update = {"event": "request", "command": "/start", "user_id": "tg:some one"}
+        result = await _hourly([bot_update, _make_request_log(user_id="")])
+        assert result["unique_users"] == 1
+        assert LatencySketch.from_dict(result["latency_sketch"]).count == 1
+
+    async def test_top_endpoints(self):
         logs = [
             _make_request_log(path="/start"),
             _make_request_log(path="/start"),
             _make_request_log(path="/help"),
         ]
-        result = compute_hourly_metrics(logs, set())
+        result = await _hourly(logs)
         assert result["top_endpoints"][0]["path"] == "/start"
         assert result["top_endpoints"][0]["count"] == 2
 
-    def test_non_request_events_ignored(self):
+    async def test_bot_commands_count_as_endpoints(self):
+        command = {"event": "request", "command": "/start", "duration_ms": 5.0, "user_id": "tg:7"}
+        result = await _hourly([command, command, _make_request_log(path="/api/items")])
+        assert result["top_endpoints"] == [
+            {"path": "/start", "count": 2},
+            {"path": "/api/items", "count": 1},
+        ]
+
+    async def test_non_request_events_ignored(self):
         logs = [
             {"event": "startup", "service": "backend"},
             _make_request_log(),
         ]
-        result = compute_hourly_metrics(logs, set())
+        result = await _hourly(logs)
         assert result["total_requests"] == 1
 
-    def test_empty_logs(self):
-        result = compute_hourly_metrics([], set())
+    async def test_empty_logs(self):
+        result = await _hourly([])
         assert result["total_requests"] == 0
         assert result["unique_users"] == 0
         assert result["p50_ms"] is None
 
-    def test_seen_users_output(self):
+    async def test_user_ids_stay_out_of_the_hourly_row(self):
         logs = [_make_request_log(user_id="tg:42")]
-        result = compute_hourly_metrics(logs, set())
-        assert len(result["seen_users"]) == 1
-        assert "user_id_hash" in result["seen_users"][0]
+        result = await _hourly(logs)
+        assert result["unique_users"] == 1
+        assert "tg:42" not in str(result)
+
+    async def test_logs_outside_the_bucket_are_not_counted(self):
+        loki = FakeLoki()
+        _push(loki, [_make_request_log()], start=BUCKET_END)
+        _push(loki, [_make_request_log()], start=BUCKET_START - timedelta(microseconds=1))
+        result = await _hourly([_make_request_log()], loki=loki)
+        assert result["total_requests"] == 1
+
+
+class TestHighTrafficHour:
+    """An hour past Loki's entry limit is counted whole, without pulling every line."""
+
+    async def test_every_request_beyond_the_entry_limit_is_counted(self):
+        loki = FakeLoki(max_entries_limit=5000)
+        logs = [_make_request_log(user_id=f"tg:{i % 7000}") for i in range(12_000)]
+
+        result = await _hourly(logs, loki=loki)
+
+        assert result["total_requests"] == 12_000
+        assert result["unique_users"] == 7000
+        # Counts come back as one series per service; only user ids are
+        # paged through, as bare ids, 5000 at a time.
+        assert len(loki.queries("/loki/api/v1/query_range")) == 3
+
+    async def test_counting_is_metric_queries_and_latencies_share_the_user_pages(self):
+        loki = FakeLoki()
+
+        await _hourly([_make_request_log()], loki=loki)
+
+        queries = loki.queries()
+        assert any(q.startswith("sum by (compose_service) (count_over_time(") for q in queries)
+        # Loki's quantiles cannot be merged into daily ones, so none are asked for.
+        assert not any(q.startswith("quantile_over_time(") for q in queries)
+        (paged,) = loki.queries("/loki/api/v1/query_range")
+        assert paged.endswith('line_format "{{.duration_ms}} {{.user_id}}"')
+
+
+class TestConcurrentProjects:
+    async def test_projects_are_aggregated_side_by_side(self):
+        apps = [
+            SimpleNamespace(repo_id=i, service_name="backend", status="running") for i in range(4)
+        ]
+        repos = [SimpleNamespace(id=i, project_id=f"project-{i}") for i in range(4)]
+        api = AsyncMock()
+        api.get_applications = AsyncMock(return_value=apps)
+        api.get_repositories = AsyncMock(return_value=repos)
+        running = peak = 0
+
+        async def aggregate(*_args):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        with (
+            patch("src.tasks.analytics_aggregator.api_client", api),
+            patch(
+                "src.tasks.analytics_aggregator._aggregate_project_hourly", side_effect=aggregate
+            ),
+        ):
+            cycle = await _aggregate_hourly(AsyncMock(), MagicMock(), BUCKET_START, BUCKET_END)
+
+        assert cycle.attempted == {f"project-{i}" for i in range(4)}
+        assert cycle.failed == set()
+        assert peak == 4
+        # One repository read for the cycle, not one per application.
+        api.get_repositories.assert_awaited_once()
+
+    async def test_one_failing_project_does_not_stop_the_others(self):
+        apps = [SimpleNamespace(repo_id=i, service_name="backend") for i in range(2)]
+        repos = [SimpleNamespace(id=i, project_id=f"project-{i}") for i in range(2)]
+        api = AsyncMock()
+        api.get_applications = AsyncMock(return_value=apps)
+        api.get_repositories = AsyncMock(return_value=repos)
+
+        async def aggregate(_loki, _redis, project_id, *_args):
+            if project_id == "project-0":
+                raise RuntimeError("loki down")
+
+        with (
+            patch("src.tasks.analytics_aggregator.api_client", api),
+            patch(
+                "src.tasks.analytics_aggregator._aggregate_project_hourly", side_effect=aggregate
+            ),
+        ):
+            cycle = await _aggregate_hourly(AsyncMock(), MagicMock(), BUCKET_START, BUCKET_END)
+
+        assert cycle.failed == {"project-0"}
+
+
+_NO_USERS = ActiveUsers(dau=0, wau=0, mau=0)
+
+
+def _hour(p95_ms: float) -> dict:
+    return {
+        "total_requests": 100,
+        "error_count": 0,
+        "unique_users": 5,
+        "new_users": 1,
+        "p95_ms": p95_ms,
+    }
 
 
 class TestComputeDailyRollup:
@@ -130,11 +291,41 @@ class TestComputeDailyRollup:
                 "p95_ms": 80.0,
             },
         ]
-        result = compute_daily_rollup(hourly, [])
+        result = compute_daily_rollup(hourly, _NO_USERS)
         assert result["total_requests"] == 300
         assert result["error_count"] == 15
         assert result["new_users"] == 10
 
+    def test_p95_is_read_from_the_merged_hourly_sketches(self):
+        quiet, busy = LatencySketch(), LatencySketch()
+        for _ in range(10):
+            quiet.add(500.0)  # a few slow requests in a quiet hour
+        for i in range(990):
+            busy.add(10.0 + i % 10)
+        hourly = [
+            {**_hour(p95_ms=500.0), "latency_sketch": quiet.to_dict()},
+            {**_hour(p95_ms=19.0), "latency_sketch": busy.to_dict()},
+        ]
+
+        result = compute_daily_rollup(hourly, _NO_USERS)
+
+        # 1% of the day's requests were slow: they are not its p95.
+        assert result["p95_ms"] == pytest.approx(19.0, rel=0.01)
+        assert LatencySketch.from_dict(result["latency_sketch"]).count == 1000
+
+    def test_rows_without_a_sketch_fall_back_to_the_worst_p95(self):
+        sketch = LatencySketch()
+        sketch.add(10.0)
+        hourly = [
+            {**_hour(p95_ms=10.0), "latency_sketch": sketch.to_dict()},
+            _hour(p95_ms=70.0),
+        ]
+
+        result = compute_daily_rollup(hourly, _NO_USERS)
+
+        assert result["p95_ms"] == 70.0
+        assert result["latency_sketch"] is None
+
     def test_worst_of_p95(self):
         hourly = [
             {
@@ -159,7 +350,7 @@ class TestComputeDailyRollup:
                 "p95_ms": 60.0,
             },
         ]
-        result = compute_daily_rollup(hourly, [])
+        result = compute_daily_rollup(hourly, _NO_USERS)
         assert result["p95_ms"] == 90.0
 
     def test_error_rate(self):
@@ -172,54 +363,79 @@ class TestComputeDailyRollup:
                 "p95_ms": 50.0,
             },
         ]
-        result = compute_daily_rollup(hourly, [])
+        result = compute_daily_rollup(hourly, _NO_USERS)
         assert result["error_rate"] == 0.1
 
-    def test_dau_is_max_hourly(self):
-        hourly = [
-            {
-                "total_requests": 100,
-                "error_count": 0,
-                "unique_users": 5,
-                "new_users": 1,
-                "p95_ms": 50.0,
-            },
-            {
-                "total_requests": 100,
-                "error_count": 0,
-                "unique_users": 15,
-                "new_users": 1,
-                "p95_ms": 50.0,
-            },
-        ]
-        result = compute_daily_rollup(hourly, [])
-        assert result["dau"] == 15
+    def test_user_counts_come_from_the_hyperloglogs(self):
+        hourly = [_hour(p95_ms=50.0), _hour(p95_ms=50.0)]
+        result = compute_daily_rollup(hourly, ActiveUsers(dau=15, wau=60, mau=200))
+        # Not the sum (or the max) of hourly uniques: the day's distinct users.
+        assert (result["unique_users"], result["dau"]) == (15, 15)
+        assert (result["wau"], result["mau"]) == (60, 200)
 
     def test_returning_users(self):
-        hourly = [
-            {
-                "total_requests": 100,
-                "error_count": 0,
-                "unique_users": 10,
-                "new_users": 3,
-                "p95_ms": 50.0,
-            },
-        ]
-        known_users = [
-            {"user_id_hash": f"hash{i}", "first_seen": "2026-01-01", "last_seen": "2026-03-20"}
-            for i in range(10)
-        ]
-        result = compute_daily_rollup(hourly, known_users)
-        # 10 known - 3 new = 7 returning
+        hourly = [{**_hour(p95_ms=50.0), "unique_users": 10, "new_users": 3}]
+        result = compute_daily_rollup(hourly, ActiveUsers(dau=10, wau=10, mau=10))
+        # 10 users today - 3 new = 7 returning
         assert result["returning_users"] == 7
 
     def test_empty_hourly(self):
-        result = compute_daily_rollup([], [])
+        result = compute_daily_rollup([], _NO_USERS)
         assert result["total_requests"] == 0
         assert result["error_rate"] == 0.0
         assert result["dau"] == 0
 
 
+class TestProjectHour:
+    """An hour of a project: Loki traffic in, user counts in Redis, hourly rows out."""
+
+    async def test_new_users_are_counted_once_across_hours(self, redis_client):
+        loki = FakeLoki()
+        _push(loki, [_make_request_log(user_id="tg:1"), _make_request_log(user_id="tg:2")])
+        next_hour = BUCKET_START + timedelta(hours=1, seconds=1)
+        _push(
+            loki,
+            [_make_request_log(user_id="tg:2"), _make_request_log(user_id="tg:3")],
+            start=next_hour,
+        )
+        api = AsyncMock()
+        api.get_known_users = AsyncMock(return_value=[])
+
+        with patch("src.tasks.analytics_aggregator.api_client", api):
+            for hour in range(2):
+                start = BUCKET_START + timedelta(hours=hour)
+                await _aggregate_project_hourly(
+                    loki.client(),
+                    redis_client,
+                    PROJECT_ID,
+                    {"backend"},
+                    start,
+                    start + timedelta(hours=1),
+                )
+
+        rows = [c.args[0] for c in api.upsert_analytics_hourly.await_args_list]
+        assert [(r["unique_users"], r["new_users"]) for r in rows] == [(2, 2), (2, 1)]
+        users = await active_users(redis_client, PROJECT_ID, BUCKET_START.date())
+        assert users == ActiveUsers(dau=3, wau=3, mau=3)
+        # Known users are read once, to seed the lifetime key, not every hour.
+        api.get_known_users.assert_awaited_once()
+
+    async def test_users_known_before_the_upgrade_are_not_new(self, redis_client):
+        loki = FakeLoki()
+        _push(loki, [_make_request_log(user_id="tg:1"), _make_request_log(user_id="tg:2")])
+        api = AsyncMock()
+        api.get_known_users = AsyncMock(return_value=[{"user_id_hash": _hash_user_id("tg:1")}])
+
+        with patch("src.tasks.analytics_aggregator.api_client", api):
+            await _aggregate_project_hourly(
+                loki.client(), redis_client, PROJECT_ID, {"backend"}, BUCKET_START, BUCKET_END
+            )
+
+        (row,) = [c.args[0] for c in api.upsert_analytics_hourly.await_args_list]
+        assert (row["unique_users"], row["new_users"]) == (2, 1)
+        assert await has_lifetime(redis_client, PROJECT_ID)
+
+
 class TestAggregatorConfig:
     """A missing read address is a config failure, not an idle mode."""
 
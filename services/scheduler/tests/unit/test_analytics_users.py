@@ -0,0 +1,82 @@
+"""Unit tests for the per-project user HyperLogLogs of the analytics aggregator."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from unittest.mock import MagicMock
+
+from fakeredis import aioredis
+import pytest
+
+from src.tasks.analytics_users import (
+    DAY_KEY_TTL_SECONDS,
+    ActiveUsers,
+    active_users,
+    day_key,
+    has_lifetime,
+    lifetime_key,
+    record_users,
+    seed_lifetime,
+)
+
+PROJECT_ID = "p-1"
+_DAY = date(2026, 10, 16)
+
+
+@pytest.fixture
+def redis_client():
+    client = MagicMock()
+    client.redis = aioredis.FakeRedis(decode_responses=True)
+    return client
+
+
+class TestRecordUsers:
+    async def test_a_user_is_new_only_the_first_time(self, redis_client):
+        first = await record_users(redis_client, PROJECT_ID, _DAY, {"api": {"a", "b"}})
+        second = await record_users(redis_client, PROJECT_ID, _DAY, {"api": {"b", "c"}})
+
+        assert first == {"api": 2}
+        assert second == {"api": 1}
+
+    async def test_a_user_of_several_services_is_new_in_the_first(self, redis_client):
+        new = await record_users(
+            redis_client, PROJECT_ID, _DAY, {"bot": {"a", "b"}, "api": {"a"}, "web": set()}
+        )
+
+        assert new == {"api": 1, "bot": 1, "web": 0}
+
+    async def test_seeded_users_are_not_new(self, redis_client):
+        await seed_lifetime(redis_client, PROJECT_ID, ["a", "b"])
+
+        new = await record_users(redis_client, PROJECT_ID, _DAY, {"api": {"a", "c"}})
+
+        assert new == {"api": 1}
+        assert await has_lifetime(redis_client, PROJECT_ID)
+
+    async def test_keys_expire_and_leave_no_scratch_behind(self, redis_client):
+        await record_users(redis_client, PROJECT_ID, _DAY, {"api": {"a"}})
+
+        keys = set(await redis_client.redis.keys("*"))
+        assert keys == {lifetime_key(PROJECT_ID), day_key(PROJECT_ID, _DAY)}
+        assert 0 < await redis_client.redis.ttl(day_key(PROJECT_ID, _DAY)) <= DAY_KEY_TTL_SECONDS
+        assert await redis_client.redis.ttl(lifetime_key(PROJECT_ID)) > DAY_KEY_TTL_SECONDS
+
+    async def test_an_empty_seed_leaves_the_project_unseeded(self, redis_client):
+        await seed_lifetime(redis_client, PROJECT_ID, [])
+
+        assert not await has_lifetime(redis_client, PROJECT_ID)
+
+
+class TestActiveUsers:
+    async def test_windows_merge_the_days_they_cover(self, redis_client):
+        for back, users in ((0, {"a", "b"}), (3, {"b", "c"}), (10, {"d"}), (40, {"e"})):
+            await record_users(
+                redis_client, PROJECT_ID, _DAY - timedelta(days=back), {"api": users}
+            )
+
+        users = await active_users(redis_client, PROJECT_ID, _DAY)
+
+        assert users == ActiveUsers(dau=2, wau=3, mau=4)
+
+    async def test_a_project_without_users(self, redis_client):
+        assert await active_users(redis_client, PROJECT_ID, _DAY) == ActiveUsers(0, 0, 0)
@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from shared.log_config.correlation import clear_context, set_correlation_id
+from src.clients.tick_cache import tick_cache
 
 _INTERNAL_KEY = "test-internal-key"
 _CORRELATION_ID = "corr-scheduler-test"
@@ -43,6 +45,7 @@ def _mock_http(response_data: dict | list, status_code: int = 200) -> AsyncMock:
     mock_resp.json.return_value = response_data
     mock_resp.raise_for_status = MagicMock()
     mock_resp.status_code = status_code
+    mock_resp.headers = {}
     mock_client = AsyncMock()
     mock_client.request = AsyncMock(return_value=mock_resp)
     mock_client.is_closed = False
@@ -137,6 +140,79 @@ class TestUpdateTask:
         assert result.current_iteration == 2
 
 
+class TestCompoundTaskTransitions:
+    @pytest.mark.asyncio
+    async def test_retry_sends_the_iteration_with_the_move(self, api_client):
+        mock = _mock_http(_task_data(status="todo", current_iteration=2))
+        api_client._client = mock
+
+        result = await api_client.retry_task("task-1", next_iteration=2, actor="supervisor")
+
+        mock.request.assert_awaited_once_with(
+            "POST",
+            "/api/tasks/task-1/retry",
+            headers=_INTERNAL_HEADERS,
+            json={"actor": "supervisor", "next_iteration": 2},
+        )
+        assert result.current_iteration == 2
+
+    @pytest.mark.asyncio
+    async def test_a_retry_the_api_refuses_as_a_conflict_answers_none(self, api_client):
+        import httpx
+
+        refused = httpx.Response(
+            409, request=httpx.Request("POST", "http://api/tasks/task-1/retry")
+        )
+        api_client.request = AsyncMock(
+            side_effect=httpx.HTTPStatusError("conflict", request=refused.request, response=refused)
+        )
+
+        assert await api_client.retry_task("task-1", next_iteration=3) is None
+
+    @pytest.mark.asyncio
+    async def test_replay_sends_the_whole_chain_in_one_request(self, api_client):
+        from shared.contracts.dto.task import TaskStatus
+
+        mock = _mock_http(_task_data(status="done"))
+        api_client._client = mock
+
+        await api_client.replay_task_statuses(
+            "task-1", (TaskStatus.IN_CI, TaskStatus.TESTING, TaskStatus.DONE), "supervisor"
+        )
+
+        mock.request.assert_awaited_once_with(
+            "POST",
+            "/api/tasks/task-1/replay",
+            headers=_INTERNAL_HEADERS,
+            json={"statuses": ["in_ci", "testing", "done"], "actor": "supervisor"},
+        )
+
+
+class TestGetPipelineSnapshot:
+    @pytest.mark.asyncio
+    async def test_one_request_returns_the_keyed_snapshot(self, api_client):
+        todo = _task_data(id="task-2", status="todo", story_id="story-1")
+        mock = _mock_http(
+            {
+                "todo_tasks": [todo],
+                "story_tasks": {"story-1": [_task_data(id="task-1", status="done"), todo]},
+                "blockers": {},
+                "projects": {},
+                "engineering_runs": {},
+                "iteration_events": {},
+            }
+        )
+        api_client._client = mock
+
+        snapshot = await api_client.get_pipeline_snapshot()
+
+        mock.request.assert_awaited_once_with(
+            "GET", "/api/pipeline/snapshot", headers=_INTERNAL_HEADERS
+        )
+        assert [task.id for task in snapshot.todo_tasks] == ["task-2"]
+        assert [task.status for task in snapshot.story_tasks["story-1"]] == ["done", "todo"]
+
+
 class TestFailStory:
     @pytest.mark.asyncio
     async def test_fail_story_posts_to_fail_endpoint(self, api_client):
@@ -324,6 +400,42 @@ class TestDeleteOldMetricsHistory:
         assert result["deleted"] == 42
 
 
+class TestMetricsHistoryTiers:
+    @pytest.mark.asyncio
+    async def test_bulk_write_is_one_post(self, api_client):
+        mock = _mock_http({"inserted": 2, "unknown_servers": []})
+        api_client._client = mock
+        snapshots = [
+            {"server_handle": "vps-1", "metrics": {"cpu": 1.0}},
+            {"server_handle": "vps-2", "metrics": {"cpu": 2.0}},
+        ]
+
+        result = await api_client.create_metrics_history_bulk(snapshots)
+
+        mock.request.assert_called_once_with(
+            "POST",
+            "/api/servers/metrics-history/bulk",
+            headers=_INTERNAL_HEADERS,
+            json={"snapshots": snapshots},
+        )
+        assert result["inserted"] == 2
+
+    @pytest.mark.asyncio
+    async def test_delete_old_rollups_names_the_tier(self, api_client):
+        mock = _mock_http({"deleted": 7})
+        api_client._client = mock
+
+        result = await api_client.delete_old_metrics_rollups(300, 720)
+
+        mock.request.assert_called_once_with(
+            "DELETE",
+            "/api/servers/metrics-history/rollups",
+            headers=_INTERNAL_HEADERS,
+            params={"resolution_seconds": 300, "retention_hours": 720},
+        )
+        assert result["deleted"] == 7
+
+
 class TestGetApplications:
     @pytest.mark.asyncio
     async def test_get_applications_no_filters(self, api_client):
@@ -469,3 +581,163 @@ class TestGetLatestRunByStory:
         run = await api_client.get_latest_run_by_story("story-1", run_type="deploy")
 
         assert run is None
+
+
+class TestListRuns:
+    @pytest.mark.asyncio
+    async def test_a_metadata_filter_is_sent_as_one_json_object(self, api_client):
+        mock = _mock_http([_run_data()])
+        api_client._client = mock
+
+        runs = await api_client.list_runs(
+            task_id="task-1", run_type="engineering", metadata={"iteration": 2}
+        )
+
+        assert [run.id for run in runs] == [_run_data()["id"]]
+        params = mock.request.call_args.kwargs["params"]
+        assert params["metadata"] == '{"iteration": 2}'
+        assert params["task_id"] == "task-1"
+
+
+class TestTickCache:
+    @pytest.mark.asyncio
+    async def test_a_read_repeated_within_a_tick_is_sent_once(self, api_client):
+        mock = _mock_http(_task_data())
+        api_client._client = mock
+
+        async with tick_cache() as reads:
+            first = await api_client.get_task("task-1")
+            second = await api_client.get_task("task-1")
+
+        assert mock.request.await_count == 1
+        assert (reads.misses, reads.hits) == (1, 1)
+        # Each caller still gets a DTO of its own.
+        assert first == second
+        assert first is not second
+
+    @pytest.mark.asyncio
+    async def test_outside_a_tick_every_read_is_sent(self, api_client):
+        mock = _mock_http(_task_data())
+        api_client._client = mock
+
+        await api_client.get_task("task-1")
+        await api_client.get_task("task-1")
+
+        assert mock.request.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_identical_reads_in_flight_together_share_one_request(self, api_client):
+        mock = _mock_http([])
+        response = mock.request.return_value
+
+        async def slow_request(*_args, **_kwargs):
+            await asyncio.sleep(0.01)
+            return response
+
+        mock.request.side_effect = slow_request
+        api_client._client = mock
+
+        async with tick_cache():
+            await asyncio.gather(
+                api_client.list_runs(task_id="task-1", run_type="engineering"),
+                api_client.list_runs(task_id="task-1", run_type="engineering"),
+                api_client.list_runs(task_id="task-2", run_type="engineering"),
+            )
+
+        assert mock.request.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_the_clients_own_write_drops_what_was_read(self, api_client):
+        mock = _mock_http(_task_data())
+        api_client._client = mock
+
+        async with tick_cache():
+            await api_client.get_task("task-1")
+            await api_client.update_task("task-1", {"priority": 1})
+            await api_client.get_task("task-1")
+
+        methods = [call.args[0] for call in mock.request.await_args_list]
+        assert methods == ["GET", "PATCH", "GET"]
+
+    @pytest.mark.asyncio
+    async def test_a_server_error_is_not_repeated_for_the_rest_of_the_tick(self, api_client):
+        mock = _mock_http({}, status_code=503)
+        api_client._client = mock
+
+        async with tick_cache():
+            await api_client.get_raw("tasks/task-1")
+            await api_client.get_raw("tasks/task-1")
+
+        assert mock.request.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_a_read_that_raised_is_tried_again(self, api_client):
+        mock = _mock_http(_task_data())
+        response = mock.request.return_value
+        mock.request.side_effect = [ConnectionError("reset"), response]
+        api_client._client = mock
+
+        async with tick_cache():
+            with pytest.raises(ConnectionError):
+                await api_client.get_task("task-1")
+            task = await api_client.get_task("task-1")
+
+        assert task.id == "task-1"
+        assert mock.request.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_a_write_in_one_lane_keeps_what_the_other_lane_read(self, api_client):
+        mock = _mock_http({})
+        response = mock.request.return_value
+
+        async def interleaved_request(*_args, **_kwargs):
+            # Hand the turn to the other lane on every request, as a real
+            # round trip would.
+            await asyncio.sleep(0)
+            return response
+
+        mock.request.side_effect = interleaved_request
+        api_client._client = mock
+
+        async def task_lane():
+            for task_id in ("task-1", "task-2", "task-3"):
+                await api_client.get_raw("projects/project-1")
+                await api_client.get_raw("runs/", params={"task_id": task_id})
+                await api_client.post_raw(f"tasks/{task_id}/transition")
+                await api_client.get_raw("runs/", params={"task_id": task_id})
+
+        async def story_lane():
+            for story_id in ("story-1", "story-2", "story-3"):
+                await api_client.get_raw("projects/project-1")
+                await api_client.get_raw("stories/story-1")
+                await api_client.post_raw(f"stories/{story_id}/fail")
+
+        async with tick_cache() as reads:
+            await asyncio.gather(task_lane(), story_lane())
+
+        sent = [call.args[1] for call in mock.request.await_args_list]
+        # The project both lanes read is sent once and the story the story lane
+        # rereads is kept until the lane writes it; the runs of a task are
+        # read again after the task's own write.
+        assert sent.count("/api/projects/project-1") == 1
+        assert sent.count("/api/stories/story-1") == 2  # noqa: PLR2004
+        assert sent.count("/api/runs/") == 6  # noqa: PLR2004
+        assert (reads.misses, reads.hits) == (9, 6)
+
+    @pytest.mark.asyncio
+    async def test_a_write_drops_the_reads_naming_its_row(self, api_client):
+        mock = _mock_http({})
+        api_client._client = mock
+
+        async with tick_cache():
+            await api_client.get_raw("tasks/batch", params={"ids": ["task-1", "task-2"]})
+            await api_client.get_raw("tasks/", params={"status": "todo"})
+            await api_client.patch_raw("stories/story-9", json={})
+            await api_client.get_raw("tasks/batch", params={"ids": ["task-1", "task-2"]})
+            await api_client.get_raw("tasks/", params={"status": "todo"})
+            await api_client.patch_raw("tasks/task-2", json={})
+            await api_client.get_raw("tasks/batch", params={"ids": ["task-1", "task-2"]})
+            await api_client.get_raw("tasks/", params={"status": "todo"})
+
+        methods = [call.args[0] for call in mock.request.await_args_list]
+        assert methods == ["GET", "GET", "PATCH", "PATCH", "GET", "GET"]
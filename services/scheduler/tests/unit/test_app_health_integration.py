@@ -14,6 +14,7 @@ os.environ.setdefault("HEALTH_CHECK_INTERVAL", "60")
 from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from fakeredis import aioredis
 import pytest
 
 from shared.contracts.dto.application import ApplicationDTO
@@ -43,6 +44,13 @@ def _make_app(
     )
 
 
+@pytest.fixture
+def redis_client():
+    client = MagicMock()
+    client.redis = aioredis.FakeRedis(decode_responses=True)
+    return client
+
+
 @pytest.fixture
 def mock_api():
     """Full mock API client for integration test."""
@@ -61,15 +69,8 @@ def mock_api():
 class TestFullProbeFlow:
     """End-to-end flow: create app → probe → verify updates + history + incidents."""
 
-    @pytest.fixture(autouse=True)
-    def _clear_state(self):
-        """Clear module-level state between tests."""
-        import src.tasks.app_health_prober as mod
-
-        mod._consecutive_failures.clear()
-
     @pytest.mark.asyncio
-    async def test_healthy_app_full_flow(self, mock_api):
+    async def test_healthy_app_full_flow(self, mock_api, redis_client):
         """Healthy app: status=running, response_time set, history created."""
         import src.tasks.app_health_prober as prober
 
@@ -90,7 +91,7 @@ class TestFullProbeFlow:
             mock_http.return_value = health_result
             mock_ssl.return_value = datetime.now(UTC) + timedelta(days=90)
 
-            await prober.app_health_probe_cycle(mock_api)
+            await prober.app_health_probe_cycle(mock_api, redis_client)
 
         # Application updated with running status + response time
         mock_api.update_application.assert_called()
@@ -111,7 +112,7 @@ class TestFullProbeFlow:
         mock_api.create_incident.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_three_failures_then_recovery_flow(self, mock_api):
+    async def test_three_failures_then_recovery_flow(self, mock_api, redis_client):
         """3 consecutive failures → SERVICE_DOWN → recovery → auto-resolve."""
         import src.tasks.app_health_prober as prober
 
@@ -137,7 +138,7 @@ class TestFullProbeFlow:
             for _ in range(3):
                 mock_http.return_value = fail_result
                 mock_api.get_active_incidents.return_value = []
-                await prober.app_health_probe_cycle(mock_api)
+                await prober.app_health_probe_cycle(mock_api, redis_client)
 
             # SERVICE_DOWN incident should have been created
             assert mock_api.create_incident.call_count == 1
@@ -157,13 +158,13 @@ class TestFullProbeFlow:
                     updated_at=datetime.now(UTC),
                 )
             ]
-            await prober.app_health_probe_cycle(mock_api)
+            await prober.app_health_probe_cycle(mock_api, redis_client)
 
         # Incident should be resolved
         mock_api.resolve_incident.assert_called_with(42)
 
     @pytest.mark.asyncio
-    async def test_ssl_expiry_creates_incident(self, mock_api):
+    async def test_ssl_expiry_creates_incident(self, mock_api, redis_client):
         """SSL cert expiring in 5 days → SSL_EXPIRING incident."""
         import src.tasks.app_health_prober as prober
 
@@ -186,7 +187,7 @@ class TestFullProbeFlow:
             mock_http.return_value = health_result
             mock_ssl.return_value = expiry_soon
 
-            await prober.app_health_probe_cycle(mock_api)
+            await prober.app_health_probe_cycle(mock_api, redis_client)
 
         # SSL_EXPIRING incident created
         mock_api.create_incident.assert_called_once()
@@ -195,7 +196,7 @@ class TestFullProbeFlow:
         assert call_kwargs["details"]["days_until_expiry"] in (4, 5)  # depends on time of day
 
     @pytest.mark.asyncio
-    async def test_multiple_apps_probed_independently(self, mock_api):
+    async def test_multiple_apps_probed_independently(self, mock_api, redis_client):
         """Multiple apps on same server probed independently."""
         import src.tasks.app_health_prober as prober
 
@@ -217,7 +218,7 @@ class TestFullProbeFlow:
             mock_http.return_value = health_result
             mock_ssl.return_value = None
 
-            await prober.app_health_probe_cycle(mock_api)
+            await prober.app_health_probe_cycle(mock_api, redis_client)
 
         # Both apps should be probed (2 HTTP checks)
         assert mock_http.call_count == 2
@@ -7,8 +7,9 @@ import os
 os.environ.setdefault("HEALTH_CHECK_INTERVAL", "60")
 
 from datetime import UTC, datetime, timedelta
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
+from fakeredis import aioredis
 import pytest
 
 from shared.contracts.dto.application import ApplicationDTO
@@ -55,6 +56,13 @@ def _make_incident(
     )
 
 
+@pytest.fixture
+def redis_client():
+    client = MagicMock()
+    client.redis = aioredis.FakeRedis(decode_responses=True)
+    return client
+
+
 @pytest.fixture
 def mock_api_client():
     """Mock SchedulerAPIClient."""
@@ -74,7 +82,9 @@ class TestCheckApplication:
     """Tests for check_application function."""
 
     @pytest.mark.asyncio
-    async def test_healthy_app_updates_status_and_response_time(self, mock_api_client):
+    async def test_healthy_app_updates_status_and_response_time(
+        self, mock_api_client, redis_client
+    ):
         """Healthy HTTP response → update Application with running status + response_time."""
         app = _make_app()
         health_result = {"healthy": True, "status_code": 200, "response_time_ms": 45}
@@ -97,6 +107,7 @@ class TestCheckApplication:
                 server_ip="10.0.0.1",
                 consecutive_failures=0,
                 api_client=mock_api_client,
+                redis_client=redis_client,
             )
 
         assert fail_count == 0
@@ -108,7 +119,7 @@ class TestCheckApplication:
         assert "last_health_check" in fields
 
     @pytest.mark.asyncio
-    async def test_unhealthy_app_increments_fail_counter(self, mock_api_client):
+    async def test_unhealthy_app_increments_fail_counter(self, mock_api_client, redis_client):
         """Unhealthy HTTP response → increment failure counter, update status to down."""
         app = _make_app()
         health_result = {"healthy": False, "error": "timeout", "response_time_ms": 5000}
@@ -131,12 +142,15 @@ class TestCheckApplication:
                 server_ip="10.0.0.1",
                 consecutive_failures=0,
                 api_client=mock_api_client,
+                redis_client=redis_client,
             )
 
         assert fail_count == 1
 
     @pytest.mark.asyncio
-    async def test_three_consecutive_fails_creates_service_down_incident(self, mock_api_client):
+    async def test_three_consecutive_fails_creates_service_down_incident(
+        self, mock_api_client, redis_client
+    ):
         """3 consecutive failures → create SERVICE_DOWN incident."""
         app = _make_app()
         health_result = {"healthy": False, "error": "timeout", "response_time_ms": 5000}
@@ -160,6 +174,7 @@ class TestCheckApplication:
                 server_ip="10.0.0.1",
                 consecutive_failures=2,  # This will be the 3rd failure
                 api_client=mock_api_client,
+                redis_client=redis_client,
             )
 
         assert fail_count == 3
@@ -168,7 +183,9 @@ class TestCheckApplication:
         assert call_kwargs["incident_type"] == "service_down"
 
     @pytest.mark.asyncio
-    async def test_ssl_expiry_near_creates_ssl_expiring_incident(self, mock_api_client):
+    async def test_ssl_expiry_near_creates_ssl_expiring_incident(
+        self, mock_api_client, redis_client
+    ):
         """SSL cert expiring within 7 days → create SSL_EXPIRING incident."""
         app = _make_app()
         health_result = {"healthy": True, "status_code": 200, "response_time_ms": 45}
@@ -193,6 +210,7 @@ class TestCheckApplication:
                 server_ip="10.0.0.1",
                 consecutive_failures=0,
                 api_client=mock_api_client,
+                redis_client=redis_client,
             )
 
         mock_api_client.create_incident.assert_called_once()
@@ -200,7 +218,9 @@ class TestCheckApplication:
         assert call_kwargs["incident_type"] == "ssl_expiring"
 
     @pytest.mark.asyncio
-    async def test_recovery_resets_fail_count_and_resolves_incident(self, mock_api_client):
+    async def test_recovery_resets_fail_count_and_resolves_incident(
+        self, mock_api_client, redis_client
+    ):
         """Recovery after failures → reset fail count, auto-resolve incidents."""
         app = _make_app()
         health_result = {"healthy": True, "status_code": 200, "response_time_ms": 45}
@@ -225,6 +245,7 @@ class TestCheckApplication:
                 server_ip="10.0.0.1",
                 consecutive_failures=5,
                 api_client=mock_api_client,
+                redis_client=redis_client,
             )
 
         assert fail_count == 0
@@ -234,15 +255,8 @@ class TestCheckApplication:
 class TestAppHealthProbeCycle:
     """Tests for the full probe cycle."""
 
-    @pytest.fixture(autouse=True)
-    def _clear_state(self):
-        """Clear module-level state between tests."""
-        import src.tasks.app_health_prober as mod
-
-        mod._consecutive_failures.clear()
-
     @pytest.mark.asyncio
-    async def test_skips_not_deployed_apps(self, mock_api_client):
+    async def test_skips_not_deployed_apps(self, mock_api_client, redis_client):
         """Apps with status not_deployed should not be probed."""
         from src.tasks import app_health_prober
 
@@ -256,12 +270,12 @@ class TestAppHealthProbeCycle:
             ) as mock_http,
             patch.object(app_health_prober, "check_ssl_expiry", new_callable=AsyncMock),
         ):
-            await app_health_prober.app_health_probe_cycle(mock_api_client)
+            await app_health_prober.app_health_probe_cycle(mock_api_client, redis_client)
 
         mock_http.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_probes_running_apps(self, mock_api_client):
+    async def test_probes_running_apps(self, mock_api_client, redis_client):
         """Running apps with ports should be probed."""
         from unittest.mock import MagicMock
 
@@ -286,14 +300,14 @@ class TestAppHealthProbeCycle:
             mock_http.return_value = health_result
             mock_ssl.return_value = None
 
-            await app_health_prober.app_health_probe_cycle(mock_api_client)
+            await app_health_prober.app_health_probe_cycle(mock_api_client, redis_client)
 
         mock_http.assert_called_once()
         mock_api_client.update_application.assert_called_once()
         mock_api_client.create_app_health_history.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_skips_app_without_ports(self, mock_api_client):
+    async def test_skips_app_without_ports(self, mock_api_client, redis_client):
         """Apps with no port allocations should be skipped."""
         from unittest.mock import MagicMock
 
@@ -313,6 +327,93 @@ class TestAppHealthProbeCycle:
             ) as mock_http,
             patch.object(app_health_prober, "check_ssl_expiry", new_callable=AsyncMock),
         ):
-            await app_health_prober.app_health_probe_cycle(mock_api_client)
+            await app_health_prober.app_health_probe_cycle(mock_api_client, redis_client)
 
         mock_http.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_apps_are_probed_side_by_side(self, mock_api_client, redis_client):
+        """A slow application holds up its own probe, not the cycle."""
+        import asyncio
+        import time
+
+        from src.tasks import app_health_prober
+
+        server = MagicMock()
+        server.handle = "vps-123"
+        server.public_ip = "10.0.0.1"
+        mock_api_client.get_servers.return_value = [server]
+        mock_api_client.get_applications.return_value = [
+            _make_app(app_id=i, server_handle="vps-123") for i in range(1, 6)
+        ]
+
+        async def slow_health(_url):
+            await asyncio.sleep(0.1)
+            return {"healthy": True, "status_code": 200, "response_time_ms": 100}
+
+        with (
+            patch.object(app_health_prober, "check_http_health", side_effect=slow_health),
+            patch.object(app_health_prober, "check_ssl_expiry", new_callable=AsyncMock) as ssl,
+        ):
+            ssl.return_value = None
+            started = time.monotonic()
+            await app_health_prober.app_health_probe_cycle(mock_api_client, redis_client)
+
+        assert time.monotonic() - started < 0.3
+        assert mock_api_client.update_application.await_count == 5
+
+    @pytest.mark.asyncio
+    async def test_a_cycle_reads_no_history_and_writes_uptime_with_the_status(
+        self, mock_api_client, redis_client
+    ):
+        from src.tasks import app_health_prober
+
+        server = MagicMock()
+        server.handle = "vps-123"
+        server.public_ip = "10.0.0.1"
+        mock_api_client.get_servers.return_value = [server]
+        mock_api_client.get_applications.return_value = [_make_app(app_id=1)]
+
+        with (
+            patch.object(app_health_prober, "check_http_health", new_callable=AsyncMock) as http,
+            patch.object(app_health_prober, "check_ssl_expiry", new_callable=AsyncMock) as ssl,
+        ):
+            ssl.return_value = None
+            http.return_value = {"healthy": True, "status_code": 200, "response_time_ms": 30}
+            await app_health_prober.app_health_probe_cycle(mock_api_client, redis_client)
+            http.return_value = {"healthy": False, "error": "timeout"}
+            await app_health_prober.app_health_probe_cycle(mock_api_client, redis_client)
+
+        mock_api_client.request.assert_not_called()
+        uptimes = [
+            call.args[1]["uptime_pct_24h"]
+            for call in mock_api_client.update_application.call_args_list
+        ]
+        assert uptimes == [100.0, 50.0]
+
+    @pytest.mark.asyncio
+    async def test_a_failure_streak_survives_a_restart(self, mock_api_client, redis_client):
+        """The streak is read back from Redis, not from the worker's memory."""
+        from src.tasks import app_health_prober
+        from src.tasks.app_uptime import failures_key
+
+        server = MagicMock()
+        server.handle = "vps-123"
+        server.public_ip = "10.0.0.1"
+        mock_api_client.get_servers.return_value = [server]
+        mock_api_client.get_applications.return_value = [_make_app(app_id=1)]
+        # Two failures recorded before the restart.
+        await redis_client.redis.set(failures_key(1), 2)
+
+        with (
+            patch.object(app_health_prober, "check_http_health", new_callable=AsyncMock) as http,
+            patch.object(app_health_prober, "check_ssl_expiry", new_callable=AsyncMock) as ssl,
+            patch.object(app_health_prober, "notify_admins_best_effort", new_callable=AsyncMock),
+        ):
+            ssl.return_value = None
+            http.return_value = {"healthy": False, "error": "timeout"}
+            await app_health_prober.app_health_probe_cycle(mock_api_client, redis_client)
+
+        mock_api_client.create_incident.assert_awaited_once()
+        assert mock_api_client.create_incident.call_args[1]["details"]["consecutive_failures"] == 3
+        assert await redis_client.redis.get(failures_key(1)) == "3"
@@ -0,0 +1,81 @@
+"""Unit tests for the Redis uptime buckets and failure streaks of the app prober."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+from fakeredis import aioredis
+import pytest
+
+from src.tasks.app_uptime import (
+    UPTIME_BUCKET_SECONDS,
+    UPTIME_WINDOW_SECONDS,
+    consecutive_failures,
+    failures_key,
+    record_probe,
+    uptime_key,
+)
+
+_T0 = 1_800_000_000.0
+
+
+@pytest.fixture
+def redis_client():
+    client = MagicMock()
+    client.redis = aioredis.FakeRedis(decode_responses=True)
+    return client
+
+
+class TestRecordProbe:
+    async def test_uptime_is_the_healthy_share_of_the_window(self, redis_client):
+        for healthy in (True, True, True, False):
+            uptime = await record_probe(redis_client, 1, healthy=healthy, failures=0, now=_T0)
+
+        assert uptime == 75.0
+
+    async def test_probes_spread_over_buckets_all_count(self, redis_client):
+        await record_probe(redis_client, 1, healthy=False, failures=1, now=_T0)
+        uptime = await record_probe(
+            redis_client, 1, healthy=True, failures=0, now=_T0 + 3 * UPTIME_BUCKET_SECONDS
+        )
+
+        assert uptime == 50.0
+        assert len(await redis_client.redis.hgetall(uptime_key(1))) == 3
+
+    async def test_buckets_that_left_the_window_are_dropped(self, redis_client):
+        await record_probe(redis_client, 1, healthy=False, failures=1, now=_T0)
+        uptime = await record_probe(
+            redis_client, 1, healthy=True, failures=0, now=_T0 + UPTIME_WINDOW_SECONDS
+        )
+
+        assert uptime == 100.0
+        assert len(await redis_client.redis.hgetall(uptime_key(1))) == 2
+
+    async def test_the_counters_expire_with_the_application(self, redis_client):
+        await record_probe(redis_client, 1, healthy=True, failures=0, now=_T0)
+
+        ttl = await redis_client.redis.ttl(uptime_key(1))
+        assert UPTIME_WINDOW_SECONDS < ttl <= UPTIME_WINDOW_SECONDS + UPTIME_BUCKET_SECONDS
+
+    async def test_the_storage_is_bounded_by_the_bucket_count(self, redis_client):
+        step = UPTIME_WINDOW_SECONDS / 2000
+        for i in range(2000):
+            await record_probe(redis_client, 1, healthy=True, failures=0, now=_T0 + i * step)
+
+        fields = await redis_client.redis.hgetall(uptime_key(1))
+        assert len(fields) <= 2 * (UPTIME_WINDOW_SECONDS // UPTIME_BUCKET_SECONDS + 1)
+
+
+class TestConsecutiveFailures:
+    async def test_streaks_are_read_in_one_call(self, redis_client):
+        await record_probe(redis_client, 1, healthy=False, failures=2, now=_T0)
+        await record_probe(redis_client, 2, healthy=True, failures=0, now=_T0)
+
+        assert await consecutive_failures(redis_client, [1, 2, 3]) == {1: 2, 2: 0}
+        assert await redis_client.redis.ttl(failures_key(1)) > 0
+
+    async def test_no_apps_is_no_read(self, redis_client):
+        redis_client.redis = MagicMock()
+
+        assert await consecutive_failures(redis_client, []) == {}
+        redis_client.redis.mget.assert_not_called()
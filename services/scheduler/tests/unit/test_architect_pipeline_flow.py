@@ -10,6 +10,7 @@ from datetime import UTC, datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import UUID
 
+from _dispatch_snapshot import serve_snapshot
 import pytest
 
 from shared.contracts.dto.project import ProjectStatus
@@ -84,7 +85,7 @@ class TestDispatcherPipelineFlow:
         project.config = {"workspace_ready": True}
         project.initiating_run_id = "live-run-1"
         client.get_project.return_value = project
-        return client
+        return serve_snapshot(client)
 
     @pytest.fixture
     def redis_client(self):
@@ -0,0 +1,213 @@
+"""A dispatcher tick runs its sweeps side by side, within budgets, under entity locks."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fakeredis import aioredis
+import pytest
+
+from src.tasks import task_dispatcher
+from src.tasks._entity_locks import each_locked, lock_key, try_lock, unlock
+from src.tasks.story_completion import _trigger_next_story
+from src.tasks.task_dispatcher import _Sweep
+
+
+@pytest.fixture()
+def redis_client():
+    client = MagicMock()
+    client.redis = aioredis.FakeRedis(decode_responses=True)
+    client.publish_message = AsyncMock()
+
+    # fakeredis runs Lua only with lupa installed; this is the release script.
+    async def release(_script, _numkeys, key, token):
+        if await client.redis.get(key) == token:
+            return await client.redis.delete(key)
+        return 0
+
+    client.redis.eval = release
+    return client
+
+
+def _entities(*ids: str) -> list[SimpleNamespace]:
+    return [SimpleNamespace(id=entity_id) for entity_id in ids]
+
+
+class TestEntityLocks:
+    async def test_a_held_lock_is_not_granted_twice(self, redis_client):
+        token = await try_lock(redis_client, "story", "s1")
+
+        assert token is not None
+        assert await try_lock(redis_client, "story", "s1") is None
+        assert await try_lock(redis_client, "task", "s1") is not None
+
+    async def test_only_the_holder_releases(self, redis_client):
+        token = await try_lock(redis_client, "story", "s1")
+
+        await unlock(redis_client, "story", "s1", "someone-else")
+        assert await redis_client.redis.get(lock_key("story", "s1")) == token
+
+        await unlock(redis_client, "story", "s1", token)
+        assert await redis_client.redis.get(lock_key("story", "s1")) is None
+
+    async def test_a_lock_expires_with_its_holder(self, redis_client):
+        await try_lock(redis_client, "story", "s1", ttl_s=30)
+
+        assert 0 < await redis_client.redis.ttl(lock_key("story", "s1")) <= 30
+
+    async def test_entities_another_sweep_holds_are_skipped(self, redis_client):
+        await try_lock(redis_client, "story", "s2")
+
+        seen = [
+            story.id
+            async for story in each_locked(
+                redis_client, "story", _entities("s1", "s2", "s3"), sweep="t"
+            )
+        ]
+
+        assert seen == ["s1", "s3"]
+
+    async def test_each_entity_is_locked_only_while_the_sweep_acts_on_it(self, redis_client):
+        held = []
+        async for story in each_locked(redis_client, "story", _entities("s1", "s2"), sweep="t"):
+            held.append(await redis_client.redis.exists(lock_key("story", story.id)))
+
+        assert held == [1, 1]
+        assert await redis_client.redis.keys("scheduler:lock:*") == []
+
+    async def test_two_sweeps_never_act_on_the_same_story_at_once(self, redis_client):
+        acting: set[str] = set()
+        overlaps = []
+        acted = []
+
+        async def sweep(name: str) -> None:
+            async for story in each_locked(
+                redis_client, "story", _entities("s1", "s2", "s3"), sweep=name
+            ):
+                if story.id in acting:
+                    overlaps.append(story.id)
+                acting.add(story.id)
+                await asyncio.sleep(0.01)
+                acting.discard(story.id)
+                acted.append(story.id)
+
+        await asyncio.gather(sweep("a"), sweep("b"))
+
+        assert overlaps == []
+        assert set(acted) == {"s1", "s2", "s3"}
+
+
+class TestTick:
+    async def _tick(self, lanes, redis_client=None) -> dict:
+        with (
+            patch.object(task_dispatcher, "_sweep_lanes", return_value=lanes),
+            patch.object(task_dispatcher, "logger") as logger,
+        ):
+            await task_dispatcher._sweep(AsyncMock(), redis_client or AsyncMock())
+        return logger
+
+    async def test_a_slow_sweep_holds_up_only_its_own_lane(self):
+        finished = []
+
+        async def slow(*_args):
+            await asyncio.sleep(0.2)
+            finished.append("slow")
+
+        async def fast(*_args):
+            finished.append("fast")
+
+        lanes = ((_Sweep("slow", slow),), (_Sweep("fast", fast),))
+        await self._tick(lanes)
+
+        assert finished == ["fast", "slow"]
+
+    async def test_a_sweep_over_its_budget_is_cut_short_and_reported(self):
+        async def hangs(*_args):
+            await asyncio.Event().wait()
+
+        lanes = (
+            (_Sweep("hangs", hangs, budget_s=0.01),),
+            (_Sweep("ok", AsyncMock(return_value=2)),),
+        )
+        logger = await self._tick(lanes)
+
+        logger.warning.assert_called_once_with(
+            "dispatcher_sweep_over_budget", sweep="hangs", budget_s=0.01
+        )
+        cycle = next(c for c in logger.info.call_args_list if c.args[0] == "dispatcher_cycle")
+        assert set(cycle.kwargs["sweep_ms"]) == {"hangs", "ok"}
+        assert cycle.kwargs["sweep_ms"]["hangs"] >= 10
+
+    async def test_a_failing_sweep_stops_the_rest_of_its_lane_only(self):
+        later = AsyncMock()
+        other = AsyncMock(return_value=0)
+        lanes = (
+            (
+                _Sweep("fails", AsyncMock(side_effect=RuntimeError("api down"))),
+                _Sweep("later", later),
+            ),
+            (_Sweep("other", other),),
+        )
+        logger = await self._tick(lanes)
+
+        later.assert_not_awaited()
+        other.assert_awaited_once()
+        logger.exception.assert_called_once_with("dispatcher_sweep_error", sweep="fails")
+
+    async def test_the_access_sweep_waits_for_stories_to_be_routed(self):
+        names = [
+            "trigger_scaffolds",
+            "dispatch_todo_tasks",
+            "complete_stories",
+            "poll_merged_prs",
+            "poll_ci_failures",
+            "supervise_stuck_stories",
+            "supervise_stuck_tasks",
+            "supervise_failed_tasks",
+            "supervise_waiting_resource_tasks",
+            "supervise_deploying_stories",
+            "supervise_waiting_user_secret_stories",
+            "supervise_owed_owner_notifications",
+            "supervise_temporary_access",
+        ]
+        mocks = {name: AsyncMock(return_value={}) for name in names}
+        testing = AsyncMock(side_effect=RuntimeError("api down"))
+        with (
+            patch.multiple(task_dispatcher, **mocks),
+            patch.object(task_dispatcher, "supervise_testing_stories", testing),
+        ):
+            await task_dispatcher._sweep(AsyncMock(), AsyncMock())
+
+        mocks["supervise_owed_owner_notifications"].assert_awaited_once()
+        mocks["supervise_temporary_access"].assert_not_awaited()
+        for name in names[:11]:
+            mocks[name].assert_awaited_once()
+
+
+class TestNextStoryTrigger:
+    async def test_a_story_the_stuck_story_sweep_holds_is_left_to_it(self, redis_client):
+        api_client = AsyncMock()
+        api_client.get_stories_by_status.return_value = [
+            SimpleNamespace(id="next", project_id="p1", priority=0)
+        ]
+        await try_lock(redis_client, "story", "next")
+
+        await _trigger_next_story(api_client, redis_client, "p1")
+
+        redis_client.publish_message.assert_not_awaited()
+
+    async def test_the_next_story_is_triggered_and_unlocked(self, redis_client):
+        api_client = AsyncMock()
+        api_client.get_stories_by_status.return_value = [
+            SimpleNamespace(id="next", project_id="p1", priority=0)
+        ]
+        with patch(
+            "src.tasks.story_completion.resolve_project_recipient",
+            AsyncMock(return_value=SimpleNamespace(telegram_chat_id="42")),
+        ):
+            await _trigger_next_story(api_client, redis_client, "p1")
+
+        redis_client.publish_message.assert_awaited_once()
+        assert await redis_client.redis.exists(lock_key("story", "next")) == 0
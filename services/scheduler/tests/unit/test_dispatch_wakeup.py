@@ -0,0 +1,184 @@
+"""The dispatcher is woken by announced state changes, between its periodic sweeps."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from fakeredis import aioredis
+import pytest
+
+from shared.contracts.queues.state_change import StateChangeEvent
+from shared.queues import STATE_CHANGES_STREAM
+from src.tasks import task_dispatcher
+from src.tasks.dispatch_wakeup import DispatchWakeup, follow_state_changes, wakes_dispatcher
+
+
+def _event(entity: str, status: str, entity_id: str = "x1") -> StateChangeEvent:
+    return StateChangeEvent(entity=entity, entity_id=entity_id, status=status)
+
+
+async def _announce(redis, event: StateChangeEvent) -> str:
+    return await redis.xadd(STATE_CHANGES_STREAM, {"data": event.model_dump_json()})
+
+
+async def _until(predicate, timeout: float = 2.0) -> None:
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.001)
+
+
+@pytest.fixture()
+def redis_client():
+    client = MagicMock()
+    client.redis = aioredis.FakeRedis(decode_responses=True)
+    client.connect = AsyncMock()
+    client.close = AsyncMock()
+    return client
+
+
+class TestTriggers:
+    @pytest.mark.parametrize(
+        ("entity", "status"),
+        [
+            ("task", "todo"),
+            ("task", "done"),
+            ("run", "completed"),
+            ("run", "failed"),
+            ("run", "cancelled"),
+            ("story", "in_progress"),
+            ("story", "reopened"),
+        ],
+    )
+    def test_transitions_that_can_make_dispatch_work_wake(self, entity, status):
+        assert wakes_dispatcher(_event(entity, status))
+
+    @pytest.mark.parametrize(
+        ("entity", "status"),
+        [("task", "in_dev"), ("task", "backlog"), ("run", "running"), ("story", "pr_review")],
+    )
+    def test_transitions_the_dispatcher_itself_causes_do_not(self, entity, status):
+        assert not wakes_dispatcher(_event(entity, status))
+
+
+class TestDispatchWakeup:
+    async def test_a_burst_of_triggers_is_one_wakeup(self):
+        wakeup = DispatchWakeup()
+        for entry_id in ("1-0", "2-0", "3-0"):
+            wakeup.notify(entry_id)
+
+        assert await wakeup.wait(0)
+        assert wakeup.take() == (3, "1-0")
+        assert not await wakeup.wait(0.01)
+
+    async def test_without_a_trigger_the_wait_times_out(self):
+        assert not await DispatchWakeup().wait(0.01)
+
+
+class TestFollowStateChanges:
+    async def test_only_triggers_announced_after_attaching_wake(self, redis_client):
+        await _announce(redis_client.redis, _event("task", "todo", "before"))
+        wakeup = DispatchWakeup()
+        listener = asyncio.create_task(follow_state_changes(redis_client, wakeup, block_ms=10))
+        try:
+            await asyncio.sleep(0.05)
+            await _announce(redis_client.redis, _event("task", "in_dev"))
+            await asyncio.sleep(0.05)
+            assert not await wakeup.wait(0)
+
+            entry_id = await _announce(redis_client.redis, _event("task", "todo", "t1"))
+            assert await wakeup.wait(2.0)
+        finally:
+            listener.cancel()
+            await asyncio.gather(listener, return_exceptions=True)
+
+        assert wakeup.take() == (1, entry_id)
+
+    async def test_reattaching_after_a_failure_wakes_once(self):
+        client = MagicMock()
+        client.redis.xrevrange = AsyncMock(return_value=[])
+        reads = 0
+
+        async def xread(*_args, **_kwargs):
+            nonlocal reads
+            reads += 1
+            if reads == 1:
+                raise ConnectionError("redis went away")
+            await asyncio.Event().wait()
+
+        client.redis.xread = xread
+        wakeup = DispatchWakeup()
+        listener = asyncio.create_task(follow_state_changes(client, wakeup, retry_delay_s=0))
+        try:
+            await _until(lambda: reads == 2)
+        finally:
+            listener.cancel()
+            await asyncio.gather(listener, return_exceptions=True)
+
+        # Transitions may have passed while detached: one pass looks for them.
+        assert wakeup.take() == (1, None)
+
+    async def test_an_unreadable_entry_is_skipped(self, redis_client):
+        wakeup = DispatchWakeup()
+        listener = asyncio.create_task(follow_state_changes(redis_client, wakeup, block_ms=10))
+        try:
+            await asyncio.sleep(0.05)
+            await redis_client.redis.xadd(STATE_CHANGES_STREAM, {"data": "{not json"})
+            await _announce(redis_client.redis, _event("run", "completed"))
+            assert await wakeup.wait(2.0)
+        finally:
+            listener.cancel()
+            await asyncio.gather(listener, return_exceptions=True)
+
+        assert wakeup.take()[0] == 1
+
+
+class TestDispatcherLoop:
+    async def test_an_announced_todo_task_is_dispatched_before_the_next_sweep(self, redis_client):
+        sweep = AsyncMock()
+        dispatch = AsyncMock(return_value=1)
+        complete = AsyncMock(return_value=0)
+        with (
+            patch.object(task_dispatcher, "RedisStreamClient", return_value=redis_client),
+            patch.object(task_dispatcher, "_dispatch_interval", return_value=3600),
+            patch.object(task_dispatcher, "_sweep", sweep),
+            patch.object(task_dispatcher, "dispatch_todo_tasks", dispatch),
+            patch.object(task_dispatcher, "complete_stories", complete),
+            patch.object(task_dispatcher, "_WAKEUP_SETTLE_S", 0),
+        ):
+            loop = asyncio.create_task(task_dispatcher.task_dispatcher_loop())
+            try:
+                await _until(lambda: sweep.await_count == 1)
+                # Let the listener attach before announcing.
+                await asyncio.sleep(0.05)
+                await _announce(redis_client.redis, _event("task", "todo", "t1"))
+                await _until(lambda: dispatch.await_count == 1)
+                await _until(lambda: complete.await_count == 1)
+            finally:
+                loop.cancel()
+                await asyncio.gather(loop, return_exceptions=True)
+
+        # Dispatched on the event; the hourly sweep has not come round again.
+        assert sweep.await_count == 1
+        redis_client.close.assert_awaited_once()
+
+    async def test_a_failing_wakeup_pass_leaves_the_loop_running(self, redis_client):
+        dispatch = AsyncMock(side_effect=[RuntimeError("api down"), 0])
+        with (
+            patch.object(task_dispatcher, "RedisStreamClient", return_value=redis_client),
+            patch.object(task_dispatcher, "_dispatch_interval", return_value=3600),
+            patch.object(task_dispatcher, "_sweep", AsyncMock()),
+            patch.object(task_dispatcher, "dispatch_todo_tasks", dispatch),
+            patch.object(task_dispatcher, "complete_stories", AsyncMock(return_value=0)),
+            patch.object(task_dispatcher, "_WAKEUP_SETTLE_S", 0),
+        ):
+            loop = asyncio.create_task(task_dispatcher.task_dispatcher_loop())
+            try:
+                await asyncio.sleep(0.05)
+                await _announce(redis_client.redis, _event("run", "failed"))
+                await _until(lambda: dispatch.await_count == 1)
+                await _announce(redis_client.redis, _event("task", "done"))
+                await _until(lambda: dispatch.await_count == 2)
+            finally:
+                loop.cancel()
+                await asyncio.gather(loop, return_exceptions=True)
@@ -18,6 +18,54 @@ def mock_api_client():
         yield mock
 
 
+@pytest.fixture
+def mock_ingest():
+    with patch(
+        "src.tasks.github_sync._ingest_to_rag", new_callable=AsyncMock, return_value=True
+    ) as mock:
+        yield mock
+
+
+async def _tracked_repos(mock_api_client, mock_github, names: list[str]) -> None:
+    """Create *names* on the fake GitHub, each with a README and a project in the API."""
+    projects = {}
+    for name in names:
+        repo = await mock_github.create_repo(org="org", name=name)
+        await mock_github.create_or_update_file("org", name, "README.md", f"# {name}", "init")
+        projects[repo.id] = ProjectDTO(
+            id=uuid.uuid4(),
+            initiating_run_id="test-run-1",
+            title=name,
+            slug=f"{name}-0000",
+            status=ProjectStatus.ACTIVE,
+            owner_id=1,
+            created_at=datetime.now(UTC),
+        )
+
+    async def repository(provider_id: int) -> RepositoryDTO:
+        return RepositoryDTO(
+            id=f"repo-{provider_id}",
+            project_id=projects[provider_id].id,
+            name=projects[provider_id].title,
+            git_url="https://github.com/org/r",
+            provider_repo_id=provider_id,
+            role="primary",
+            visibility="private",
+            is_managed=True,
+            created_at=datetime.now(UTC),
+        )
+
+    by_project = {str(p.id): p for p in projects.values()}
+    mock_api_client.get_repository_by_provider_id = AsyncMock(side_effect=repository)
+    mock_api_client.get_project = AsyncMock(side_effect=lambda pid: by_project[pid])
+    mock_api_client.update_project = AsyncMock()
+
+
+async def _cycle(mock_github, sync_state: dict) -> int:
+    repos = await mock_github.list_org_repos("org")
+    return await github_sync._sync_repos(mock_github, repos, {}, sync_state)
+
+
 @pytest.fixture
 def mock_notify_admins():
     with patch("src.tasks.github_sync.notify_admins_best_effort", new_callable=AsyncMock) as mock:
@@ -163,3 +211,80 @@ async def test_detect_missing_projects_marks_missing(mock_api_client, mock_notif
     mock_api_client.update_repository.assert_called_once_with(
         "repo-2", {"status": RepositoryStatus.MISSING.value}
     )
+
+
+@pytest.mark.asyncio
+async def test_sync_repos_fetches_nothing_from_unchanged_repos(
+    mock_api_client, mock_github, mock_ingest
+):
+    await _tracked_repos(mock_api_client, mock_github, ["alpha", "beta", "gamma"])
+    sync_state = {}
+
+    assert await _cycle(mock_github, sync_state) == 3
+    assert len(mock_github.file_fetches) == 3 * len(github_sync._DOCS_PATHS)
+    assert mock_ingest.await_count == 3
+
+    mock_github.file_fetches.clear()
+    assert await _cycle(mock_github, sync_state) == 3
+
+    assert mock_github.file_fetches == []
+    assert mock_ingest.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_sync_repos_ingests_only_changed_content(mock_api_client, mock_github, mock_ingest):
+    await _tracked_repos(mock_api_client, mock_github, ["alpha", "beta"])
+    sync_state = {}
+    await _cycle(mock_github, sync_state)
+    mock_github.file_fetches.clear()
+
+    # A push that leaves the synced files alone: fetched, not ingested.
+    await mock_github.create_or_update_file("org", "alpha", "src/app.py", "pass", "code")
+    await _cycle(mock_github, sync_state)
+
+    assert {repo for repo, _ in mock_github.file_fetches} == {"alpha"}
+    assert mock_ingest.await_count == 2
+
+    await mock_github.create_or_update_file("org", "beta", "README.md", "# beta v2", "docs")
+    await _cycle(mock_github, sync_state)
+
+    assert mock_ingest.await_count == 3
+    documents = mock_ingest.await_args.kwargs["documents"]
+    assert [d["content"] for d in documents] == ["# beta v2"]
+
+
+@pytest.mark.asyncio
+async def test_sync_repos_defers_repos_past_the_request_budget(
+    mock_api_client, mock_github, mock_ingest
+):
+    await _tracked_repos(mock_api_client, mock_github, ["alpha", "beta", "gamma"])
+    sync_state = {}
+
+    with patch.object(
+        github_sync, "_request_budget", return_value=2 * github_sync._DOCS_SYNC_REQUESTS
+    ):
+        await _cycle(mock_github, sync_state)
+        assert len(sync_state) == 2
+
+        await _cycle(mock_github, sync_state)
+        assert len(sync_state) == 3
+
+    assert len(mock_github.file_fetches) == 3 * len(github_sync._DOCS_PATHS)
+
+
+@pytest.mark.asyncio
+async def test_sync_repos_retries_a_repo_whose_ingest_failed(
+    mock_api_client, mock_github, mock_ingest
+):
+    await _tracked_repos(mock_api_client, mock_github, ["alpha"])
+    sync_state = {}
+    mock_ingest.return_value = False
+
+    await _cycle(mock_github, sync_state)
+    assert sync_state == {}
+
+    mock_ingest.return_value = True
+    await _cycle(mock_github, sync_state)
+
+    assert mock_ingest.await_count == 2
+    assert len(sync_state) == 1
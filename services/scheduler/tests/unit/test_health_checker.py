@@ -3,11 +3,12 @@
 from __future__ import annotations
 
 import os
+import time
 
 # Must set before importing health_checker (module-level config)
 os.environ.setdefault("HEALTH_CHECK_INTERVAL", "60")
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import httpx
 import pytest
@@ -15,10 +16,16 @@ import pytest
 from shared.contracts.dto.incident import IncidentDTO
 
 
-def _http_response(status_code: int = 200, text: str = "") -> httpx.Response:
-    """Create an httpx.Response with a fake request attached."""
-    request = httpx.Request("GET", "http://test/metrics")
-    return httpx.Response(status_code, text=text, request=request)
+def _metrics_http(node: str | Exception, cadvisor: str | Exception = "") -> httpx.AsyncClient:
+    """An HTTP client whose node_exporter and cadvisor answer with the given bodies."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        answer = node if request.url.port == 9100 else cadvisor
+        if isinstance(answer, Exception):
+            raise answer
+        return httpx.Response(200, text=answer)
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
 
 
 # ── Fixtures ──
@@ -113,19 +120,14 @@ class TestCheckServer:
         """Successful HTTP fetch → update server metrics + append history."""
         server = _make_server()
 
-        node_resp = _http_response(200, NODE_EXPORTER_TEXT)
-        cadvisor_resp = _http_response(200, CADVISOR_TEXT)
-
-        mock_http = AsyncMock()
-        mock_http.get = AsyncMock(side_effect=[node_resp, cadvisor_resp])
+        mock_http = _metrics_http(NODE_EXPORTER_TEXT, CADVISOR_TEXT)
 
         with (
             patch("src.tasks.health_checker.api_client", mock_api_client),
-            patch("src.tasks.health_checker._get_http_client", return_value=mock_http),
         ):
             from src.tasks.health_checker import _check_server
 
-            await _check_server(server)
+            snapshot = await _check_server(server, mock_http)
 
         # Server should be updated with parsed metrics
         mock_api_client.update_server.assert_called_once()
@@ -137,32 +139,27 @@ class TestCheckServer:
         assert update.container_count_running == 2
         assert update.last_health_check is not None
 
-        # History should be appended
-        mock_api_client.create_metrics_history.assert_called_once()
-        hist_args = mock_api_client.create_metrics_history.call_args
-        assert hist_args[0][0] == "vps-123"
-        metrics_dict = hist_args[0][1]
-        assert "cpu_usage_pct" in metrics_dict
-        assert "containers" in metrics_dict
+        # The history snapshot is returned for the cycle's bulk write
+        mock_api_client.create_metrics_history.assert_not_called()
+        assert "cpu_usage_pct" in snapshot
+        assert "containers" in snapshot
 
     @pytest.mark.asyncio
     async def test_node_exporter_timeout_creates_incident(self, mock_api_client):
         """HTTP timeout on node_exporter → SERVER_UNREACHABLE incident."""
         server = _make_server()
 
-        mock_http = AsyncMock()
-        mock_http.get = AsyncMock(side_effect=httpx.ConnectTimeout("timeout"))
+        mock_http = _metrics_http(httpx.ConnectTimeout("timeout"))
 
         with (
             patch("src.tasks.health_checker.api_client", mock_api_client),
-            patch("src.tasks.health_checker._get_http_client", return_value=mock_http),
             patch(
                 "src.tasks.health_checker.notify_admins_best_effort", new_callable=AsyncMock
             ) as mock_notify,
         ):
             from src.tasks.health_checker import _check_server
 
-            await _check_server(server)
+            await _check_server(server, mock_http)
 
         # Incident should be created
         mock_api_client.create_incident.assert_called_once()
@@ -182,19 +179,17 @@ class TestCheckServer:
         server = _make_server()
         mock_api_client.get_active_incidents.return_value = [_make_incident(1)]
 
-        mock_http = AsyncMock()
-        mock_http.get = AsyncMock(side_effect=httpx.ConnectTimeout("timeout"))
+        mock_http = _metrics_http(httpx.ConnectTimeout("timeout"))
 
         with (
             patch("src.tasks.health_checker.api_client", mock_api_client),
-            patch("src.tasks.health_checker._get_http_client", return_value=mock_http),
             patch(
                 "src.tasks.health_checker.notify_admins_best_effort", new_callable=AsyncMock
             ) as mock_notify,
         ):
             from src.tasks.health_checker import _check_server
 
-            await _check_server(server)
+            await _check_server(server, mock_http)
 
         # No new incident created
         mock_api_client.create_incident.assert_not_called()
@@ -207,22 +202,17 @@ class TestCheckServer:
         server = _make_server()
         mock_api_client.get_active_incidents.return_value = [_make_incident(5)]
 
-        node_resp = _http_response(200, NODE_EXPORTER_TEXT)
-        cadvisor_resp = _http_response(200, CADVISOR_TEXT)
-
-        mock_http = AsyncMock()
-        mock_http.get = AsyncMock(side_effect=[node_resp, cadvisor_resp])
+        mock_http = _metrics_http(NODE_EXPORTER_TEXT, CADVISOR_TEXT)
 
         with (
             patch("src.tasks.health_checker.api_client", mock_api_client),
-            patch("src.tasks.health_checker._get_http_client", return_value=mock_http),
             patch(
                 "src.tasks.health_checker.notify_admins_best_effort", new_callable=AsyncMock
             ) as mock_notify,
         ):
             from src.tasks.health_checker import _check_server
 
-            await _check_server(server)
+            await _check_server(server, mock_http)
 
         # Incident should be resolved
         mock_api_client.resolve_incident.assert_called_once_with(5)
@@ -230,6 +220,50 @@ class TestCheckServer:
         mock_notify.assert_called_once()
         assert mock_notify.call_args[1]["level"] == "success"
 
+    @pytest.mark.asyncio
+    async def test_an_exporter_error_status_is_unreachable(self, mock_api_client):
+        server = _make_server()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(503, text="unavailable")
+
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with (
+            patch("src.tasks.health_checker.api_client", mock_api_client),
+            patch("src.tasks.health_checker.notify_admins_best_effort", new_callable=AsyncMock),
+        ):
+            from src.tasks.health_checker import _check_server
+
+            await _check_server(server, http)
+
+        mock_api_client.update_server.assert_not_called()
+        assert mock_api_client.create_incident.call_args[1]["incident_type"] == "server_unreachable"
+
+    @pytest.mark.asyncio
+    async def test_the_body_is_parsed_as_it_streams_in(self, mock_api_client):
+        """A scrape sent in small chunks parses the same as one sent whole."""
+        server = _make_server()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = NODE_EXPORTER_TEXT if request.url.port == 9100 else CADVISOR_TEXT
+            data = body.encode()
+
+            async def chunks():
+                for i in range(0, len(data), 7):
+                    yield data[i : i + 7]
+
+            return httpx.Response(200, content=chunks())
+
+        http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        with patch("src.tasks.health_checker.api_client", mock_api_client):
+            from src.tasks.health_checker import _check_server
+
+            await _check_server(server, http)
+
+        update = mock_api_client.update_server.call_args[0][1]
+        assert update.load_avg_1m == 0.5
+        assert update.container_count_running == 2
+
 
 class TestResourceExhaustion:
     """Tests for RAM/disk threshold alerting."""
@@ -247,22 +281,17 @@ node_filesystem_size_bytes{mountpoint="/"} 42949672960
 node_filesystem_avail_bytes{mountpoint="/"} 21474836480
 node_load1 0.5
 """
-        node_resp = _http_response(200, high_ram_text)
-        cadvisor_resp = _http_response(200, "")
-
-        mock_http = AsyncMock()
-        mock_http.get = AsyncMock(side_effect=[node_resp, cadvisor_resp])
+        mock_http = _metrics_http(high_ram_text, "")
 
         with (
             patch("src.tasks.health_checker.api_client", mock_api_client),
-            patch("src.tasks.health_checker._get_http_client", return_value=mock_http),
             patch(
                 "src.tasks.health_checker.notify_admins_best_effort", new_callable=AsyncMock
             ) as mock_notify,
         ):
             from src.tasks.health_checker import _check_server
 
-            await _check_server(server)
+            await _check_server(server, mock_http)
 
         # RESOURCE_EXHAUSTED incident should be created
         mock_api_client.create_incident.assert_called_once()
@@ -287,20 +316,15 @@ node_filesystem_size_bytes{mountpoint="/"} 42949672960
 node_filesystem_avail_bytes{mountpoint="/"} 2147483648
 node_load1 0.5
 """
-        node_resp = _http_response(200, high_disk_text)
-        cadvisor_resp = _http_response(200, "")
-
-        mock_http = AsyncMock()
-        mock_http.get = AsyncMock(side_effect=[node_resp, cadvisor_resp])
+        mock_http = _metrics_http(high_disk_text, "")
 
         with (
             patch("src.tasks.health_checker.api_client", mock_api_client),
-            patch("src.tasks.health_checker._get_http_client", return_value=mock_http),
             patch("src.tasks.health_checker.notify_admins_best_effort", new_callable=AsyncMock),
         ):
             from src.tasks.health_checker import _check_server
 
-            await _check_server(server)
+            await _check_server(server, mock_http)
 
         mock_api_client.create_incident.assert_called_once()
         call_kwargs = mock_api_client.create_incident.call_args[1]
@@ -331,6 +355,111 @@ class TestFilterServers:
         assert handles == ["s1", "s4", "s5"]
 
 
+class TestConcurrentChecks:
+    """Servers are checked side by side, each within its own deadline."""
+
+    @pytest.mark.asyncio
+    async def test_a_cycle_takes_as_long_as_its_slowest_server(self):
+        import asyncio
+        import time
+
+        async def check(server, _http):
+            await asyncio.sleep(0.1)
+
+        servers = [_make_server(f"s{i}") for i in range(5)]
+        with patch("src.tasks.health_checker._check_server", side_effect=check):
+            from src.tasks.health_checker import _check_servers
+
+            started = time.monotonic()
+            checked = await _check_servers(AsyncMock(), servers)
+
+        assert len(checked) == 5
+        assert time.monotonic() - started < 0.3
+
+    @pytest.mark.asyncio
+    async def test_no_more_than_the_concurrency_run_at_once(self):
+        import asyncio
+
+        running = 0
+        peak = 0
+
+        async def check(server, _http):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        servers = [_make_server(f"s{i}") for i in range(20)]
+        with patch("src.tasks.health_checker._check_server", side_effect=check):
+            from src.tasks.health_checker import _check_servers
+
+            assert len(await _check_servers(AsyncMock(), servers)) == 20
+
+        assert peak == 8
+
+    @pytest.mark.asyncio
+    async def test_a_hung_server_is_cut_off_and_the_rest_finish(self):
+        import asyncio
+
+        done = []
+
+        async def check(server, _http):
+            if server.handle == "hung":
+                await asyncio.Event().wait()
+            done.append(server.handle)
+
+        servers = [_make_server("hung"), _make_server("ok-1"), _make_server("ok-2")]
+        with (
+            patch("src.tasks.health_checker._check_server", side_effect=check),
+            patch("src.tasks.health_checker._server_deadline", return_value=0.05),
+            patch("src.tasks.health_checker.logger") as logger,
+        ):
+            from src.tasks.health_checker import _check_servers
+
+            checked = await _check_servers(AsyncMock(), servers)
+
+        assert list(checked) == ["ok-1", "ok-2"]
+        assert done == ["ok-1", "ok-2"]
+        logger.warning.assert_called_once_with(
+            "health_check_deadline_exceeded", server_handle="hung", deadline_sec=0.05
+        )
+
+    @pytest.mark.asyncio
+    async def test_the_worker_scrapes_every_cycle_through_one_client(self, mock_api_client):
+        mock_api_client.get_servers.return_value = [_make_server("s1")]
+        clients = []
+        cycles = 0
+
+        async def check(server, http):
+            clients.append(http)
+
+        async def sleep(_seconds):
+            nonlocal cycles
+            cycles += 1
+            if cycles == 2:
+                raise _BreakLoop
+
+        class _BreakLoop(Exception):
+            pass
+
+        with (
+            patch("src.tasks.health_checker.api_client", mock_api_client),
+            patch("src.tasks.health_checker.RedisStreamClient", return_value=AsyncMock()),
+            patch("src.tasks.health_checker._check_server", side_effect=check),
+            patch("src.tasks.health_checker.app_health_probe_cycle", new_callable=AsyncMock),
+            patch("src.tasks.health_checker.asyncio.sleep", side_effect=sleep),
+        ):
+            from src.tasks.health_checker import health_check_worker
+
+            with pytest.raises(_BreakLoop):
+                await health_check_worker()
+
+        assert len(clients) == 2
+        assert clients[0] is clients[1]
+        assert clients[0].is_closed
+
+
 class TestCleanupHistory:
     """Tests for daily metrics history cleanup."""
 
@@ -338,6 +467,7 @@ class TestCleanupHistory:
     async def test_cleanup_calls_api(self, mock_api_client):
         """_cleanup_old_history calls delete_old_metrics_history."""
         mock_api_client.delete_old_metrics_history = AsyncMock(return_value={"deleted": 10})
+        mock_api_client.delete_old_metrics_rollups = AsyncMock(return_value={"deleted": 0})
         mock_api_client.delete_old_app_health_history = AsyncMock(return_value={"deleted": 0})
 
         with patch("src.tasks.health_checker.api_client", mock_api_client):
@@ -348,6 +478,79 @@ class TestCleanupHistory:
         mock_api_client.delete_old_metrics_history.assert_called_once_with(168)
         assert deleted == 10
 
+    @pytest.mark.asyncio
+    async def test_each_rollup_tier_keeps_its_own_retention(self, mock_api_client):
+        mock_api_client.delete_old_metrics_history = AsyncMock(return_value={"deleted": 0})
+        mock_api_client.delete_old_metrics_rollups = AsyncMock(return_value={"deleted": 4})
+        mock_api_client.delete_old_app_health_history = AsyncMock(return_value={"deleted": 0})
+
+        with patch("src.tasks.health_checker.api_client", mock_api_client):
+            from src.tasks.health_checker import _cleanup_old_history
+
+            await _cleanup_old_history()
+
+        assert mock_api_client.delete_old_metrics_rollups.await_args_list == [
+            call(300, 720),
+            call(3600, 8760),
+        ]
+
+
+class TestHistoryWrites:
+    """A cycle writes every server's snapshot in one request, then rolls up."""
+
+    @pytest.mark.asyncio
+    async def test_one_cycle_is_one_bulk_write(self, mock_api_client):
+        mock_api_client.get_servers.return_value = [_make_server("s1"), _make_server("s2")]
+
+        async def check(server, _http):
+            return {"cpu_usage_pct": 10.0, "handle": server.handle}
+
+        with (
+            patch("src.tasks.health_checker.api_client", mock_api_client),
+            patch("src.tasks.health_checker._check_server", side_effect=check),
+            patch("src.tasks.health_checker.app_health_probe_cycle", new_callable=AsyncMock),
+        ):
+            from src.tasks.health_checker import _health_check_cycle
+
+            await _health_check_cycle(AsyncMock(), AsyncMock(), time.monotonic())
+
+        mock_api_client.create_metrics_history.assert_not_called()
+        [snapshots] = mock_api_client.create_metrics_history_bulk.await_args.args
+        assert sorted(s["server_handle"] for s in snapshots) == ["s1", "s2"]
+        mock_api_client.roll_up_metrics_history.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_servers_without_a_snapshot_are_left_out(self, mock_api_client):
+        with patch("src.tasks.health_checker.api_client", mock_api_client):
+            from src.tasks.health_checker import _write_history
+
+            await _write_history({"up": {"cpu_usage_pct": 1.0}, "down": None})
+
+        mock_api_client.create_metrics_history_bulk.assert_awaited_once_with(
+            [{"server_handle": "up", "metrics": {"cpu_usage_pct": 1.0}}]
+        )
+
+    @pytest.mark.asyncio
+    async def test_a_failed_write_does_not_stop_the_application_probes(self, mock_api_client):
+        mock_api_client.create_metrics_history_bulk.side_effect = RuntimeError("api down")
+
+        async def check(server, _http):
+            return {"cpu_usage_pct": 10.0}
+
+        mock_api_client.get_servers.return_value = [_make_server("s1")]
+        with (
+            patch("src.tasks.health_checker.api_client", mock_api_client),
+            patch("src.tasks.health_checker._check_server", side_effect=check),
+            patch(
+                "src.tasks.health_checker.app_health_probe_cycle", new_callable=AsyncMock
+            ) as probe,
+        ):
+            from src.tasks.health_checker import _health_check_cycle
+
+            await _health_check_cycle(AsyncMock(), AsyncMock(), time.monotonic())
+
+        probe.assert_awaited_once()
+
 
 class TestAppHealthIntegration:
     """Tests for app health prober integration into health_check_worker."""
@@ -360,8 +563,11 @@ class TestAppHealthIntegration:
         class _BreakLoop(Exception):
             pass
 
+        redis_client = AsyncMock()
+
         with (
             patch("src.tasks.health_checker.api_client", mock_api_client),
+            patch("src.tasks.health_checker.RedisStreamClient", return_value=redis_client),
             patch(
                 "src.tasks.health_checker.app_health_probe_cycle", new_callable=AsyncMock
             ) as mock_app_probe,
@@ -372,12 +578,14 @@ class TestAppHealthIntegration:
             with pytest.raises(_BreakLoop):
                 await health_check_worker()
 
-        mock_app_probe.assert_called_once()
+        mock_app_probe.assert_called_once_with(mock_api_client, redis_client)
+        redis_client.close.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_cleanup_includes_app_health_history(self, mock_api_client):
         """Daily cleanup also deletes old app health history."""
         mock_api_client.delete_old_metrics_history = AsyncMock(return_value={"deleted": 5})
+        mock_api_client.delete_old_metrics_rollups = AsyncMock(return_value={"deleted": 0})
         mock_api_client.delete_old_app_health_history = AsyncMock(return_value={"deleted": 3})
 
         with patch("src.tasks.health_checker.api_client", mock_api_client):
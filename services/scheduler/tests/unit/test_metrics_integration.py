@@ -114,3 +114,29 @@ class TestPublicAPI:
         result = parse_cadvisor(text)
         assert len(result) == 3
         assert result[0].name == "myapp"
+
+    async def test_read_node_exporter_matches_parse(self):
+        from src.metrics import parse_node_exporter, read_node_exporter
+
+        text = (FIXTURES / "node_exporter_sample.txt").read_text()
+
+        async def lines():
+            for line in text.splitlines():
+                yield line
+
+        streamed = await read_node_exporter(lines())
+        parsed = parse_node_exporter(text)
+        assert streamed.ram_total_bytes == parsed.ram_total_bytes
+        assert streamed.cpu_usage_pct == parsed.cpu_usage_pct
+        assert streamed.network_rx_errors == parsed.network_rx_errors
+
+    async def test_read_cadvisor_matches_parse(self):
+        from src.metrics import parse_cadvisor, read_cadvisor
+
+        text = (FIXTURES / "cadvisor_sample.txt").read_text()
+
+        async def lines():
+            for line in text.splitlines():
+                yield line
+
+        assert await read_cadvisor(lines()) == parse_cadvisor(text)
@@ -2,7 +2,12 @@
 
 import pytest
 
-from src.metrics.parser import PrometheusMetric, parse_prometheus_text
+from src.metrics.parser import (
+    PrometheusMetric,
+    aiter_prometheus_metrics,
+    iter_prometheus_metrics,
+    parse_prometheus_text,
+)
 
 
 class TestParsePrometheusText:
@@ -108,3 +113,47 @@ class TestParsePrometheusText:
         text = "node_load1 0.42\n"
         result = parse_prometheus_text(text)
         assert result[0].timestamp is None
+
+
+class TestFamilyFilter:
+    """Only the requested families are parsed; the rest are dropped by prefix."""
+
+    TEXT = (
+        "# TYPE node_load1 gauge\n"
+        "node_load1 0.42\n"
+        "node_load15 0.20\n"
+        'node_scrape_collector_duration_seconds{collector="cpu"} 0.01\n'
+        'http_latency_seconds_bucket{le="0.1"} 3\n'
+        "http_latency_seconds_sum 0.2\n"
+        "http_latency_seconds_count 3\n"
+    )
+
+    def test_other_families_are_dropped(self):
+        result = parse_prometheus_text(self.TEXT, {"node_load1"})
+        assert [m.name for m in result] == ["node_load1"]
+
+    def test_a_histogram_family_keeps_its_bucket_sum_and_count(self):
+        result = parse_prometheus_text(self.TEXT, {"http_latency_seconds"})
+        assert [m.name for m in result] == [
+            "http_latency_seconds_bucket",
+            "http_latency_seconds_sum",
+            "http_latency_seconds_count",
+        ]
+
+    def test_no_filter_parses_everything(self):
+        assert len(parse_prometheus_text(self.TEXT)) == 6
+
+    def test_the_parser_is_lazy(self):
+        lines = iter(self.TEXT.splitlines())
+        first = next(iter_prometheus_metrics(lines, {"node_load1"}))
+        assert first.name == "node_load1"
+        # Nothing past the first sample has been read.
+        assert next(lines) == "node_load15 0.20"
+
+    async def test_lines_arriving_asynchronously(self):
+        async def lines():
+            for line in self.TEXT.splitlines():
+                yield line
+
+        result = [m async for m in aiter_prometheus_metrics(lines(), {"node_load15"})]
+        assert [(m.name, m.value) for m in result] == [("node_load15", 0.20)]
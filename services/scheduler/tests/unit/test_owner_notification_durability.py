@@ -674,6 +674,65 @@ class TestALostPublishIsPickedUpLater:
         assert len(world.published) == 1
 
 
+class TestTheSweepReadsItsPageOfStoriesInOneBatch:
+    """The recovery sweep reads every owed story at once; the batch only saves requests."""
+
+    @staticmethod
+    async def _owed_and_completed(world, api_client, redis_client) -> None:
+        from src.tasks.supervisor import supervise_testing_stories
+
+        world.publish_failures = 1
+        await supervise_testing_stories(api_client, redis_client)
+        api_client.get_story.reset_mock()
+
+    @pytest.mark.asyncio
+    async def test_a_story_the_batch_found_ended_is_not_read_again(
+        self, world, api_client, redis_client
+    ):
+        from src.tasks.owner_notifications import supervise_owed_owner_notifications
+
+        await self._owed_and_completed(world, api_client, redis_client)
+        api_client.get_stories_by_ids.side_effect = lambda ids: [world.story]
+
+        counts = await supervise_owed_owner_notifications(api_client, redis_client)
+
+        assert counts["delivered"] == 1
+        api_client.get_stories_by_ids.assert_awaited_once()
+        api_client.get_story.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_a_story_the_batch_found_short_of_its_ending_is_read_again(
+        self, world, api_client, redis_client
+    ):
+        """The transition may have committed since the batch: voiding needs a fresh read."""
+        from src.tasks.owner_notifications import supervise_owed_owner_notifications
+
+        await self._owed_and_completed(world, api_client, redis_client)
+        stale = world.story.model_copy(update={"status": StoryStatus.TESTING})
+        api_client.get_stories_by_ids.side_effect = lambda ids: [stale]
+
+        counts = await supervise_owed_owner_notifications(api_client, redis_client)
+
+        assert counts["delivered"] == 1
+        assert counts["voided"] == 0
+        api_client.get_story.assert_awaited_once_with("story-1")
+
+    @pytest.mark.asyncio
+    async def test_a_failed_batch_falls_back_to_one_read_per_record(
+        self, world, api_client, redis_client
+    ):
+        from src.tasks.owner_notifications import supervise_owed_owner_notifications
+
+        await self._owed_and_completed(world, api_client, redis_client)
+        api_client.get_stories_by_ids.side_effect = TimeoutError("the API did not answer")
+
+        counts = await supervise_owed_owner_notifications(api_client, redis_client)
+
+        assert counts["delivered"] == 1
+        assert world.record.attempts == 2
+        api_client.get_story.assert_awaited_once_with("story-1")
+
+
 class TestTheRetryIsBoundedAndItsEndIsLoud:
     """AC3: three attempts, then an administrator with the identifiers."""
 
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import time
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -17,69 +18,161 @@ def mock_redis_client():
     return client
 
 
+@pytest.fixture()
+async def fake_client():
+    """RedisStreamClient over fakeredis."""
+    from fakeredis import aioredis
+
+    from shared.redis_client import RedisStreamClient
+
+    c = RedisStreamClient(redis_url="redis://fake:6379")
+    c._redis = aioredis.FakeRedis(decode_responses=True)
+    yield c
+    await c._redis.aclose()
+
+
+@pytest.fixture()
+def idle_times():
+    """OBJECT IDLETIME by key (fakeredis lacks it); unlisted keys read as gone."""
+    idle: dict[str, object] = {}
+
+    async def lookup(redis, keys):
+        return [idle.get(key) for key in keys]
+
+    with patch("src.tasks.queue_cleanup._idle_times", side_effect=lookup) as mock:
+        mock.idle = idle
+        yield mock
+
+
+async def _stream(client, key: str, written_s_ago: float) -> None:
+    from shared.redis.ephemeral import EPHEMERAL_REGISTRY
+
+    await client.redis.xadd(key, {"data": "{}"})
+    await client.redis.zadd(EPHEMERAL_REGISTRY, {key: time.time() - written_s_ago})
+
+
 class TestCleanOrphanStreams:
     """Tests for _clean_orphan_streams."""
 
     @pytest.mark.asyncio()
-    async def test_orphan_response_streams_cleaned(self, mock_redis_client):
-        """Response streams idle > threshold are deleted."""
+    async def test_orphan_streams_cleaned(self, fake_client, idle_times):
+        """Registered streams idle > threshold are deleted and leave the registry."""
+        from shared.redis.ephemeral import EPHEMERAL_REGISTRY
         from src.tasks.queue_cleanup import _clean_orphan_streams
 
-        redis = mock_redis_client.redis
-        # SCAN returns cursor=0 (done) and 3 keys
-        redis.scan.return_value = (
-            0,
-            [
-                "po:response:req-001",
-                "po:response:req-002",
-                "po:response:req-003",
-            ],
-        )
-        # All streams are idle > 600s
-        redis.object.side_effect = [700, 800, 900]
+        keys = ["po:response:req-001", "worker:dead-123:input", "worker:dead-123:output"]
+        for key in keys:
+            await _stream(fake_client, key, written_s_ago=900)
+            idle_times.idle[key] = 900
 
-        cleaned = await _clean_orphan_streams(mock_redis_client, idle_threshold_s=600)
+        cleaned = await _clean_orphan_streams(fake_client, idle_threshold_s=600)
 
         assert cleaned == 3
-        assert redis.delete.call_count == 3
+        assert await fake_client.redis.exists(*keys) == 0
+        assert await fake_client.redis.zcard(EPHEMERAL_REGISTRY) == 0
 
     @pytest.mark.asyncio()
-    async def test_fresh_response_streams_kept(self, mock_redis_client):
-        """Response streams idle < threshold are NOT deleted."""
+    async def test_recently_written_streams_not_examined(self, fake_client, idle_times):
+        """Only members scored past the threshold are looked at."""
         from src.tasks.queue_cleanup import _clean_orphan_streams
 
-        redis = mock_redis_client.redis
-        redis.scan.return_value = (0, ["po:response:fresh-1"])
-        redis.object.return_value = 30  # 30s idle — well under threshold
+        await _stream(fake_client, "po:response:fresh-1", written_s_ago=30)
+        await _stream(fake_client, "po:response:old-1", written_s_ago=900)
+        idle_times.idle["po:response:old-1"] = 900
+
+        cleaned = await _clean_orphan_streams(fake_client, idle_threshold_s=600)
+
+        assert cleaned == 1
+        assert await fake_client.redis.exists("po:response:fresh-1") == 1
+        examined = [key for call in idle_times.call_args_list for key in call.args[1]]
+        assert examined == ["po:response:old-1"]
 
-        cleaned = await _clean_orphan_streams(mock_redis_client, idle_threshold_s=600)
+    @pytest.mark.asyncio()
+    async def test_stream_read_since_its_last_write_is_kept(self, fake_client, idle_times):
+        """A worker blocked on its input keeps it alive: kept and re-scored."""
+        from shared.redis.ephemeral import EPHEMERAL_REGISTRY
+        from src.tasks.queue_cleanup import _clean_orphan_streams
+
+        await _stream(fake_client, "worker:busy-1:input", written_s_ago=3600)
+        idle_times.idle["worker:busy-1:input"] = 2
+
+        cleaned = await _clean_orphan_streams(fake_client, idle_threshold_s=600)
 
         assert cleaned == 0
-        redis.delete.assert_not_called()
+        assert await fake_client.redis.exists("worker:busy-1:input") == 1
+        score = await fake_client.redis.zscore(EPHEMERAL_REGISTRY, "worker:busy-1:input")
+        assert score == pytest.approx(time.time() - 2, abs=5)
 
     @pytest.mark.asyncio()
-    async def test_worker_streams_cleaned(self, mock_redis_client):
-        """Orphan worker:*:input and worker:*:output streams are cleaned."""
+    async def test_streams_deleted_by_their_owner_leave_the_registry(self, fake_client, idle_times):
+        from shared.redis.ephemeral import EPHEMERAL_REGISTRY
         from src.tasks.queue_cleanup import _clean_orphan_streams
 
-        redis = mock_redis_client.redis
-        # SCAN called 3 times (po:response:*, worker:*:input, worker:*:output)
-        redis.scan.side_effect = [
-            (0, []),  # no po:response streams
-            (0, ["worker:dead-123:input"]),  # orphan input stream
-            (0, ["worker:dead-123:output"]),  # orphan output stream
-        ]
-        redis.object.side_effect = [700, 700]
+        await fake_client.redis.zadd(EPHEMERAL_REGISTRY, {"worker:gone:output": 1.0})
+
+        assert await _clean_orphan_streams(fake_client, idle_threshold_s=600) == 0
+        assert await fake_client.redis.zcard(EPHEMERAL_REGISTRY) == 0
+
+    @pytest.mark.asyncio()
+    async def test_object_idletime_error_skips_key(self, fake_client, idle_times):
+        """If OBJECT IDLETIME fails for a key, skip it until the next run (don't crash)."""
+        from shared.redis.ephemeral import EPHEMERAL_REGISTRY
+        from src.tasks.queue_cleanup import _clean_orphan_streams
+
+        await _stream(fake_client, "po:response:broken", written_s_ago=900)
+        await _stream(fake_client, "po:response:ok", written_s_ago=900)
+        idle_times.idle.update({"po:response:broken": Exception("busy"), "po:response:ok": 700})
+
+        cleaned = await _clean_orphan_streams(fake_client, idle_threshold_s=600)
+
+        assert cleaned == 1
+        assert await fake_client.redis.exists("po:response:broken") == 1
+        assert await fake_client.redis.zrange(EPHEMERAL_REGISTRY, 0, -1) == ["po:response:broken"]
+
+    @pytest.mark.asyncio()
+    async def test_expired_members_are_taken_in_batches(self, fake_client, idle_times):
+        from src.tasks.queue_cleanup import _clean_orphan_streams
+
+        for n in range(5):
+            await _stream(fake_client, f"po:response:req-{n}", written_s_ago=900)
+            idle_times.idle[f"po:response:req-{n}"] = 900
 
-        cleaned = await _clean_orphan_streams(mock_redis_client, idle_threshold_s=600)
+        with patch("src.tasks.queue_cleanup.ORPHAN_BATCH_SIZE", 2):
+            cleaned = await _clean_orphan_streams(fake_client, idle_threshold_s=600)
 
-        assert cleaned == 2
-        assert redis.delete.call_count == 2
+        assert cleaned == 5
+        assert [len(call.args[1]) for call in idle_times.call_args_list] == [2, 2, 1]
+
+
+class TestRegisterUnindexedStreams:
+    """Tests for _register_unindexed_streams (the startup backfill)."""
+
+    @pytest.mark.asyncio()
+    async def test_unregistered_streams_are_scored_by_idle_time(self, fake_client, idle_times):
+        from shared.redis.ephemeral import EPHEMERAL_REGISTRY
+        from src.tasks.queue_cleanup import _register_unindexed_streams
+
+        redis = fake_client.redis
+        for key in ("po:response:legacy", "worker:w1:input", "worker:w1:output", "po:input"):
+            await redis.xadd(key, {"data": "{}"})
+        idle_times.idle.update(
+            {"po:response:legacy": 3600, "worker:w1:input": 10, "worker:w1:output": 10}
+        )
+        # Already registered by its producer: the fresher score stays.
+        await redis.zadd(EPHEMERAL_REGISTRY, {"worker:w1:output": time.time()})
+
+        added = await _register_unindexed_streams(fake_client)
+
+        assert added == 2
+        scores = dict(await redis.zrange(EPHEMERAL_REGISTRY, 0, -1, withscores=True))
+        assert set(scores) == {"po:response:legacy", "worker:w1:input", "worker:w1:output"}
+        assert scores["po:response:legacy"] == pytest.approx(time.time() - 3600, abs=5)
+        assert scores["worker:w1:output"] == pytest.approx(time.time(), abs=5)
 
     @pytest.mark.asyncio()
     async def test_scan_pagination(self, mock_redis_client):
         """SCAN with multiple pages is followed correctly."""
-        from src.tasks.queue_cleanup import _clean_orphan_streams
+        from src.tasks.queue_cleanup import _register_unindexed_streams
 
         redis = mock_redis_client.redis
         # First pattern: two pages
@@ -89,28 +182,15 @@ class TestCleanOrphanStreams:
             (0, []),  # worker:*:input
             (0, []),  # worker:*:output
         ]
-        redis.object.side_effect = [700, 700]
+        redis.zadd.return_value = 2
 
-        cleaned = await _clean_orphan_streams(mock_redis_client, idle_threshold_s=600)
+        with patch(
+            "src.tasks.queue_cleanup._idle_times", new_callable=AsyncMock, return_value=[700, 700]
+        ) as idle:
+            added = await _register_unindexed_streams(mock_redis_client)
 
-        assert cleaned == 2
-
-    @pytest.mark.asyncio()
-    async def test_object_idletime_error_skips_key(self, mock_redis_client):
-        """If OBJECT IDLETIME fails for a key, skip it (don't crash)."""
-        from src.tasks.queue_cleanup import _clean_orphan_streams
-
-        redis = mock_redis_client.redis
-        redis.scan.side_effect = [
-            (0, ["po:response:broken", "po:response:ok"]),
-            (0, []),
-            (0, []),
-        ]
-        redis.object.side_effect = [Exception("key gone"), 700]
-
-        cleaned = await _clean_orphan_streams(mock_redis_client, idle_threshold_s=600)
-
-        assert cleaned == 1
+        assert added == 2
+        idle.assert_awaited_once_with(redis, ["po:response:page1", "po:response:page2"])
 
 
 class TestTrimOldMessages:
@@ -162,3 +242,65 @@ class TestTrimOldMessages:
             assert minid.endswith("-0")
             ts_ms = int(minid.split("-")[0])
             assert ts_ms > 0
+
+
+class TestTrimConsumedMessages:
+    """Tests for _trim_consumed_messages."""
+
+    @pytest.fixture()
+    async def client(self):
+        from fakeredis import aioredis
+
+        from shared.redis_client import RedisStreamClient
+
+        c = RedisStreamClient(redis_url="redis://fake:6379")
+        c._redis = aioredis.FakeRedis(decode_responses=True)
+        yield c
+        await c._redis.aclose()
+
+    @pytest.mark.asyncio()
+    async def test_acked_entries_are_trimmed_from_every_queue(self, client):
+        from shared.queues import ENGINEERING_QUEUE, WORKER_GROUP
+        from src.tasks.queue_cleanup import _trim_consumed_messages
+
+        redis = client.redis
+        await client.ensure_consumer_group(ENGINEERING_QUEUE, WORKER_GROUP)
+        ids = [await redis.xadd(ENGINEERING_QUEUE, {"data": "{}"}) for _ in range(3)]
+        await redis.xreadgroup(WORKER_GROUP, "c", {ENGINEERING_QUEUE: ">"})
+        await redis.xack(ENGINEERING_QUEUE, WORKER_GROUP, ids[0], ids[1])
+
+        trimmed = await _trim_consumed_messages(client)
+
+        assert trimmed == 2
+        assert [entry_id for entry_id, _ in await redis.xrange(ENGINEERING_QUEUE)] == [ids[2]]
+
+    @pytest.mark.asyncio()
+    async def test_a_group_pinning_old_entries_is_reported(self, client):
+        from structlog.testing import capture_logs
+
+        from shared.queues import DEPLOY_QUEUE, WORKER_GROUP
+        from src.tasks.queue_cleanup import _trim_consumed_messages
+
+        redis = client.redis
+        await client.ensure_consumer_group(DEPLOY_QUEUE, WORKER_GROUP)
+        two_hours_ago_ms = int((time.time() - 7200) * 1000)
+        await redis.xadd(DEPLOY_QUEUE, {"data": "{}"}, id=f"{two_hours_ago_ms}-0")
+        await redis.xreadgroup(WORKER_GROUP, "dead-consumer", {DEPLOY_QUEUE: ">"})
+
+        with capture_logs() as logs:
+            await _trim_consumed_messages(client, lag_warn_age_s=3600)
+
+        [warning] = [e for e in logs if e["event"] == "consumer_group_pinning_stream"]
+        assert warning["stream"] == DEPLOY_QUEUE
+        assert warning["pinned_by"] == "pending"
+        assert warning["floor_age_s"] >= 7200
+        assert await redis.xlen(DEPLOY_QUEUE) == 1
+
+    @pytest.mark.asyncio()
+    async def test_one_failing_queue_does_not_stop_the_rest(self, mock_redis_client):
+        from src.tasks.queue_cleanup import _trim_consumed_messages
+
+        mock_redis_client.trim_consumed.side_effect = ConnectionError("down")
+
+        assert await _trim_consumed_messages(mock_redis_client) == 0
+        assert mock_redis_client.trim_consumed.await_count > 1
@@ -7,6 +7,7 @@ from structlog.testing import capture_logs
 from shared.clients.time4vps import Time4VPSAPIError
 from shared.contracts.dto.incident import IncidentDTO, IncidentStatus, IncidentType
 from shared.contracts.dto.server import ServerDTO, ServerStatus
+from shared.tests.mocks.time4vps import FakeTime4VPS
 from src.tasks import server_sync
 
 
@@ -378,6 +379,89 @@ async def test_sync_server_details_keeps_health_checker_usage(
     assert "used_disk_mb" not in update_payload.model_dump(exclude_unset=True)
 
 
+def _provider_server(handle: str, provider_id: int, **fields) -> ServerDTO:
+    fields.setdefault("last_health_check", datetime.now(UTC))
+    return ServerDTO(
+        handle=handle,
+        host=f"{handle}.example",
+        public_ip=f"10.0.0.{provider_id}",
+        ssh_user="root",
+        status=ServerStatus.ACTIVE,
+        provider_id=str(provider_id),
+        is_managed=True,
+        labels={"provider_id": str(provider_id)},
+        created_at=datetime.now(UTC),
+        **fields,
+    )
+
+
+@pytest.mark.asyncio
+async def test_sync_server_details_fetches_servers_concurrently(mock_api_client):
+    fake = FakeTime4VPS(latency=0.02)
+    servers = [_provider_server(f"vps-{i}", i) for i in range(1, 9)]
+    for i in range(1, 9):
+        fake.add_server(i)
+    mock_api_client.get_servers = AsyncMock(return_value=servers)
+    mock_api_client.update_server = AsyncMock()
+    client = fake.client(max_connections=4)
+
+    updated = await server_sync._sync_server_details(client)
+
+    assert updated == 8  # noqa: PLR2004
+    assert sorted(fake.detail_fetches()) == list(range(1, 9))
+    assert fake.max_in_flight == 4  # noqa: PLR2004
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_sync_server_details_reuses_cached_details_and_skips_unchanged_rows(
+    mock_api_client,
+):
+    fake = FakeTime4VPS()
+    fake.add_server(1)
+    fake.add_server(2)
+    settled = _provider_server(
+        "vps-1",
+        1,
+        capacity_cpu=2,
+        capacity_ram_mb=4096,
+        capacity_disk_mb=81920,
+        os_template="kvm-ubuntu-24.04-gpt-x86_64",
+    )
+    # Not health-checked yet: usage still comes from the provider, so always fresh.
+    unchecked = _provider_server("vps-2", 2, last_health_check=None)
+    mock_api_client.get_servers = AsyncMock(return_value=[settled, unchecked])
+    mock_api_client.update_server = AsyncMock()
+    client = fake.client()
+
+    await server_sync._sync_server_details(client)
+    await server_sync._sync_server_details(client)
+
+    assert sorted(fake.detail_fetches()) == [1, 2, 2]
+    # vps-1 already matched its details; vps-2's row is written on each pass.
+    assert [call.args[0] for call in mock_api_client.update_server.await_args_list] == [
+        "vps-2",
+        "vps-2",
+    ]
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_get_time4vps_client_is_reused_until_the_credentials_change(mock_api_client):
+    mock_api_client.get_api_key = AsyncMock(
+        return_value={"value": '{"username": "u", "password": "p"}'}
+    )
+    first = await server_sync.get_time4vps_client()
+    again = await server_sync.get_time4vps_client()
+
+    mock_api_client.get_api_key.return_value = {"value": '{"username": "u", "password": "q"}'}
+    rotated = await server_sync.get_time4vps_client()
+
+    assert again is first
+    assert rotated is not first
+    assert rotated.password == "q"  # noqa: S105
+
+
 @pytest.mark.asyncio
 async def test_check_provisioning_triggers_detects_force_rebuild(
     mock_api_client, mock_notify_admins, monkeypatch
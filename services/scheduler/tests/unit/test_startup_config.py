@@ -9,7 +9,7 @@ import yaml
 os.environ.setdefault("HEALTH_CHECK_INTERVAL", "300")
 os.environ.setdefault("INTERNAL_API_KEY", "test-internal-key")
 
-from shared.config_store import ConfigStore, ConfigStoreUnavailableError
+from shared.config_store import AsyncConfigStore, ConfigStoreUnavailableError
 from src import main, startup
 from src.tasks import supervisor, task_dispatcher
 
@@ -40,8 +40,11 @@ def test_required_keys_cover_every_scheduler_task_config_value():
         "scheduler.dispatch_interval_seconds",
         "scheduler.github_sync_interval",
         "scheduler.github_sync_missing_threshold",
+        "scheduler.github_sync_concurrency",
+        "scheduler.github_sync_request_budget",
         "scheduler.server_sync_interval",
         "scheduler.server_details_sync_interval",
+        "scheduler.server_details_cache_ttl_seconds",
         "scheduler.provisioning_stuck_timeout_seconds",
         "scheduler.provisioning_trigger_cooldown_seconds",
         "scheduler.scaffold_inflight_ttl",
@@ -62,8 +65,12 @@ def test_required_keys_cover_every_scheduler_task_config_value():
         "health.consecutive_failure_threshold",
         "health.ssl_expiry_warning_days",
         "health.metrics_retention_hours",
+        "health.metrics_rollup_5m_retention_hours",
+        "health.metrics_rollup_1h_retention_hours",
         "health.metrics_cleanup_interval_seconds",
         "health.http_timeout",
+        "health.check_concurrency",
+        "health.server_check_deadline_seconds",
         "scheduler.ci_failure_max_fingerprint_attempts",
         "scheduler.ci_failure_log_excerpt_lines",
     } <= set(startup.REQUIRED_KEYS)
@@ -80,60 +87,82 @@ def test_every_required_key_is_declared_in_the_seed_file():
 
 
 class _ConfigResponder:
-    """Answers the config read the store sends through the shared transport."""
+    """Answers the config reads the store sends through the shared transport."""
 
     def __init__(self):
         self.status_code = 200
-        self.json_body = {"key": "scheduler.dispatch_interval_seconds", "value": 30}
+        self.json_body = [
+            {"key": "scheduler.dispatch_interval_seconds", "value": 30, "category": "scheduler"}
+        ]
         self.error = None
+        self.calls = 0
 
     def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
         if self.error is not None:
             raise self.error
         return httpx.Response(self.status_code, json=self.json_body)
 
 
 def _config_transport(responder):
-    """Route the store's sync client through `responder` instead of the network."""
-    real_client = httpx.Client
+    """Route the store's async client through `responder` instead of the network."""
+    real_client = httpx.AsyncClient
 
     def factory(**kwargs):
         return real_client(transport=httpx.MockTransport(responder), **kwargs)
 
-    return patch("shared.clients.internal_api.httpx.Client", factory)
+    return patch("shared.clients.internal_api.httpx.AsyncClient", factory)
 
 
-def test_dispatch_interval_survives_the_config_api_going_away(monkeypatch):
-    """A working loop keeps its last known value while the source is unreachable."""
+@pytest.mark.asyncio
+async def test_dispatch_interval_is_read_from_memory_once_loaded(monkeypatch):
+    """After the startup load, the config API going away costs a loop nothing."""
     responder = _ConfigResponder()
 
     with _config_transport(responder):
-        store = ConfigStore("http://api:8000", cache_ttl=0)
+        store = AsyncConfigStore("http://api:8000", redis_url="")
+        await store.load()
         monkeypatch.setattr(startup, "config", store)
 
-        assert task_dispatcher._dispatch_interval() == 30
-
         responder.error = httpx.ConnectError("connection refused")
         assert task_dispatcher._dispatch_interval() == 30
+        assert task_dispatcher._dispatch_interval() == 30
 
+    assert responder.calls == 1
 
-def test_dispatch_interval_still_fails_loudly_when_the_key_is_gone(monkeypatch):
+
+@pytest.mark.asyncio
+async def test_dispatch_interval_still_fails_loudly_when_the_key_is_gone(monkeypatch):
     responder = _ConfigResponder()
-    responder.status_code = 404
+    responder.json_body = []
 
     with _config_transport(responder):
-        store = ConfigStore("http://api:8000")
+        store = AsyncConfigStore("http://api:8000", redis_url="")
+        await store.load()
         monkeypatch.setattr(startup, "config", store)
 
         with pytest.raises(KeyError, match="not found"):
             task_dispatcher._dispatch_interval()
 
 
+@pytest.mark.asyncio
+async def test_init_config_refuses_a_store_missing_required_keys(monkeypatch):
+    responder = _ConfigResponder()
+    monkeypatch.setenv("API_BASE_URL", "http://api:8000")
+    monkeypatch.setenv("REDIS_URL", "")
+    monkeypatch.setattr(startup, "config", None)
+
+    with _config_transport(responder), pytest.raises(RuntimeError, match="Missing required"):
+        await startup.init_config()
+
+    assert startup.config is None
+
+
 @pytest.mark.asyncio
 async def test_startup_retries_config_validation_until_api_is_available(monkeypatch):
     attempts = 0
 
-    def validate_configs():
+    async def validate_configs():
         nonlocal attempts
         attempts += 1
         if attempts == 1:
@@ -10,6 +10,7 @@ from datetime import UTC, datetime, timedelta
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, patch
 
+from _dispatch_snapshot import serve_snapshot
 from _run_routing_factories import _make_repo, _make_story, _make_task
 import pytest
 
@@ -43,7 +44,7 @@ def api_client():
     # that publishes a terminal owner notice reads the story back before it
     # publishes, so the double has to answer that read like the API would.
     client.get_story.return_value = _make_story(id="story-1", status="waiting_human_review")
-    return client
+    return serve_snapshot(client)
 
 
 @pytest.fixture
@@ -189,6 +190,36 @@ class TestSuperviseStuckStories:
         assert result["failed"] == 0
         redis_client.publish_message.assert_not_called()
 
+    @pytest.mark.asyncio
+    async def test_the_tasks_of_every_overdue_story_are_one_batch_read(
+        self, api_client, redis_client
+    ):
+        """Which stories the architect has decomposed is asked once, not per story."""
+        from src.tasks.task_dispatcher import supervise_stuck_stories
+
+        old = datetime.now(UTC) - timedelta(minutes=10)
+        stories = [
+            _make_story(
+                id=f"story-{i}",
+                project_id=f"00000000-0000-0000-0000-00000000000{i}",
+                created_at=old,
+            )
+            for i in range(1, 4)
+        ]
+        api_client.get_stories_by_status.side_effect = lambda status: (
+            stories if status == "created" else []
+        )
+        api_client.get_tasks_by_story.side_effect = lambda story_id: (
+            [_make_task(id="task-1")] if story_id == "story-2" else []
+        )
+
+        result = await supervise_stuck_stories(api_client, redis_client)
+
+        assert result["retried"] == 2
+        api_client.get_tasks_by_story_ids.assert_awaited_once()
+        published = [c.args[1].story_id for c in redis_client.publish_message.call_args_list]
+        assert published == ["story-1", "story-3"]
+
 
 class TestCompleteStoriesTriggersNext:
     """After completing a story, trigger the next queued story for the same project."""
@@ -292,19 +323,36 @@ class TestSuperviseFailedTasks:
                 max_iterations=3,
             )
         ]
-        api_client.transition_task.return_value = {}
-        api_client.update_task.return_value = {}
-
         result = await supervise_failed_tasks(api_client, redis_client)
 
         assert result["retried"] == 1
-        # Should transition: failed -> backlog -> todo
-        calls = api_client.transition_task.call_args_list
-        assert len(calls) == 2  # noqa: PLR2004
-        assert calls[0].args == ("task-1", "backlog", "supervisor")
-        assert calls[1].args == ("task-1", "todo", "supervisor")
-        # Should increment current_iteration
-        api_client.update_task.assert_called_once_with("task-1", {"current_iteration": 1})
+        # failed -> backlog -> todo and the iteration bump are one request
+        api_client.retry_task.assert_awaited_once_with(
+            "task-1", next_iteration=1, actor="supervisor"
+        )
+        api_client.transition_task.assert_not_awaited()
+        api_client.update_task.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_a_retry_refused_as_already_moved_is_not_counted(self, api_client, redis_client):
+        """The API refused the retry: another one put the task back first."""
+        from src.tasks.task_dispatcher import supervise_failed_tasks
+
+        api_client.get_tasks_by_status.return_value = [
+            _make_task(
+                id="task-1",
+                story_id="story-1",
+                status="failed",
+                current_iteration=0,
+                max_iterations=3,
+            )
+        ]
+        api_client.retry_task.return_value = None
+
+        result = await supervise_failed_tasks(api_client, redis_client)
+
+        assert result["retried"] == 0
+        api_client.transition_task.assert_not_awaited()
 
     @pytest.mark.asyncio
     async def test_escalates_to_whr_when_retries_exhausted(self, api_client, redis_client):
@@ -406,11 +454,9 @@ class TestSuperviseFailedTasks:
         result = await supervise_failed_tasks(api_client, redis_client)
 
         assert result == {"retried": 1, "escalated": 0}
-        assert [call.args[1] for call in api_client.transition_task.call_args_list] == [
-            "backlog",
-            "todo",
-        ]
-        api_client.update_task.assert_awaited_once_with("task-1", {"current_iteration": 2})
+        api_client.retry_task.assert_awaited_once_with(
+            "task-1", next_iteration=2, actor="supervisor"
+        )
 
     @pytest.mark.asyncio
     async def test_no_fresh_metrics_escalates_without_spending_an_iteration(
@@ -578,10 +624,8 @@ class TestSuperviseWaitingResourceTasks:
         result = await supervise_waiting_resource_tasks(api_client, redis_client)
 
         assert result == {"resumed": 1, "expired": 0}
-        assert [call.args[1] for call in api_client.transition_task.call_args_list] == [
-            "backlog",
-            "todo",
-        ]
+        api_client.retry_task.assert_awaited_once_with(task.id, actor="supervisor")
+        api_client.transition_task.assert_not_awaited()
         redis_client.publish_flat.assert_awaited_once()
 
     @pytest.mark.asyncio
@@ -202,7 +202,10 @@ async def test_terminal_run_is_replayed_without_clobbering_its_outcome():
         "stopping": 0,
     }
     api.update_run.assert_not_called()
-    assert api.transition_task.await_count == 3
+    api.replay_task_statuses.assert_awaited_once_with(
+        "task-1", ("in_ci", "testing", "done"), "supervisor"
+    )
+    api.transition_task.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -5,6 +5,7 @@ from __future__ import annotations
 from datetime import UTC, datetime
 from unittest.mock import AsyncMock
 
+from _dispatch_snapshot import serve_snapshot
 import pytest
 
 from shared.contracts.dto.repository import RepositoryDTO
@@ -130,7 +131,7 @@ def api_client():
     client.get_applications_by_project.return_value = [{"id": 1, "status": "running"}]
     # Default: no live engineering run left over from a previous tick
     client.list_runs.return_value = []
-    return client
+    return serve_snapshot(client)
 
 
 @pytest.fixture
@@ -795,7 +796,9 @@ class TestDispatchPartialFailure:
         assert dispatched == 1
         api_client.create_run.assert_not_called()
         redis_client.publish_message.assert_not_called()
-        assert [c[0][1] for c in api_client.transition_task.call_args_list] == [
+        api_client.transition_task.assert_not_called()
+        [replay] = api_client.replay_task_statuses.call_args_list
+        assert list(replay.args[1]) == [
             "in_dev",
             "in_ci",
             "testing",
@@ -817,7 +820,9 @@ class TestDispatchPartialFailure:
 
         api_client.create_run.assert_not_called()
         redis_client.publish_message.assert_not_called()
-        assert [c[0][1] for c in api_client.transition_task.call_args_list] == [
+        api_client.transition_task.assert_not_called()
+        [replay] = api_client.replay_task_statuses.call_args_list
+        assert list(replay.args[1]) == [
             "in_dev",
             "failed",
         ]
@@ -836,7 +841,9 @@ class TestDispatchPartialFailure:
         await dispatch_todo_tasks(api_client, redis_client)
 
         api_client.create_run.assert_not_called()
-        assert [c[0][1] for c in api_client.transition_task.call_args_list] == [
+        api_client.transition_task.assert_not_called()
+        [replay] = api_client.replay_task_statuses.call_args_list
+        assert list(replay.args[1]) == [
             "in_dev",
             "waiting_human_review",
         ]
@@ -861,6 +868,74 @@ class TestDispatchPartialFailure:
         api_client.transition_task.assert_called_once_with("task-1", "in_dev", "dispatcher")
 
 
+class TestDispatchFromSnapshot:
+    """A tick reads the pipeline once, whatever the size of the backlog."""
+
+    @staticmethod
+    def _snapshot(todo: list[TaskDTO], **fields):
+        from uuid import UUID
+
+        from _run_routing_factories import _make_project
+
+        from shared.contracts.dto.pipeline import PipelineSnapshot
+
+        project = _make_project(id=UUID(PROJ_ID), config={"workspace_ready": True})
+        return PipelineSnapshot(todo_tasks=todo, projects={PROJ_ID: project}, **fields)
+
+    @pytest.mark.asyncio
+    async def test_a_large_backlog_is_decided_without_per_task_reads(self, redis_client):
+        from src.tasks.task_dispatcher import dispatch_todo_tasks
+
+        todo = [_task(id=f"task-{i}", story_id=f"story-{i}") for i in range(300)]
+        api_client = AsyncMock()
+        api_client.get_pipeline_snapshot.return_value = self._snapshot(
+            todo, story_tasks={f"story-{i}": [todo[i]] for i in range(300)}
+        )
+
+        dispatched = await dispatch_todo_tasks(api_client, redis_client)
+
+        assert dispatched == 300
+        api_client.get_pipeline_snapshot.assert_awaited_once()
+        for per_task_read in (
+            api_client.get_tasks_by_status,
+            api_client.get_task,
+            api_client.get_project,
+            api_client.get_tasks_by_story,
+            api_client.list_runs,
+            api_client.get_task_events,
+        ):
+            per_task_read.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_a_story_changed_this_tick_waits_for_the_next_one(self, redis_client):
+        """The snapshot still shows the first task in todo once it has been dispatched."""
+        from src.tasks.task_dispatcher import dispatch_todo_tasks
+
+        first = _task(id="task-1", story_id="story-1")
+        second = _task(id="task-2", story_id="story-1")
+        api_client = AsyncMock()
+        api_client.get_pipeline_snapshot.return_value = self._snapshot(
+            [first, second], story_tasks={"story-1": [first, second]}
+        )
+
+        dispatched = await dispatch_todo_tasks(api_client, redis_client)
+
+        assert dispatched == 1
+        api_client.transition_task.assert_awaited_once_with("task-1", "in_dev", "dispatcher")
+
+    @pytest.mark.asyncio
+    async def test_a_blocker_missing_from_the_snapshot_keeps_the_task_blocked(self, redis_client):
+        from src.tasks.task_dispatcher import dispatch_todo_tasks
+
+        api_client = AsyncMock()
+        api_client.get_pipeline_snapshot.return_value = self._snapshot(
+            [_task(blocked_by_task_id="task-0")]
+        )
+
+        assert await dispatch_todo_tasks(api_client, redis_client) == 0
+        api_client.create_run.assert_not_called()
+
+
 class TestParseOwnerRepo:
     """Parse owner/repo from GitHub git URLs."""
 
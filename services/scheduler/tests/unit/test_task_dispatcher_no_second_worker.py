@@ -13,6 +13,7 @@ from datetime import UTC, datetime
 from unittest.mock import AsyncMock
 from uuid import UUID
 
+from _dispatch_snapshot import serve_snapshot
 from _run_routing_factories import _make_project, _make_run, _make_task
 import pytest
 
@@ -29,7 +30,7 @@ def api_client():
     )
     client.get_tasks_by_story.return_value = []
     client.get_task_events.return_value = []
-    return client
+    return serve_snapshot(client)
 
 
 @pytest.fixture
@@ -20,6 +20,7 @@ from shared.contracts.worker_control_plane import (
     WorkerControlPlaneOperation,
     control_plane_denial,
 )
+from shared.redis.ephemeral import register_ephemeral
 from shared.worker_type_cutover import backfill_pre_cutover_worker_type
 
 from .auth import credential_key, token_digest, verify_token
@@ -169,6 +170,7 @@ async def register_worker(registration: Registration, x_broker_internal_token: s
     except ResponseError as exc:
         if "BUSYGROUP" not in str(exc):
             raise
+    await register_ephemeral(redis, registration.input_stream)
     return {"ok": True}
 
 
@@ -216,6 +218,7 @@ async def submit_output(
         maxlen=settings.STREAM_MAXLEN,
         approximate=True,
     )
+    await register_ephemeral(redis, metadata["output_stream"])
     # ACK comes after the typed output is durably accepted. A failed submission leaves the input pending.
     await redis.xack(metadata["input_stream"], metadata["consumer_group"], submission.lease_id)
     active_turn = WorkerActiveTurn.from_redis_fields(await redis.hgetall(active_turn_key(worker_id)))
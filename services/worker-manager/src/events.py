@@ -17,6 +17,7 @@ from shared.contracts.queues.worker_result import WorkerFailedResult
 
 from shared.contracts.dto.worker import WorkerStatus
 from shared.contracts.queues.worker import WorkerLabel
+from shared.redis.ephemeral import register_ephemeral
 
 logger = structlog.get_logger()
 
@@ -142,6 +143,7 @@ class DockerEventsListener:
         error_payload = WorkerFailedResult(error=f"Worker container died (exit_code={exit_code})").model_dump_json()
         try:
             await self.redis.xadd(output_stream, {"data": error_payload})
+            await register_ephemeral(self.redis, output_stream)
             logger.info("worker_death_published", worker_id=worker_id, stream=output_stream)
         except Exception as e:
             logger.error("worker_death_publish_failed", worker_id=worker_id, error=str(e))
@@ -18,6 +18,7 @@ this is a plain module next to the other clients.
 
 from __future__ import annotations
 
+from collections.abc import AsyncIterator, Iterable
 import os
 
 import httpx
@@ -26,6 +27,18 @@ from shared.log_config.correlation import ensure_correlation_id, set_correlation
 
 DEFAULT_TIMEOUT_SECONDS = 30.0
 
+# Most ids one batch read may name. The API refuses more with a 422, so the
+# query string stays well under any proxy's URL limit; `get_batch` splits a
+# longer list into requests of this size.
+BATCH_MAX_IDS = 200
+
+# Largest page a list read (`/runs/`, `/projects/`, `/tasks/`, `/stories/`) hands
+# out, and the page `iter_pages` asks for unless told otherwise. A full page
+# names the next one in this response header.
+PAGE_MAX = 1000
+DEFAULT_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 INTERNAL_KEY_HEADER = "X-Internal-Key"
 CORRELATION_ID_HEADER = "X-Correlation-ID"
 
@@ -127,6 +140,51 @@ class InternalAPIClient(InternalAPITransport):
     async def patch_raw(self, path: str, **kwargs) -> httpx.Response:
         return await self.request_raw("PATCH", path, **kwargs)
 
+    async def get_batch(self, path: str, param: str, ids: Iterable[str], **params) -> list:
+        """Every row a batch read returns for *ids*, named in *param*.
+
+        The ids are sent once each, at most `BATCH_MAX_IDS` to a request, so a
+        story of any size is a handful of requests rather than one per row. No
+        ids is no request.
+        """
+        unique = list(dict.fromkeys(ids))
+        rows: list = []
+        for start in range(0, len(unique), BATCH_MAX_IDS):
+            chunk = unique[start : start + BATCH_MAX_IDS]
+            resp = await self.request("GET", path, params={**params, param: chunk})
+            rows.extend(resp.json())
+        return rows
+
+    async def iter_pages(
+        self,
+        path: str,
+        *,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        headers: dict | None = None,
+        **params,
+    ) -> AsyncIterator[dict]:
+        """Every row of a paged list read, one page of *page_size* at a time.
+
+        Follows `NEXT_CURSOR_HEADER` until a page comes back without one, so a
+        caller sees one stream of rows however many requests it took.
+        """
+        params = {**params, "limit": page_size}
+        # Only a caller's own headers are passed on: a bare ``params`` read is
+        # what a subclass may cache.
+        extra = {"headers": headers} if headers else {}
+        while True:
+            resp = await self.request("GET", path, params=params, **extra)
+            for row in resp.json():
+                yield row
+            cursor = resp.headers.get(NEXT_CURSOR_HEADER)
+            if cursor is None:
+                return
+            params["cursor"] = cursor
+
+    async def get_all(self, path: str, *, headers: dict | None = None, **params) -> list[dict]:
+        """Every row of a paged list read, collected from `iter_pages`."""
+        return [row async for row in self.iter_pages(path, headers=headers, **params)]
+
     async def close(self) -> None:
         if self._client is not None:
             await self._client.aclose()
@@ -1,6 +1,9 @@
-"""Loki HTTP client — LogQL range queries over Loki's HTTP API."""
+"""Loki HTTP client — LogQL range and metric queries over Loki's HTTP API."""
 
+from collections.abc import AsyncIterator, Iterator
 from datetime import datetime
+import json
+import math
 import os
 
 import httpx
@@ -8,6 +11,9 @@ import structlog
 
 logger = structlog.get_logger()
 
+# Loki refuses a page larger than its max_entries_limit_per_query (5000 by default).
+DEFAULT_PAGE_SIZE = 5000
+
 
 def _get_env(key: str) -> str:
     """Read env var, raising RuntimeError if missing."""
@@ -17,14 +23,20 @@ def _get_env(key: str) -> str:
     return val
 
 
+def unix_ns(moment: datetime) -> int:
+    """Unix nanoseconds of *moment*, the resolution Loki stores and pages by."""
+    return int(moment.timestamp()) * 1_000_000_000 + moment.microsecond * 1000
+
+
 class LokiClient:
-    """Async client for Loki's query_range HTTP API."""
+    """Async client for Loki's query_range and query HTTP APIs."""
 
     def __init__(
         self,
         base_url: str | None = None,
         user: str | None = None,
         password: str | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
     ):
         if base_url is None:
             base_url = _get_env("LOKI_URL")
@@ -37,6 +49,7 @@ class LokiClient:
             base_url=base_url.rstrip("/"),
             auth=auth,
             timeout=30.0,
+            transport=transport,
         )
 
     async def query_range(
@@ -44,32 +57,103 @@ class LokiClient:
         query: str,
         start: datetime,
         end: datetime,
-        limit: int = 5000,
+        limit: int = DEFAULT_PAGE_SIZE,
     ) -> list[dict]:
-        """Execute a LogQL range query and return parsed log entries.
+        """Execute a LogQL range query and return every parsed log entry in [start, end).
 
-        Returns a flat list of parsed JSON log lines from all streams.
+        Returns a flat list of parsed JSON log lines from all streams, fetched
+        *limit* entries per request. Prefer ``iter_range`` when the window may
+        be large: it holds one page at a time.
         """
-        params = {
-            "query": query,
-            "start": str(int(start.timestamp())),
-            "end": str(int(end.timestamp())),
-            "limit": str(limit),
-            "direction": "forward",
-        }
+        return [entry async for entry in self.iter_range(query, start, end, limit)]
 
-        logger.debug(
-            "loki_query_range",
-            query=query,
-            start=start.isoformat(),
-            end=end.isoformat(),
-        )
-
-        resp = await self._client.get("/loki/api/v1/query_range", params=params)
+    async def iter_range(
+        self,
+        query: str,
+        start: datetime,
+        end: datetime,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> AsyncIterator[dict]:
+        """Yield every parsed log entry in [start, end), one page of *page_size* at a time.
+
+        Pages follow a timestamp cursor: each starts at the newest timestamp of
+        the page before, and the entries already yielded at that timestamp are
+        skipped, so lines sharing a nanosecond across a page boundary are
+        neither lost nor repeated.
+        """
+        cursor = unix_ns(start)
+        end_ns = unix_ns(end)
+        seen_at_cursor: set[tuple[int, str, str]] = set()
+
+        while cursor < end_ns:
+            params = {
+                "query": query,
+                "start": str(cursor),
+                "end": str(end_ns),
+                "limit": str(page_size),
+                "direction": "forward",
+            }
+            logger.debug("loki_query_range", query=query, start=cursor, end=end_ns)
+            resp = await self._client.get("/loki/api/v1/query_range", params=params)
+            resp.raise_for_status()
+
+            count = 0
+            newest = cursor
+            at_newest: set[tuple[int, str, str]] = set()
+            for ts, labels_key, line, entry in self._iter_page(resp.json()):
+                count += 1
+                key = (ts, labels_key, line)
+                if ts > newest:
+                    newest = ts
+                    at_newest = set()
+                if ts == newest:
+                    at_newest.add(key)
+                if key not in seen_at_cursor:
+                    yield entry
+
+            if count < page_size:
+                return
+            if newest == cursor:
+                # A full page within one nanosecond: asking again from the
+                # same cursor would return the same page forever.
+                logger.warning("loki_page_overflow", query=query, timestamp=cursor)
+                cursor, seen_at_cursor = cursor + 1, set()
+            else:
+                cursor, seen_at_cursor = newest, at_newest
+
+    async def query_metric(self, query: str, at: datetime | int) -> list[tuple[dict, float]]:
+        """Evaluate a LogQL metric query at *at*; one ``(labels, value)`` per series.
+
+        *at* may be a datetime or Unix nanoseconds. Series whose value is NaN
+        (a quantile over no samples) are left out.
+        """
+        params = {"query": query, "time": str(at if isinstance(at, int) else unix_ns(at))}
+        logger.debug("loki_query_metric", query=query, time=params["time"])
+        resp = await self._client.get("/loki/api/v1/query", params=params)
         resp.raise_for_status()
 
-        data = resp.json()
-        return self._parse_response(data)
+        series = []
+        for sample in resp.json()["data"]["result"]:
+            value = float(sample["value"][1])
+            if not math.isnan(value):
+                series.append((sample["metric"], value))
+        return series
+
+    @staticmethod
+    def _iter_page(data: dict) -> Iterator[tuple[int, str, str, dict]]:
+        """Walk one query_range page lazily: ``(ts, labels key, line, parsed entry)``."""
+        for stream in data["data"]["result"]:
+            labels = stream["stream"]
+            labels_key = json.dumps(labels, sort_keys=True)
+            for ts, line in stream["values"]:
+                try:
+                    parsed = json.loads(line)
+                except (json.JSONDecodeError, TypeError):
+                    parsed = {"raw": line}
+                if not isinstance(parsed, dict):
+                    parsed = {"raw": line}
+                parsed["_labels"] = labels
+                yield int(ts), labels_key, line, parsed
 
     @staticmethod
     def _parse_response(data: dict) -> list[dict]:
@@ -89,19 +173,7 @@ class LokiClient:
           }
         }
         """
-        import json
-
-        entries: list[dict] = []
-        for stream in data["data"]["result"]:
-            labels = stream["stream"]
-            for _ts, line in stream["values"]:
-                try:
-                    parsed = json.loads(line)
-                except (json.JSONDecodeError, TypeError):
-                    parsed = {"raw": line}
-                parsed["_labels"] = labels
-                entries.append(parsed)
-        return entries
+        return [entry for *_, entry in LokiClient._iter_page(data)]
 
     async def close(self):
         """Close the underlying HTTP client."""
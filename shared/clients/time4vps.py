@@ -1,4 +1,12 @@
-"""Time4VPS Client for Internal API."""
+"""Time4VPS Client for Internal API.
+
+One ``Time4VPSClient`` keeps one pooled HTTP connection set for its lifetime;
+build it once and reuse it, and ``close()`` it (or use it as an async context
+manager) when done. Every request first takes a token from a bucket of
+``REQUESTS_PER_SECOND`` (bursts up to ``REQUEST_BURST``), and at most
+``MAX_CONNECTIONS`` requests are in flight at once, so callers may fan out
+freely without outrunning the provider's API.
+"""
 
 import asyncio
 import base64
@@ -18,6 +26,21 @@ logger = get_logger(__name__)
 # Cap anyway so an HTML error page can't flood the log or an exception message.
 _ERROR_BODY_LIMIT = 2000
 
+DEFAULT_BASE_URL = "https://billing.time4vps.com/api"
+
+# Client-side budget for the billing API. The provider publishes no limit; these
+# keep a details sweep over tens of servers to a few seconds without bursts that
+# look like abuse.
+REQUESTS_PER_SECOND = 5.0
+REQUEST_BURST = 10
+MAX_CONNECTIONS = 5
+
+# A task poll waits longer after every pending answer, up to this many seconds:
+# reinstalls take minutes, and every poll counts against the billing API's
+# per-server throttle.
+MAX_POLL_INTERVAL = 60
+_POLL_BACKOFF = 1.5
+
 # The billing API throttles consecutive actions on one server and refuses the extra
 # call with 401 — the very status it also uses for a real authorization failure.
 # Only this key inside the error body tells the two apart.
@@ -59,25 +82,73 @@ class Time4VPSAPIError(Exception):
         raise ValueError(f"Unrecognized Time4VPS rate-limit body: {self.body}")
 
 
+class _TokenBucket:
+    """Token bucket on the event loop's clock; waiters reserve tokens in arrival order.
+
+    A request that finds the bucket empty takes its token anyway, leaving the
+    balance negative, and sleeps until that token would have been refilled. The
+    next caller sees the debt and waits behind it. Nothing awaits between
+    reading and updating the balance, so no lock is needed.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated: float | None = None
+
+    async def acquire(self) -> None:
+        now = asyncio.get_running_loop().time()
+        if self._updated is not None:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+
 class Time4VPSClient:
     """Client for Time4VPS API."""
 
-    def __init__(self, username: str | None = None, password: str | None = None):
+    def __init__(
+        self,
+        username: str | None = None,
+        password: str | None = None,
+        *,
+        base_url: str = DEFAULT_BASE_URL,
+        requests_per_second: float = REQUESTS_PER_SECOND,
+        burst: int = REQUEST_BURST,
+        max_connections: int = MAX_CONNECTIONS,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
         """Initialize Time4VPS Client.
 
         Args:
             username: Time4VPS account login. Callers pass it explicitly; the env
                 fallback is TIME4VPS_USERNAME.
             password: Time4VPS password. Defaults to TIME4VPS_PASSWORD env var.
+            base_url: API root; tests and benchmarks point it at a fake.
+            requests_per_second: Sustained request rate across all callers.
+            burst: Requests allowed at once before the rate applies.
+            max_connections: Requests in flight at once; the rest wait their turn.
+            transport: httpx transport override, for tests.
 
         Note: access to the API is restricted by an IP allowlist on the provider side.
         A correct login from an unlisted address answers 401 with
         {"error":["ipnotallowed","unauthorized"]}.
         """
-        self.base_url = "https://billing.time4vps.com/api"
+        self.base_url = base_url.rstrip("/")
         self.username = username or os.getenv("TIME4VPS_USERNAME")
         self.password = password or os.getenv("TIME4VPS_PASSWORD")
         self._auth_header: str | None = None
+        self._bucket = _TokenBucket(requests_per_second, burst)
+        self._max_connections = max_connections
+        # Bounds requests in flight whatever the transport; the pool limits
+        # below only keep that many connections alive for reuse.
+        self._slots = asyncio.Semaphore(max_connections)
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self._details_cache: dict[int, tuple[float, Time4VPSServerDetails]] = {}
 
         if not self.username or not self.password:
             logger.warning(
@@ -97,13 +168,41 @@ class Time4VPSClient:
             self._auth_header = f"Basic {encoded_auth}"
         return {"Authorization": self._auth_header}
 
+    def _http(self) -> httpx.AsyncClient:
+        """The pooled HTTP client, created on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self._max_connections,
+                    max_keepalive_connections=self._max_connections,
+                ),
+                # The slots already keep requests within the pool, so only
+                # the network steps need a timeout.
+                timeout=httpx.Timeout(30.0, pool=None),
+                transport=self._transport,
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """Close the pooled HTTP client; the next request opens a new one."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> "Time4VPSClient":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
     async def _request(self, method: str, path: str, **kwargs: Any) -> httpx.Response:
         """Send an authenticated request, logging the response body on 4xx/5xx."""
         headers = self._get_auth_header()
         url = f"{self.base_url}{path}"
 
-        async with httpx.AsyncClient() as client:
-            resp = await client.request(method, url, headers=headers, **kwargs)
+        async with self._slots:
+            await self._bucket.acquire()
+            resp = await self._http().request(method, url, headers=headers, **kwargs)
 
         if resp.is_error:
             body = resp.text[:_ERROR_BODY_LIMIT]
@@ -124,19 +223,32 @@ class Time4VPSClient:
         # API returns list of servers
         return [Time4VPSServer.model_validate(item) for item in resp.json()]
 
-    async def get_server_details(self, server_id: int) -> Time4VPSServerDetails:
+    async def get_server_details(self, server_id: int, max_age: float = 0) -> Time4VPSServerDetails:
         """Get details for a specific server.
 
+        Args:
+            server_id: Server ID
+            max_age: Seconds a previously fetched answer stays good enough. The
+                default 0 always asks the provider; a reinstall or password reset
+                through this client drops the server's cached answer.
+
         Note: The response does not include server_id - use the parameter if needed.
         """
+        now = asyncio.get_running_loop().time()
+        cached = self._details_cache.get(server_id)
+        if cached is not None and now - cached[0] < max_age:
+            return cached[1]
         resp = await self._request("GET", f"/server/{server_id}")
-        return Time4VPSServerDetails.model_validate(resp.json())
+        details = Time4VPSServerDetails.model_validate(resp.json())
+        self._details_cache[server_id] = (now, details)
+        return details
 
     async def reset_password(self, server_id: int) -> int:
         """Reset server root password.
 
         Returns task_id for polling the result.
         """
+        self._details_cache.pop(server_id, None)
         resp = await self._request("POST", f"/server/{server_id}/resetpassword")
         result = resp.json()
 
@@ -263,6 +375,7 @@ class Time4VPSClient:
             os_template=os_template,
         )
 
+        self._details_cache.pop(server_id, None)
         resp = await self._request("POST", f"/server/{server_id}/reinstall", json=payload)
         result = resp.json()
         logger.debug("time4vps_reinstall_response", response=result)
@@ -276,7 +389,12 @@ class Time4VPSClient:
         return task_id
 
     async def wait_for_task(
-        self, server_id: int, task_id: int, timeout: int = 600, poll_interval: int = 10
+        self,
+        server_id: int,
+        task_id: int,
+        timeout: int = 600,
+        poll_interval: int = 10,
+        max_poll_interval: int = MAX_POLL_INTERVAL,
     ) -> Time4VPSTask:
         """Wait for any task to complete.
 
@@ -284,7 +402,10 @@ class Time4VPSClient:
             server_id: Server ID
             task_id: Task ID to wait for
             timeout: Maximum wait time in seconds
-            poll_interval: Polling interval in seconds
+            poll_interval: Wait after the first pending poll, in seconds. Each
+                further pending poll waits half as long again, up to
+                *max_poll_interval*, and never past *timeout*.
+            max_poll_interval: Longest wait between two polls, in seconds
 
         Returns:
             Task result dict
@@ -298,6 +419,7 @@ class Time4VPSClient:
                 unknown state and still ends the wait.
         """
         start_time = asyncio.get_running_loop().time()
+        delay = float(poll_interval)
 
         while True:
             remaining = timeout - (asyncio.get_running_loop().time() - start_time)
@@ -330,6 +452,7 @@ class Time4VPSClient:
                 "time4vps_task_waiting",
                 server_id=server_id,
                 task_id=task_id,
-                poll_interval=poll_interval,
+                poll_interval=delay,
             )
-            await asyncio.sleep(poll_interval)
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * _POLL_BACKOFF, max_poll_interval)
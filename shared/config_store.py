@@ -1,31 +1,62 @@
-"""ConfigStore — read-only client for system_configs with TTL cache.
+"""Read-only clients for system_configs.
 
-Reads operational constants from the API. No business logic — just
-HTTP GET + in-memory caching with TTL.
+Two stores read operational constants from the API. No business logic.
 
-It is read at service startup, from synchronous code, so it takes the
-synchronous form of the shared transport rather than raw `httpx`: these reads are
-internal API calls and carry the same two headers as every other one.
+``ConfigStore`` is HTTP GET + in-memory caching with TTL. It is read from
+synchronous code, so it takes the synchronous form of the shared transport
+rather than raw `httpx`: these reads are internal API calls and carry the same
+two headers as every other one. A cache miss blocks its caller on the request —
+from async code, the whole event loop.
+
+``AsyncConfigStore`` is for long-running async services. ``start()`` loads
+every key in one request; after that a read is a dict lookup and never touches
+the network. The store reloads everything every ``refresh_interval`` seconds
+in the background, and applies the API's ``ConfigChangeEvent`` announcements
+on ``CONFIG_CHANGES_CHANNEL`` as they arrive, so a change reaches it within a
+pub/sub round trip. An event lost while the subscription was down is picked
+up by the reload that follows every resubscribe, or by the next periodic one.
 
 Usage:
     store = ConfigStore(api_base_url="http://api:8000")
     interval = store.get_int("scheduler.dispatch_interval_seconds")
     thresholds = store.get_category("health")
+
+    store = AsyncConfigStore(api_base_url="http://api:8000")
+    await store.start()
+    interval = store.get_int("scheduler.dispatch_interval_seconds")
+    await store.close()
 """
 
+import asyncio
+import contextlib
+import os
 import threading
 import time
 from typing import Any
 
 import httpx
+from pydantic import ValidationError
 import structlog
 
-from shared.clients.internal_api import InternalAPISyncClient
+from shared.clients.internal_api import InternalAPIClient, InternalAPISyncClient
+from shared.contracts.queues.config_change import ConfigChangeEvent
+from shared.queues import CONFIG_CHANGES_CHANNEL
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None  # type: ignore
 
 logger = structlog.get_logger()
 
 _DEFAULT_SENTINEL = object()
 
+# Seconds between full reloads of an AsyncConfigStore: the bound on staleness
+# when change events are lost.
+DEFAULT_REFRESH_INTERVAL = 60
+# Seconds between attempts to restore a lost change subscription.
+SUBSCRIBE_RETRY_SECONDS = 2
+
 
 class ConfigStoreUnavailableError(RuntimeError):
     """Raised when the system-config API cannot answer a config request."""
@@ -139,3 +170,223 @@ class ConfigStore:
                 f"Missing required system configs: {', '.join(missing)}. "
                 f"Run `make seed` to populate defaults."
             )
+
+
+class AsyncConfigStore:
+    """Every system config held in memory and kept current in the background."""
+
+    def __init__(
+        self,
+        api_base_url: str,
+        *,
+        redis_url: str | None = None,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+    ):
+        self._client = InternalAPIClient(api_base_url, timeout=10.0)
+        # None: REDIS_URL from the environment. Empty: no change events.
+        self._redis_url = os.getenv("REDIS_URL") if redis_url is None else redis_url
+        self._refresh_interval = refresh_interval
+        self._values: dict[str, Any] | None = None
+        self._categories: dict[str, str | None] = {}
+        self._redis = None
+        self._tasks: list[asyncio.Task] = []
+        self._load_lock = asyncio.Lock()
+        # Events that arrive while a load is in flight: its snapshot may
+        # predate them, so they are applied again on top of it.
+        self._during_load: list[ConfigChangeEvent] | None = None
+
+    # ── lifecycle ──
+
+    async def load(self) -> None:
+        """Replace every value with the API's, in one request.
+
+        Raises ConfigStoreUnavailableError when the API cannot answer; the
+        values already held are kept.
+        """
+        async with self._load_lock:
+            self._during_load = []
+            try:
+                values, categories = await self._fetch_all()
+            finally:
+                during_load, self._during_load = self._during_load, None
+            self._values, self._categories = values, categories
+            for event in during_load:
+                self._apply(event)
+
+    async def _fetch_all(self) -> tuple[dict[str, Any], dict[str, str | None]]:
+        try:
+            resp = await self._client.get_raw("system-configs/")
+        except httpx.RequestError as exc:
+            raise ConfigStoreUnavailableError(
+                f"System config API is unavailable (request failed: {exc})"
+            ) from exc
+        if resp.status_code != httpx.codes.OK:
+            raise ConfigStoreUnavailableError(
+                f"System config API is unavailable (HTTP {resp.status_code})"
+            )
+        try:
+            items = resp.json()
+            values = {item["key"]: item["value"] for item in items}
+            categories = {item["key"]: item.get("category") for item in items}
+        except (KeyError, TypeError, ValueError) as exc:
+            raise ConfigStoreUnavailableError(
+                "System config API is unavailable (invalid response body)"
+            ) from exc
+        return values, categories
+
+    async def start(self) -> None:
+        """Subscribe to changes, load every key, then keep both going in the background.
+
+        The subscription comes first, so a change made during the load is
+        applied after it rather than lost.
+        """
+        pubsub = await self._subscribe_or_none()
+        try:
+            await self.load()
+        except BaseException:
+            if pubsub is not None:
+                await pubsub.aclose()
+            await self.close()
+            raise
+        self._tasks.append(asyncio.create_task(self._refresh_loop(), name="config_refresh"))
+        if self._redis is not None:
+            self._tasks.append(asyncio.create_task(self._listen(pubsub), name="config_changes"))
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+        await self._client.close()
+
+    # ── background ──
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._refresh_interval)
+            try:
+                await self.load()
+            except ConfigStoreUnavailableError as exc:
+                logger.warning("config_store_refresh_failed", error=str(exc))
+
+    async def _subscribe_or_none(self):
+        """A pub/sub subscribed to config changes; None without Redis or on failure."""
+        if not self._redis_url or aioredis is None:
+            return None
+        if self._redis is None:
+            self._redis = aioredis.from_url(self._redis_url, decode_responses=True)
+        pubsub = self._redis.pubsub()
+        try:
+            await pubsub.subscribe(CONFIG_CHANGES_CHANNEL)
+        except Exception as exc:
+            await pubsub.aclose()
+            logger.warning(
+                "config_store_subscribe_failed",
+                error=str(exc),
+                retry_in_seconds=SUBSCRIBE_RETRY_SECONDS,
+            )
+            return None
+        return pubsub
+
+    async def _listen(self, pubsub) -> None:
+        """Apply change events; resubscribe and reload whenever the subscription drops."""
+        while True:
+            if pubsub is None:
+                await asyncio.sleep(SUBSCRIBE_RETRY_SECONDS)
+                pubsub = await self._subscribe_or_none()
+                if pubsub is None:
+                    continue
+                # Whatever changed while nobody listened.
+                try:
+                    await self.load()
+                except ConfigStoreUnavailableError as exc:
+                    logger.warning("config_store_refresh_failed", error=str(exc))
+            try:
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self.apply_change(message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(
+                    "config_store_subscription_lost",
+                    error=str(exc),
+                    retry_in_seconds=SUBSCRIBE_RETRY_SECONDS,
+                )
+            finally:
+                with contextlib.suppress(Exception):
+                    await pubsub.aclose()
+            pubsub = None
+
+    def apply_change(self, payload: str) -> None:
+        """Apply one ``ConfigChangeEvent`` as published by the API."""
+        try:
+            event = ConfigChangeEvent.model_validate_json(payload)
+        except ValidationError:
+            logger.warning("config_store_change_invalid", payload=payload[:200])
+            return
+        if self._during_load is not None:
+            self._during_load.append(event)
+        self._apply(event)
+        logger.info("config_store_change_applied", key=event.key, deleted=event.deleted)
+
+    def _apply(self, event: ConfigChangeEvent) -> None:
+        if self._values is None:
+            return
+        if event.deleted:
+            self._values.pop(event.key, None)
+            self._categories.pop(event.key, None)
+        else:
+            self._values[event.key] = event.value
+            self._categories[event.key] = event.category
+
+    # ── reads: memory only ──
+
+    def get(self, key: str, default: Any = _DEFAULT_SENTINEL) -> Any:
+        """Get a config value by key. Raises KeyError if not found and no default."""
+        if self._values is None:
+            raise ConfigStoreUnavailableError(
+                f"System configs are not loaded yet while reading '{key}'; call start() first"
+            )
+        if key in self._values:
+            return self._values[key]
+        if default is not _DEFAULT_SENTINEL:
+            return default
+        raise KeyError(f"System config '{key}' not found")
+
+    def get_int(self, key: str, default: int | None = None) -> int:
+        """Get config value as int."""
+        sentinel = _DEFAULT_SENTINEL if default is None else default
+        return int(self.get(key, sentinel))
+
+    def get_float(self, key: str, default: float | None = None) -> float:
+        """Get config value as float."""
+        sentinel = _DEFAULT_SENTINEL if default is None else default
+        return float(self.get(key, sentinel))
+
+    def get_category(self, category: str) -> dict[str, Any]:
+        """Get all configs in a category as {key: value} dict."""
+        if self._values is None:
+            return {}
+        return {
+            key: value
+            for key, value in self._values.items()
+            if self._categories.get(key) == category
+        }
+
+    def validate_required(self, keys: list[str]) -> None:
+        """Validate that all required config keys were loaded.
+
+        Raises RuntimeError listing all missing keys — call after start().
+        """
+        missing = [key for key in keys if key not in (self._values or {})]
+        if missing:
+            raise RuntimeError(
+                f"Missing required system configs: {', '.join(missing)}. "
+                f"Run `make seed` to populate defaults."
+            )
@@ -1,4 +1,4 @@
-"""Analytics DTOs — hourly, daily, known users."""
+"""Analytics DTOs — hourly, daily."""
 
 import datetime as dt
 from typing import Any
@@ -27,6 +27,7 @@ class AnalyticsHourlyDTO(TimestampedDTO):
     p50_ms: float | None = None
     p95_ms: float | None = None
     p99_ms: float | None = None
+    latency_sketch: dict[str, Any] | None = None
 
     top_endpoints: list[dict[str, Any]] | None = None
 
@@ -43,10 +44,13 @@ class AnalyticsDailyDTO(TimestampedDTO):
     unique_users: int
     new_users: int
     dau: int
+    wau: int | None = None
+    mau: int | None = None
     returning_users: int
 
     p95_ms: float | None = None
     error_rate: float | None = None
+    latency_sketch: dict[str, Any] | None = None
 
 
 class AnalyticsKnownUserDTO(BaseModel):
@@ -76,6 +80,7 @@ class AnalyticsHourlyCreate(BaseModel):
     p50_ms: float | None = None
     p95_ms: float | None = None
     p99_ms: float | None = None
+    latency_sketch: dict[str, Any] | None = None
 
     top_endpoints: list[dict[str, Any]] | None = None
 
@@ -91,22 +96,10 @@ class AnalyticsDailyCreate(BaseModel):
     unique_users: int
     new_users: int
     dau: int
+    wau: int | None = None
+    mau: int | None = None
     returning_users: int
 
     p95_ms: float | None = None
     error_rate: float | None = None
-
-
-class AnalyticsKnownUserUpsert(BaseModel):
-    """Upsert a known user entry."""
-
-    user_id_hash: str
-    first_seen: dt.datetime
-    last_seen: dt.datetime
-
-
-class AnalyticsKnownUsersBatchUpsert(BaseModel):
-    """Batch upsert known users for a project."""
-
-    project_id: uuid.UUID
-    users: list[AnalyticsKnownUserUpsert]
+    latency_sketch: dict[str, Any] | None = None
@@ -0,0 +1,41 @@
+"""Everything one dispatcher tick reads, in one response.
+
+The dispatcher used to assemble this per TODO task: the blocker, the project,
+the story's tasks, the task's engineering runs twice, and the events of every
+finished sibling — one request each, so a backlog of a few hundred tasks cost a
+tick thousands of round trips. ``GET /api/pipeline/snapshot`` answers all of it
+with a fixed number of queries, keyed so the dispatcher looks things up instead
+of asking for them.
+
+A snapshot is as old as the tick that read it. The dispatcher treats it that
+way: once it has acted on a story it leaves the rest of that story to the next
+tick rather than trust what the snapshot says about it.
+"""
+
+from __future__ import annotations
+
+from pydantic import BaseModel, Field
+
+from shared.contracts.dto.project import ProjectDTO
+from shared.contracts.dto.run import RunDTO
+from shared.contracts.dto.task import TaskDTO, TaskEventDTO
+
+
+class PipelineSnapshot(BaseModel):
+    """The TODO tasks and what deciding each one's dispatch needs."""
+
+    # Every TODO task, in dispatch order (priority, then age).
+    todo_tasks: list[TaskDTO] = Field(default_factory=list)
+    # Story id → every task of that story, any status, in dispatch order.
+    story_tasks: dict[str, list[TaskDTO]] = Field(default_factory=dict)
+    # Task id → the task a TODO task is blocked by.
+    blockers: dict[str, TaskDTO] = Field(default_factory=dict)
+    # Project id → the project of a TODO task. A project that no longer exists
+    # is absent.
+    projects: dict[str, ProjectDTO] = Field(default_factory=dict)
+    # TODO task id → its engineering runs that are unfinished or stamped with
+    # the task's current iteration, newest first.
+    engineering_runs: dict[str, list[RunDTO]] = Field(default_factory=dict)
+    # Task id of a DONE task in one of those stories → its ``iteration_end``
+    # events, oldest first: the context a sibling's dispatch builds on.
+    iteration_events: dict[str, list[TaskEventDTO]] = Field(default_factory=dict)
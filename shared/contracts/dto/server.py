@@ -162,3 +162,5 @@ class ServerMetricsHistoryDTO(BaseModel):
     server_handle: str
     recorded_at: datetime
     metrics: dict
+    resolution_seconds: int | None = None
+    samples: int = 1
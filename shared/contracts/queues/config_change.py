@@ -0,0 +1,18 @@
+from typing import Any
+
+from shared.contracts.base import QueueMeta
+
+
+class ConfigChangeEvent(QueueMeta):
+    """A committed create, update or delete of one system config.
+
+    Published by the API on the ``system_configs:changes`` pub/sub channel
+    after the transaction has committed. Config stores apply it at once;
+    one that was not subscribed when it went out catches up on its next full
+    reload, so a lost event delays a change without losing it.
+    """
+
+    key: str
+    value: Any = None
+    category: str | None = None
+    deleted: bool = False
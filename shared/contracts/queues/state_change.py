@@ -0,0 +1,22 @@
+from typing import Literal
+
+from shared.contracts.base import QueueMeta
+
+# The planning and execution entities whose status transitions the API announces.
+StateEntity = Literal["run", "story", "task"]
+
+
+class StateChangeEvent(QueueMeta):
+    """A committed status transition of a run, story or task.
+
+    Published by the API on ``state:changes`` after the transaction that made
+    the change has committed, so a reader never sees a status the database
+    does not hold. Publishing is best-effort: readers treat the stream as a
+    hint that lets them skip a round trip, and fall back to the API whenever
+    they have not seen an entity yet.
+    """
+
+    entity: StateEntity
+    entity_id: str
+    status: str
+    previous_status: str | None = None
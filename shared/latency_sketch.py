@@ -0,0 +1,132 @@
+"""Mergeable latency sketch for analytics percentiles (DDSketch).
+
+A percentile of an hour cannot be combined with the percentiles of other hours
+into a percentile of the day. A sketch can: it counts latencies in
+logarithmic bins, so sketches of any set of hours, services or days merge by
+adding bin counts, and every quantile read from the merge is within
+``RELATIVE_ACCURACY`` of the true value. Rollups then cost one merge per
+stored bucket instead of a pass over every request.
+
+The serialized form is the JSON stored on ``analytics_hourly`` and
+``analytics_daily`` rows::
+
+    {"alpha": 0.01, "zero": 0, "min": 3.1, "max": 412.0, "bins": {"58": 12, ...}}
+"""
+
+from collections.abc import Iterable
+import math
+
+# Quantiles come back within 1% of the true value. At this accuracy latencies
+# from 1µs to an hour fit in about 1,100 bins; in practice an hour of one
+# service fills a few hundred.
+RELATIVE_ACCURACY = 0.01
+
+# Bound on stored bins. Past it the lowest bins are folded together, which
+# only ever costs accuracy at the fast end — never at p95/p99.
+MAX_BINS = 2048
+
+# Latencies at or below this many milliseconds are counted as zero.
+_MIN_INDEXABLE = 1e-6
+
+
+class LatencySketch:
+    """Counts of latencies (ms) in bins of width ``RELATIVE_ACCURACY`` on a log scale."""
+
+    def __init__(self, alpha: float = RELATIVE_ACCURACY):
+        self.alpha = alpha
+        self._gamma = (1 + alpha) / (1 - alpha)
+        self._log_gamma = math.log(self._gamma)
+        self.bins: dict[int, int] = {}
+        self.zero = 0
+        self.min: float | None = None
+        self.max: float | None = None
+
+    @property
+    def count(self) -> int:
+        return self.zero + sum(self.bins.values())
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Record *count* observations of *value* milliseconds."""
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if value <= _MIN_INDEXABLE:
+            self.zero += count
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[key] = self.bins.get(key, 0) + count
+        if len(self.bins) > MAX_BINS:
+            self._collapse()
+
+    def merge(self, other: "LatencySketch") -> None:
+        """Add every observation of *other* to this sketch."""
+        if other.alpha != self.alpha:
+            raise ValueError(f"cannot merge sketches of accuracy {other.alpha} and {self.alpha}")
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.zero += other.zero
+        for bound in (other.min, other.max):
+            if bound is not None:
+                self.min = bound if self.min is None else min(self.min, bound)
+                self.max = bound if self.max is None else max(self.max, bound)
+        if len(self.bins) > MAX_BINS:
+            self._collapse()
+
+    def quantile(self, q: float) -> float | None:
+        """The *q*-quantile (0..1) of the recorded latencies; None when there are none."""
+        total = self.count
+        if not total:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        rank = q * (total - 1)
+        seen = self.zero
+        if seen > rank:
+            return 0.0
+        value = self.max
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                value = 2 * self._gamma**key / (self._gamma + 1)
+                break
+        # The bin midpoint can stray past the extremes actually seen.
+        return min(max(value, self.min), self.max)
+
+    def to_dict(self) -> dict:
+        return {
+            "alpha": self.alpha,
+            "zero": self.zero,
+            "min": self.min,
+            "max": self.max,
+            "bins": {str(key): count for key, count in sorted(self.bins.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LatencySketch":
+        sketch = cls(data["alpha"])
+        sketch.zero = data.get("zero", 0)
+        sketch.min = data.get("min")
+        sketch.max = data.get("max")
+        sketch.bins = {int(key): count for key, count in data.get("bins", {}).items()}
+        return sketch
+
+    def _collapse(self) -> None:
+        keys = sorted(self.bins)
+        excess = keys[: len(keys) - MAX_BINS + 1]
+        self.bins[excess[-1]] += sum(self.bins.pop(key) for key in excess[:-1])
+
+
+def merge_sketches(serialized: Iterable[dict | None]) -> LatencySketch | None:
+    """Merge stored sketches into one; None if any is missing.
+
+    Rows written before sketches were kept have none, and a merge that leaves
+    them out would understate the tail — callers fall back to the stored
+    percentiles instead.
+    """
+    merged = LatencySketch()
+    for data in serialized:
+        if data is None:
+            return None
+        merged.merge(LatencySketch.from_dict(data))
+    return merged
@@ -18,7 +18,7 @@ from .repository import Repository
 from .resource import Resource
 from .run import Run
 from .server import Server, ServerStatus
-from .server_metrics_history import ServerMetricsHistory
+from .server_metrics_history import ServerMetricsHistory, ServerMetricsRollup
 from .story import Story
 from .system_config import SystemConfig
 from .task import Task, TaskEvent
@@ -45,6 +45,7 @@ __all__ = [
     "Run",
     "Server",
     "ServerMetricsHistory",
+    "ServerMetricsRollup",
     "ServerStatus",
     "PortAllocation",
     "Task",
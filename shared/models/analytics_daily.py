@@ -3,7 +3,7 @@
 import datetime as dt
 import uuid
 
-from sqlalchemy import Date, Float, ForeignKey, Integer, UniqueConstraint, Uuid
+from sqlalchemy import JSON as SA_JSON, Date, Float, ForeignKey, Integer, UniqueConstraint, Uuid
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
@@ -28,7 +28,12 @@ class AnalyticsDaily(Base):
     unique_users: Mapped[int] = mapped_column(Integer, default=0)
     new_users: Mapped[int] = mapped_column(Integer, default=0)
     dau: Mapped[int] = mapped_column(Integer, default=0)
+    # Distinct users of the 7 and 30 days ending on this date.
+    wau: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    mau: Mapped[int | None] = mapped_column(Integer, nullable=True)
     returning_users: Mapped[int] = mapped_column(Integer, default=0)
 
     p95_ms: Mapped[float] = mapped_column(Float, nullable=True)
+    # Merge of the day's hourly sketches, across all services.
+    latency_sketch: Mapped[dict | None] = mapped_column(SA_JSON, nullable=True)
     error_rate: Mapped[float] = mapped_column(Float, nullable=True)
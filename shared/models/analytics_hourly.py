@@ -47,5 +47,7 @@ class AnalyticsHourly(Base):
     p50_ms: Mapped[float] = mapped_column(Float, nullable=True)
     p95_ms: Mapped[float] = mapped_column(Float, nullable=True)
     p99_ms: Mapped[float] = mapped_column(Float, nullable=True)
+    # Serialized LatencySketch of the hour's latencies; merged for rollups.
+    latency_sketch: Mapped[dict | None] = mapped_column(SA_JSON, nullable=True)
 
     top_endpoints: Mapped[dict | None] = mapped_column(SA_JSON, nullable=True)
@@ -3,18 +3,46 @@
 from datetime import datetime
 import uuid
 
-from sqlalchemy import JSON, Boolean, DateTime, Float, ForeignKey, Integer, String, Text, Uuid
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    Uuid,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
 from shared.contracts.dto.run import RunStatus
 
 from .base import Base
 
+# JSONB on Postgres, so what is inside can be indexed and matched with `@>`;
+# plain JSON where tests build the table on SQLite.
+_JSONB = JSON().with_variant(JSONB(), "postgresql")
+
 
 class Run(Base):
     """Run model - tracks asynchronous operations like engineering, deploy, etc."""
 
     __tablename__ = "runs"
+    __table_args__ = (
+        # The keyset of the `/runs/` list pages.
+        Index("ix_runs_created_at_id", "created_at", "id"),
+        # Containment (`metadata @> {...}`) filters: the `/runs/` `metadata`
+        # parameter, the pipeline snapshot and the owner-notification selection.
+        Index(
+            "ix_runs_metadata",
+            "metadata",
+            postgresql_using="gin",
+            postgresql_ops={"metadata": "jsonb_path_ops"},
+        ),
+    )
 
     id: Mapped[str] = mapped_column(String(255), primary_key=True)
     type: Mapped[str] = mapped_column(String(50), index=True)
@@ -32,10 +60,10 @@ class Run(Base):
 
     # Run metadata (input parameters, configuration)
     # Note: 'metadata' is a reserved name in SQLAlchemy, so we use 'run_metadata'
-    run_metadata: Mapped[dict] = mapped_column("metadata", JSON, default=dict)
+    run_metadata: Mapped[dict] = mapped_column("metadata", _JSONB, default=dict)
 
     # Run result (output data, artifacts, etc.)
-    result: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    result: Mapped[dict | None] = mapped_column(_JSONB, nullable=True)
 
     # Error information if run failed
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
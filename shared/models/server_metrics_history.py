@@ -1,13 +1,17 @@
-"""Server metrics history model — time-series snapshots with 7-day retention."""
+"""Server metrics history models — raw snapshots and their coarser rollups."""
 
 from datetime import datetime
 
-from sqlalchemy import JSON, BigInteger, DateTime, ForeignKey, Index
+from sqlalchemy import JSON, BigInteger, DateTime, ForeignKey, Index, Integer, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
 from .base import Base
 
+# Bucket widths of the rollup tiers, finest first. Each tier is built from the
+# one before it (the first from the raw snapshots).
+METRICS_ROLLUP_RESOLUTIONS: tuple[int, ...] = (300, 3600)
+
 
 class ServerMetricsHistory(Base):
     """Time-series metrics snapshots for servers."""
@@ -25,3 +29,31 @@ class ServerMetricsHistory(Base):
         DateTime(timezone=True), server_default=func.now(), index=True
     )
     metrics: Mapped[dict] = mapped_column(JSON, nullable=False)
+
+
+class ServerMetricsRollup(Base):
+    """Metrics snapshots of a server averaged over one bucket of a rollup tier.
+
+    ``recorded_at`` is the start of the bucket and ``samples`` the number of
+    raw snapshots it summarises, so a coarser tier can weight it correctly.
+    """
+
+    __tablename__ = "server_metrics_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "server_handle",
+            "resolution_seconds",
+            "recorded_at",
+            name="uq_server_metrics_rollups_bucket",
+        ),
+        Index("ix_server_metrics_rollups_resolution_recorded", "resolution_seconds", "recorded_at"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    server_handle: Mapped[str] = mapped_column(
+        ForeignKey("servers.handle"), index=True, nullable=False
+    )
+    resolution_seconds: Mapped[int] = mapped_column(Integer, nullable=False)
+    recorded_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    samples: Mapped[int] = mapped_column(Integer, nullable=False)
+    metrics: Mapped[dict] = mapped_column(JSON, nullable=False)
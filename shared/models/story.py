@@ -2,7 +2,7 @@
 
 import uuid
 
-from sqlalchemy import JSON, ForeignKey, Integer, String, Text, Uuid
+from sqlalchemy import JSON, ForeignKey, Index, Integer, String, Text, Uuid
 from sqlalchemy.orm import Mapped, mapped_column
 
 from shared.contracts.dto.story import StoryStatus, StoryType
@@ -14,6 +14,8 @@ class Story(Base):
     """Story — a product requirement created by PO, decomposed into Tasks."""
 
     __tablename__ = "stories"
+    # The keyset of the `/stories/` list pages.
+    __table_args__ = (Index("ix_stories_priority_created_at_id", "priority", "created_at", "id"),)
 
     id: Mapped[str] = mapped_column(String(255), primary_key=True)
     project_id: Mapped[uuid.UUID] = mapped_column(
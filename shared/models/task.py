@@ -2,7 +2,7 @@
 
 import uuid
 
-from sqlalchemy import JSON, Boolean, ForeignKey, Integer, String, Text, Uuid
+from sqlalchemy import JSON, Boolean, ForeignKey, Index, Integer, String, Text, Uuid
 from sqlalchemy.orm import Mapped, mapped_column
 
 from shared.contracts.dto.task import (
@@ -18,6 +18,8 @@ class Task(Base):
     """Task — a unit of work with agile statuses (planning layer)."""
 
     __tablename__ = "tasks"
+    # The keyset of the `/tasks/` list pages.
+    __table_args__ = (Index("ix_tasks_priority_created_at_id", "priority", "created_at", "id"),)
 
     id: Mapped[str] = mapped_column(String(255), primary_key=True)
     project_id: Mapped[uuid.UUID] = mapped_column(
@@ -32,6 +32,12 @@ QA_QUEUE = "qa:queue"
 PO_INPUT_QUEUE = "po:input"
 PO_PROACTIVE_QUEUE = "po:proactive"
 PO_REMINDERS_KEY = "po:reminders"
+# Committed run/story/task status transitions, published by the API. Read
+# without a group by every process that keeps a local status view.
+STATE_CHANGES_STREAM = "state:changes"
+# Committed system-config changes, published by the API. A pub/sub channel,
+# not a stream: a store that misses one catches up on its next full reload.
+CONFIG_CHANGES_CHANNEL = "system_configs:changes"
 
 # ---------------------------------------------------------------------------
 # Redis hash keys
@@ -1,17 +1,35 @@
 from .client import (
+    GroupBacklog,
     RedisStreamClient,
     StreamMessage,
+    TrimReport,
     TypedMessage,
     decode_redis_fields,
     decode_redis_value,
     dlq_stream,
 )
+from .codec import PayloadDecodeError, StreamCodec, codec_from_name
+from .ephemeral import (
+    EPHEMERAL_PATTERNS,
+    EPHEMERAL_REGISTRY,
+    is_ephemeral_stream,
+    register_ephemeral,
+)
 
 __all__ = [
+    "EPHEMERAL_PATTERNS",
+    "EPHEMERAL_REGISTRY",
+    "GroupBacklog",
+    "PayloadDecodeError",
     "RedisStreamClient",
+    "StreamCodec",
     "StreamMessage",
+    "TrimReport",
     "TypedMessage",
+    "codec_from_name",
     "decode_redis_fields",
     "decode_redis_value",
     "dlq_stream",
+    "is_ephemeral_stream",
+    "register_ephemeral",
 ]
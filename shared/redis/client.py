@@ -11,20 +11,44 @@ becomes visible:
   which is logged and counted (``_record_lost_entry``).
 
 None of the three is a silent ``continue``.
+
+Entries can be read one at a time (``consume`` / ``consume_typed``) or a read
+at a time (``consume_batch`` / ``consume_typed_batch``). The batch readers hand
+over everything one XREADGROUP or one XAUTOCLAIM page returned, and their
+callers settle the processed ids with ``ack_many`` — one pipelined round trip
+instead of one XACK per entry.
+
+Payloads are encoded by the client's ``StreamCodec`` (``shared.redis.codec``):
+JSON by default, byte-compatible with every older reader, or msgpack and zstd
+when ``REDIS_STREAM_CODEC`` says so. Every reader decodes every codec, tagged by
+the entry's ``content_type`` field.
+
+Streams are bounded either by MAXLEN on every XADD or, with
+``REDIS_STREAM_TRIM=consumer-groups``, by ``trim_consumed``: XTRIM MINID up to
+the oldest entry some consumer group has not yet ACKed, so a queue's memory
+follows its real backlog instead of a fixed entry count.
+
+Writes to ephemeral streams (``po:response:*``, ``worker:*:input|output``) are
+recorded in ``EPHEMERAL_REGISTRY`` (``shared.redis.ephemeral``) in the same
+round trip, so their cleanup need not scan the keyspace for them.
+
+Every read, reclaim, ACK and DLQ copy is counted in ``STREAM_METRICS``
+(``shared.redis.metrics``), and the first consume starts the process's metrics
+exporter when ``METRICS_PORT`` or ``METRICS_TEXTFILE`` is set.
 """
 
 import asyncio
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Sequence
 import copy
 from dataclasses import dataclass
 from datetime import UTC, datetime
 import json
 import os
 import time
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import BaseModel, TypeAdapter, ValidationError
-from redis.exceptions import TimeoutError as RedisTimeoutError
+from redis.exceptions import ResponseError, TimeoutError as RedisTimeoutError
 import structlog
 
 from shared.contracts.recipient import (
@@ -32,6 +56,20 @@ from shared.contracts.recipient import (
     has_legacy_recipient_field,
 )
 from shared.diagnostics import safe_validation_errors
+from shared.queues import QUEUE_TOPOLOGY
+
+from .codec import (
+    DEFAULT_CODEC,
+    ENCODING_ERRORS,
+    PayloadDecodeError,
+    StreamCodec,
+    codec_from_name,
+    decode_fields,
+    is_tagged,
+    printable_fields,
+)
+from .ephemeral import EPHEMERAL_REGISTRY, is_ephemeral_stream, register_ephemeral
+from .metrics import STREAM_METRICS, ensure_metrics_exporter
 
 try:
     import redis.asyncio as redis
@@ -82,6 +120,23 @@ class TypedMessage[T]:
 
 DEFAULT_STREAM_MAXLEN = 1000
 
+# How streams are kept from growing without bound (REDIS_STREAM_TRIM).
+# ``maxlen``: every XADD caps the stream at ``stream_maxlen`` entries, whether or
+# not they have been consumed. ``consumer-groups``: XADD to a group-trimmed
+# stream does not cap it; the scheduler's queue cleanup trims it up to what
+# every consumer group has ACKed (``trim_consumed``) instead.
+TRIM_MAXLEN = "maxlen"
+TRIM_CONSUMER_GROUPS = "consumer-groups"
+TRIM_MODES = (TRIM_MAXLEN, TRIM_CONSUMER_GROUPS)
+
+# How many entries a batch reader asks XREADGROUP / XAUTOCLAIM for per call.
+DEFAULT_BATCH_COUNT = 50
+
+# Ids per XACK inside one ``ack_many`` pipeline. A single XACK takes any number
+# of ids, but a command carrying thousands of them is one long blocking step on
+# the server; chunks keep each step short and still travel in one round trip.
+ACK_CHUNK_SIZE = 500
+
 # Floor on how often a live consumer re-runs its XAUTOCLAIM sweep. The sweep is
 # a single round trip against an empty PEL, but a caller may pass
 # ``pending_timeout_ms=0`` (the proactive listener does, so a dead predecessor's
@@ -107,6 +162,54 @@ DLQ_FAILURE_VALIDATION = "validation_error"
 _XAUTOCLAIM_WITH_DELETED_LEN = 3
 
 
+def parse_stream_id(entry_id: str) -> tuple[int, int]:
+    """``"1710000000000-3"`` as ``(1710000000000, 3)``, which orders like the ids."""
+    ms, _, seq = entry_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+def next_stream_id(entry_id: str) -> str:
+    """The smallest id greater than *entry_id*."""
+    ms, seq = parse_stream_id(entry_id)
+    return f"{ms}-{seq + 1}"
+
+
+@dataclass
+class GroupBacklog:
+    """The oldest entry one consumer group still needs, and why it needs it.
+
+    ``floor_id`` is the group's PEL minimum while it has pending entries
+    (``pinned_by="pending"``), otherwise the entry after its last-delivered id
+    (``pinned_by="undelivered"``): everything older has been delivered and
+    ACKed. ``undelivered`` is XINFO GROUPS' ``lag``, None when Redis cannot
+    compute it (after an XDEL or a trim inside the group's unread range).
+    """
+
+    group: str
+    floor_id: str
+    pinned_by: Literal["pending", "undelivered"]
+    pending: int
+    undelivered: int | None
+
+    def age_s(self, now_ms: int) -> float:
+        """How long ago the oldest entry this group still needs was written."""
+        return max(0, now_ms - parse_stream_id(self.floor_id)[0]) / 1000
+
+
+@dataclass
+class TrimReport:
+    """What ``trim_consumed`` did to one stream.
+
+    ``minid`` is the low-water mark the stream was trimmed to, None when it was
+    left alone because no consumer group reads it.
+    """
+
+    stream: str
+    minid: str | None
+    trimmed: int
+    groups: list[GroupBacklog]
+
+
 def dlq_stream(stream: str) -> str:
     """The dead-letter stream that carries *stream*'s poison entries."""
     return f"{stream}{DLQ_SUFFIX}"
@@ -220,12 +323,27 @@ def validate_tolerating_additions(adapter: TypeAdapter, data: Any) -> tuple[Any,
 class RedisStreamClient:
     """Client for Redis Streams-based message passing."""
 
-    def __init__(self, redis_url: str | None = None, *, stream_maxlen: int = DEFAULT_STREAM_MAXLEN):
+    def __init__(
+        self,
+        redis_url: str | None = None,
+        *,
+        stream_maxlen: int = DEFAULT_STREAM_MAXLEN,
+        codec: StreamCodec | str | None = None,
+        trim_mode: str | None = None,
+    ):
         """Initialize Redis client.
 
         Args:
             redis_url: Redis connection URL. Falls back to REDIS_URL env var.
             stream_maxlen: Approximate max messages per stream (MAXLEN ~). 0 to disable.
+            codec: How ``publish`` encodes payloads — a ``StreamCodec`` or its
+                name. Falls back to the REDIS_STREAM_CODEC env var, then JSON.
+                Reading is unaffected: every codec is always decoded.
+            trim_mode: ``maxlen`` or ``consumer-groups`` (see ``TRIM_MODES``).
+                Falls back to the REDIS_STREAM_TRIM env var, then ``maxlen``.
+                In ``consumer-groups`` mode the queue streams declared in
+                ``QUEUE_TOPOLOGY`` are published without MAXLEN; every other
+                stream is still capped at ``stream_maxlen``.
         """
         self.redis_url = redis_url or os.getenv("REDIS_URL")
         if not self.redis_url:
@@ -234,6 +352,20 @@ class RedisStreamClient:
             )
         self._redis: redis.Redis | None = None
         self._stream_maxlen = stream_maxlen
+        if codec is None:
+            codec = os.getenv("REDIS_STREAM_CODEC") or DEFAULT_CODEC
+        self.codec = codec if isinstance(codec, StreamCodec) else codec_from_name(codec)
+        trim_mode = trim_mode or os.getenv("REDIS_STREAM_TRIM") or TRIM_MAXLEN
+        if trim_mode not in TRIM_MODES:
+            raise ValueError(
+                f"unknown stream trim mode {trim_mode!r}; expected one of {', '.join(TRIM_MODES)}"
+            )
+        self.trim_mode = trim_mode
+        self._group_trimmed_streams = (
+            frozenset(binding.stream for binding in QUEUE_TOPOLOGY)
+            if trim_mode == TRIM_CONSUMER_GROUPS
+            else frozenset()
+        )
 
     async def connect(self) -> None:
         """Connect to Redis."""
@@ -243,9 +375,12 @@ class RedisStreamClient:
             # Blocking stream reads use their own ``block`` interval. Disable the
             # transport read timeout so an idle XREADGROUP is not mistaken for a
             # dead consumer when REDIS_URL carries a shorter socket_timeout.
+            # Binary payloads (msgpack, zstd) survive the decoding as
+            # surrogates that ``codec.body_bytes`` turns back into bytes.
             self._redis = redis.from_url(
                 self.redis_url,
                 decode_responses=True,
+                encoding_errors=ENCODING_ERRORS,
                 socket_timeout=None,
             )
             logger.info("redis_connected")
@@ -264,22 +399,32 @@ class RedisStreamClient:
             raise RuntimeError("Redis not connected. Call connect() first.")
         return self._redis
 
-    def _xadd_kwargs(self) -> dict[str, Any]:
-        """Return maxlen kwargs for xadd if configured."""
-        if self._stream_maxlen:
+    def _xadd_kwargs(self, stream: str) -> dict[str, Any]:
+        """Return maxlen kwargs for an xadd to *stream*, if it is capped."""
+        if self._stream_maxlen and stream not in self._group_trimmed_streams:
             return {"maxlen": self._stream_maxlen, "approximate": True}
         return {}
 
+    async def _xadd(self, stream: str, fields: dict[str, Any]) -> str:
+        """XADD *fields*; an ephemeral stream is registered in the same round trip."""
+        if not is_ephemeral_stream(stream):
+            return await self.redis.xadd(stream, fields, **self._xadd_kwargs(stream))
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.xadd(stream, fields, **self._xadd_kwargs(stream))
+        pipe.zadd(EPHEMERAL_REGISTRY, {stream: time.time()})
+        message_id, _ = await pipe.execute()
+        return message_id
+
     async def publish(self, stream: str, data: dict[str, Any]) -> str:
-        """Publish a dict to a Redis Stream (wrapped in JSON 'data' field)."""
-        message = {"data": json.dumps(data)}
-        message_id = await self.redis.xadd(stream, message, **self._xadd_kwargs())
+        """Publish a dict to a Redis Stream (encoded by the codec into a 'data' field)."""
+        message = self.codec.encode(data)
+        message_id = await self._xadd(stream, message)
         logger.debug("message_published", stream=stream, message_id=message_id)
         return message_id
 
     async def publish_flat(self, stream: str, fields: dict[str, str]) -> str:
         """Publish flat key-value fields directly to a Redis Stream (no JSON wrapping)."""
-        message_id = await self.redis.xadd(stream, fields, **self._xadd_kwargs())
+        message_id = await self._xadd(stream, fields)
         logger.debug("message_published_flat", stream=stream, message_id=message_id)
         return message_id
 
@@ -291,8 +436,28 @@ class RedisStreamClient:
     async def ack(self, stream: str, group: str, message_id: str) -> None:
         """Acknowledge a message, removing it from the pending entries list (PEL)."""
         await self.redis.xack(stream, group, message_id)
+        STREAM_METRICS.acked.inc(stream=stream, group=group)
         logger.debug("message_acked", stream=stream, message_id=message_id)
 
+    async def ack_many(self, stream: str, group: str, message_ids: Sequence[str]) -> int:
+        """Acknowledge several entries of one stream in a single round trip.
+
+        The ids go out as XACK commands of up to ``ACK_CHUNK_SIZE`` ids each,
+        all in one non-transactional pipeline. Returns how many entries the PEL
+        actually released; an id already acked, or never delivered to *group*,
+        counts zero, exactly as a lone XACK would.
+        """
+        if not message_ids:
+            return 0
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for start in range(0, len(message_ids), ACK_CHUNK_SIZE):
+                pipe.xack(stream, group, *message_ids[start : start + ACK_CHUNK_SIZE])
+            released = await pipe.execute()
+        acked = sum(int(count) for count in released)
+        STREAM_METRICS.acked.inc(acked, stream=stream, group=group)
+        logger.debug("messages_acked", stream=stream, requested=len(message_ids), acked=acked)
+        return acked
+
     async def delivery_count(self, stream: str, group: str, message_id: str) -> int:
         """How many times this group has been handed *message_id*.
 
@@ -315,6 +480,8 @@ class RedisStreamClient:
         """
         try:
             await self.redis.xgroup_create(stream, group, id="0", mkstream=True)
+            if is_ephemeral_stream(stream):
+                await register_ephemeral(self.redis, stream)
             logger.info("consumer_group_created", stream=stream, group=group)
         except redis.ResponseError as e:
             if "BUSYGROUP" in str(e):
@@ -322,14 +489,76 @@ class RedisStreamClient:
             else:
                 raise
 
+    async def group_backlogs(self, stream: str) -> list[GroupBacklog]:
+        """Where each consumer group of *stream* holds its low-water mark.
+
+        Empty when the stream does not exist or no group reads it. The floor
+        can only be too low, never too high: an entry ACKed or delivered while
+        this runs merely makes the floor older than it needs to be.
+        """
+        try:
+            groups = await self.redis.xinfo_groups(stream)
+        except ResponseError:
+            # "no such key": nothing to keep, nothing to trim.
+            return []
+        backlogs: list[GroupBacklog] = []
+        for info in groups:
+            name = decode_redis_value(info["name"])
+            last_delivered = decode_redis_value(info["last-delivered-id"])
+            pel_min = None
+            if int(info["pending"]):
+                summary = await self.redis.xpending(stream, name)
+                pel_min = decode_redis_value(summary["min"]) if summary["min"] else None
+            if pel_min is not None:
+                floor, pinned_by = pel_min, "pending"
+            else:
+                floor, pinned_by = next_stream_id(last_delivered), "undelivered"
+            lag = info.get("lag")
+            backlogs.append(
+                GroupBacklog(
+                    group=name,
+                    floor_id=floor,
+                    pinned_by=pinned_by,
+                    pending=int(info["pending"]),
+                    undelivered=int(lag) if lag is not None else None,
+                )
+            )
+        return backlogs
+
+    async def trim_consumed(self, stream: str) -> TrimReport:
+        """XTRIM MINID *stream* up to the oldest entry any consumer group still needs.
+
+        The low-water mark is the minimum of every group's floor (see
+        ``group_backlogs``), so no group loses an entry it has not been
+        delivered or has not ACKed. A stream no group reads is left alone: its
+        readers, if any, are not visible from here.
+        """
+        backlogs = await self.group_backlogs(stream)
+        if not backlogs:
+            return TrimReport(stream=stream, minid=None, trimmed=0, groups=[])
+        minid = min((b.floor_id for b in backlogs), key=parse_stream_id)
+        trimmed = await self.redis.xtrim(stream, minid=minid)
+        if trimmed:
+            logger.debug("stream_trimmed_to_consumed", stream=stream, minid=minid, trimmed=trimmed)
+        return TrimReport(stream=stream, minid=minid, trimmed=trimmed, groups=backlogs)
+
     @staticmethod
     def _parse_fields(fields: dict[str, str]) -> dict[str, Any]:
         """Parse Redis stream message fields into a data dict.
 
-        Handles two formats:
+        Handles three formats:
+        - Tagged: {"data": <body>, "content_type": "..."} → decoded dict
         - Wrapped: {"data": "<JSON string>"} → parsed JSON dict
         - Flat: {"key1": "val1", "key2": "val2"} → fields as-is
         """
+        if is_tagged(fields):
+            try:
+                parsed = decode_fields(fields)
+                if isinstance(parsed, dict):
+                    return parsed
+            except PayloadDecodeError:
+                pass
+            return printable_fields(fields)
         fields = decode_redis_fields(fields)
         if "data" in fields:
             try:
@@ -346,13 +575,12 @@ class RedisStreamClient:
 
         Unlike ``_parse_fields`` (which silently falls back to the flat field
         map when the wrapped ``data`` payload is malformed), this raises
-        ``json.JSONDecodeError`` so ``consume_typed`` can surface a broken
+        ``PayloadDecodeError`` so ``consume_typed`` can surface a broken
         payload as a terminal error instead of swallowing it.
         """
-        fields = decode_redis_fields(fields)
-        if "data" in fields:
-            return json.loads(fields["data"])
-        return dict(fields)
+        if "data" in fields or b"data" in fields:
+            return decode_fields(fields)
+        return decode_redis_fields(fields)
 
     async def _record_lost_entry(self, stream: str, group: str, entry_id: str | None) -> None:
         """Count and log a pending entry the stream no longer holds.
@@ -387,14 +615,17 @@ class RedisStreamClient:
         consumer: str,
         count: int,
         pending_timeout_ms: int,
-    ) -> AsyncIterator[tuple[str, dict[str, str]]]:
-        """One XAUTOCLAIM sweep over the group's PEL.
+    ) -> AsyncIterator[list[tuple[str, dict[str, str]]]]:
+        """One XAUTOCLAIM sweep over the group's PEL, a claimed page at a time.
 
         ``min_idle_time=pending_timeout_ms`` is the whole protection against
         taking work away from a healthy consumer, so it is passed through
         untouched: an entry is only claimable once nobody has been handed it for
-        that long.
+        that long. A page that claimed nothing with a body is not yielded.
+
+        The PEL size is sampled for the metrics before the sweep starts.
         """
+        await self._sample_pending(stream, group)
         cursor = "0-0"
         while True:
             result = await self.redis.xautoclaim(
@@ -411,15 +642,20 @@ class RedisStreamClient:
             # Redis 6.2 leaves a body-less entry in the claimed list instead.
             deleted = result[2] if len(result) >= _XAUTOCLAIM_WITH_DELETED_LEN else []
 
+            page: list[tuple[str, dict[str, str]]] = []
             for message_id, fields in claimed:
                 if fields is None:
                     await self._record_lost_entry(
                         stream, group, decode_redis_value(message_id) if message_id else None
                     )
                     continue
-                yield decode_redis_value(message_id), fields
+                page.append((decode_redis_value(message_id), fields))
             for message_id in deleted:
                 await self._record_lost_entry(stream, group, decode_redis_value(message_id))
+            if page:
+                STREAM_METRICS.reclaimed.inc(len(page), stream=stream, group=group)
+                STREAM_METRICS.read.inc(len(page), stream=stream, group=group)
+                yield page
 
             # Follow the cursor whenever Redis moved it, even when this page
             # brought back nothing. XAUTOCLAIM gives up after scanning about
@@ -434,7 +670,19 @@ class RedisStreamClient:
                 break
             cursor = new_cursor
 
-    async def _iter_entries(
+    async def _sample_pending(self, stream: str, group: str) -> None:
+        """Record the group's PEL size for ``redis_stream_pending_entries``.
+
+        A failure only costs the sample, never the sweep or the read after it.
+        """
+        try:
+            summary = await self.redis.xpending(stream, group)
+        except Exception as e:
+            logger.debug("pending_sample_failed", stream=stream, group=group, error=str(e))
+            return
+        STREAM_METRICS.pending.set(int(summary["pending"]), stream=stream, group=group)
+
+    async def _iter_batches(
         self,
         stream: str,
         group: str,
@@ -444,14 +692,14 @@ class RedisStreamClient:
         claim_pending: bool,
         pending_timeout_ms: int,
         reclaim_interval_ms: int,
-    ) -> AsyncIterator[tuple[str, dict[str, str]] | None]:
-        """Yield raw ``(message_id, fields)`` entries from a stream.
+    ) -> AsyncIterator[list[tuple[str, dict[str, str]]] | None]:
+        """Yield raw ``(message_id, fields)`` entries from a stream, a read at a time.
 
-        Shared read plumbing for ``consume`` and ``consume_typed``: ensures the
-        group exists, then alternates an XAUTOCLAIM sweep of the PEL with a
-        blocking XREADGROUP. Never acks — the caller owns ack semantics. Yields
-        ``None`` when a blocking read returns empty so callers can cede the
-        event loop.
+        Shared read plumbing for every consume method: ensures the group
+        exists, then alternates an XAUTOCLAIM sweep of the PEL with a blocking
+        XREADGROUP. Each non-empty XAUTOCLAIM page and each XREADGROUP answer is
+        one batch. Never acks — the caller owns ack semantics. Yields ``None``
+        when a blocking read returns empty so callers can cede the event loop.
 
         The sweep runs *inside* the read loop, on ``reclaim_interval_ms``. It
         used to run once, before the loop: this generator is created once per
@@ -460,6 +708,7 @@ class RedisStreamClient:
         expecting reclaim to bring it back.
         """
         await self.ensure_consumer_group(stream, group)
+        await ensure_metrics_exporter()
         reclaim_interval_s = reclaim_interval_ms / 1000
         next_reclaim_at = 0.0
 
@@ -469,10 +718,10 @@ class RedisStreamClient:
                     # Scheduled before the sweep, so a sweep that raises waits
                     # its full interval instead of retrying on the next turn.
                     next_reclaim_at = time.monotonic() + reclaim_interval_s
-                    async for entry in self._reclaim_pending(
+                    async for page in self._reclaim_pending(
                         stream, group, consumer, count, pending_timeout_ms
                     ):
-                        yield entry
+                        yield page
 
                 messages = await self.redis.xreadgroup(
                     groupname=group,
@@ -492,9 +741,13 @@ class RedisStreamClient:
                     yield None
                     continue
 
-                for _stream_name, stream_messages in messages:
-                    for message_id, fields in stream_messages:
-                        yield decode_redis_value(message_id), fields
+                batch = [
+                    (decode_redis_value(message_id), fields)
+                    for _stream_name, stream_messages in messages
+                    for message_id, fields in stream_messages
+                ]
+                STREAM_METRICS.observe_read(stream, group, [entry_id for entry_id, _ in batch])
+                yield batch
 
             except asyncio.CancelledError:
                 logger.info("consumer_cancelled", consumer=consumer)
@@ -512,6 +765,34 @@ class RedisStreamClient:
                     logger.error("consume_error", stream=stream, error=str(e))
                 await asyncio.sleep(1)
 
+    async def _iter_entries(
+        self,
+        stream: str,
+        group: str,
+        consumer: str,
+        block_ms: int,
+        count: int,
+        claim_pending: bool,
+        pending_timeout_ms: int,
+        reclaim_interval_ms: int,
+    ) -> AsyncIterator[tuple[str, dict[str, str]] | None]:
+        """``_iter_batches`` flattened to one entry at a time, for the per-entry readers."""
+        async for batch in self._iter_batches(
+            stream,
+            group,
+            consumer,
+            block_ms,
+            count,
+            claim_pending,
+            pending_timeout_ms,
+            reclaim_interval_ms,
+        ):
+            if batch is None:
+                yield None
+                continue
+            for entry in batch:
+                yield entry
+
     async def consume(
         self,
         stream: str,
@@ -558,8 +839,47 @@ class RedisStreamClient:
             yield StreamMessage(message_id=message_id, data=data)
             if auto_ack:
                 await self.redis.xack(stream, group, message_id)
+                STREAM_METRICS.acked.inc(stream=stream, group=group)
                 logger.debug("message_acked", message_id=message_id)
 
+    async def consume_batch(
+        self,
+        stream: str,
+        group: str,
+        consumer: str,
+        *,
+        block_ms: int = 5000,
+        count: int = DEFAULT_BATCH_COUNT,
+        claim_pending: bool = True,
+        pending_timeout_ms: int = 60_000,
+        reclaim_interval_ms: int | None = None,
+    ) -> AsyncIterator[list[StreamMessage] | None]:
+        """Consume up to *count* messages per read, handed over as one list.
+
+        The batch counterpart of ``consume`` with ``auto_ack=False``: every
+        message in a batch stays pending until the caller settles it, normally
+        with one ``ack_many`` for all the ids it processed. Reclaimed entries
+        arrive in batches of their own, one per XAUTOCLAIM page. Yields ``None``
+        when a read comes back empty.
+        """
+        async for batch in self._iter_batches(
+            stream,
+            group,
+            consumer,
+            block_ms,
+            count,
+            claim_pending,
+            pending_timeout_ms,
+            resolve_reclaim_interval_ms(pending_timeout_ms, reclaim_interval_ms),
+        ):
+            if batch is None:
+                yield None
+                continue
+            yield [
+                StreamMessage(message_id=message_id, data=self._parse_fields(fields))
+                for message_id, fields in batch
+            ]
+
     async def _terminal_ack(self, stream: str, group: str, message_id: str) -> None:
         """ACK a poison entry, tolerating a failing XACK.
 
@@ -579,6 +899,8 @@ class RedisStreamClient:
                 entry_id=message_id,
                 error=str(e),
             )
+            return
+        STREAM_METRICS.acked.inc(stream=stream, group=group)
 
     async def _quarantine_entry(
         self,
@@ -609,10 +931,10 @@ class RedisStreamClient:
             "failure": failure,
             "reason": json.dumps(reason),
             "quarantined_at": datetime.now(UTC).isoformat(),
-            "body": json.dumps(decode_redis_fields(fields)),
+            "body": json.dumps(printable_fields(fields)),
         }
         try:
-            dlq_id = await self.redis.xadd(target, entry, **self._xadd_kwargs())
+            dlq_id = await self.redis.xadd(target, entry, **self._xadd_kwargs(target))
         except Exception as e:
             # The exception is raised while handling a payload that may contain
             # secrets, so only its type is logged, never its message.
@@ -625,6 +947,7 @@ class RedisStreamClient:
                 error_type=type(e).__name__,
             )
             return False
+        STREAM_METRICS.dead_lettered.inc(stream=stream, group=group, failure=failure)
         logger.error(
             "typed_consume_entry_quarantined",
             stream=stream,
@@ -709,69 +1032,131 @@ class RedisStreamClient:
                 yield None
                 continue
             message_id, fields = entry
+            message = await self._validate_entry(stream, group, message_id, fields, adapter)
+            if message is not None:
+                yield message
 
-            try:
-                data = self._decode_entry(fields)
-            except json.JSONDecodeError as e:
-                # str(JSONDecodeError) is positional only ("Expecting value:
-                # line 1 column 1"), so it carries no payload. Never log the raw
-                # fields — the payload may hold secrets (tokens in env_vars, api_key).
-                logger.error(
-                    "typed_consume_decode_failed",
-                    stream=stream,
-                    entry_id=message_id,
-                    error=str(e),
-                )
-                await self._reject_entry(
-                    stream,
-                    group,
-                    message_id,
-                    fields=fields,
-                    failure=DLQ_FAILURE_DECODE,
-                    reason={"error": str(e)},
-                )
-                continue
+    async def consume_typed_batch[T](
+        self,
+        stream: str,
+        group: str,
+        consumer: str,
+        message_type: type[T] | TypeAdapter,
+        *,
+        block_ms: int = 5000,
+        count: int = DEFAULT_BATCH_COUNT,
+        claim_pending: bool = True,
+        pending_timeout_ms: int = 60_000,
+        reclaim_interval_ms: int | None = None,
+    ) -> AsyncIterator["list[TypedMessage[T]] | None"]:
+        """``consume_typed``, a read at a time.
+
+        Each batch holds the valid entries of one XREADGROUP answer or one
+        XAUTOCLAIM page, in stream order. A poison entry is settled exactly as
+        ``consume_typed`` settles it — quarantined to ``{stream}:dlq`` and then
+        ACKed — before its batch is handed over, so it never appears in one; a
+        read made only of poison yields nothing. Nothing valid is acked here:
+        the caller settles what it processed with ``ack_many``.
+        """
+        adapter = (
+            message_type if isinstance(message_type, TypeAdapter) else TypeAdapter(message_type)
+        )
 
-            try:
-                value, dropped = validate_tolerating_additions(adapter, data)
-            except ValidationError as e:
-                # Log structured errors with input elided. str(e) and the raw
-                # data both echo field values, which may include secrets, so
-                # they must never reach the logs.
-                errors = safe_validation_errors(e)
-                logger.error(
-                    "typed_consume_validation_failed",
-                    stream=stream,
-                    entry_id=message_id,
-                    errors=errors,
-                )
-                # A message still addressed by the removed ``user_id`` field is
-                # not just malformed: somebody's notification has nowhere to go.
-                # Reject it loudly instead of letting it pass as unaddressable
-                # work.
-                if has_legacy_recipient_field(data):
-                    await alert_legacy_recipient_field(
-                        source=stream, entry_id=message_id, data=data
-                    )
-                await self._reject_entry(
-                    stream,
-                    group,
-                    message_id,
-                    fields=fields,
-                    failure=DLQ_FAILURE_VALIDATION,
-                    reason=errors,
-                )
+        async for batch in self._iter_batches(
+            stream,
+            group,
+            consumer,
+            block_ms,
+            count,
+            claim_pending,
+            pending_timeout_ms,
+            resolve_reclaim_interval_ms(pending_timeout_ms, reclaim_interval_ms),
+        ):
+            if batch is None:
+                yield None
                 continue
+            valid: list[TypedMessage[T]] = []
+            for message_id, fields in batch:
+                message = await self._validate_entry(stream, group, message_id, fields, adapter)
+                if message is not None:
+                    valid.append(message)
+            if valid:
+                yield valid
+
+    async def _validate_entry(
+        self,
+        stream: str,
+        group: str,
+        message_id: str,
+        fields: dict[str, str],
+        adapter: TypeAdapter,
+    ) -> TypedMessage | None:
+        """Decode and validate one entry, rejecting it to the DLQ when it is poison.
 
-            if dropped:
-                # Field names only. They come from the validation error's ``loc``,
-                # which is already what the elided error log carries; no value
-                # from the payload is named here.
-                logger.warning(
-                    "typed_consume_unknown_fields_ignored",
-                    stream=stream,
-                    entry_id=message_id,
-                    unknown_fields=dropped,
-                )
+        Returns the ``TypedMessage`` for a valid entry and ``None`` for one that
+        was handed to ``_reject_entry``.
+        """
+        try:
+            data = self._decode_entry(fields)
+        except PayloadDecodeError as e:
+            # str(PayloadDecodeError) is positional ("Expecting value: line 1
+            # column 1") or names only the failure, so it carries no payload.
+            # Never log the raw fields — the payload may hold secrets (tokens
+            # in env_vars, api_key).
+            logger.error(
+                "typed_consume_decode_failed",
+                stream=stream,
+                entry_id=message_id,
+                error=str(e),
+            )
+            await self._reject_entry(
+                stream,
+                group,
+                message_id,
+                fields=fields,
+                failure=DLQ_FAILURE_DECODE,
+                reason={"error": str(e)},
+            )
+            return None
+
+        try:
+            value, dropped = validate_tolerating_additions(adapter, data)
+        except ValidationError as e:
+            # Log structured errors with input elided. str(e) and the raw
+            # data both echo field values, which may include secrets, so
+            # they must never reach the logs.
+            errors = safe_validation_errors(e)
+            logger.error(
+                "typed_consume_validation_failed",
+                stream=stream,
+                entry_id=message_id,
+                errors=errors,
+            )
+            # A message still addressed by the removed ``user_id`` field is
+            # not just malformed: somebody's notification has nowhere to go.
+            # Reject it loudly instead of letting it pass as unaddressable
+            # work.
+            if has_legacy_recipient_field(data):
+                await alert_legacy_recipient_field(source=stream, entry_id=message_id, data=data)
+            await self._reject_entry(
+                stream,
+                group,
+                message_id,
+                fields=fields,
+                failure=DLQ_FAILURE_VALIDATION,
+                reason=errors,
+            )
+            return None
+
+        if dropped:
+            # Field names only. They come from the validation error's ``loc``,
+            # which is already what the elided error log carries; no value
+            # from the payload is named here.
+            logger.warning(
+                "typed_consume_unknown_fields_ignored",
+                stream=stream,
+                entry_id=message_id,
+                unknown_fields=dropped,
+            )
 
-            yield TypedMessage(message_id=message_id, value=value)
+        return TypedMessage(message_id=message_id, value=value)
@@ -0,0 +1,245 @@
+"""Payload codecs for Redis stream entries.
+
+Every entry ``RedisStreamClient`` publishes carries its payload in one ``data``
+field. Historically that field was always ``json.dumps`` text, and every reader
+``json.loads`` it — on every read, for every consumer group, which for the large
+DTOs (engineering results, QA verdicts) is most of what a read costs.
+
+A codec names how ``data`` is encoded, and the entry says which one was used in
+a ``content_type`` field next to it:
+
+* ``application/json`` — JSON text. Written **without** a ``content_type``
+  field and encoded with stdlib ``json.dumps``, so an entry from the JSON codec
+  is byte-for-byte what every producer wrote before this module existed, and a
+  reader that predates it still reads it. ``orjson`` writes differently
+  (compact, non-ASCII unescaped, ``NaN`` as ``null``), so it is used only to
+  decode, when installed; the ``NaN`` and ``Infinity`` it refuses fall back to
+  stdlib ``json``.
+* ``application/msgpack`` — MessagePack (``msgpack`` or ``ormsgpack``).
+* either of the above with ``+zstd`` — the encoded body compressed with
+  ``zstandard``. Only bodies of at least ``compress_min_bytes`` are compressed;
+  a smaller one is written uncompressed under the base content type, because
+  zstd's frame overhead would make it bigger.
+
+Readers decode whatever the entry says, whatever their own client writes. That
+is the migration path: every reader learns the tags first, producers switch
+(``REDIS_STREAM_CODEC``) afterwards, and during the switch old and new entries
+sit side by side in the same stream. An entry without a tag is JSON.
+
+Binary bodies ride the client's ``decode_responses=True`` connection because
+the connection decodes with ``surrogateescape``: undecodable bytes come back as
+lone surrogates, and ``body_bytes`` turns them back into the exact bytes that
+were written. Anything that reads a binary entry over a different, strictly
+decoding connection has to ask for bytes itself.
+"""
+
+from __future__ import annotations
+
+import base64
+from dataclasses import dataclass
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None  # type: ignore
+
+try:
+    import ormsgpack
+except ImportError:
+    ormsgpack = None  # type: ignore
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # type: ignore
+
+DATA_FIELD = "data"
+CONTENT_TYPE_FIELD = "content_type"
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+ZSTD_SUFFIX = "+zstd"
+
+# Codec names as ``REDIS_STREAM_CODEC`` spells them.
+CODEC_NAMES = ("json", "msgpack", "json+zstd", "msgpack+zstd")
+DEFAULT_CODEC = "json"
+
+# Below this many encoded bytes a body is not worth a zstd frame.
+DEFAULT_COMPRESS_MIN_BYTES = 1024
+
+# How the connection decodes values it cannot read as UTF-8 (see module docstring).
+ENCODING_ERRORS = "surrogateescape"
+
+
+class PayloadDecodeError(ValueError):
+    """An entry's ``data`` could not be decoded under its content type.
+
+    The message names the content type and the failure, never the body: a
+    payload may carry secrets, and some decoders echo what they choked on.
+    """
+
+
+def body_bytes(value: str | bytes) -> bytes:
+    """The bytes that were written for *value*, however the connection decoded it."""
+    if isinstance(value, bytes):
+        return value
+    return value.encode("utf-8", ENCODING_ERRORS)
+
+
+def _field(fields: dict, name: str) -> Any:
+    if name in fields:
+        return fields[name]
+    return fields.get(name.encode())
+
+
+def content_type_of(fields: dict) -> str | None:
+    """The entry's ``content_type``, or None for an untagged (JSON) entry."""
+    value = _field(fields, CONTENT_TYPE_FIELD)
+    if value is None:
+        return None
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def is_tagged(fields: dict) -> bool:
+    """Whether the entry is an envelope this module wrote with a content type."""
+    return _field(fields, DATA_FIELD) is not None and content_type_of(fields) is not None
+
+
+def _json_loads(body: str | bytes) -> Any:
+    if orjson is not None:
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(body)
+
+
+def _msgpack_dumps(data: Any) -> bytes:
+    if msgpack is not None:
+        return msgpack.packb(data, use_bin_type=True)
+    return ormsgpack.packb(data)
+
+
+def _msgpack_loads(body: bytes) -> Any:
+    if msgpack is not None:
+        return msgpack.unpackb(body, raw=False)
+    return ormsgpack.unpackb(body)
+
+
+def _require(content_type: str) -> None:
+    base, _, compression = content_type.partition("+")
+    if base not in (JSON, MSGPACK) or compression not in ("", ZSTD_SUFFIX[1:]):
+        raise PayloadDecodeError(f"unknown content type {content_type!r}")
+    if base == MSGPACK and msgpack is None and ormsgpack is None:
+        raise PayloadDecodeError(f"{content_type}: no msgpack library installed")
+    if compression and zstandard is None:
+        raise PayloadDecodeError(f"{content_type}: zstandard is not installed")
+
+
+def decode_body(body: str | bytes, content_type: str | None) -> Any:
+    """Decode *body* as written under *content_type* (None: untagged JSON).
+
+    Raises ``PayloadDecodeError`` for a body that does not decode.
+    """
+    if content_type is None or content_type == JSON:
+        try:
+            return _json_loads(body)
+        except ValueError as exc:
+            # JSON decoders report a position, never the document.
+            raise PayloadDecodeError(str(exc)) from exc
+
+    _require(content_type)
+    raw = body_bytes(body)
+    base, _, compression = content_type.partition("+")
+    try:
+        if compression:
+            raw = zstandard.ZstdDecompressor().decompress(raw)
+        return _json_loads(raw) if base == JSON else _msgpack_loads(raw)
+    except Exception as exc:
+        raise PayloadDecodeError(f"undecodable {content_type} body: {type(exc).__name__}") from exc
+
+
+def decode_fields(fields: dict) -> Any:
+    """Decode an entry's ``data`` under its own content type."""
+    body = _field(fields, DATA_FIELD)
+    if body is None:
+        raise PayloadDecodeError(f"entry has no {DATA_FIELD!r} field")
+    return decode_body(body, content_type_of(fields))
+
+
+def printable_fields(fields: dict) -> dict[str, str]:
+    """The entry's fields as text, for JSON documents such as a DLQ copy.
+
+    A binary body is carried base64-encoded, flagged by ``data_encoding``.
+    """
+    printable: dict[str, str] = {}
+    for key, value in fields.items():
+        key = key.decode() if isinstance(key, bytes) else key
+        raw = body_bytes(value)
+        try:
+            printable[key] = raw.decode()
+        except UnicodeDecodeError:
+            printable[key] = base64.b64encode(raw).decode()
+            printable[f"{key}_encoding"] = "base64"
+    return printable
+
+
+@dataclass(frozen=True)
+class StreamCodec:
+    """Encodes payloads into entry fields. ``decode_fields`` reads any of them."""
+
+    base: str = JSON
+    compress: bool = False
+    compress_min_bytes: int = DEFAULT_COMPRESS_MIN_BYTES
+
+    @property
+    def name(self) -> str:
+        """The codec's ``REDIS_STREAM_CODEC`` spelling."""
+        name = "json" if self.base == JSON else "msgpack"
+        return f"{name}{ZSTD_SUFFIX}" if self.compress else name
+
+    def encode(self, data: Any) -> dict[str, str | bytes]:
+        """The ``XADD`` field map carrying *data*."""
+        if self.base == JSON:
+            text = json.dumps(data)
+            if not self.compress or len(text) < self.compress_min_bytes:
+                return {DATA_FIELD: text}
+            body: bytes = text.encode()
+        else:
+            body = _msgpack_dumps(data)
+            if not self.compress or len(body) < self.compress_min_bytes:
+                return {DATA_FIELD: body, CONTENT_TYPE_FIELD: MSGPACK}
+        return {
+            DATA_FIELD: zstandard.ZstdCompressor().compress(body),
+            CONTENT_TYPE_FIELD: f"{self.base}{ZSTD_SUFFIX}",
+        }
+
+
+def codec_from_name(
+    name: str, *, compress_min_bytes: int = DEFAULT_COMPRESS_MIN_BYTES
+) -> StreamCodec:
+    """Build the codec ``REDIS_STREAM_CODEC`` names, checking its libraries exist.
+
+    Raises ``ValueError`` for an unknown name and ``ImportError`` when a library
+    the codec needs is not installed — at startup, rather than on the first
+    publish.
+    """
+    if name not in CODEC_NAMES:
+        raise ValueError(f"unknown stream codec {name!r}; expected one of {', '.join(CODEC_NAMES)}")
+    base_name, _, compression = name.partition("+")
+    if base_name == "msgpack" and msgpack is None and ormsgpack is None:
+        raise ImportError("stream codec 'msgpack' needs the msgpack or ormsgpack package")
+    if compression and zstandard is None:
+        raise ImportError(f"stream codec {name!r} needs the zstandard package")
+    return StreamCodec(
+        base=JSON if base_name == "json" else MSGPACK,
+        compress=bool(compression),
+        compress_min_bytes=compress_min_bytes,
+    )
@@ -0,0 +1,41 @@
+"""Registry of ephemeral streams, scored by their last write.
+
+Request-response and per-worker streams (``po:response:{request_id}``,
+``worker:{id}:input``, ``worker:{id}:output``) outlive their owners whenever a
+reader times out or a worker is not torn down cleanly. Their producers record
+each write in one sorted set, ``EPHEMERAL_REGISTRY``, member the stream key and
+score the Unix time of the write. The scheduler's queue cleanup then reads only
+the members whose score is past its idle threshold, instead of scanning the
+whole keyspace for the patterns below.
+
+A score is a lower bound on activity, not the activity itself: reads do not
+move it. Cleanup confirms each expired member with ``OBJECT IDLETIME`` before
+deleting it.
+"""
+
+import time
+from typing import Any
+
+EPHEMERAL_REGISTRY = "stream:registry:ephemeral"
+
+# The keys registered here, as SCAN patterns: what the registry replaced, and
+# what a one-off backfill still walks for streams written before it existed.
+EPHEMERAL_PATTERNS = (
+    "po:response:*",
+    "worker:*:input",
+    "worker:*:output",
+)
+
+
+def is_ephemeral_stream(stream: str) -> bool:
+    """Whether *stream* is one of ``EPHEMERAL_PATTERNS``."""
+    if stream.startswith("po:response:"):
+        return True
+    return stream.startswith("worker:") and stream.endswith((":input", ":output"))
+
+
+async def register_ephemeral(redis: Any, *streams: str) -> None:
+    """Record a write to *streams* now (one ZADD, whatever their number)."""
+    if streams:
+        now = time.time()
+        await redis.zadd(EPHEMERAL_REGISTRY, dict.fromkeys(streams, now))
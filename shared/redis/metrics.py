@@ -0,0 +1,323 @@
+"""Consumer metrics for Redis streams, in Prometheus text format.
+
+Until these existed, the only view into the queues was the XINFO loop behind
+``/debug/queues``: a snapshot of lengths and PEL sizes, taken when somebody
+asked. It cannot say where a job's time went — waiting in the stream, waiting
+in a PEL, or in the handler — and that is the question under load.
+
+``RedisStreamClient`` and the shared queue worker record into ``STREAM_METRICS``,
+one per process:
+
+- ``redis_stream_messages_read_total`` / ``_reclaimed_total`` / ``_acked_total``
+  / ``_dead_lettered_total`` — per stream and group;
+- ``redis_stream_handler_seconds`` — how long the handler ran, by outcome;
+- ``redis_stream_enqueue_to_dequeue_seconds`` — for the newest fresh read, how
+  long the entry sat in the stream, from the timestamp in its id;
+- ``redis_stream_pending_entries`` — the group's PEL size, sampled on every
+  reclaim sweep.
+
+The exporter is deliberately small: no client library, nothing but the text
+format. ``METRICS_PORT`` serves it on ``GET /metrics``; ``METRICS_TEXTFILE``
+writes it to a file for node_exporter's textfile collector instead. The
+exporter starts the first time a process consumes a stream, so every consuming
+service exports without wiring of its own; with neither variable set nothing
+listens and the numbers are only kept.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import asyncio
+from collections.abc import Iterable
+import math
+import os
+from pathlib import Path
+import time
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Handler runs range from a stale-message skip (milliseconds) to an engineering
+# job (tens of minutes), so the buckets span both.
+HANDLER_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 5, 15, 30, 60, 300, 900, 1800, 3600)
+
+TEXTFILE_INTERVAL_S = 15.0
+
+LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _sample(name: str, labels: dict[str, str], value: float) -> str:
+    if not labels:
+        return f"{name} {_format_value(value)}"
+    rendered = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+    return f"{name}{{{rendered}}} {_format_value(value)}"
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str]) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: LabelValues) -> dict[str, str]:
+        return dict(zip(self.labelnames, key, strict=True))
+
+    @abstractmethod
+    def _samples(self) -> Iterable[str]:
+        """The metric's sample lines, one per label set (and bucket)."""
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """A monotonically increasing count per label set."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str]) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> Iterable[str]:
+        for key, value in sorted(self._values.items()):
+            yield _sample(self.name, self._labels(key), value)
+
+
+class Gauge(_Metric):
+    """A value that goes up and down, per label set."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str]) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = value
+
+    def value(self, **labels: str) -> float | None:
+        return self._values.get(self._key(labels))
+
+    def _samples(self) -> Iterable[str]:
+        for key, value in sorted(self._values.items()):
+            yield _sample(self.name, self._labels(key), value)
+
+
+class Histogram(_Metric):
+    """Cumulative bucket counts, sum and count per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str],
+        buckets: Iterable[float],
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: one count per bucket (non-cumulative), then sum, count.
+        self._series: dict[LabelValues, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        counts, totals = self._series.setdefault(key, ([0] * len(self.buckets), [0.0, 0]))
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        totals[0] += value
+        totals[1] += 1
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return int(series[1][1]) if series else 0
+
+    def _samples(self) -> Iterable[str]:
+        for key, (counts, (total, count)) in sorted(self._series.items()):
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts, strict=True):
+                cumulative += bucket_count
+                bucket_labels = {**labels, "le": _format_value(bound)}
+                yield _sample(f"{self.name}_bucket", bucket_labels, cumulative)
+            yield _sample(f"{self.name}_bucket", {**labels, "le": "+Inf"}, count)
+            yield _sample(f"{self.name}_sum", labels, total)
+            yield _sample(f"{self.name}_count", labels, count)
+
+
+def entry_age_s(entry_id: str, now: float | None = None) -> float:
+    """Seconds since the entry was added, from the millisecond part of its id."""
+    written_ms = int(entry_id.partition("-")[0])
+    return max(0.0, (now if now is not None else time.time()) - written_ms / 1000)
+
+
+class StreamMetrics:
+    """The consumer metrics one process keeps; see the module docstring."""
+
+    def __init__(self) -> None:
+        stream_group = ("stream", "group")
+        self.read = Counter(
+            "redis_stream_messages_read_total",
+            "Entries handed to a consumer, fresh or reclaimed.",
+            stream_group,
+        )
+        self.reclaimed = Counter(
+            "redis_stream_messages_reclaimed_total",
+            "Entries taken over from an idle PEL by XAUTOCLAIM.",
+            stream_group,
+        )
+        self.acked = Counter(
+            "redis_stream_messages_acked_total",
+            "Entries acknowledged.",
+            stream_group,
+        )
+        self.dead_lettered = Counter(
+            "redis_stream_messages_dead_lettered_total",
+            "Poison entries copied to the stream's DLQ.",
+            (*stream_group, "failure"),
+        )
+        self.handler_seconds = Histogram(
+            "redis_stream_handler_seconds",
+            "Time the handler spent on one entry.",
+            (*stream_group, "outcome"),
+            HANDLER_BUCKETS,
+        )
+        self.enqueue_to_dequeue = Gauge(
+            "redis_stream_enqueue_to_dequeue_seconds",
+            "Age of the newest freshly read entry when it was read.",
+            stream_group,
+        )
+        self.pending = Gauge(
+            "redis_stream_pending_entries",
+            "Entries in the group's PEL when the last reclaim sweep started.",
+            stream_group,
+        )
+
+    @property
+    def metrics(self) -> tuple[_Metric, ...]:
+        return (
+            self.read,
+            self.reclaimed,
+            self.acked,
+            self.dead_lettered,
+            self.handler_seconds,
+            self.enqueue_to_dequeue,
+            self.pending,
+        )
+
+    def observe_read(self, stream: str, group: str, entry_ids: list[str]) -> None:
+        """Count a fresh read and record how long its newest entry waited."""
+        if not entry_ids:
+            return
+        self.read.inc(len(entry_ids), stream=stream, group=group)
+        self.enqueue_to_dequeue.set(entry_age_s(entry_ids[-1]), stream=stream, group=group)
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format."""
+        return "\n".join(metric.render() for metric in self.metrics) + "\n"
+
+
+STREAM_METRICS = StreamMetrics()
+
+
+async def _serve_request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+        # Drain the headers; nothing in them changes the answer.
+        while await asyncio.wait_for(reader.readline(), timeout=5) not in (b"\r\n", b"\n", b""):
+            pass
+        method, path, *_ = request_line.decode("latin-1").split() + ["", ""]
+        if method == "GET" and path.split("?")[0] == "/metrics":
+            body = STREAM_METRICS.render().encode()
+            status = "200 OK"
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            body, status, content_type = b"not found\n", "404 Not Found", "text/plain"
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+            + body
+        )
+        await writer.drain()
+    except (TimeoutError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _write_textfile_forever(path: Path, interval_s: float) -> None:
+    while True:
+        try:
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            tmp.write_text(STREAM_METRICS.render())
+            # The collector must never read a half-written file.
+            tmp.replace(path)
+        except OSError as exc:
+            logger.warning("metrics_textfile_write_failed", path=str(path), error=str(exc))
+        await asyncio.sleep(interval_s)
+
+
+# Held so the server and the writer task are not garbage-collected.
+_exporter_handles: list[asyncio.Task | asyncio.Server] = []
+_exporter_started = False
+
+
+async def ensure_metrics_exporter() -> None:
+    """Start the exporter ``METRICS_PORT`` / ``METRICS_TEXTFILE`` ask for, once.
+
+    A port that cannot be bound — a second consuming process sharing the
+    container's network — is logged and skipped; the first process exports.
+    """
+    global _exporter_started  # noqa: PLW0603
+    if _exporter_started:
+        return
+    _exporter_started = True
+
+    port = os.getenv("METRICS_PORT")
+    if port:
+        try:
+            # Scraped from the compose network, not from inside the container.
+            server = await asyncio.start_server(_serve_request, "0.0.0.0", int(port))  # noqa: S104
+        except (OSError, ValueError) as exc:
+            logger.warning("metrics_exporter_unavailable", port=port, error=str(exc))
+        else:
+            _exporter_handles.append(server)
+            logger.info("metrics_exporter_listening", port=int(port))
+
+    textfile = os.getenv("METRICS_TEXTFILE")
+    if textfile:
+        task = asyncio.create_task(
+            _write_textfile_forever(Path(textfile), TEXTFILE_INTERVAL_S),
+            name="metrics-textfile",
+        )
+        _exporter_handles.append(task)
+        logger.info("metrics_textfile_exporter_started", path=textfile)
@@ -18,6 +18,8 @@ class MockGitHubClient:
         self.repos: dict[str, GitHubRepository] = {}  # name -> GitHubRepository
         self.files: dict[str, dict[str, str]] = {}  # repo_name -> { path -> content }
         self.secrets: dict[str, dict[str, str]] = {}  # repo_name -> { key -> value }
+        # (repo_name, path) of every get_file_contents call, in order
+        self.file_fetches: list[tuple[str, str]] = []
 
         # Behavior Configuration
         self.should_fail: bool = False
@@ -59,6 +61,7 @@ class MockGitHubClient:
             description=description,
             created_at=datetime.now(UTC),
             updated_at=datetime.now(UTC),
+            pushed_at=datetime.now(UTC),
         )
         self.repos[name] = repo
         self.files[name] = {}
@@ -84,6 +87,7 @@ class MockGitHubClient:
         self, owner: str, repo: str, path: str, ref: str = "main"
     ) -> str | None:
         self._check_failure()
+        self.file_fetches.append((repo, path))
         if repo not in self.repos:
             return None
 
@@ -133,6 +137,8 @@ class MockGitHubClient:
             raise httpx.HTTPStatusError("Repo Not Found", request=request, response=response)
 
         self.files[repo][path] = content
+        # A commit is a push: list_org_repos reports it as GitHub does.
+        self.repos[repo] = self.repos[repo].model_copy(update={"pushed_at": datetime.now(UTC)})
 
         return {
             "name": path.split("/")[-1],
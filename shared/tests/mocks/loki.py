@@ -0,0 +1,210 @@
+"""In-process fake of Loki's read API for unit tests.
+
+Stores pushed lines and answers ``/loki/api/v1/query_range`` and
+``/loki/api/v1/query`` over an ``httpx.MockTransport``, so ``LokiClient`` is
+exercised end to end — paging, limits and response parsing included.
+
+It evaluates the LogQL this repo sends, not LogQL in general:
+
+* stream selectors with ``=``, ``!=``, ``=~`` and ``!~`` matchers;
+* the ``json`` parser, label filters (``a="x"``, ``a!=""``, ``a=~"5.."``,
+  conditions joined by ``or``), ``line_format`` with ``{{.label}}`` fields, ``unwrap <label>``
+  and ``__error__=""``;
+* ``count_over_time`` and ``quantile_over_time`` over ``[<n>s]`` ranges, with
+  ``sum by (...)`` and ``topk(k, ...) by (...)`` around them.
+"""
+
+from collections.abc import Iterable
+from datetime import datetime
+import json
+import math
+import re
+
+import httpx
+
+from shared.clients.loki import LokiClient, unix_ns
+
+_MATCHER = re.compile(r'(\w+)\s*(=~|!~|!=|=)\s*"([^"]*)"')
+_RANGE = re.compile(
+    r"^(?P<fn>count_over_time|quantile_over_time)\((?:(?P<q>[\d.]+), )?"
+    r"(?P<log>.+) \[(?P<secs>\d+)s\]\)(?: by \((?P<by>[^)]*)\))?$"
+)
+_LINE_FORMAT = re.compile(r'line_format "(?P<template>.*)"')
+_TEMPLATE_FIELD = re.compile(r"\{\{\s*\.(\w+)\s*\}\}")
+_SUM = re.compile(r"^sum by \((?P<by>[^)]*)\) \((?P<inner>.+)\)$")
+_TOPK = re.compile(r"^topk\((?P<k>\d+), (?P<inner>.+)\) by \((?P<by>[^)]*)\)$")
+
+type Series = list[tuple[dict[str, str], float]]
+
+
+def _matches(labels: dict[str, str], name: str, op: str, value: str) -> bool:
+    actual = labels.get(name, "")
+    if op == "=":
+        return actual == value
+    if op == "!=":
+        return actual != value
+    matched = re.fullmatch(value, actual) is not None
+    return matched if op == "=~" else not matched
+
+
+def _label_value(value: object) -> str:
+    if isinstance(value, bool):
+        return str(value).lower()
+    return value if isinstance(value, str) else json.dumps(value)
+
+
+def _group(labels: dict[str, str], by: str) -> dict[str, str]:
+    names = [name.strip() for name in by.split(",") if name.strip()]
+    return {name: labels[name] for name in names if labels.get(name)}
+
+
+def _render(template: str, labels: dict[str, str]) -> str:
+    """``line_format``: Loki renders a missing label as the empty string."""
+    return _TEMPLATE_FIELD.sub(lambda field: labels.get(field[1], ""), template)
+
+
+def _key(labels: dict[str, str]) -> tuple:
+    return tuple(sorted(labels.items()))
+
+
+def _quantile(q: float, values: list[float]) -> float:
+    """Prometheus' interpolated quantile, which ``quantile_over_time`` uses."""
+    ordered = sorted(values)
+    rank = q * (len(ordered) - 1)
+    lower, upper = math.floor(rank), math.ceil(rank)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+class FakeLoki:
+    """In-memory Loki read API; ``client()`` returns a ``LokiClient`` wired to it."""
+
+    def __init__(self, max_entries_limit: int = 5000):
+        self.max_entries_limit = max_entries_limit
+        self.entries: list[tuple[int, dict[str, str], str]] = []
+        self.requests: list[httpx.Request] = []
+
+    def push(self, labels: dict[str, str], lines: Iterable[tuple[datetime | int, dict | str]]):
+        """Store *lines* (timestamp, JSON object or raw text) under the stream *labels*."""
+        for moment, line in lines:
+            ts = moment if isinstance(moment, int) else unix_ns(moment)
+            text = line if isinstance(line, str) else json.dumps(line)
+            self.entries.append((ts, dict(labels), text))
+        self.entries.sort(key=lambda entry: entry[0])
+
+    def client(self) -> LokiClient:
+        return LokiClient(base_url="http://loki", transport=httpx.MockTransport(self._handle))
+
+    def queries(self, path: str = "/loki/api/v1/query") -> list[str]:
+        """The LogQL of every request made to *path*, in order."""
+        return [r.url.params["query"] for r in self.requests if r.url.path == path]
+
+    # ── HTTP ──
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        params = request.url.params
+        if request.url.path == "/loki/api/v1/query_range":
+            limit = int(params["limit"])
+            if limit > self.max_entries_limit:
+                return httpx.Response(
+                    400,
+                    text=f"max entries limit per query exceeded, limit > max_entries_limit "
+                    f"({limit} > {self.max_entries_limit})",
+                )
+            return httpx.Response(200, json=self._query_range(params))
+        if request.url.path == "/loki/api/v1/query":
+            at = int(params["time"])
+            result = [
+                {"metric": labels, "value": [at / 1e9, repr(value)]}
+                for labels, value in self._evaluate(params["query"], at)
+            ]
+            return httpx.Response(
+                200, json={"status": "success", "data": {"resultType": "vector", "result": result}}
+            )
+        return httpx.Response(404)
+
+    def _query_range(self, params) -> dict:
+        assert params["direction"] == "forward"
+        start, end = int(params["start"]), int(params["end"])
+        selected = self._select(params["query"], lambda ts: start <= ts < end)
+        streams: dict[tuple, dict] = {}
+        for ts, labels, line, _ in selected[: int(params["limit"])]:
+            stream = streams.setdefault(_key(labels), {"stream": labels, "values": []})
+            stream["values"].append([str(ts), line])
+        return {
+            "status": "success",
+            "data": {"resultType": "streams", "result": list(streams.values())},
+        }
+
+    # ── LogQL ──
+
+    def _select(self, query: str, in_window) -> list[tuple[int, dict, str, float | None]]:
+        """Entries of a log query in the window: ``(ts, labels, line, unwrapped value)``."""
+        selector, _, pipeline = query.partition("}")
+        matchers = _MATCHER.findall(selector)
+        stages = [stage.strip() for stage in pipeline.split(" | ") if stage.strip()]
+
+        selected = []
+        for ts, stream_labels, stored in self.entries:
+            if not in_window(ts) or not all(_matches(stream_labels, *m) for m in matchers):
+                continue
+            labels, line, value = dict(stream_labels), stored, None
+            for stage in stages:
+                if stage == "json":
+                    try:
+                        fields = json.loads(line)
+                    except json.JSONDecodeError:
+                        fields = None
+                    if not isinstance(fields, dict):
+                        labels["__error__"] = "JSONParserErr"
+                        continue
+                    for name, field_value in fields.items():
+                        if field_value is not None and not isinstance(field_value, dict | list):
+                            labels.setdefault(name, _label_value(field_value))
+                elif stage.startswith("line_format "):
+                    line = _render(_LINE_FORMAT.fullmatch(stage)["template"], labels)
+                elif stage.startswith("unwrap "):
+                    name = stage.removeprefix("unwrap ")
+                    try:
+                        value = float(labels.pop(name))
+                    except (KeyError, ValueError):
+                        labels["__error__"] = "SampleExtractionErr"
+                elif not any(
+                    all(_matches(labels, *m) for m in _MATCHER.findall(condition))
+                    for condition in stage.split(" or ")
+                ):
+                    break
+            else:
+                labels.pop("__error__", None)
+                selected.append((ts, labels, line, value))
+        return selected
+
+    def _evaluate(self, query: str, at: int) -> Series:
+        if match := _TOPK.match(query):
+            groups: dict[tuple, Series] = {}
+            for labels, value in self._evaluate(match["inner"], at):
+                groups.setdefault(_key(_group(labels, match["by"])), []).append((labels, value))
+            k = int(match["k"])
+            return [
+                sample
+                for series in groups.values()
+                for sample in sorted(series, key=lambda s: -s[1])[:k]
+            ]
+        if match := _SUM.match(query):
+            sums: dict[tuple, float] = {}
+            for labels, value in self._evaluate(match["inner"], at):
+                key = _key(_group(labels, match["by"]))
+                sums[key] = sums.get(key, 0.0) + value
+            return [(dict(key), value) for key, value in sums.items()]
+        if match := _RANGE.match(query):
+            window = int(match["secs"]) * 1_000_000_000
+            selected = self._select(match["log"], lambda ts: at - window < ts <= at)
+            groups: dict[tuple, list[float]] = {}
+            for _, labels, _, value in selected:
+                grouped = _group(labels, match["by"]) if match["by"] is not None else labels
+                groups.setdefault(_key(grouped), []).append(1.0 if value is None else value)
+            if match["fn"] == "count_over_time":
+                return [(dict(key), float(len(values))) for key, values in groups.items()]
+            q = float(match["q"])
+            return [(dict(key), _quantile(q, values)) for key, values in groups.items()]
+        raise ValueError(f"FakeLoki cannot evaluate: {query}")
@@ -0,0 +1,99 @@
+"""Local fake of the Time4VPS billing API for tests and benchmarks.
+
+``FakeTime4VPS`` is a plain ASGI app answering ``GET /api/server`` and
+``GET /api/server/{id}``. Unit tests reach it in process through ``client()``
+(``httpx.ASGITransport``); ``scripts/benchmarks/time4vps_sync.py`` serves it
+over real TCP with uvicorn. Each answer can be delayed by ``latency`` seconds
+to stand in for the round trip to the provider, and the fake records what a
+test wants to assert on: the requests, their arrival times and the most that
+were in flight at once.
+"""
+
+import asyncio
+import json
+import time
+
+import httpx
+
+from shared.clients.time4vps import Time4VPSClient
+
+
+class FakeTime4VPS:
+    """In-memory Time4VPS server list and details."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.servers: dict[int, dict] = {}
+        self.requests: list[tuple[str, str]] = []
+        self.arrivals: list[float] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def add_server(self, server_id: int, **details) -> None:
+        self.servers[server_id] = {
+            "name": f"vps-{server_id}",
+            "domain": f"vps-{server_id}.example",
+            "ip": f"10.0.{server_id // 256 % 256}.{server_id % 256}",
+            "status": "Active",
+            "cpu_cores": 2,
+            "ram_limit": 4096,
+            "disk_limit": 81920,
+            "ram_used": 512,
+            "disk_usage": 4096,
+            "os": "kvm-ubuntu-24.04-gpt-x86_64",
+            **details,
+        }
+
+    def client(self, **kwargs) -> Time4VPSClient:
+        return Time4VPSClient(
+            "user",
+            "secret",
+            base_url="http://time4vps/api",
+            transport=httpx.ASGITransport(app=self),
+            **kwargs,
+        )
+
+    def detail_fetches(self) -> list[int]:
+        """Server IDs of every details request, in arrival order."""
+        return [
+            int(path.rsplit("/", 1)[1])
+            for method, path in self.requests
+            if method == "GET" and path.count("/") == 3  # noqa: PLR2004 — /api/server/{id}
+        ]
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            return
+        self.requests.append((scope["method"], scope["path"]))
+        self.arrivals.append(time.monotonic())
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            status, payload = self._answer(scope["method"], scope["path"])
+        finally:
+            self.in_flight -= 1
+        body = json.dumps(payload).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    def _answer(self, method: str, path: str) -> tuple[int, object]:
+        parts = path.strip("/").split("/")
+        if method != "GET" or parts[:2] != ["api", "server"]:
+            return 404, {"error": ["notfound"]}
+        if len(parts) == 2:  # noqa: PLR2004
+            return 200, [
+                {"server_id": server_id, **{k: d[k] for k in ("name", "domain", "ip", "status")}}
+                for server_id, d in self.servers.items()
+            ]
+        server_id = int(parts[2])
+        if len(parts) == 3 and server_id in self.servers:  # noqa: PLR2004
+            return 200, self.servers[server_id]
+        return 404, {"error": ["notfound"]}
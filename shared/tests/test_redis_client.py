@@ -14,13 +14,17 @@ import redis as redis_module
 from structlog.testing import capture_logs
 
 from shared.contracts.base import BaseMessage
+from shared.queues import ENGINEERING_QUEUE
 from shared.redis.client import (
+    DEFAULT_STREAM_MAXLEN,
     RedisStreamClient,
     StreamMessage,
     TypedMessage,
     decode_redis_value,
     dlq_stream,
+    next_stream_id,
 )
+from shared.redis.ephemeral import EPHEMERAL_REGISTRY, is_ephemeral_stream
 from shared.tests.redis_pel_scan import PelEntry, RedisPelScan
 
 
@@ -517,6 +521,34 @@ class TestPublishFlat:
         )
 
 
+class TestEphemeralRegistry:
+    async def test_writes_to_ephemeral_streams_are_registered(self, client, fake_redis):
+        before = time.time()
+        await client.publish_flat("po:response:req-1", {"text": "hi"})
+        await client.publish("worker:w1:output", {"status": "success"})
+        await client.ensure_consumer_group("worker:w1:input", "worker_group")
+
+        scores = dict(await fake_redis.zrange(EPHEMERAL_REGISTRY, 0, -1, withscores=True))
+        assert set(scores) == {"po:response:req-1", "worker:w1:output", "worker:w1:input"}
+        assert all(score >= before - 1 for score in scores.values())
+        assert await fake_redis.xlen("po:response:req-1") == 1
+
+    async def test_other_streams_are_not_registered(self, client, fake_redis):
+        await client.publish(ENGINEERING_QUEUE, {"key": "value"})
+        await client.publish_flat("po:input", {"text": "hi"})
+        await client.ensure_consumer_group("worker:commands", "manager")
+
+        assert await fake_redis.exists(EPHEMERAL_REGISTRY) == 0
+
+    def test_is_ephemeral_stream_matches_the_cleanup_patterns(self):
+        assert is_ephemeral_stream("po:response:abc")
+        assert is_ephemeral_stream("worker:abc-123:input")
+        assert is_ephemeral_stream("worker:abc-123:output")
+        assert not is_ephemeral_stream("po:input")
+        assert not is_ephemeral_stream("worker:status:abc")
+        assert not is_ephemeral_stream("worker:commands")
+
+
 class StrictSample(BaseMessage):
     """A strict contract: unknown fields are refused, as the queue DTOs are."""
 
@@ -811,3 +843,217 @@ class TestNewerPublisherIsNotDestructive:
         """Tolerance is read-side only: the write side keeps ``extra="forbid"``."""
         with pytest.raises(ValueError, match="cost_usd"):
             StrictSample(name="hello", cost_usd=0.42)
+
+
+async def _first_batch(iterator):
+    """The first non-idle batch a batch reader hands over, or None on idle."""
+    async for batch in iterator:
+        return batch
+    return None
+
+
+class TestBatchConsume:
+    """One XREADGROUP and one XACK per batch, not two round trips per entry."""
+
+    async def test_one_read_hands_over_every_waiting_entry(self, client, fake_redis):
+        for i in range(5):
+            await client.publish("s", {"n": i})
+
+        batch = await _first_batch(client.consume_batch("s", "g", "c1", block_ms=10, count=10))
+
+        assert [msg.data["n"] for msg in batch] == [0, 1, 2, 3, 4]
+        assert (await fake_redis.xpending("s", "g"))["pending"] == 5, "a batch is never auto-acked"
+
+    async def test_count_bounds_the_batch(self, client):
+        for i in range(5):
+            await client.publish("s", {"n": i})
+
+        batch = await _first_batch(client.consume_batch("s", "g", "c1", block_ms=10, count=2))
+
+        assert [msg.data["n"] for msg in batch] == [0, 1]
+
+    async def test_ack_many_settles_the_batch_in_one_pipeline(self, client, fake_redis):
+        for i in range(3):
+            await client.publish("s", {"n": i})
+        batch = await _first_batch(client.consume_batch("s", "g", "c1", block_ms=10))
+
+        executed = []
+        real_pipeline = fake_redis.pipeline
+
+        def counting_pipeline(*args, **kwargs):
+            pipe = real_pipeline(*args, **kwargs)
+            real_execute = pipe.execute
+
+            async def execute(*a, **kw):
+                executed.append(len(pipe.command_stack))
+                return await real_execute(*a, **kw)
+
+            pipe.execute = execute
+            return pipe
+
+        fake_redis.pipeline = counting_pipeline
+        acked = await client.ack_many("s", "g", [msg.message_id for msg in batch])
+
+        assert acked == 3
+        assert executed == [1], "three ids should travel as one XACK in one round trip"
+        assert (await fake_redis.xpending("s", "g"))["pending"] == 0
+
+    async def test_ack_many_chunks_long_id_lists(self, client, fake_redis, monkeypatch):
+        monkeypatch.setattr("shared.redis.client.ACK_CHUNK_SIZE", 2)
+        for i in range(5):
+            await client.publish("s", {"n": i})
+        batch = await _first_batch(client.consume_batch("s", "g", "c1", block_ms=10))
+
+        assert await client.ack_many("s", "g", [msg.message_id for msg in batch]) == 5
+        assert (await fake_redis.xpending("s", "g"))["pending"] == 0
+
+    async def test_ack_many_with_nothing_to_ack_makes_no_call(self, client, fake_redis):
+        fake_redis.pipeline = AsyncMock(side_effect=AssertionError("no round trip expected"))
+        assert await client.ack_many("s", "g", []) == 0
+
+    async def test_reclaimed_entries_arrive_as_a_batch(self, client, fake_redis):
+        for key in ("a", "b"):
+            await fake_redis.xadd("s", {"data": json.dumps({"key": key})})
+        await fake_redis.xgroup_create("s", "g", id="0", mkstream=True)
+        await fake_redis.xreadgroup("g", "crashed", {"s": ">"}, count=2)
+
+        batch = await _first_batch(
+            client.consume_batch("s", "g", "fresh", block_ms=10, pending_timeout_ms=0)
+        )
+
+        assert [msg.data["key"] for msg in batch] == ["a", "b"]
+
+    async def test_empty_read_yields_none(self, client):
+        assert await _first_batch(client.consume_batch("s", "g", "c1", block_ms=10)) is None
+
+
+class TestTypedBatchConsume:
+    async def test_valid_entries_are_validated_in_stream_order(self, client, fake_redis):
+        await client.publish("s", {"name": "first"})
+        await client.publish("s", {"name": "second"})
+
+        batch = await _first_batch(
+            client.consume_typed_batch("s", "g", "c1", TypedSample, block_ms=10)
+        )
+
+        assert [msg.value.name for msg in batch] == ["first", "second"]
+        assert all(isinstance(msg, TypedMessage) for msg in batch)
+        assert (await fake_redis.xpending("s", "g"))["pending"] == 2
+
+    async def test_poison_inside_a_batch_is_quarantined_and_left_out(self, client, fake_redis):
+        await client.publish("s", {"name": "good"})
+        await fake_redis.xadd("s", {"data": "{not json"})
+        await client.publish("s", {"wrong_field": "x"})
+
+        batch = await _first_batch(
+            client.consume_typed_batch("s", "g", "c1", TypedSample, block_ms=10)
+        )
+
+        assert [msg.value.name for msg in batch] == ["good"]
+        failures = [fields["failure"] for _, fields in await fake_redis.xrange(dlq_stream("s"))]
+        assert failures == ["decode_error", "validation_error"]
+        # Only the valid entry is still the caller's to settle.
+        assert (await fake_redis.xpending("s", "g"))["pending"] == 1
+
+    async def test_a_read_of_only_poison_yields_no_batch(self, client, fake_redis):
+        await fake_redis.xadd("s", {"data": "{not json"})
+
+        batch = await _first_batch(
+            client.consume_typed_batch("s", "g", "c1", TypedSample, block_ms=10)
+        )
+
+        assert batch is None, "an all-poison read should leave the caller nothing to process"
+        assert (await fake_redis.xpending("s", "g"))["pending"] == 0
+
+    async def test_an_unquarantinable_entry_stays_pending(self, client, fake_redis):
+        real_xadd = fake_redis.xadd
+
+        async def refuse_dlq(name, *args, **kwargs):
+            if name.endswith(":dlq"):
+                raise RuntimeError("redis refused the write")
+            return await real_xadd(name, *args, **kwargs)
+
+        fake_redis.xadd = refuse_dlq
+        await client.publish("s", {"wrong_field": "x"})
+
+        await _first_batch(client.consume_typed_batch("s", "g", "c1", TypedSample, block_ms=10))
+
+        assert (await fake_redis.xpending("s", "g"))["pending"] == 1
+
+
+class TestTrimConsumed:
+    """XTRIM MINID up to what every consumer group has ACKed, and no further."""
+
+    async def _fill(self, fake_redis, n: int) -> list[str]:
+        return [await fake_redis.xadd("q", {"data": json.dumps({"i": i})}) for i in range(n)]
+
+    async def test_acked_entries_go_and_pending_ones_stay(self, client, fake_redis):
+        ids = await self._fill(fake_redis, 5)
+        await client.ensure_consumer_group("q", "g")
+        await fake_redis.xreadgroup("g", "c", {"q": ">"}, count=3)
+        await fake_redis.xack("q", "g", ids[0], ids[2])
+
+        report = await client.trim_consumed("q")
+
+        assert report.minid == ids[1]
+        assert [entry_id for entry_id, _ in await fake_redis.xrange("q")] == ids[1:]
+        [backlog] = report.groups
+        assert (backlog.pinned_by, backlog.pending) == ("pending", 1)
+
+    async def test_the_slowest_group_sets_the_mark(self, client, fake_redis):
+        ids = await self._fill(fake_redis, 4)
+        await client.ensure_consumer_group("q", "fast")
+        await client.ensure_consumer_group("q", "slow")
+        await fake_redis.xreadgroup("fast", "c", {"q": ">"})
+        await fake_redis.xack("q", "fast", *ids)
+        await fake_redis.xreadgroup("slow", "c", {"q": ">"}, count=2)
+        await fake_redis.xack("q", "slow", ids[0], ids[1])
+
+        report = await client.trim_consumed("q")
+
+        # Everything "slow" has not been delivered yet survives.
+        assert await fake_redis.xlen("q") == 2
+        slow = next(b for b in report.groups if b.group == "slow")
+        assert slow.pinned_by == "undelivered"
+        assert slow.floor_id == next_stream_id(ids[1])
+
+    async def test_a_stream_no_group_reads_is_left_alone(self, client, fake_redis):
+        await self._fill(fake_redis, 3)
+
+        report = await client.trim_consumed("q")
+
+        assert (report.minid, report.trimmed) == (None, 0)
+        assert await fake_redis.xlen("q") == 3
+
+    async def test_a_missing_stream_has_no_backlog(self, client):
+        assert await client.group_backlogs("absent") == []
+
+
+class TestTrimMode:
+    async def test_consumer_group_mode_leaves_queue_streams_uncapped(self, fake_redis):
+        c = RedisStreamClient(
+            redis_url="redis://fake:6379", stream_maxlen=2, trim_mode="consumer-groups"
+        )
+        c._redis = fake_redis
+        for i in range(5):
+            await c.publish(ENGINEERING_QUEUE, {"i": i})
+            await c.publish("po:response:r1", {"i": i})
+
+        assert await fake_redis.xlen(ENGINEERING_QUEUE) == 5
+        # Not a queue any group trims: still capped, however approximately.
+        assert c._xadd_kwargs("po:response:r1") == {"maxlen": 2, "approximate": True}
+
+    def test_maxlen_is_the_default(self, monkeypatch):
+        monkeypatch.delenv("REDIS_STREAM_TRIM", raising=False)
+
+        c = RedisStreamClient(redis_url="redis://fake:6379")
+
+        assert c.trim_mode == "maxlen"
+        assert c._xadd_kwargs(ENGINEERING_QUEUE) == {
+            "maxlen": DEFAULT_STREAM_MAXLEN,
+            "approximate": True,
+        }
+
+    def test_unknown_modes_are_refused(self):
+        with pytest.raises(ValueError, match="unknown stream trim mode"):
+            RedisStreamClient(redis_url="redis://fake:6379", trim_mode="forever")
@@ -0,0 +1,159 @@
+"""Unit tests for shared.redis.codec and the client's use of it."""
+
+import json
+
+from fakeredis import aioredis
+import pytest
+import pytest_asyncio
+
+from shared.contracts.base import BaseMessage
+from shared.redis.client import RedisStreamClient, dlq_stream
+from shared.redis.codec import (
+    CONTENT_TYPE_FIELD,
+    ENCODING_ERRORS,
+    JSON,
+    MSGPACK,
+    PayloadDecodeError,
+    StreamCodec,
+    codec_from_name,
+    decode_body,
+    decode_fields,
+    printable_fields,
+)
+
+PAYLOAD = {"task_id": "eng-1", "result": {"files": ["a.py"] * 3, "ok": True, "n": 3}}
+LARGE = {"log": "line of build output\n" * 500}
+
+
+@pytest_asyncio.fixture
+async def fake_redis():
+    r = aioredis.FakeRedis(decode_responses=True, encoding_errors=ENCODING_ERRORS)
+    yield r
+    await r.aclose()
+
+
+async def _first(iterator):
+    """The first item a reader hands over."""
+    async for item in iterator:
+        return item
+    return None
+
+
+def _client(fake_redis, codec: str) -> RedisStreamClient:
+    c = RedisStreamClient(redis_url="redis://fake:6379", codec=codec)
+    c._redis = fake_redis
+    return c
+
+
+class TestStreamCodec:
+    def test_json_writes_the_legacy_untagged_envelope(self):
+        fields = codec_from_name("json").encode(PAYLOAD)
+
+        assert set(fields) == {"data"}
+        assert json.loads(fields["data"]) == PAYLOAD
+
+    def test_json_bodies_are_what_json_dumps_wrote(self):
+        payload = {"text": "привет", "score": float("nan")}
+
+        assert codec_from_name("json").encode(payload) == {"data": json.dumps(payload)}
+
+    def test_legacy_nan_still_decodes(self):
+        decoded = decode_body(json.dumps({"score": float("nan")}), None)
+
+        assert decoded["score"] != decoded["score"]
+
+    @pytest.mark.parametrize("name", ["json", "msgpack", "json+zstd", "msgpack+zstd"])
+    @pytest.mark.parametrize("payload", [PAYLOAD, LARGE])
+    def test_every_codec_round_trips(self, name, payload):
+        fields = codec_from_name(name).encode(payload)
+
+        assert decode_fields(fields) == payload
+
+    def test_small_bodies_are_not_compressed(self):
+        fields = codec_from_name("msgpack+zstd").encode(PAYLOAD)
+
+        assert fields[CONTENT_TYPE_FIELD] == MSGPACK
+
+    def test_large_bodies_are_compressed_and_tagged(self):
+        fields = codec_from_name("json+zstd").encode(LARGE)
+
+        assert fields[CONTENT_TYPE_FIELD] == f"{JSON}+zstd"
+        assert len(fields["data"]) < len(json.dumps(LARGE)) / 10
+
+    def test_unknown_codec_names_are_refused(self):
+        with pytest.raises(ValueError, match="unknown stream codec"):
+            codec_from_name("protobuf")
+
+    def test_the_name_round_trips(self):
+        assert StreamCodec(base=MSGPACK, compress=True).name == "msgpack+zstd"
+
+
+class TestDecode:
+    def test_untagged_bodies_are_json(self):
+        assert decode_body('{"a": 1}', None) == {"a": 1}
+
+    def test_unknown_content_types_are_a_decode_error(self):
+        with pytest.raises(PayloadDecodeError, match="unknown content type"):
+            decode_body(b"\x00", "application/x-pickle")
+
+    def test_a_corrupt_binary_body_does_not_echo_the_body(self):
+        with pytest.raises(PayloadDecodeError) as excinfo:
+            decode_body(b"secret-token-\xff", f"{MSGPACK}+zstd")
+
+        assert "secret" not in str(excinfo.value)
+
+    def test_printable_fields_carry_binary_bodies_as_base64(self):
+        fields = codec_from_name("msgpack").encode(PAYLOAD)
+
+        printable = printable_fields(fields)
+
+        assert printable["data_encoding"] == "base64"
+        assert printable[CONTENT_TYPE_FIELD] == MSGPACK
+        json.dumps(printable)
+
+
+class TestClientCodec:
+    def test_the_env_var_picks_the_publishing_codec(self, monkeypatch):
+        monkeypatch.setenv("REDIS_STREAM_CODEC", "msgpack+zstd")
+
+        assert RedisStreamClient(redis_url="redis://fake:6379").codec.name == "msgpack+zstd"
+
+    def test_json_is_the_default(self, monkeypatch):
+        monkeypatch.delenv("REDIS_STREAM_CODEC", raising=False)
+
+        assert RedisStreamClient(redis_url="redis://fake:6379").codec.name == "json"
+
+    async def test_old_and_new_producers_share_a_stream(self, fake_redis):
+        old = _client(fake_redis, "json")
+        new = _client(fake_redis, "msgpack+zstd")
+        await old.ensure_consumer_group("s", "g")
+        await old.publish("s", {"n": 1})
+        await new.publish("s", {"n": 2, **LARGE})
+        await new.publish("s", {"n": 3})
+
+        batch = await _first(old.consume_batch("s", "g", "c", block_ms=1))
+
+        assert [msg.data["n"] for msg in batch] == [1, 2, 3]
+
+    async def test_typed_consume_decodes_binary_entries(self, fake_redis):
+        client = _client(fake_redis, "msgpack")
+        await client.ensure_consumer_group("s", "g")
+        sent = BaseMessage()
+        await client.publish_message("s", sent)
+
+        msg = await _first(client.consume_typed("s", "g", "c", BaseMessage, block_ms=1))
+
+        assert msg.value.request_id == sent.request_id
+
+    async def test_an_undecodable_binary_entry_is_quarantined(self, fake_redis):
+        client = _client(fake_redis, "json")
+        await client.ensure_consumer_group("s", "g")
+        await fake_redis.xadd("s", {"data": b"\xc1", CONTENT_TYPE_FIELD: MSGPACK})
+        await client.publish_message("s", BaseMessage())
+
+        msg = await _first(client.consume_typed("s", "g", "c", BaseMessage, block_ms=1))
+
+        [(_, entry)] = await fake_redis.xrange(dlq_stream("s"))
+        assert entry["failure"] == "decode_error"
+        assert json.loads(entry["body"])["data_encoding"] == "base64"
+        assert msg.value is not None
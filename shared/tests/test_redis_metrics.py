@@ -0,0 +1,210 @@
+"""Unit tests for shared.redis.metrics and the client's instrumentation."""
+
+import asyncio
+import socket
+import time
+
+from fakeredis import aioredis
+import pytest
+import pytest_asyncio
+
+from shared.contracts.base import BaseMessage
+from shared.redis import metrics
+from shared.redis.client import RedisStreamClient, dlq_stream
+from shared.redis.codec import ENCODING_ERRORS
+from shared.redis.metrics import STREAM_METRICS, Counter, Histogram, StreamMetrics, entry_age_s
+
+
+@pytest_asyncio.fixture
+async def fake_redis():
+    r = aioredis.FakeRedis(decode_responses=True, encoding_errors=ENCODING_ERRORS)
+    yield r
+    await r.aclose()
+
+
+@pytest.fixture
+def client(fake_redis):
+    c = RedisStreamClient(redis_url="redis://fake:6379")
+    c._redis = fake_redis
+    return c
+
+
+@pytest.fixture
+def exporter_state(monkeypatch):
+    """A fresh, not-yet-started exporter; whatever the test starts is stopped."""
+    handles: list = []
+    monkeypatch.setattr(metrics, "_exporter_started", False)
+    monkeypatch.setattr(metrics, "_exporter_handles", handles)
+    yield handles
+    for handle in handles:
+        if isinstance(handle, asyncio.Task):
+            handle.cancel()
+        else:
+            handle.close()
+
+
+async def _first(iterator):
+    """The first item a reader hands over."""
+    async for item in iterator:
+        return item
+    return None
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestExposition:
+    def test_counters_render_one_sample_per_label_set(self):
+        counter = Counter("jobs_total", "Jobs.", ("stream",))
+        counter.inc(stream="a")
+        counter.inc(2, stream="b")
+
+        rendered = counter.render().splitlines()
+
+        assert rendered == [
+            "# HELP jobs_total Jobs.",
+            "# TYPE jobs_total counter",
+            'jobs_total{stream="a"} 1',
+            'jobs_total{stream="b"} 2',
+        ]
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram("run_seconds", "Runs.", ("stream",), (1, 10))
+        for value in (0.5, 5, 50):
+            histogram.observe(value, stream="s")
+
+        rendered = histogram.render()
+
+        assert 'run_seconds_bucket{stream="s",le="1"} 1' in rendered
+        assert 'run_seconds_bucket{stream="s",le="10"} 2' in rendered
+        assert 'run_seconds_bucket{stream="s",le="+Inf"} 3' in rendered
+        assert 'run_seconds_sum{stream="s"} 55.5' in rendered
+        assert 'run_seconds_count{stream="s"} 3' in rendered
+
+    def test_label_values_are_escaped(self):
+        counter = Counter("c_total", "C.", ("stream",))
+        counter.inc(stream='a"b\\c')
+
+        assert 'c_total{stream="a\\"b\\\\c"} 1' in counter.render()
+
+    def test_every_metric_is_declared_even_before_it_has_samples(self):
+        rendered = StreamMetrics().render()
+
+        for name in (
+            "redis_stream_messages_read_total",
+            "redis_stream_messages_reclaimed_total",
+            "redis_stream_messages_acked_total",
+            "redis_stream_messages_dead_lettered_total",
+            "redis_stream_handler_seconds",
+            "redis_stream_enqueue_to_dequeue_seconds",
+            "redis_stream_pending_entries",
+        ):
+            assert f"# TYPE {name} " in rendered
+
+    def test_entry_age_comes_from_the_id_timestamp(self):
+        assert entry_age_s("1000000-3", now=1005.5) == 5.5
+        assert entry_age_s("9999999999999-0", now=0) == 0.0
+
+
+class TestClientInstrumentation:
+    async def test_fresh_reads_and_batch_acks_are_counted(self, client):
+        await client.ensure_consumer_group("m:reads", "g")
+        for n in range(3):
+            await client.publish("m:reads", {"n": n})
+
+        batch = await _first(client.consume_batch("m:reads", "g", "c", block_ms=1))
+        await client.ack_many("m:reads", "g", [msg.message_id for msg in batch])
+
+        assert STREAM_METRICS.read.value(stream="m:reads", group="g") == 3
+        assert STREAM_METRICS.acked.value(stream="m:reads", group="g") == 3
+        lag = STREAM_METRICS.enqueue_to_dequeue.value(stream="m:reads", group="g")
+        assert 0 <= lag < 5
+
+    async def test_reclaims_are_counted_and_the_pel_is_sampled(self, client, fake_redis):
+        await client.ensure_consumer_group("m:reclaim", "g")
+        await client.publish("m:reclaim", {"n": 1})
+        await fake_redis.xreadgroup("g", "dead", {"m:reclaim": ">"})
+
+        batch = await _first(
+            client.consume_batch("m:reclaim", "g", "c", block_ms=1, pending_timeout_ms=0)
+        )
+
+        assert len(batch) == 1
+        assert STREAM_METRICS.reclaimed.value(stream="m:reclaim", group="g") == 1
+        assert STREAM_METRICS.pending.value(stream="m:reclaim", group="g") == 1
+
+    async def test_quarantined_entries_count_as_dead_lettered_and_acked(self, client, fake_redis):
+        await client.ensure_consumer_group("m:dlq", "g")
+        await fake_redis.xadd("m:dlq", {"data": "{not json"})
+        await client.publish_message("m:dlq", BaseMessage())
+
+        await _first(client.consume_typed("m:dlq", "g", "c", BaseMessage, block_ms=1))
+
+        assert await fake_redis.xlen(dlq_stream("m:dlq")) == 1
+        dead = STREAM_METRICS.dead_lettered.value(stream="m:dlq", group="g", failure="decode_error")
+        assert dead == 1
+        assert STREAM_METRICS.acked.value(stream="m:dlq", group="g") == 1
+
+
+class TestExporter:
+    async def test_metrics_are_served_over_http(self, monkeypatch, exporter_state):
+        port = _free_port()
+        monkeypatch.setenv("METRICS_PORT", str(port))
+        monkeypatch.delenv("METRICS_TEXTFILE", raising=False)
+        STREAM_METRICS.read.inc(stream="m:http", group="g")
+
+        await metrics.ensure_metrics_exporter()
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /metrics HTTP/1.1\r\nHost: x\r\n\r\n")
+        response = (await reader.read()).decode()
+        writer.close()
+
+        assert response.startswith("HTTP/1.1 200 OK")
+        assert 'redis_stream_messages_read_total{stream="m:http",group="g"} 1' in response
+
+    async def test_other_paths_are_not_found(self, monkeypatch, exporter_state):
+        port = _free_port()
+        monkeypatch.setenv("METRICS_PORT", str(port))
+
+        await metrics.ensure_metrics_exporter()
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET / HTTP/1.1\r\n\r\n")
+        response = (await reader.read()).decode()
+        writer.close()
+
+        assert response.startswith("HTTP/1.1 404")
+
+    async def test_a_taken_port_is_logged_not_raised(self, monkeypatch, exporter_state):
+        with socket.socket() as taken:
+            taken.bind(("0.0.0.0", 0))  # noqa: S104 — the exporter binds all interfaces
+            taken.listen()
+            monkeypatch.setenv("METRICS_PORT", str(taken.getsockname()[1]))
+
+            await metrics.ensure_metrics_exporter()
+
+        assert exporter_state == []
+
+    async def test_the_textfile_is_written_atomically(self, monkeypatch, tmp_path, exporter_state):
+        target = tmp_path / "streams.prom"
+        monkeypatch.delenv("METRICS_PORT", raising=False)
+        monkeypatch.setenv("METRICS_TEXTFILE", str(target))
+
+        await metrics.ensure_metrics_exporter()
+        deadline = time.monotonic() + 2
+        while not target.exists() and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+
+        assert "# TYPE redis_stream_messages_read_total counter" in target.read_text()
+        assert not target.with_suffix(".prom.tmp").exists()
+
+    async def test_nothing_starts_without_configuration(self, monkeypatch, exporter_state):
+        monkeypatch.delenv("METRICS_PORT", raising=False)
+        monkeypatch.delenv("METRICS_TEXTFILE", raising=False)
+
+        await metrics.ensure_metrics_exporter()
+        await metrics.ensure_metrics_exporter()
+
+        assert exporter_state == []
@@ -37,6 +37,7 @@ def test_analytics_hourly_columns():
         "p50_ms",
         "p95_ms",
         "p99_ms",
+        "latency_sketch",
         "top_endpoints",
         "created_at",
         "updated_at",
@@ -78,9 +79,12 @@ def test_analytics_daily_columns():
         "unique_users",
         "new_users",
         "dau",
+        "wau",
+        "mau",
         "returning_users",
         "p95_ms",
         "error_rate",
+        "latency_sketch",
         "created_at",
         "updated_at",
     }
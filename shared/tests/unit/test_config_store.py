@@ -5,13 +5,18 @@ the tests drive the shared transport instead: the same cache and fallback
 behaviour, plus proof that a config read carries the two internal API headers.
 """
 
+import asyncio
+from collections.abc import Callable
 import time
 
+from fakeredis import FakeServer, aioredis
 import httpx
 import pytest
 
-from shared.config_store import ConfigStore, ConfigStoreUnavailableError
+from shared.config_store import AsyncConfigStore, ConfigStore, ConfigStoreUnavailableError
+from shared.contracts.queues.config_change import ConfigChangeEvent
 from shared.log_config.correlation import clear_context, set_correlation_id
+from shared.queues import CONFIG_CHANGES_CHANNEL
 
 INTERNAL_KEY = "config-store-test-key"
 
@@ -24,12 +29,17 @@ class _Responder:
         self.status_code = 200
         self.json_body: dict | list | None = {"key": "test", "value": 42}
         self.error: Exception | None = None
+        # Runs once the response is built, before the client receives it.
+        self.after: Callable[[], None] | None = None
 
     def __call__(self, request: httpx.Request) -> httpx.Response:
         self.requests.append(request)
         if self.error is not None:
             raise self.error
-        return httpx.Response(self.status_code, json=self.json_body)
+        response = httpx.Response(self.status_code, json=self.json_body)
+        if self.after is not None:
+            self.after()
+        return response
 
     @property
     def call_count(self) -> int:
@@ -237,3 +247,142 @@ class TestValidateRequired:
         responder.error = httpx.ConnectError("connection refused")
         with pytest.raises(ConfigStoreUnavailableError, match="unavailable"):
             store.validate_required(["key1", "key2"])
+
+
+# ── AsyncConfigStore ──
+
+_ALL_CONFIGS = [
+    {"key": "scheduler.interval", "value": 30, "category": "scheduler"},
+    {"key": "health.threshold", "value": 90.5, "category": "health"},
+    {"key": "health.retries", "value": 3, "category": "health"},
+]
+
+
+@pytest.fixture
+def async_responder(monkeypatch) -> _Responder:
+    rec = _Responder()
+    rec.json_body = list(_ALL_CONFIGS)
+    real_client = httpx.AsyncClient
+
+    def factory(**kwargs):
+        return real_client(transport=httpx.MockTransport(rec), **kwargs)
+
+    monkeypatch.setattr("shared.clients.internal_api.httpx.AsyncClient", factory)
+    monkeypatch.setenv("INTERNAL_API_KEY", INTERNAL_KEY)
+    return rec
+
+
+@pytest.fixture
+def redis_server(monkeypatch) -> FakeServer:
+    """One fake Redis for the store's subscription and the test's publishes."""
+    server = FakeServer()
+    monkeypatch.setattr(
+        "shared.config_store.aioredis.from_url",
+        lambda url, **kwargs: aioredis.FakeRedis(server=server, **kwargs),
+    )
+    return server
+
+
+async def _publish(server: FakeServer, event: ConfigChangeEvent) -> None:
+    redis = aioredis.FakeRedis(server=server, decode_responses=True)
+    await redis.publish(CONFIG_CHANGES_CHANNEL, event.model_dump_json())
+    await redis.aclose()
+
+
+async def _until(condition, timeout: float = 2.0) -> None:
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.01)
+
+
+class TestAsyncConfigStore:
+    async def test_start_loads_every_key_in_one_request(self, async_responder):
+        store = AsyncConfigStore("http://test:8000", redis_url="")
+        await store.start()
+        try:
+            assert store.get_int("scheduler.interval") == 30
+            assert store.get_float("health.threshold") == 90.5
+            assert store.get_category("health") == {"health.threshold": 90.5, "health.retries": 3}
+            store.validate_required(["scheduler.interval", "health.retries"])
+        finally:
+            await store.close()
+
+        assert async_responder.call_count == 1
+        sent = async_responder.last
+        assert sent.url.path == "/api/system-configs/"
+        assert sent.headers["X-Internal-Key"] == INTERNAL_KEY
+
+    async def test_reads_never_touch_the_network(self, async_responder):
+        store = AsyncConfigStore("http://test:8000", redis_url="")
+        await store.load()
+        async_responder.error = httpx.ConnectError("connection refused")
+
+        assert store.get("scheduler.interval") == 30
+        assert store.get("missing", default=5) == 5
+        with pytest.raises(KeyError, match="not found"):
+            store.get("missing")
+        with pytest.raises(RuntimeError, match="missing"):
+            store.validate_required(["scheduler.interval", "missing"])
+        assert async_responder.call_count == 1
+
+    async def test_reading_before_the_first_load_is_an_error(self, async_responder):
+        store = AsyncConfigStore("http://test:8000", redis_url="")
+        with pytest.raises(ConfigStoreUnavailableError, match="not loaded"):
+            store.get("scheduler.interval")
+
+    async def test_start_fails_while_the_api_is_unavailable(self, async_responder):
+        async_responder.error = httpx.ConnectError("connection refused")
+        store = AsyncConfigStore("http://test:8000", redis_url="")
+        with pytest.raises(ConfigStoreUnavailableError, match="unavailable"):
+            await store.start()
+
+    async def test_a_failed_reload_keeps_the_values_held(self, async_responder):
+        store = AsyncConfigStore("http://test:8000", redis_url="")
+        await store.load()
+        async_responder.status_code = 503
+
+        with pytest.raises(ConfigStoreUnavailableError, match="503"):
+            await store.load()
+        assert store.get_int("scheduler.interval") == 30
+
+    async def test_background_refresh_picks_up_changes(self, async_responder):
+        store = AsyncConfigStore("http://test:8000", redis_url="", refresh_interval=0.01)
+        await store.start()
+        try:
+            async_responder.json_body = [{"key": "scheduler.interval", "value": 45}]
+            await _until(lambda: store.get("scheduler.interval") == 45)
+            assert store.get("health.retries", default=None) is None
+        finally:
+            await store.close()
+
+    async def test_published_changes_apply_without_a_request(self, async_responder, redis_server):
+        store = AsyncConfigStore("http://test:8000", redis_url="redis://fake")
+        await store.start()
+        try:
+            await _publish(
+                redis_server,
+                ConfigChangeEvent(key="scheduler.interval", value=60, category="scheduler"),
+            )
+            await _until(lambda: store.get("scheduler.interval") == 60)
+
+            await _publish(redis_server, ConfigChangeEvent(key="health.retries", deleted=True))
+            await _until(lambda: store.get("health.retries", default=None) is None)
+        finally:
+            await store.close()
+
+        assert async_responder.call_count == 1
+
+    async def test_a_change_during_a_reload_is_not_overwritten_by_it(self, async_responder):
+        store = AsyncConfigStore("http://test:8000", redis_url="")
+        await store.load()
+        changed = ConfigChangeEvent(key="scheduler.interval", value=99)
+        # The API read the old value; the change lands before the reply does.
+        async_responder.after = lambda: store.apply_change(changed.model_dump_json())
+
+        await store.load()
+
+        assert store.get("scheduler.interval") == 99
+
+    def test_an_unreadable_change_is_ignored(self):
+        store = AsyncConfigStore("http://test:8000", redis_url="")
+        store.apply_change("not json")
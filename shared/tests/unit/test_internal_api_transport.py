@@ -17,7 +17,13 @@ from pathlib import Path
 import httpx
 import pytest
 
-from shared.clients.internal_api import InternalAPIClient, InternalAPISyncClient
+from shared.clients.internal_api import (
+    BATCH_MAX_IDS,
+    DEFAULT_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    InternalAPIClient,
+    InternalAPISyncClient,
+)
 from shared.log_config.correlation import clear_context, get_correlation_id, set_correlation_id
 
 REPO_ROOT = Path(__file__).parents[3]
@@ -411,10 +417,14 @@ class _Recorder:
     def __init__(self, status_code: int = 200) -> None:
         self.requests: list[httpx.Request] = []
         self.status_code = status_code
+        self.respond = lambda _request: {"ok": True}
+        self.respond_headers = lambda _request: {}
 
     def __call__(self, request: httpx.Request) -> httpx.Response:
         self.requests.append(request)
-        return httpx.Response(self.status_code, json={"ok": True})
+        return httpx.Response(
+            self.status_code, json=self.respond(request), headers=self.respond_headers(request)
+        )
 
     @property
     def last(self) -> httpx.Request:
@@ -592,6 +602,58 @@ async def test_the_timeout_is_a_parameter_not_a_second_transport(recorder):
     assert (await impatient._get_client()).timeout.read == 10.0
 
 
+@pytest.mark.asyncio
+async def test_a_batch_read_names_each_id_once_in_capped_requests(client, recorder):
+    recorder.respond = lambda request: [
+        {"id": task_id} for task_id in request.url.params.get_list("ids")
+    ]
+    ids = [f"task-{i}" for i in range(BATCH_MAX_IDS + 5)]
+
+    rows = await client.get_batch("tasks/batch", "ids", ids + ids[:3], event_type="x")
+
+    assert [row["id"] for row in rows] == ids
+    assert [len(r.url.params.get_list("ids")) for r in recorder.requests] == [BATCH_MAX_IDS, 5]
+    assert {r.url.params["event_type"] for r in recorder.requests} == {"x"}
+    assert recorder.last.url.path == "/api/tasks/batch"
+
+
+@pytest.mark.asyncio
+async def test_a_batch_read_of_no_ids_sends_nothing(client, recorder):
+    assert await client.get_batch("tasks/batch", "ids", []) == []
+    assert recorder.requests == []
+
+
+@pytest.mark.asyncio
+async def test_a_paged_read_follows_the_cursor_until_the_last_page(client, recorder):
+    pages = {None: ([1, 2], "c1"), "c1": ([3, 4], "c2"), "c2": ([5], None)}
+    recorder.respond = lambda request: [
+        {"id": row} for row in pages[request.url.params.get("cursor")][0]
+    ]
+
+    def respond_headers(request):
+        following = pages[request.url.params.get("cursor")][1]
+        return {NEXT_CURSOR_HEADER: following} if following else {}
+
+    recorder.respond_headers = respond_headers
+
+    rows = await client.get_all("tasks/", page_size=2, status="todo")
+
+    assert [row["id"] for row in rows] == [1, 2, 3, 4, 5]
+    assert [r.url.params.get("cursor") for r in recorder.requests] == [None, "c1", "c2"]
+    assert {r.url.params["limit"] for r in recorder.requests} == {"2"}
+    assert {r.url.params["status"] for r in recorder.requests} == {"todo"}
+
+
+@pytest.mark.asyncio
+async def test_a_paged_read_passes_the_callers_headers_on_every_page(client, recorder):
+    recorder.respond = lambda _request: []
+
+    await client.get_all("projects/", headers={"X-Telegram-ID": "42"})
+
+    assert recorder.last.headers["X-Telegram-ID"] == "42"
+    assert recorder.last.url.params["limit"] == str(DEFAULT_PAGE_SIZE)
+
+
 # ---------------------------------------------------------------------------
 # The synchronous form sends the same two headers
 # ---------------------------------------------------------------------------
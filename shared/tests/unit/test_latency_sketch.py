@@ -0,0 +1,84 @@
+"""Unit tests for the mergeable latency sketch."""
+
+import json
+import random
+
+import pytest
+
+from shared.latency_sketch import MAX_BINS, RELATIVE_ACCURACY, LatencySketch, merge_sketches
+
+
+def _exact(values: list[float], q: float) -> float:
+    """The rank-``q * (n - 1)`` value the sketch approximates."""
+    return sorted(values)[int(q * (len(values) - 1))]
+
+
+def _sketch(values) -> LatencySketch:
+    sketch = LatencySketch()
+    for value in values:
+        sketch.add(value)
+    return sketch
+
+
+class TestQuantiles:
+    @pytest.mark.parametrize("q", [0.5, 0.9, 0.95, 0.99])
+    def test_within_the_relative_accuracy(self, q):
+        rng = random.Random(7)  # noqa: S311 — reproducible test data
+        values = [rng.lognormvariate(3, 1.2) for _ in range(20_000)]
+
+        estimate = _sketch(values).quantile(q)
+
+        assert estimate == pytest.approx(_exact(values, q), rel=RELATIVE_ACCURACY)
+
+    def test_extremes_are_exact(self):
+        sketch = _sketch([3.3, 7.0, 120.5])
+
+        assert sketch.quantile(0.0) == 3.3
+        assert sketch.quantile(1.0) == 120.5
+
+    def test_zero_latencies(self):
+        sketch = _sketch([0.0, 0.0, 0.0, 5.0])
+
+        assert sketch.quantile(0.5) == 0.0
+        assert sketch.count == 4
+
+    def test_an_empty_sketch_has_no_quantiles(self):
+        assert LatencySketch().quantile(0.95) is None
+
+
+class TestMerging:
+    def test_merged_quantiles_match_the_whole(self):
+        rng = random.Random(11)  # noqa: S311 — reproducible test data
+        hours = [[rng.expovariate(1 / (20 + 10 * h)) for _ in range(2000)] for h in range(24)]
+
+        merged = merge_sketches(_sketch(values).to_dict() for values in hours)
+
+        everything = [v for values in hours for v in values]
+        assert merged.count == len(everything)
+        for q in (0.5, 0.95, 0.99):
+            assert merged.quantile(q) == pytest.approx(_exact(everything, q), rel=RELATIVE_ACCURACY)
+
+    def test_a_missing_sketch_makes_the_merge_unknown(self):
+        assert merge_sketches([_sketch([1.0]).to_dict(), None]) is None
+
+    def test_sketches_of_different_accuracy_do_not_merge(self):
+        with pytest.raises(ValueError, match="accuracy"):
+            LatencySketch(0.01).merge(LatencySketch(0.02))
+
+
+class TestStorage:
+    def test_round_trips_through_json(self):
+        sketch = _sketch([0.0, 1.5, 1.5, 900.0])
+
+        restored = LatencySketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+
+        assert restored.to_dict() == sketch.to_dict()
+        assert restored.quantile(0.99) == sketch.quantile(0.99)
+
+    def test_bins_are_bounded_and_the_tail_survives(self):
+        # Values spread over far more bins than are kept.
+        values = [1.0001**i for i in range(0, 400_000, 50)]
+        sketch = _sketch(values)
+
+        assert len(sketch.bins) <= MAX_BINS
+        assert sketch.quantile(0.99) == pytest.approx(_exact(values, 0.99), rel=RELATIVE_ACCURACY)
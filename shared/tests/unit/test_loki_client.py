@@ -1,8 +1,13 @@
 """Unit tests for Loki client — response parsing logic."""
 
+from datetime import UTC, datetime, timedelta
 import json
 
+import httpx
+import pytest
+
 from shared.clients.loki import LokiClient
+from shared.tests.mocks.loki import FakeLoki
 
 SAMPLE_LOKI_RESPONSE = {
     "status": "success",
@@ -114,3 +119,67 @@ def test_parse_response_empty_result():
     data = {"data": {"result": []}}
     entries = LokiClient._parse_response(data)
     assert entries == []
+
+
+# ── Paging and metric queries, against the in-process fake ──
+
+_START = datetime(2026, 3, 20, 10, tzinfo=UTC)
+_END = _START + timedelta(hours=1)
+_LABELS = {"job": "docker", "compose_service": "backend"}
+
+
+async def test_a_window_past_the_page_size_is_read_whole():
+    loki = FakeLoki()
+    loki.push(_LABELS, [(_START + timedelta(seconds=i), {"n": i}) for i in range(25)])
+    client = loki.client()
+
+    entries = await client.query_range('{job="docker"}', _START, _END, limit=10)
+
+    assert [e["n"] for e in entries] == list(range(25))
+    assert len(loki.queries("/loki/api/v1/query_range")) == 3
+
+
+async def test_lines_sharing_a_timestamp_across_pages_are_neither_lost_nor_repeated():
+    loki = FakeLoki()
+    moment = _START + timedelta(minutes=1)
+    loki.push(_LABELS, [(_START, {"n": 0})])
+    # The first page ends on this nanosecond and the second starts on it again.
+    loki.push(_LABELS, [(moment, {"n": 1}), (moment, {"n": 2})])
+    loki.push(_LABELS, [(moment + timedelta(seconds=1), {"n": 3})])
+    client = loki.client()
+
+    entries = [e async for e in client.iter_range('{job="docker"}', _START, _END, page_size=3)]
+
+    assert [e["n"] for e in entries] == [0, 1, 2, 3]
+
+
+async def test_a_page_larger_than_loki_allows_is_an_error():
+    client = FakeLoki(max_entries_limit=100).client()
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.query_range('{job="docker"}', _START, _END, limit=101)
+
+
+async def test_query_metric_returns_one_value_per_series():
+    loki = FakeLoki()
+    loki.push(_LABELS, [(_START + timedelta(seconds=i), {"event": "request"}) for i in (1, 2, 3)])
+    client = loki.client()
+
+    series = await client.query_metric(
+        'sum by (compose_service) (count_over_time({job="docker"} | json [3600s]))', _END
+    )
+
+    assert series == [({"compose_service": "backend"}, 3.0)]
+
+
+async def test_query_metric_leaves_out_nan_series():
+    def handler(request: httpx.Request) -> httpx.Response:
+        result = [
+            {"metric": {"compose_service": "a"}, "value": [1, "NaN"]},
+            {"metric": {"compose_service": "b"}, "value": [1, "12.5"]},
+        ]
+        return httpx.Response(200, json={"data": {"resultType": "vector", "result": result}})
+
+    client = LokiClient(base_url="http://loki", transport=httpx.MockTransport(handler))
+
+    assert await client.query_metric("q", _END) == [({"compose_service": "b"}, 12.5)]
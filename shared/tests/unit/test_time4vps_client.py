@@ -1,5 +1,6 @@
 """Time4VPS client: 4xx/5xx responses must surface the provider's own reason."""
 
+import asyncio
 from unittest.mock import patch
 
 import httpx
@@ -142,6 +143,8 @@ class _FakeAsyncio:
     the test spending the seconds it asserts on.
     """
 
+    Semaphore = asyncio.Semaphore
+
     def __init__(self):
         self.now = 0.0
         self.slept: list[float] = []
@@ -306,3 +309,107 @@ async def test_successful_response_is_parsed():
 
     assert [s.id for s in servers] == [1001]
     assert stub.calls == [("GET", "https://billing.time4vps.com/api/server")]
+
+
+class _CountingAsyncClient(_StubAsyncClient):
+    """Counts how many httpx clients the Time4VPS client builds."""
+
+    def __init__(self, response: httpx.Response):
+        super().__init__(response)
+        self.built = 0
+
+    def __call__(self, *args, **kwargs):
+        self.built += 1
+        return self
+
+
+@pytest.mark.asyncio
+async def test_one_pooled_http_client_serves_every_request():
+    stub = _CountingAsyncClient(
+        httpx.Response(
+            200, json=[], request=httpx.Request("GET", "https://billing.time4vps.com/api/server")
+        )
+    )
+    client = Time4VPSClient("user", "secret")
+
+    with patch("shared.clients.time4vps.httpx.AsyncClient", stub):
+        for _ in range(3):
+            await client.get_servers()
+
+    assert stub.built == 1
+    assert len(stub.calls) == 3  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_requests_past_the_burst_wait_for_the_bucket_to_refill(monkeypatch):
+    from shared.clients import time4vps as module
+
+    clock = _FakeAsyncio()
+    monkeypatch.setattr(module, "asyncio", clock)
+    stub = _StubAsyncClient(
+        httpx.Response(
+            200, json=[], request=httpx.Request("GET", "https://billing.time4vps.com/api/server")
+        )
+    )
+    client = Time4VPSClient("user", "secret", requests_per_second=5, burst=3)
+
+    with patch("shared.clients.time4vps.httpx.AsyncClient", stub):
+        for _ in range(5):
+            await client.get_servers()
+
+    # Three go at once; each further one waits for a token at 5 per second.
+    assert clock.slept == pytest.approx([0.2, 0.2])
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_the_connection_limit():
+    from shared.tests.mocks.time4vps import FakeTime4VPS
+
+    fake = FakeTime4VPS(latency=0.02)
+    for server_id in range(1, 13):
+        fake.add_server(server_id)
+    client = fake.client(max_connections=3, burst=20)
+
+    details = await asyncio.gather(*(client.get_server_details(i) for i in range(1, 13)))
+
+    assert [d.name for d in details] == [f"vps-{i}" for i in range(1, 13)]
+    assert fake.max_in_flight == 3  # noqa: PLR2004
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_server_details_are_reused_within_max_age():
+    from shared.tests.mocks.time4vps import FakeTime4VPS
+
+    fake = FakeTime4VPS()
+    fake.add_server(7, os="kvm-debian-12")
+    client = fake.client()
+
+    await client.get_server_details(7, max_age=300)
+    fake.servers[7]["os"] = "kvm-ubuntu-24.04-gpt-x86_64"
+    cached = await client.get_server_details(7, max_age=300)
+    fresh = await client.get_server_details(7)
+
+    assert cached.os == "kvm-debian-12"
+    assert fresh.os == "kvm-ubuntu-24.04-gpt-x86_64"
+    assert fake.detail_fetches() == [7, 7]
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_pending_task_polls_back_off_up_to_the_cap(monkeypatch):
+    from shared.clients import time4vps as module
+
+    clock = _FakeAsyncio()
+    monkeypatch.setattr(module, "asyncio", clock)
+    stub = _SequenceAsyncClient(
+        [_task(completed=None) for _ in range(4)] + [_task(completed="2026-08-06 10:01:40")]
+    )
+    client = Time4VPSClient("user", "secret")
+
+    with patch("shared.clients.time4vps.httpx.AsyncClient", stub):
+        await client.wait_for_task(
+            275301, 4948782, timeout=600, poll_interval=10, max_poll_interval=20
+        )
+
+    assert clock.slept == [10, 15, 20, 20]
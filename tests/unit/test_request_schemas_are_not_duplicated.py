@@ -24,8 +24,6 @@ import pytest
 MERGED = [
     ("analytics", "AnalyticsDailyCreate"),
     ("analytics", "AnalyticsHourlyCreate"),
-    ("analytics", "AnalyticsKnownUserUpsert"),
-    ("analytics", "AnalyticsKnownUsersBatchUpsert"),
     ("application", "ApplicationCreate"),
     ("application", "ApplicationUpdate"),
     ("incident", "IncidentCreate"),